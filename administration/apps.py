@@ -6,3 +6,11 @@ class AdministrationConfig(AppConfig):
     name = 'administration'
     verbose_name = 'Administración'
 
+    def ready(self):
+        from applacolina.pagination import track_counts
+
+        from .models import PurchaseRequest
+
+        track_counts(PurchaseRequest)
+
+        from . import signals  # noqa: F401
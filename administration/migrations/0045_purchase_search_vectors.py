@@ -0,0 +1,102 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:15
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+from django.db.models import Func, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat
+
+
+def search_text(*expressions):
+    parts = []
+    for expression in expressions:
+        if parts:
+            parts.append(Value(" "))
+        parts.append(Coalesce(expression, Value(""), output_field=models.TextField()))
+    return Func(
+        Concat(*parts, output_field=models.TextField()),
+        function="REGEXP_REPLACE",
+        template="%(function)s(%(expressions)s, '[^[:alnum:]]+', ' ', 'g')",
+        output_field=models.TextField(),
+    )
+
+
+def backfill_search_vectors(apps, schema_editor):
+    PurchaseRequest = apps.get_model("administration", "PurchaseRequest")
+    PurchaseItem = apps.get_model("administration", "PurchaseItem")
+    PurchasingExpenseType = apps.get_model("administration", "PurchasingExpenseType")
+    Supplier = apps.get_model("administration", "Supplier")
+
+    Supplier.objects.update(search_vector=SearchVector(search_text("name", "tax_id"), config="simple"))
+    item_scopes = (
+        PurchaseItem.objects.filter(purchase_id=OuterRef("pk"))
+        .order_by()
+        .values("purchase_id")
+        .annotate(
+            text=StringAgg(
+                Concat(
+                    Coalesce("scope_farm__name", Value("")),
+                    Value(" "),
+                    Coalesce("scope_chicken_house__name", Value("")),
+                    output_field=models.TextField(),
+                ),
+                delimiter=" ",
+            )
+        )
+        .values("text")
+    )
+    PurchaseRequest.objects.update(
+        search_vector=SearchVector(
+            search_text(
+                "timeline_code",
+                "name",
+                "description",
+                "order_number",
+                "invoice_number",
+                "scope_batch_code",
+                Subquery(
+                    Supplier.objects.filter(pk=OuterRef("supplier_id")).values("name")[:1],
+                    output_field=models.TextField(),
+                ),
+                Subquery(
+                    PurchasingExpenseType.objects.filter(pk=OuterRef("expense_type_id")).values("name")[:1],
+                    output_field=models.TextField(),
+                ),
+                Subquery(item_scopes, output_field=models.TextField()),
+            ),
+            config="simple",
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0044_product_category'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='purchaserequest',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='supplier',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='purchaserequest',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='purchase_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='supplier_search_idx'),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
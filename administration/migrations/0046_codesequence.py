@@ -0,0 +1,48 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:40
+
+import re
+
+from django.db import migrations, models
+
+
+CODE_PATTERN = re.compile(r"^(?P<key>(?:SOL-\d{4})|(?:SG-\d{8}))-(?P<number>\d+)$")
+
+
+def seed_code_sequences(apps, schema_editor):
+    PurchaseRequest = apps.get_model("administration", "PurchaseRequest")
+    CodeSequence = apps.get_model("administration", "CodeSequence")
+
+    last_values: dict[str, int] = {}
+    codes = PurchaseRequest.objects.values_list("timeline_code", "support_group_code")
+    for timeline_code, support_group_code in codes.iterator():
+        for code in (timeline_code, support_group_code):
+            match = CODE_PATTERN.match(code or "")
+            if not match:
+                continue
+            key = match.group("key")
+            last_values[key] = max(last_values.get(key, 0), int(match.group("number")))
+    CodeSequence.objects.bulk_create(
+        [CodeSequence(key=key, last_value=value) for key, value in last_values.items()]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0045_purchase_search_vectors'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CodeSequence',
+            fields=[
+                ('key', models.CharField(max_length=40, primary_key=True, serialize=False, verbose_name='Serie')),
+                ('last_value', models.PositiveIntegerField(default=0, verbose_name='Último consecutivo')),
+            ],
+            options={
+                'verbose_name': 'Consecutivo de códigos',
+                'verbose_name_plural': 'Consecutivos de códigos',
+            },
+        ),
+        migrations.RunPython(seed_code_sequences, migrations.RunPython.noop),
+    ]
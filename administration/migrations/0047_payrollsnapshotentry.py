@@ -0,0 +1,156 @@
+# Generated by Django 5.0.14 on 2026-10-18 23:05
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def split_payroll_payloads(apps, schema_editor):
+    PayrollSnapshot = apps.get_model("administration", "PayrollSnapshot")
+    PayrollSnapshotEntry = apps.get_model("administration", "PayrollSnapshotEntry")
+    UserProfile = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    Farm = apps.get_model("production", "Farm")
+
+    existing_operator_ids = set(UserProfile.objects.values_list("pk", flat=True))
+    existing_farm_ids = set(Farm.objects.values_list("pk", flat=True))
+
+    for snapshot in PayrollSnapshot.objects.iterator():
+        payload = snapshot.payload or {}
+        source_versions = payload.get("source_versions") or {}
+        snapshot.overall_total = Decimal(payload.get("overall_total") or "0")
+        snapshot.totals_by_job_type = payload.get("totals_by_job_type") or []
+        snapshot.totals_by_farm = payload.get("totals_by_farm") or []
+        snapshot.save(update_fields=["overall_total", "totals_by_job_type", "totals_by_farm"])
+
+        rows = []
+        seen_operator_ids = set()
+        for position, entry in enumerate(payload.get("entries") or []):
+            operator = entry.get("operator") or {}
+            operator_id = operator.get("id")
+            if operator_id not in existing_operator_ids or operator_id in seen_operator_ids:
+                operator_id = None
+            else:
+                seen_operator_ids.add(operator_id)
+            farm_id = entry.get("farm_id")
+            override_amount = entry.get("override_amount")
+            rows.append(
+                PayrollSnapshotEntry(
+                    snapshot=snapshot,
+                    position=position,
+                    operator_id=operator_id,
+                    operator_cedula=operator.get("cedula") or "",
+                    operator_nombres=operator.get("nombres") or "",
+                    operator_apellidos=operator.get("apellidos") or "",
+                    source_version=source_versions.get(str(operator.get("id")), ""),
+                    job_type=entry.get("job_type"),
+                    job_type_label=entry.get("job_type_label") or "",
+                    farm_id=farm_id if farm_id in existing_farm_ids else None,
+                    farm_label=entry.get("farm_label") or "Otros",
+                    payment_type=entry.get("payment_type") or "",
+                    payment_type_label=entry.get("payment_type_label") or "",
+                    salary_amount=Decimal(entry.get("salary_amount") or "0"),
+                    worked_days=int(entry.get("worked_days") or 0),
+                    rest_days=int(entry.get("rest_days") or 0),
+                    extra_rest_count=int(entry.get("extra_rest_count") or 0),
+                    bonified_extra_count=int(entry.get("bonified_extra_count") or 0),
+                    discounted_extra_count=int(entry.get("discounted_extra_count") or 0),
+                    non_worked_count=int(entry.get("non_worked_count") or 0),
+                    bonified_non_worked_count=int(entry.get("bonified_non_worked_count") or 0),
+                    discounted_non_worked_count=int(entry.get("discounted_non_worked_count") or 0),
+                    base_amount=Decimal(entry.get("base_amount") or "0"),
+                    deduction_amount=Decimal(entry.get("deduction_amount") or "0"),
+                    suggested_amount=Decimal(entry.get("suggested_amount") or "0"),
+                    final_amount=Decimal(entry.get("final_amount") or "0"),
+                    override_amount=Decimal(override_amount) if override_amount not in (None, "") else None,
+                    override_note=entry.get("override_note") or "",
+                    rest_details=entry.get("rest_details") or [],
+                    shift_details=entry.get("shift_details") or [],
+                    non_worked_details=entry.get("non_worked_details") or [],
+                    extra_rest_tokens=entry.get("extra_rest_tokens") or [],
+                )
+            )
+        PayrollSnapshotEntry.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0046_codesequence'),
+        ('production', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payrollsnapshot',
+            name='overall_total',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=16, verbose_name='Total general'),
+        ),
+        migrations.AddField(
+            model_name='payrollsnapshot',
+            name='totals_by_farm',
+            field=models.JSONField(blank=True, default=list, verbose_name='Totales por granja'),
+        ),
+        migrations.AddField(
+            model_name='payrollsnapshot',
+            name='totals_by_job_type',
+            field=models.JSONField(blank=True, default=list, verbose_name='Totales por tipo de puesto'),
+        ),
+        migrations.CreateModel(
+            name='PayrollSnapshotEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(default=0, verbose_name='Orden')),
+                ('operator_cedula', models.CharField(blank=True, max_length=32, verbose_name='Cédula')),
+                ('operator_nombres', models.CharField(blank=True, max_length=150, verbose_name='Nombres')),
+                ('operator_apellidos', models.CharField(blank=True, max_length=150, verbose_name='Apellidos')),
+                ('source_version', models.CharField(blank=True, max_length=255, verbose_name='Versión de origen')),
+                ('job_type', models.CharField(blank=True, max_length=32, null=True, verbose_name='Tipo de puesto')),
+                ('job_type_label', models.CharField(blank=True, max_length=120, verbose_name='Etiqueta del tipo de puesto')),
+                ('farm_label', models.CharField(blank=True, max_length=200, verbose_name='Etiqueta de granja')),
+                ('payment_type', models.CharField(max_length=16, verbose_name='Esquema de pago')),
+                ('payment_type_label', models.CharField(blank=True, max_length=120, verbose_name='Etiqueta del esquema de pago')),
+                ('salary_amount', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14, verbose_name='Salario')),
+                ('worked_days', models.PositiveSmallIntegerField(default=0, verbose_name='Días trabajados')),
+                ('rest_days', models.PositiveSmallIntegerField(default=0, verbose_name='Días de descanso')),
+                ('extra_rest_count', models.PositiveSmallIntegerField(default=0, verbose_name='Descansos extra')),
+                ('bonified_extra_count', models.PositiveSmallIntegerField(default=0, verbose_name='Descansos extra bonificados')),
+                ('discounted_extra_count', models.PositiveSmallIntegerField(default=0, verbose_name='Descansos extra descontados')),
+                ('non_worked_count', models.PositiveSmallIntegerField(default=0, verbose_name='Días sin turno')),
+                ('bonified_non_worked_count', models.PositiveSmallIntegerField(default=0, verbose_name='Días sin turno bonificados')),
+                ('discounted_non_worked_count', models.PositiveSmallIntegerField(default=0, verbose_name='Días sin turno descontados')),
+                ('base_amount', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14, verbose_name='Base')),
+                ('deduction_amount', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14, verbose_name='Descuento')),
+                ('suggested_amount', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14, verbose_name='Sugerido')),
+                ('final_amount', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14, verbose_name='Valor final')),
+                ('override_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True, verbose_name='Ajuste manual')),
+                ('override_note', models.TextField(blank=True, verbose_name='Justificación del ajuste')),
+                ('rest_details', models.JSONField(blank=True, default=list, verbose_name='Detalle de descansos')),
+                ('shift_details', models.JSONField(blank=True, default=list, verbose_name='Detalle de turnos')),
+                ('non_worked_details', models.JSONField(blank=True, default=list, verbose_name='Detalle de días sin turno')),
+                ('extra_rest_tokens', models.JSONField(blank=True, default=list, verbose_name='Descansos extra')),
+                ('farm', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payroll_snapshot_entries', to='production.farm', verbose_name='Granja')),
+                ('operator', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payroll_snapshot_entries', to=settings.AUTH_USER_MODEL, verbose_name='Colaborador')),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='administration.payrollsnapshot', verbose_name='Nómina')),
+            ],
+            options={
+                'verbose_name': 'Colaborador en nómina almacenada',
+                'verbose_name_plural': 'Colaboradores en nóminas almacenadas',
+                'ordering': ('snapshot', 'position', 'id'),
+                'indexes': [
+                    models.Index(fields=['snapshot', 'job_type'], name='payroll_entry_job_type_idx'),
+                    models.Index(fields=['snapshot', 'farm'], name='payroll_entry_farm_idx'),
+                ],
+                'constraints': [
+                    models.UniqueConstraint(fields=('snapshot', 'operator'), name='unique_payroll_snapshot_operator'),
+                ],
+            },
+        ),
+        migrations.RunPython(split_payroll_payloads, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='payrollsnapshot',
+            name='payload',
+        ),
+    ]
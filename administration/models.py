@@ -6,6 +6,8 @@ import os
 from typing import ClassVar
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.utils import timezone
@@ -73,11 +75,13 @@ class Supplier(TimeStampedModel):
     account_type = models.CharField("Tipo de cuenta", max_length=20, choices=ACCOUNT_TYPE_CHOICES, blank=True)
     account_number = models.CharField("Número de cuenta", max_length=60, blank=True)
     bank_name = models.CharField("Banco", max_length=120, blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = "Tercero"
         verbose_name_plural = "Terceros"
         ordering = ("name",)
+        indexes = [GinIndex(fields=["search_vector"], name="supplier_search_idx")]
 
     def __str__(self) -> str:
         return self.name
@@ -397,11 +401,13 @@ class PurchaseRequest(TimeStampedModel):
         blank=True,
         null=True,
     )
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = "Solicitud de compra"
         verbose_name_plural = "Solicitudes de compra"
         ordering = ("-created_at",)
+        indexes = [GinIndex(fields=["search_vector"], name="purchase_search_idx")]
 
     def __str__(self) -> str:
         return f"{self.timeline_code} - {self.name}"
@@ -793,6 +799,20 @@ class PurchaseAuditLog(TimeStampedModel):
         return f"{self.purchase_request.timeline_code} · {self.event}"
 
 
+class CodeSequence(models.Model):
+    """Last number handed out for a code series such as ``SOL-2025`` or ``SG-20250301``."""
+
+    key = models.CharField("Serie", max_length=40, primary_key=True)
+    last_value = models.PositiveIntegerField("Último consecutivo", default=0)
+
+    class Meta:
+        verbose_name = "Consecutivo de códigos"
+        verbose_name_plural = "Consecutivos de códigos"
+
+    def __str__(self) -> str:
+        return f"{self.key} · {self.last_value}"
+
+
 class PayrollSnapshot(TimeStampedModel):
     class LastAction(models.TextChoices):
         GENERATE = "generate", "Generación inicial"
@@ -802,7 +822,9 @@ class PayrollSnapshot(TimeStampedModel):
 
     start_date = models.DateField("Fecha inicial")
     end_date = models.DateField("Fecha final")
-    payload = models.JSONField("Resumen almacenado", default=dict, blank=True)
+    overall_total = models.DecimalField("Total general", max_digits=16, decimal_places=2, default=Decimal("0"))
+    totals_by_job_type = models.JSONField("Totales por tipo de puesto", default=list, blank=True)
+    totals_by_farm = models.JSONField("Totales por granja", default=list, blank=True)
     last_computed_at = models.DateTimeField("Calculado en", null=True, blank=True)
     last_computed_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -833,6 +855,78 @@ class PayrollSnapshot(TimeStampedModel):
         return f"{self.start_date:%Y-%m-%d} / {self.end_date:%Y-%m-%d}"
 
 
+class PayrollSnapshotEntry(models.Model):
+    snapshot = models.ForeignKey(
+        PayrollSnapshot,
+        on_delete=models.CASCADE,
+        related_name="entries",
+        verbose_name="Nómina",
+    )
+    position = models.PositiveIntegerField("Orden", default=0)
+    operator = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="payroll_snapshot_entries",
+        null=True,
+        blank=True,
+        verbose_name="Colaborador",
+    )
+    operator_cedula = models.CharField("Cédula", max_length=32, blank=True)
+    operator_nombres = models.CharField("Nombres", max_length=150, blank=True)
+    operator_apellidos = models.CharField("Apellidos", max_length=150, blank=True)
+    source_version = models.CharField("Versión de origen", max_length=255, blank=True)
+    job_type = models.CharField("Tipo de puesto", max_length=32, null=True, blank=True)
+    job_type_label = models.CharField("Etiqueta del tipo de puesto", max_length=120, blank=True)
+    farm = models.ForeignKey(
+        Farm,
+        on_delete=models.SET_NULL,
+        related_name="payroll_snapshot_entries",
+        null=True,
+        blank=True,
+        verbose_name="Granja",
+    )
+    farm_label = models.CharField("Etiqueta de granja", max_length=200, blank=True)
+    payment_type = models.CharField("Esquema de pago", max_length=16)
+    payment_type_label = models.CharField("Etiqueta del esquema de pago", max_length=120, blank=True)
+    salary_amount = models.DecimalField("Salario", max_digits=14, decimal_places=2, default=Decimal("0"))
+    worked_days = models.PositiveSmallIntegerField("Días trabajados", default=0)
+    rest_days = models.PositiveSmallIntegerField("Días de descanso", default=0)
+    extra_rest_count = models.PositiveSmallIntegerField("Descansos extra", default=0)
+    bonified_extra_count = models.PositiveSmallIntegerField("Descansos extra bonificados", default=0)
+    discounted_extra_count = models.PositiveSmallIntegerField("Descansos extra descontados", default=0)
+    non_worked_count = models.PositiveSmallIntegerField("Días sin turno", default=0)
+    bonified_non_worked_count = models.PositiveSmallIntegerField("Días sin turno bonificados", default=0)
+    discounted_non_worked_count = models.PositiveSmallIntegerField("Días sin turno descontados", default=0)
+    base_amount = models.DecimalField("Base", max_digits=14, decimal_places=2, default=Decimal("0"))
+    deduction_amount = models.DecimalField("Descuento", max_digits=14, decimal_places=2, default=Decimal("0"))
+    suggested_amount = models.DecimalField("Sugerido", max_digits=14, decimal_places=2, default=Decimal("0"))
+    final_amount = models.DecimalField("Valor final", max_digits=14, decimal_places=2, default=Decimal("0"))
+    override_amount = models.DecimalField("Ajuste manual", max_digits=14, decimal_places=2, null=True, blank=True)
+    override_note = models.TextField("Justificación del ajuste", blank=True)
+    rest_details = models.JSONField("Detalle de descansos", default=list, blank=True)
+    shift_details = models.JSONField("Detalle de turnos", default=list, blank=True)
+    non_worked_details = models.JSONField("Detalle de días sin turno", default=list, blank=True)
+    extra_rest_tokens = models.JSONField("Descansos extra", default=list, blank=True)
+
+    class Meta:
+        verbose_name = "Colaborador en nómina almacenada"
+        verbose_name_plural = "Colaboradores en nóminas almacenadas"
+        ordering = ("snapshot", "position", "id")
+        constraints = [
+            models.UniqueConstraint(
+                fields=("snapshot", "operator"),
+                name="unique_payroll_snapshot_operator",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=("snapshot", "job_type"), name="payroll_entry_job_type_idx"),
+            models.Index(fields=("snapshot", "farm"), name="payroll_entry_farm_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.snapshot} · {self.operator_nombres} {self.operator_apellidos}".strip()
+
+
 class Sale(TimeStampedModel):
     class Status(models.TextChoices):
         DRAFT = "draft", "Pre-factura"
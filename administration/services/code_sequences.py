@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from django.db import connection
+
+from administration.models import CodeSequence
+
+
+def next_code_number(key: str) -> int:
+    """
+    Reserve the next consecutive of the ``key`` series in a single statement.
+
+    The upsert takes the row lock only for the duration of the caller's transaction, so concurrent
+    submissions queue on one row instead of scanning existing codes and retrying on collisions.
+    """
+
+    table = connection.ops.quote_name(CodeSequence._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (key, last_value) VALUES (%s, 1)
+            ON CONFLICT (key) DO UPDATE SET last_value = {table}.last_value + 1
+            RETURNING last_value
+            """,
+            [key],
+        )
+        (value,) = cursor.fetchone()
+    return value
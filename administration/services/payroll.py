@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 from collections import Counter, defaultdict
-from dataclasses import dataclass
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from datetime import date, timedelta
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Any, Iterable, Mapping, Sequence
+from typing import Any, Collection, Iterable, Iterator, Mapping, Sequence
 import calendar
 
-from django.db import models
-from django.db.models import Prefetch
+from django.contrib.postgres.aggregates import StringAgg
+from django.db import connection, models, transaction
+from django.db.models import F, Prefetch, Value
+from django.db.models.functions import MD5, Cast, Concat
 
 from personal.models import (
     JOB_TYPE_CATEGORY_CODE_MAP,
@@ -198,56 +201,257 @@ def build_payroll_summary(
     bonified_idle_tokens = {token for token in (bonified_idle_tokens or []) if token}
     override_map = overrides or {}
 
-    assignments = list(
-        ShiftAssignment.objects.filter(date__range=(period.start_date, period.end_date))
-        .select_related("operator", "position", "position__farm", "position__category")
-        .order_by("date")
+    entries = [
+        _price_entry(
+            entry,
+            period=period,
+            bonified_tokens=bonified_tokens,
+            bonified_idle_tokens=bonified_idle_tokens,
+            override=override_map.get(entry.operator.pk),
+        )
+        for entry in _build_base_entries(period)
+    ]
+    return _summarize_entries(period, entries)
+
+
+def refresh_payroll_summary(
+    summary: PayrollSummary,
+    *,
+    source_versions: Mapping[int, str],
+    bonified_rest_tokens: Iterable[str] | None = None,
+    bonified_idle_tokens: Iterable[str] | None = None,
+    overrides: Mapping[int, PayrollOverrideData] | None = None,
+) -> tuple[PayrollSummary, dict[int, str]]:
+    """
+    Bring a stored summary up to date without rebuilding every entry.
+
+    Operators whose payroll sources (see ``load_payroll_source_versions``) changed since
+    ``source_versions`` are reloaded; the remaining entries are reused and only repriced when their bonified tokens or
+    override differ. Returns the refreshed summary and the versions it was built from.
+    """
+
+    bonified_tokens = {token for token in (bonified_rest_tokens or []) if token}
+    bonified_idle_tokens = {token for token in (bonified_idle_tokens or []) if token}
+    override_map = overrides or {}
+    period = summary.period
+
+    with payroll_source_snapshot():
+        current_versions = load_payroll_source_versions(period)
+        reusable = {
+            entry.operator.pk: entry
+            for entry in summary.entries
+            if entry.operator.pk in current_versions
+            and source_versions.get(entry.operator.pk) == current_versions[entry.operator.pk]
+        }
+        stale_ids = set(current_versions) - set(reusable)
+        entries = list(reusable.values())
+        if stale_ids:
+            entries.extend(_build_base_entries(period, operator_ids=stale_ids))
+
+    priced_entries: list[PayrollEntry] = []
+    for entry in entries:
+        override = override_map.get(entry.operator.pk)
+        if entry.operator.pk in stale_ids or _pricing_changed(
+            entry,
+            bonified_tokens=bonified_tokens,
+            bonified_idle_tokens=bonified_idle_tokens,
+            override=override,
+        ):
+            entry = _price_entry(
+                entry,
+                period=period,
+                bonified_tokens=bonified_tokens,
+                bonified_idle_tokens=bonified_idle_tokens,
+                override=override,
+            )
+        priced_entries.append(entry)
+    return _summarize_entries(period, priced_entries), current_versions
+
+
+@contextmanager
+def payroll_source_snapshot() -> Iterator[None]:
+    """
+    Read the source versions and the entries they describe from one database snapshot.
+
+    Outside a transaction the block runs under REPEATABLE READ, so a write committed between the
+    fingerprint and the entry queries cannot pair new rows with an old version. Inside an outer
+    transaction the isolation level is already fixed; reading the versions first still means the
+    entries are at least as new as the versions stored with them, so a racing write only causes an
+    extra rebuild on the next refresh.
+    """
+
+    if connection.in_atomic_block:
+        yield
+        return
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+        yield
+
+
+def load_payroll_source_versions(period: PayrollPeriodInfo) -> dict[int, str]:
+    """
+    Fingerprint, per operator, the rows ``build_payroll_summary`` reads for the period.
+
+    Besides the assignments, rests and salaries, the fingerprint covers everything the job type
+    and farm columns are derived from: the assigned positions' category, farm and name, the
+    operator's roles and suggested positions. Each source is hashed in the database with one
+    grouped query, so comparing versions never transfers the rows themselves.
+    """
+
+    suggestion_link = UserProfile.suggested_positions.through
+    role_link = UserProfile.roles.through
+    sources = (
+        (
+            ShiftAssignment.objects.filter(date__range=(period.start_date, period.end_date)),
+            "operator_id",
+            (
+                F("date"),
+                F("position_id"),
+                F("is_overtime"),
+                F("position__name"),
+                F("position__job_type"),
+                F("position__category__code"),
+                F("position__farm_id"),
+                F("position__farm__name"),
+            ),
+            ("date", "position_id"),
+        ),
+        (
+            _active_rest_periods(period),
+            "operator_id",
+            (F("start_date"), F("end_date"), F("status"), F("notes")),
+            ("start_date", "id"),
+        ),
+        (
+            _covering_salaries(period),
+            "operator_id",
+            (
+                F("id"),
+                F("amount"),
+                F("payment_type"),
+                F("effective_from"),
+                F("effective_until"),
+                F("rest_days_per_week"),
+            ),
+            ("effective_from", "id"),
+        ),
+        (
+            suggestion_link.objects.all(),
+            "userprofile_id",
+            (
+                F("positiondefinition_id"),
+                F("positiondefinition__job_type"),
+                F("positiondefinition__category__code"),
+            ),
+            ("positiondefinition_id",),
+        ),
+        (
+            role_link.objects.all(),
+            "userprofile_id",
+            (F("role__name"),),
+            ("role__name",),
+        ),
+    )
+    profile_index = len(sources)
+    fingerprints: dict[int, list[str]] = defaultdict(lambda: [""] * (profile_index + 1))
+    for index, (queryset, key, columns, ordering) in enumerate(sources):
+        rows = (
+            queryset.filter(**{f"{key}__isnull": False})
+            .order_by()
+            .values(key)
+            .annotate(fingerprint=MD5(StringAgg(_row_text(columns), delimiter=";", ordering=ordering)))
+            .values_list(key, "fingerprint")
+        )
+        for operator_id, fingerprint in rows:
+            fingerprints[operator_id][index] = fingerprint
+
+    # Roles and suggestions only matter for operators the period already involves.
+    involved = [pk for pk, parts in fingerprints.items() if any(parts[:3])]
+    profiles = UserProfile.objects.filter(pk__in=involved, is_superuser=False).values_list(
+        "pk", "employment_start_date", "employment_end_date", "nombres", "apellidos"
     )
+    versions: dict[int, str] = {}
+    for pk, employment_start, employment_end, nombres, apellidos in profiles:
+        parts = fingerprints[pk]
+        parts[profile_index] = f"{employment_start}:{employment_end}:{nombres}:{apellidos}"
+        versions[pk] = "|".join(parts)
+    return versions
+
+
+def _row_text(columns: Sequence[F]) -> Concat:
+    parts: list[Any] = []
+    for column in columns:
+        if parts:
+            parts.append(Value(":"))
+        parts.append(Cast(column, output_field=models.TextField()))
+    return Concat(*parts, output_field=models.TextField())
+
+
+def _active_rest_periods(period: PayrollPeriodInfo) -> models.QuerySet[OperatorRestPeriod]:
+    return OperatorRestPeriod.objects.filter(
+        start_date__lte=period.end_date,
+        end_date__gte=period.start_date,
+        status__in=[
+            RestPeriodStatus.PLANNED,
+            RestPeriodStatus.APPROVED,
+            RestPeriodStatus.CONFIRMED,
+        ],
+    )
+
+
+def _covering_salaries(period: PayrollPeriodInfo) -> models.QuerySet[OperatorSalary]:
+    return OperatorSalary.objects.filter(
+        effective_from__lte=period.end_date,
+    ).filter(models.Q(effective_until__isnull=True) | models.Q(effective_until__gte=period.start_date))
 
-    rest_periods = list(
-        OperatorRestPeriod.objects.filter(
-            start_date__lte=period.end_date,
-            end_date__gte=period.start_date,
-            status__in=[
-                RestPeriodStatus.PLANNED,
-                RestPeriodStatus.APPROVED,
-                RestPeriodStatus.CONFIRMED,
-            ],
+
+def _build_base_entries(
+    period: PayrollPeriodInfo,
+    *,
+    operator_ids: Collection[int] | None = None,
+) -> list[PayrollEntry]:
+    """
+    Load the operational data of the period and return one unpriced entry per operator.
+
+    Entries carry no bonifications or overrides; ``_price_entry`` fills the amounts. When
+    ``operator_ids`` is given only those operators are loaded.
+    """
+
+    assignment_qs = ShiftAssignment.objects.filter(date__range=(period.start_date, period.end_date))
+    rest_qs = _active_rest_periods(period)
+    salary_qs = _covering_salaries(period)
+    if operator_ids is not None:
+        assignment_qs = assignment_qs.filter(operator_id__in=operator_ids)
+        rest_qs = rest_qs.filter(operator_id__in=operator_ids)
+        salary_qs = salary_qs.filter(operator_id__in=operator_ids)
+
+    assignments = list(
+        assignment_qs.select_related("operator", "position", "position__farm", "position__category").order_by(
+            "date"
         )
-        .select_related("operator")
-        .order_by("start_date")
     )
 
+    rest_periods = list(rest_qs.select_related("operator").order_by("start_date"))
+
     date_list = [period.start_date + timedelta(days=offset) for offset in range(period.days)]
 
-    operator_ids: set[int] = set()
+    operator_ids_found: set[int] = set()
     for assignment in assignments:
         if assignment.operator_id:
-            operator_ids.add(assignment.operator_id)
+            operator_ids_found.add(assignment.operator_id)
     for rest in rest_periods:
         if rest.operator_id:
-            operator_ids.add(rest.operator_id)
+            operator_ids_found.add(rest.operator_id)
 
-    salary_operator_ids = set(
-        OperatorSalary.objects.filter(
-            effective_from__lte=period.end_date,
-        )
-        .filter(models.Q(effective_until__isnull=True) | models.Q(effective_until__gte=period.start_date))
-        .values_list("operator_id", flat=True)
-    )
-    operator_ids.update(salary_operator_ids)
+    salary_operator_ids = set(salary_qs.values_list("operator_id", flat=True))
+    operator_ids_found.update(salary_operator_ids)
 
-    if not operator_ids:
-        return PayrollSummary(
-            period=period,
-            entries=[],
-            totals_by_job_type=[],
-            totals_by_farm=[],
-            overall_total=Decimal("0.00"),
-        )
+    if not operator_ids_found:
+        return []
 
     operators = list(
-        UserProfile.objects.filter(pk__in=operator_ids).prefetch_related(
+        UserProfile.objects.filter(pk__in=operator_ids_found).prefetch_related(
             Prefetch(
                 "salary_records",
                 queryset=OperatorSalary.objects.order_by("-effective_from", "-id"),
@@ -262,18 +466,11 @@ def build_payroll_summary(
     operator_map = {operator.pk: operator for operator in operators}
 
     relevant_operator_ids = [
-        pk for pk in operator_ids if pk in operator_map and not operator_map[pk].is_superuser
+        pk for pk in operator_ids_found if pk in operator_map and not operator_map[pk].is_superuser
     ]
 
     if not relevant_operator_ids:
-        return PayrollSummary(
-            period=period,
-            entries=[],
-            totals_by_job_type=[],
-            totals_by_farm=[],
-            overall_total=Decimal("0.00"),
-        )
-
+        return []
     salary_map: dict[int, OperatorSalary] = {}
     for operator in operators:
         selected = _select_salary_for_period(operator, period.start_date, period.end_date)
@@ -352,17 +549,7 @@ def build_payroll_summary(
         farm_id_by_operator[operator_id] = farm_id_value
         farm_label_by_operator[operator_id] = _farm_label(farm_id_value, farm_label_map)
 
-    sorted_operator_ids = sorted(
-        relevant_operator_ids,
-        key=lambda pk: (
-            job_type_label_by_operator.get(pk, "Sin tipo").lower(),
-            (operator_map.get(pk).apellidos or "").lower(),
-            (operator_map.get(pk).nombres or "").lower(),
-            pk,
-        ),
-    )
-
-    for operator_id in sorted_operator_ids:
+    for operator_id in relevant_operator_ids:
         operator = operator_map.get(operator_id)
         if not operator or operator.is_superuser:
             continue
@@ -387,32 +574,21 @@ def build_payroll_summary(
         raw_rest_details.sort(key=lambda item: item.date)
         allowed_paid_rests = _allowed_paid_rest_days(salary.rest_days_per_week, period.days)
         rest_details: list[PayrollRestDetail] = []
-        extra_rest_count = 0
-        bonified_extra_count = 0
-        non_bonified_extra = 0
         extra_tokens: list[str] = []
         for index, detail in enumerate(raw_rest_details):
             is_extra = index >= allowed_paid_rests
-            is_bonified = is_extra and detail.token in bonified_tokens
-            rest_detail = PayrollRestDetail(
-                token=detail.token,
-                date=detail.date,
-                status=detail.status,
-                notes=detail.notes,
-                is_extra=is_extra,
-                is_bonified=is_bonified,
+            rest_details.append(
+                PayrollRestDetail(
+                    token=detail.token,
+                    date=detail.date,
+                    status=detail.status,
+                    notes=detail.notes,
+                    is_extra=is_extra,
+                    is_bonified=False,
+                )
             )
-            rest_details.append(rest_detail)
             if is_extra:
-                extra_rest_count += 1
                 extra_tokens.append(detail.token)
-                if is_bonified:
-                    bonified_extra_count += 1
-                else:
-                    non_bonified_extra += 1
-
-        rest_days = len(rest_details)
-        worked_days = len(shift_details)
 
         rest_dates = {detail.date for detail in rest_details}
         assignment_dates = assignment_dates_by_operator.get(operator_id, set())
@@ -422,44 +598,14 @@ def build_payroll_summary(
                 continue
             if target_date in rest_dates or target_date in assignment_dates:
                 continue
-            token = f"idle:{operator_id}:{target_date.isoformat()}"
-            is_bonified_idle = token in bonified_idle_tokens
             non_worked_details.append(
                 PayrollIdleDetail(
-                    token=token,
+                    token=f"idle:{operator_id}:{target_date.isoformat()}",
                     date=target_date,
-                    is_bonified=is_bonified_idle,
+                    is_bonified=False,
                 )
             )
 
-        non_worked_count = len(non_worked_details)
-        bonified_non_worked_count = sum(1 for detail in non_worked_details if detail.is_bonified)
-        discounted_non_worked_count = non_worked_count - bonified_non_worked_count
-
-        if salary.payment_type == OperatorSalary.PaymentType.MONTHLY:
-            base_amount = (salary.amount / Decimal("2"))
-            per_day_value = (base_amount / Decimal(period.days)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-            deduction_units = non_bonified_extra + discounted_non_worked_count
-            deduction = (per_day_value * Decimal(deduction_units)).quantize(
-                Decimal("0.01"), rounding=ROUND_HALF_UP
-            )
-        else:
-            base_amount = (salary.amount * Decimal(worked_days))
-            deduction = Decimal("0.00")
-
-        suggested = (base_amount - deduction).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        if suggested < Decimal("0.00"):
-            suggested = Decimal("0.00")
-
-        override = override_map.get(operator_id)
-        final_amount = suggested
-        override_amount = None
-        override_note = ""
-        if override and override.amount is not None:
-            override_amount = override.amount
-            final_amount = override.amount
-            override_note = override.note
-
         entries.append(
             PayrollEntry(
                 operator=operator,
@@ -470,27 +616,126 @@ def build_payroll_summary(
                 payment_type=salary.payment_type,
                 payment_type_label=payment_type_label,
                 salary_amount=salary.amount,
-                worked_days=worked_days,
-                rest_days=rest_days,
+                worked_days=len(shift_details),
+                rest_days=len(rest_details),
                 rest_details=rest_details,
                 shift_details=shift_details,
-                extra_rest_count=extra_rest_count,
-                bonified_extra_count=bonified_extra_count,
-                discounted_extra_count=non_bonified_extra,
+                extra_rest_count=len(extra_tokens),
+                bonified_extra_count=0,
+                discounted_extra_count=len(extra_tokens),
                 non_worked_details=non_worked_details,
-                non_worked_count=non_worked_count,
-                bonified_non_worked_count=bonified_non_worked_count,
-                discounted_non_worked_count=discounted_non_worked_count,
-                base_amount=base_amount.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP),
-                deduction_amount=deduction,
-                suggested_amount=suggested,
-                final_amount=final_amount,
-                override_amount=override_amount,
-                override_note=override_note,
+                non_worked_count=len(non_worked_details),
+                bonified_non_worked_count=0,
+                discounted_non_worked_count=len(non_worked_details),
+                base_amount=Decimal("0.00"),
+                deduction_amount=Decimal("0.00"),
+                suggested_amount=Decimal("0.00"),
+                final_amount=Decimal("0.00"),
+                override_amount=None,
+                override_note="",
                 extra_rest_tokens=extra_tokens,
             )
         )
 
+    return entries
+
+
+def _price_entry(
+    entry: PayrollEntry,
+    *,
+    period: PayrollPeriodInfo,
+    bonified_tokens: Collection[str],
+    bonified_idle_tokens: Collection[str],
+    override: PayrollOverrideData | None,
+) -> PayrollEntry:
+    """Apply bonifications and the manual override to ``entry`` and recompute its amounts."""
+
+    rest_details = [
+        replace(detail, is_bonified=detail.is_extra and detail.token in bonified_tokens)
+        for detail in entry.rest_details
+    ]
+    extra_rest_count = sum(1 for detail in rest_details if detail.is_extra)
+    bonified_extra_count = sum(1 for detail in rest_details if detail.is_bonified)
+    non_bonified_extra = extra_rest_count - bonified_extra_count
+
+    non_worked_details = [
+        replace(detail, is_bonified=detail.token in bonified_idle_tokens) for detail in entry.non_worked_details
+    ]
+    non_worked_count = len(non_worked_details)
+    bonified_non_worked_count = sum(1 for detail in non_worked_details if detail.is_bonified)
+    discounted_non_worked_count = non_worked_count - bonified_non_worked_count
+
+    if entry.payment_type == OperatorSalary.PaymentType.MONTHLY:
+        base_amount = (entry.salary_amount / Decimal("2"))
+        per_day_value = (base_amount / Decimal(period.days)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        deduction_units = non_bonified_extra + discounted_non_worked_count
+        deduction = (per_day_value * Decimal(deduction_units)).quantize(
+            Decimal("0.01"), rounding=ROUND_HALF_UP
+        )
+    else:
+        base_amount = (entry.salary_amount * Decimal(entry.worked_days))
+        deduction = Decimal("0.00")
+
+    suggested = (base_amount - deduction).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    if suggested < Decimal("0.00"):
+        suggested = Decimal("0.00")
+
+    final_amount = suggested
+    override_amount = None
+    override_note = ""
+    if override and override.amount is not None:
+        override_amount = override.amount
+        final_amount = override.amount
+        override_note = override.note
+
+    return replace(
+        entry,
+        rest_details=rest_details,
+        extra_rest_count=extra_rest_count,
+        bonified_extra_count=bonified_extra_count,
+        discounted_extra_count=non_bonified_extra,
+        non_worked_details=non_worked_details,
+        non_worked_count=non_worked_count,
+        bonified_non_worked_count=bonified_non_worked_count,
+        discounted_non_worked_count=discounted_non_worked_count,
+        base_amount=base_amount.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP),
+        deduction_amount=deduction,
+        suggested_amount=suggested,
+        final_amount=final_amount,
+        override_amount=override_amount,
+        override_note=override_note,
+    )
+
+
+def _pricing_changed(
+    entry: PayrollEntry,
+    *,
+    bonified_tokens: Collection[str],
+    bonified_idle_tokens: Collection[str],
+    override: PayrollOverrideData | None,
+) -> bool:
+    for detail in entry.rest_details:
+        if detail.is_bonified != (detail.is_extra and detail.token in bonified_tokens):
+            return True
+    for detail in entry.non_worked_details:
+        if detail.is_bonified != (detail.token in bonified_idle_tokens):
+            return True
+    if override and override.amount is not None:
+        return entry.override_amount != override.amount or entry.override_note != override.note
+    return entry.override_amount is not None
+
+
+def _summarize_entries(period: PayrollPeriodInfo, entries: Sequence[PayrollEntry]) -> PayrollSummary:
+    entries = sorted(
+        entries,
+        key=lambda entry: (
+            entry.job_type_label.lower(),
+            (entry.operator.apellidos or "").lower(),
+            (entry.operator.nombres or "").lower(),
+            entry.operator.pk,
+        ),
+    )
+
     job_type_totals_raw: dict[str | None, dict[str, Any]] = {}
     farm_totals_raw: dict[str, dict[str, Any]] = {}
 
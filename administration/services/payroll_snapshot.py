@@ -2,130 +2,274 @@ from __future__ import annotations
 
 from datetime import date
 from decimal import Decimal
-from typing import Any, Iterable, Mapping, Sequence
+from typing import Any, Collection, Mapping
 
+from django.db import transaction
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from administration.models import PayrollSnapshot, PayrollSnapshotEntry
 from personal.models import UserProfile
 
 from .payroll import (
     FarmPayrollSummary,
     JobTypePayrollSummary,
     PayrollIdleDetail,
-    PayrollOverrideData,
-    PayrollPeriodInfo,
     PayrollRestDetail,
     PayrollShiftDetail,
     PayrollSummary,
     PayrollEntry,
+    PayrollPeriodInfo,
+    resolve_payroll_period,
 )
 
-SNAPSHOT_VERSION = 1
 
-
-def serialize_payroll_summary(summary: PayrollSummary) -> dict[str, Any]:
-    return {
-        "version": SNAPSHOT_VERSION,
-        "period": _serialize_period(summary.period),
-        "entries": [_serialize_entry(entry) for entry in summary.entries],
+def save_payroll_snapshot(
+    *,
+    period: PayrollPeriodInfo,
+    summary: PayrollSummary,
+    source_versions: Mapping[int, str],
+    action: str,
+    computed_by: UserProfile | None,
+    instance: PayrollSnapshot | None = None,
+    previous: PayrollSummary | None = None,
+) -> PayrollSnapshot:
+    """
+    Store ``summary`` as the header totals plus one row per operator.
+
+    When ``previous`` is the summary loaded from ``instance``, only the entries that are not the
+    very same objects are rewritten; reused entries at most get their position updated.
+    """
+
+    values = {
+        "overall_total": summary.overall_total,
         "totals_by_job_type": [_serialize_total(total) for total in summary.totals_by_job_type],
         "totals_by_farm": [_serialize_farm_total(total) for total in summary.totals_by_farm],
-        "overall_total": _serialize_decimal(summary.overall_total),
+        "last_computed_at": timezone.now(),
+        "last_computed_by": computed_by,
+        "last_action": action,
     }
+    with transaction.atomic():
+        if instance:
+            for field, value in values.items():
+                setattr(instance, field, value)
+            instance.save(update_fields=[*values, "updated_at"])
+            snapshot = instance
+        else:
+            snapshot, _ = PayrollSnapshot.objects.update_or_create(
+                start_date=period.start_date,
+                end_date=period.end_date,
+                defaults=values,
+            )
+            previous = None
+
+        if previous is None:
+            snapshot.entries.all().delete()
+            PayrollSnapshotEntry.objects.bulk_create(
+                [
+                    _entry_row(snapshot, position, entry, source_versions)
+                    for position, entry in enumerate(summary.entries)
+                ]
+            )
+            return snapshot
+
+        # Entries of deleted operators have no key to match on: their rows are always replaced.
+        stored = {
+            entry.operator.pk: (position, entry)
+            for position, entry in enumerate(previous.entries)
+            if entry.operator.pk is not None
+        }
+        current_ids = {entry.operator.pk for entry in summary.entries}
+        rewritten: list[tuple[int, PayrollEntry]] = []
+        moved: dict[int, int] = {}
+        for position, entry in enumerate(summary.entries):
+            stored_position, stored_entry = stored.get(entry.operator.pk, (None, None))
+            if entry.operator.pk is None or stored_entry is not entry:
+                rewritten.append((position, entry))
+            elif stored_position != position:
+                moved[entry.operator.pk] = position
+
+        stale_ids = {pk for pk in stored if pk not in current_ids}
+        stale_ids.update(entry.operator.pk for _, entry in rewritten if entry.operator.pk is not None)
+        snapshot.entries.filter(Q(operator_id__in=stale_ids) | Q(operator__isnull=True)).delete()
+        if rewritten:
+            PayrollSnapshotEntry.objects.bulk_create(
+                [_entry_row(snapshot, position, entry, source_versions) for position, entry in rewritten]
+            )
+        if moved:
+            snapshot.entries.filter(operator_id__in=moved).update(
+                position=Case(
+                    *[When(operator_id=pk, then=Value(position)) for pk, position in moved.items()],
+                    output_field=IntegerField(),
+                )
+            )
+    return snapshot
+
+
+def load_payroll_summary(
+    snapshot: PayrollSnapshot,
+    *,
+    operator_ids: Collection[int] | None = None,
+    job_types: Collection[str | None] | None = None,
+    farm_ids: Collection[int | None] | None = None,
+) -> PayrollSummary:
+    """
+    Rebuild the stored summary, optionally narrowed to some operators, job types or farms.
+
+    The totals always describe the whole period as stored in the snapshot header.
+    """
+
+    rows = snapshot.entries.select_related("operator")
+    if operator_ids is not None:
+        rows = rows.filter(operator_id__in=operator_ids)
+    if job_types is not None:
+        rows = rows.filter(_nullable_in("job_type", job_types))
+    if farm_ids is not None:
+        rows = rows.filter(_nullable_in("farm_id", farm_ids))
 
-
-def deserialize_payroll_summary(payload: Mapping[str, Any]) -> PayrollSummary:
-    period_data = payload.get("period")
-    if not period_data:
-        raise ValueError("Payload is missing period information.")
-    period = PayrollPeriodInfo(
-        start_date=date.fromisoformat(period_data["start_date"]),
-        end_date=date.fromisoformat(period_data["end_date"]),
-        label=period_data["label"],
-        month_name=period_data["month_name"],
-        year=int(period_data["year"]),
-        days=int(period_data["days"]),
-        half_label=period_data["half_label"],
-    )
-    entry_payloads: Sequence[Mapping[str, Any]] = payload.get("entries", [])
-    operator_ids = [entry["operator"]["id"] for entry in entry_payloads if "operator" in entry]
-    operator_map = _load_operator_map(operator_ids)
-    entries = [_deserialize_entry(entry, operator_map) for entry in entry_payloads]
-
-    job_totals = [
-        JobTypePayrollSummary(
-            job_type=total["job_type"],
-            job_type_label=total["job_type_label"],
-            collaborator_count=int(total["collaborator_count"]),
-            total_amount=Decimal(total["total_amount"]),
-        )
-        for total in payload.get("totals_by_job_type", [])
-    ]
-    farm_totals = [
-        FarmPayrollSummary(
-            farm_id=total["farm_id"],
-            farm_label=total["farm_label"],
-            collaborator_count=int(total["collaborator_count"]),
-            total_amount=Decimal(total["total_amount"]),
-        )
-        for total in payload.get("totals_by_farm", [])
-    ]
-    overall_total = Decimal(payload.get("overall_total", "0"))
     return PayrollSummary(
-        period=period,
-        entries=entries,
-        totals_by_job_type=job_totals,
-        totals_by_farm=farm_totals,
-        overall_total=overall_total,
+        period=resolve_payroll_period(snapshot.start_date, snapshot.end_date),
+        entries=[_row_entry(row) for row in rows],
+        totals_by_job_type=[
+            JobTypePayrollSummary(
+                job_type=total["job_type"],
+                job_type_label=total["job_type_label"],
+                collaborator_count=int(total["collaborator_count"]),
+                total_amount=Decimal(total["total_amount"]),
+            )
+            for total in snapshot.totals_by_job_type
+        ],
+        totals_by_farm=[
+            FarmPayrollSummary(
+                farm_id=total["farm_id"],
+                farm_label=total["farm_label"],
+                collaborator_count=int(total["collaborator_count"]),
+                total_amount=Decimal(total["total_amount"]),
+            )
+            for total in snapshot.totals_by_farm
+        ],
+        overall_total=snapshot.overall_total,
     )
 
 
-def _serialize_period(period: PayrollPeriodInfo) -> dict[str, Any]:
-    return {
-        "start_date": period.start_date.isoformat(),
-        "end_date": period.end_date.isoformat(),
-        "label": _serialize_text(period.label),
-        "month_name": _serialize_text(period.month_name),
-        "year": period.year,
-        "days": period.days,
-        "half_label": _serialize_text(period.half_label),
-    }
+def load_source_versions(snapshot: PayrollSnapshot) -> dict[int, str]:
+    return dict(
+        snapshot.entries.filter(operator__isnull=False).values_list("operator_id", "source_version")
+    )
 
 
-def _serialize_entry(entry: PayrollEntry) -> dict[str, Any]:
-    return {
-        "operator": {
-            "id": entry.operator.pk,
-            "cedula": entry.operator.cedula,
-            "nombres": entry.operator.nombres,
-            "apellidos": entry.operator.apellidos,
-        },
-        "job_type": entry.job_type,
-        "job_type_label": _serialize_text(entry.job_type_label),
-        "farm_id": entry.farm_id,
-        "farm_label": _serialize_text(entry.farm_label),
-        "payment_type": entry.payment_type,
-        "payment_type_label": _serialize_text(entry.payment_type_label),
-        "salary_amount": _serialize_decimal(entry.salary_amount),
-        "worked_days": entry.worked_days,
-        "rest_days": entry.rest_days,
-        "extra_rest_count": entry.extra_rest_count,
-        "bonified_extra_count": entry.bonified_extra_count,
-        "discounted_extra_count": entry.discounted_extra_count,
-        "non_worked_count": entry.non_worked_count,
-        "bonified_non_worked_count": entry.bonified_non_worked_count,
-        "discounted_non_worked_count": entry.discounted_non_worked_count,
-        "base_amount": _serialize_decimal(entry.base_amount),
-        "deduction_amount": _serialize_decimal(entry.deduction_amount),
-        "suggested_amount": _serialize_decimal(entry.suggested_amount),
-        "final_amount": _serialize_decimal(entry.final_amount),
-        "override_amount": (
-            _serialize_decimal(entry.override_amount) if entry.override_amount is not None else None
-        ),
-        "override_note": _serialize_text(entry.override_note),
-        "rest_details": [_serialize_rest_detail(detail) for detail in entry.rest_details],
-        "shift_details": [_serialize_shift_detail(detail) for detail in entry.shift_details],
-        "non_worked_details": [_serialize_idle_detail(detail) for detail in entry.non_worked_details],
-        "extra_rest_tokens": list(entry.extra_rest_tokens),
-    }
+def _nullable_in(field: str, values: Collection[Any]) -> Q:
+    present = [value for value in values if value is not None]
+    condition = Q(**{f"{field}__in": present})
+    if len(present) != len(values):
+        condition |= Q(**{f"{field}__isnull": True})
+    return condition
+
+
+def _entry_row(
+    snapshot: PayrollSnapshot,
+    position: int,
+    entry: PayrollEntry,
+    source_versions: Mapping[int, str],
+) -> PayrollSnapshotEntry:
+    operator = entry.operator
+    return PayrollSnapshotEntry(
+        snapshot=snapshot,
+        position=position,
+        operator_id=operator.pk,
+        operator_cedula=operator.cedula or "",
+        operator_nombres=operator.nombres or "",
+        operator_apellidos=operator.apellidos or "",
+        source_version=source_versions.get(operator.pk, ""),
+        job_type=entry.job_type,
+        job_type_label=_serialize_text(entry.job_type_label),
+        farm_id=entry.farm_id,
+        farm_label=_serialize_text(entry.farm_label),
+        payment_type=entry.payment_type,
+        payment_type_label=_serialize_text(entry.payment_type_label),
+        salary_amount=entry.salary_amount,
+        worked_days=entry.worked_days,
+        rest_days=entry.rest_days,
+        extra_rest_count=entry.extra_rest_count,
+        bonified_extra_count=entry.bonified_extra_count,
+        discounted_extra_count=entry.discounted_extra_count,
+        non_worked_count=entry.non_worked_count,
+        bonified_non_worked_count=entry.bonified_non_worked_count,
+        discounted_non_worked_count=entry.discounted_non_worked_count,
+        base_amount=entry.base_amount,
+        deduction_amount=entry.deduction_amount,
+        suggested_amount=entry.suggested_amount,
+        final_amount=entry.final_amount,
+        override_amount=entry.override_amount,
+        override_note=_serialize_text(entry.override_note),
+        rest_details=[_serialize_rest_detail(detail) for detail in entry.rest_details],
+        shift_details=[_serialize_shift_detail(detail) for detail in entry.shift_details],
+        non_worked_details=[_serialize_idle_detail(detail) for detail in entry.non_worked_details],
+        extra_rest_tokens=list(entry.extra_rest_tokens),
+    )
+
+
+def _row_entry(row: PayrollSnapshotEntry) -> PayrollEntry:
+    operator = row.operator
+    if not operator:
+        operator = UserProfile(
+            cedula=row.operator_cedula,
+            nombres=row.operator_nombres,
+            apellidos=row.operator_apellidos,
+            telefono="",
+        )
+    return PayrollEntry(
+        operator=operator,
+        job_type=row.job_type,
+        job_type_label=row.job_type_label,
+        farm_id=row.farm_id,
+        farm_label=row.farm_label or "Otros",
+        payment_type=row.payment_type,
+        payment_type_label=row.payment_type_label,
+        salary_amount=row.salary_amount,
+        worked_days=row.worked_days,
+        rest_days=row.rest_days,
+        rest_details=[
+            PayrollRestDetail(
+                token=detail["token"],
+                date=date.fromisoformat(detail["date"]),
+                status=detail["status"],
+                notes=detail.get("notes") or "",
+                is_extra=detail.get("is_extra", False),
+                is_bonified=detail.get("is_bonified", False),
+            )
+            for detail in row.rest_details
+        ],
+        shift_details=[
+            PayrollShiftDetail(
+                date=date.fromisoformat(detail["date"]),
+                position_label=detail["position_label"],
+                is_overtime=detail.get("is_overtime", False),
+            )
+            for detail in row.shift_details
+        ],
+        extra_rest_count=row.extra_rest_count,
+        bonified_extra_count=row.bonified_extra_count,
+        discounted_extra_count=row.discounted_extra_count,
+        non_worked_details=[
+            PayrollIdleDetail(
+                token=detail["token"],
+                date=date.fromisoformat(detail["date"]),
+                is_bonified=detail.get("is_bonified", False),
+            )
+            for detail in row.non_worked_details
+        ],
+        non_worked_count=row.non_worked_count,
+        bonified_non_worked_count=row.bonified_non_worked_count,
+        discounted_non_worked_count=row.discounted_non_worked_count,
+        base_amount=row.base_amount,
+        deduction_amount=row.deduction_amount,
+        suggested_amount=row.suggested_amount,
+        final_amount=row.final_amount,
+        override_amount=row.override_amount,
+        override_note=row.override_note,
+        extra_rest_tokens=list(row.extra_rest_tokens),
+    )
 
 
 def _serialize_total(total: JobTypePayrollSummary) -> dict[str, Any]:
@@ -183,85 +327,8 @@ def _serialize_text(value: Any) -> str:
     return str(value)
 
 
-def _deserialize_entry(entry: Mapping[str, Any], operator_map: dict[int, UserProfile]) -> PayrollEntry:
-    operator_payload = entry["operator"]
-    operator = operator_map.get(operator_payload["id"])
-    if not operator:
-        operator = UserProfile(
-            pk=operator_payload["id"],
-            cedula=operator_payload.get("cedula") or "",
-            nombres=operator_payload.get("nombres") or "",
-            apellidos=operator_payload.get("apellidos") or "",
-            telefono=operator_payload.get("telefono") or "",
-        )
-    rest_details = [
-        PayrollRestDetail(
-            token=detail["token"],
-            date=date.fromisoformat(detail["date"]),
-            status=detail["status"],
-            notes=detail.get("notes") or "",
-            is_extra=detail.get("is_extra", False),
-            is_bonified=detail.get("is_bonified", False),
-        )
-        for detail in entry.get("rest_details", [])
-    ]
-    shift_details = [
-        PayrollShiftDetail(
-            date=date.fromisoformat(detail["date"]),
-            position_label=detail["position_label"],
-            is_overtime=detail.get("is_overtime", False),
-        )
-        for detail in entry.get("shift_details", [])
-    ]
-    idle_details = [
-        PayrollIdleDetail(
-            token=detail["token"],
-            date=date.fromisoformat(detail["date"]),
-            is_bonified=detail.get("is_bonified", False),
-        )
-        for detail in entry.get("non_worked_details", [])
-    ]
-    override_amount_raw = entry.get("override_amount")
-    override_amount = Decimal(override_amount_raw) if override_amount_raw not in (None, "") else None
-    return PayrollEntry(
-        operator=operator,
-        job_type=entry.get("job_type"),
-        job_type_label=entry.get("job_type_label") or "",
-        farm_id=entry.get("farm_id"),
-        farm_label=entry.get("farm_label") or "Otros",
-        payment_type=entry.get("payment_type"),
-        payment_type_label=entry.get("payment_type_label") or "",
-        salary_amount=Decimal(entry.get("salary_amount", "0")),
-        worked_days=int(entry.get("worked_days", 0)),
-        rest_days=int(entry.get("rest_days", 0)),
-        rest_details=rest_details,
-        shift_details=shift_details,
-        extra_rest_count=int(entry.get("extra_rest_count", 0)),
-        bonified_extra_count=int(entry.get("bonified_extra_count", 0)),
-        discounted_extra_count=int(entry.get("discounted_extra_count", 0)),
-        non_worked_details=idle_details,
-        non_worked_count=int(entry.get("non_worked_count", 0)),
-        bonified_non_worked_count=int(entry.get("bonified_non_worked_count", 0)),
-        discounted_non_worked_count=int(entry.get("discounted_non_worked_count", 0)),
-        base_amount=Decimal(entry.get("base_amount", "0")),
-        deduction_amount=Decimal(entry.get("deduction_amount", "0")),
-        suggested_amount=Decimal(entry.get("suggested_amount", "0")),
-        final_amount=Decimal(entry.get("final_amount", "0")),
-        override_amount=override_amount,
-        override_note=entry.get("override_note") or "",
-        extra_rest_tokens=entry.get("extra_rest_tokens", []),
-    )
-
-
-def _load_operator_map(operator_ids: Iterable[int]) -> dict[int, UserProfile]:
-    unique_ids = {operator_id for operator_id in operator_ids if operator_id}
-    if not unique_ids:
-        return {}
-    operators = UserProfile.objects.filter(pk__in=unique_ids)
-    return {operator.pk: operator for operator in operators}
-
-
 __all__ = [
-    "serialize_payroll_summary",
-    "deserialize_payroll_summary",
+    "save_payroll_snapshot",
+    "load_payroll_summary",
+    "load_source_versions",
 ]
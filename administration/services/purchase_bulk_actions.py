@@ -8,6 +8,8 @@ from django.db.models import Case, DecimalField, F, Q, When
 from django.utils import timezone
 
 from administration.models import PurchaseRequest, PurchaseSupportAttachment
+from administration.services.code_sequences import next_code_number
+from administration.services.purchases import invalidate_scope_counts
 
 
 class PurchaseBulkActionError(Exception):
@@ -49,7 +51,10 @@ def move_purchases_to_status(*, purchase_ids: Sequence[int], target_status: str
             default=F('payment_amount'),
             output_field=DecimalField(max_digits=14, decimal_places=2),
         )
-    return queryset.update(**update_kwargs)
+    updated = queryset.update(**update_kwargs)
+    if updated:
+        invalidate_scope_counts()
+    return updated
 
 
 def update_purchases_requested_date(*, purchase_ids: Sequence[int], requested_date: date | None) -> int:
@@ -140,13 +145,7 @@ def group_purchases_for_support(*, purchase_ids: Sequence[int]) -> tuple[str, in
 
 def _generate_support_group_code() -> str:
     today_prefix = timezone.localtime().strftime("SG-%Y%m%d")
-    suffix = 1
-    while True:
-        candidate = f"{today_prefix}-{suffix:02d}"
-        exists = PurchaseRequest.objects.filter(support_group_code=candidate).exists()
-        if not exists:
-            return candidate
-        suffix += 1
+    return f"{today_prefix}-{next_code_number(today_prefix):02d}"
 
 
 def ungroup_support_group(*, purchase_id: int | None) -> tuple[str, int, PurchaseRequest]:
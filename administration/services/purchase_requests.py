@@ -3,7 +3,6 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date, datetime
 from decimal import Decimal
-import re
 from typing import Iterable, Sequence
 
 from django.contrib.auth import get_user_model
@@ -18,6 +17,7 @@ from administration.models import (
     Supplier,
     SupportDocumentType,
 )
+from administration.services.code_sequences import next_code_number
 from administration.services.workflows import PurchaseApprovalWorkflowService
 from production.models import ChickenHouse, Farm
 
@@ -62,19 +62,7 @@ class PurchaseRequestValidationError(Exception):
 
 def generate_timeline_code() -> str:
     prefix = timezone.now().strftime("SOL-%Y")
-    pattern = f"{prefix}-"
-    last_code = (
-        PurchaseRequest.objects.filter(timeline_code__startswith=pattern)
-        .order_by("-timeline_code")
-        .values_list("timeline_code", flat=True)
-        .first()
-    )
-    next_number = 1
-    if last_code:
-        match = re.search(r"(\d+)$", last_code)
-        if match:
-            next_number = int(match.group(1)) + 1
-    return f"{pattern}{next_number:04d}"
+    return f"{prefix}-{next_code_number(prefix):04d}"
 
 
 class PurchaseRequestSubmissionService:
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import models
+from django.db.models import Func, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat
+
+from administration.models import PurchaseItem, PurchaseRequest, PurchasingExpenseType, Supplier
+
+# The "simple" configuration keeps codes, NITs and Spanish words as typed (no stemming).
+SEARCH_CONFIG = 'simple'
+PURCHASE_SEARCH_FIELDS = (
+    'timeline_code',
+    'name',
+    'description',
+    'order_number',
+    'invoice_number',
+    'scope_batch_code',
+    'supplier',
+    'expense_type',
+)
+SUPPLIER_SEARCH_FIELDS = ('name', 'tax_id')
+
+_TOKEN_PATTERN = re.compile(r'[^\W_]+', re.UNICODE)
+
+
+class SearchText(Func):
+    """
+    Join the searchable values and turn punctuation into spaces: the text parser would
+    otherwise index "SOL-2025-0001" as signed numbers and miss prefixes of its parts.
+    """
+    function = 'REGEXP_REPLACE'
+    template = "%(function)s(%(expressions)s, '[^[:alnum:]]+', ' ', 'g')"
+    output_field = models.TextField()
+
+    def __init__(self, *expressions, **extra):
+        parts = []
+        for expression in expressions:
+            if parts:
+                parts.append(Value(' '))
+            parts.append(Coalesce(expression, Value(''), output_field=models.TextField()))
+        super().__init__(Concat(*parts, output_field=models.TextField()), **extra)
+
+
+def build_search_query(text: str | None) -> SearchQuery | None:
+    """
+    Turn free text into a prefix query where every typed word must match the start of
+    some word in the document, so partially typed terms already narrow the results.
+    """
+    tokens = _TOKEN_PATTERN.findall((text or '').lower())
+    if not tokens:
+        return None
+    raw_query = ' & '.join(f"{token}:*" for token in tokens)
+    return SearchQuery(raw_query, search_type='raw', config=SEARCH_CONFIG)
+
+
+def _purchase_search_vector() -> SearchVector:
+    supplier_name = Supplier.objects.filter(pk=OuterRef('supplier_id')).values('name')[:1]
+    expense_type_name = PurchasingExpenseType.objects.filter(pk=OuterRef('expense_type_id')).values('name')[:1]
+    item_scopes = (
+        PurchaseItem.objects.filter(purchase_id=OuterRef('pk'))
+        .order_by()
+        .values('purchase_id')
+        .annotate(
+            text=StringAgg(
+                Concat(
+                    Coalesce('scope_farm__name', Value('')),
+                    Value(' '),
+                    Coalesce('scope_chicken_house__name', Value('')),
+                    output_field=models.TextField(),
+                ),
+                delimiter=' ',
+            )
+        )
+        .values('text')
+    )
+    return SearchVector(
+        SearchText(
+            'timeline_code',
+            'name',
+            'description',
+            'order_number',
+            'invoice_number',
+            'scope_batch_code',
+            Subquery(supplier_name, output_field=models.TextField()),
+            Subquery(expense_type_name, output_field=models.TextField()),
+            Subquery(item_scopes, output_field=models.TextField()),
+        ),
+        config=SEARCH_CONFIG,
+    )
+
+
+def refresh_purchase_search_vectors(queryset: models.QuerySet[PurchaseRequest]) -> int:
+    """Recompute the search document of every purchase in ``queryset`` with a single UPDATE."""
+    return PurchaseRequest.objects.filter(pk__in=queryset.values('pk')).update(
+        search_vector=_purchase_search_vector()
+    )
+
+
+def refresh_supplier_search_vectors(supplier_ids: Iterable[int]) -> int:
+    return Supplier.objects.filter(pk__in=list(supplier_ids)).update(
+        search_vector=SearchVector(SearchText(*SUPPLIER_SEARCH_FIELDS), config=SEARCH_CONFIG)
+    )
+
+
+def search_purchases(
+    queryset: models.QuerySet[PurchaseRequest], text: str | None
+) -> models.QuerySet[PurchaseRequest]:
+    query = build_search_query(text)
+    if query is None:
+        return queryset
+    return queryset.filter(search_vector=query)
+
+
+def search_suppliers(queryset: models.QuerySet[Supplier], text: str | None) -> models.QuerySet[Supplier]:
+    query = build_search_query(text)
+    if query is None:
+        return queryset
+    return queryset.filter(search_vector=query)
@@ -6,12 +6,16 @@ from datetime import date
 from decimal import Decimal
 from typing import Literal, Sequence
 
-from django.core.paginator import EmptyPage, Paginator
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.utils import timezone
 
 from administration.models import PurchaseApproval, PurchaseRequest, PurchasingExpenseType
+from administration.services.purchase_search import search_purchases
+from applacolina.pagination import approximate_count, decode_cursor, keyset_paginate, page_anchor
+from production.services.cache_versions import bump_cache_versions, read_cache_versions
 
 StageStatus = Literal['pending', 'active', 'completed', 'locked']
 
@@ -79,6 +83,13 @@ class PurchaseScope:
     count: int
 
 
+@dataclass(frozen=True)
+class PurchaseScopeCounts:
+    total: int
+    by_status: dict[str, int]
+    waiting: int
+
+
 @dataclass(frozen=True)
 class PurchasePanel:
     code: str
@@ -114,6 +125,9 @@ class PurchasePagination:
     next_page_number: int | None
     start_index: int
     end_index: int
+    cursor: str | None = None
+    previous_cursor: str | None = None
+    next_cursor: str | None = None
 
 
 PANEL_REGISTRY = {
@@ -234,6 +248,8 @@ ACTION_BY_STATUS = {
 }
 
 PAGE_SIZE = 30
+# Keyset order of the purchases list; the trailing pk keeps pages stable for equal timestamps.
+PURCHASE_ORDERING = ('-created_at', '-pk')
 
 def get_dashboard_state(
     *,
@@ -247,6 +263,7 @@ def get_dashboard_state(
     category_ids: Sequence[int] | None = None,
     supplier_ids: Sequence[int] | None = None,
     manager_ids: Sequence[int] | None = None,
+    cursor: str | None = None,
 ) -> PurchaseDashboardState:
     scopes = _build_scopes()
     selected_scope = _find_scope(scopes, scope_code or scopes[0].code)
@@ -263,6 +280,7 @@ def get_dashboard_state(
         queryset=queryset,
         scope_code=selected_scope.code,
         page_number=page_number or 1,
+        cursor=cursor,
     )
     panel_state = _resolve_panel(panel_code, purchase_pk)
     activity = _recent_activity()
@@ -303,31 +321,64 @@ def get_filtered_purchases_queryset(
     return queryset, selected_scope
 
 
-def _build_scopes() -> Sequence[PurchaseScope]:
-    total_count = PurchaseRequest.objects.count()
-    counts = {code: 0 for code, *_ in SCOPE_DEFINITIONS}
-    qs = (
-        PurchaseRequest.objects.values('status')
-        .order_by('status')
-        .annotate(count=models.Count('id'))  # type: ignore[name-defined]
+SCOPE_COUNTS_CACHE_KEY = 'purchases:scope-counts'
+SCOPE_COUNTS_VERSION_KEY = 'purchases:scope-counts'
+# Entries of retired versions are never read again; the timeout only bounds how long they linger.
+SCOPE_COUNTS_CACHE_SECONDS = 300
+
+
+def get_scope_counts() -> PurchaseScopeCounts:
+    """
+    Badge counts for the dashboard scopes, cached under the shared version that
+    ``invalidate_scope_counts`` bumps on a status change. A cache hit costs the version lookup;
+    a miss adds a single aggregate.
+    """
+    (version,) = read_cache_versions(SCOPE_COUNTS_VERSION_KEY)
+    cache_key = f'{SCOPE_COUNTS_CACHE_KEY}:{version}'
+    counts = cache.get(cache_key)
+    if counts is not None:
+        return counts
+    status_codes = [code for code, *_ in SCOPE_DEFINITIONS]
+    aggregates = PurchaseRequest.objects.aggregate(
+        total=Count('id'),
+        waiting=Count(
+            'id',
+            filter=Q(
+                delivery_condition=PurchaseRequest.DeliveryCondition.SHIPPING,
+                status__in=WAITING_SCOPE_STATUSES,
+            ),
+        ),
+        **{f'status_{index}': Count('id', filter=Q(status=code)) for index, code in enumerate(status_codes)},
+    )
+    counts = PurchaseScopeCounts(
+        total=aggregates['total'],
+        by_status={code: aggregates[f'status_{index}'] for index, code in enumerate(status_codes)},
+        waiting=aggregates['waiting'],
     )
-    for row in qs:
-        counts[row['status']] = row['count']
+    cache.set(
+        cache_key,
+        counts,
+        getattr(settings, 'PURCHASE_SCOPE_COUNTS_CACHE_SECONDS', SCOPE_COUNTS_CACHE_SECONDS),
+    )
+    return counts
+
+
+def invalidate_scope_counts() -> None:
+    """Retire the cached badge counts on every worker once the surrounding transaction commits."""
+    bump_cache_versions(SCOPE_COUNTS_VERSION_KEY)
+
+
+def _build_scopes() -> Sequence[PurchaseScope]:
+    counts = get_scope_counts()
     stage_scopes: list[PurchaseScope] = [
-        PurchaseScope(code=code, label=label, description=description, count=counts.get(code, 0))
+        PurchaseScope(code=code, label=label, description=description, count=counts.by_status.get(code, 0))
         for code, label, description in SCOPE_DEFINITIONS
     ]
-    waiting_count = (
-        PurchaseRequest.objects.filter(
-            delivery_condition=PurchaseRequest.DeliveryCondition.SHIPPING,
-            status__in=WAITING_SCOPE_STATUSES,
-        ).count()
-    )
     waiting_scope = PurchaseScope(
         code=WAITING_SCOPE_CODE,
         label=WAITING_SCOPE_LABEL,
         description=WAITING_SCOPE_DESCRIPTION,
-        count=waiting_count,
+        count=counts.waiting,
     )
     waiting_insert_index = BASE_SCOPE_STAGE_ORDER.index('payable') + 1
     stage_scopes.insert(waiting_insert_index, waiting_scope)
@@ -336,7 +387,7 @@ def _build_scopes() -> Sequence[PurchaseScope]:
             code=ALL_SCOPE_CODE,
             label=ALL_SCOPE_LABEL,
             description=ALL_SCOPE_DESCRIPTION,
-            count=total_count,
+            count=counts.total,
         )
     ]
     scopes.extend(stage_scopes)
@@ -377,20 +428,7 @@ def _query_purchases(
         )
     elif scope_code != ALL_SCOPE_CODE:
         queryset = queryset.filter(status=scope_code)
-    search_value = (search_query or '').strip()
-    if search_value:
-        queryset = queryset.filter(
-            Q(timeline_code__icontains=search_value)
-            | Q(name__icontains=search_value)
-            | Q(description__icontains=search_value)
-            | Q(order_number__icontains=search_value)
-            | Q(invoice_number__icontains=search_value)
-            | Q(supplier__name__icontains=search_value)
-            | Q(expense_type__name__icontains=search_value)
-            | Q(items__scope_farm__name__icontains=search_value)
-            | Q(items__scope_chicken_house__name__icontains=search_value)
-            | Q(scope_batch_code__icontains=search_value)
-    )
+    queryset = search_purchases(queryset, search_query)
     if start_date:
         queryset = queryset.filter(created_at__date__gte=start_date)
     if end_date:
@@ -402,7 +440,7 @@ def _query_purchases(
         queryset = queryset.filter(supplier_id__in=supplier_ids)
     if manager_ids:
         queryset = queryset.filter(assigned_manager_id__in=manager_ids)
-    return queryset.order_by('-created_at')
+    return queryset.order_by(*PURCHASE_ORDERING)
 
 
 def _resolve_category_descendants(category_ids: Sequence[int]) -> tuple[int, ...]:
@@ -433,9 +471,15 @@ def _build_pagination(
     queryset: models.QuerySet[PurchaseRequest],
     scope_code: str,
     page_number: int,
+    cursor: str | None = None,
 ) -> PurchasePagination:
-    paginator = Paginator(queryset, PAGE_SIZE)
-    if paginator.count == 0:
+    """
+    Keyset pagination over ``PURCHASE_ORDERING``: following a cursor costs the same on any page.
+    The total only feeds the page badge, so it comes from a short-lived cached count. Page numbers
+    without a cursor (old links, form re-renders) resolve their first row once and continue by cursor.
+    """
+    count = approximate_count(queryset)
+    if count == 0:
         return PurchasePagination(
             records=(),
             page_number=1,
@@ -449,10 +493,25 @@ def _build_pagination(
             start_index=0,
             end_index=0,
         )
-    try:
-        page = paginator.page(page_number)
-    except EmptyPage:
-        page = paginator.page(paginator.num_pages)
+    num_pages = max((count + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+    position = decode_cursor(cursor, model=PurchaseRequest, ordering=PURCHASE_ORDERING)
+    if position is None and page_number > 1:
+        position = page_anchor(
+            queryset,
+            ordering=PURCHASE_ORDERING,
+            page_number=min(page_number, num_pages),
+            per_page=PAGE_SIZE,
+        )
+        cursor = None
+    page = keyset_paginate(queryset, ordering=PURCHASE_ORDERING, per_page=PAGE_SIZE, cursor=position)
+    if not page.object_list and position is not None:
+        page = keyset_paginate(queryset, ordering=PURCHASE_ORDERING, per_page=PAGE_SIZE)
+        cursor = None
+    if page.start_index:
+        page_number = (page.start_index - 1) // PAGE_SIZE + 1
+    elif position is None:
+        page_number = 1
+    num_pages = max(num_pages, page_number + (1 if page.has_next else 0))
     group_summaries = _build_group_summaries(page.object_list)
     records = tuple(
         _build_purchase_record(
@@ -464,16 +523,19 @@ def _build_pagination(
     )
     return PurchasePagination(
         records=records,
-        page_number=page.number,
+        page_number=page_number,
         per_page=PAGE_SIZE,
-        num_pages=paginator.num_pages or 1,
-        count=paginator.count,
-        has_previous=page.has_previous(),
-        has_next=page.has_next(),
-        previous_page_number=page.previous_page_number() if page.has_previous() else None,
-        next_page_number=page.next_page_number() if page.has_next() else None,
-        start_index=page.start_index(),
-        end_index=page.end_index(),
+        num_pages=num_pages,
+        count=count,
+        has_previous=page.has_previous,
+        has_next=page.has_next,
+        previous_page_number=page_number - 1 if page.has_previous and page_number > 1 else None,
+        next_page_number=page_number + 1 if page.has_next else None,
+        start_index=page.start_index or 0,
+        end_index=page.end_index or 0,
+        cursor=cursor or None,
+        previous_cursor=page.previous_cursor,
+        next_cursor=page.next_cursor,
     )
 
 
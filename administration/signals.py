@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from administration.models import PurchaseItem, PurchaseRequest, PurchasingExpenseType, Supplier
+from administration.services.purchase_search import (
+    PURCHASE_SEARCH_FIELDS,
+    SUPPLIER_SEARCH_FIELDS,
+    refresh_purchase_search_vectors,
+    refresh_supplier_search_vectors,
+)
+from administration.services.purchases import invalidate_scope_counts
+from production.models import ChickenHouse, Farm
+
+
+def _touches(update_fields, searchable: tuple[str, ...]) -> bool:
+    if update_fields is None:
+        return True
+    return any(field in update_fields or f'{field}_id' in update_fields for field in searchable)
+
+
+@receiver(post_save, sender=PurchaseRequest, dispatch_uid='administration_purchase_search_vector')
+def _refresh_purchase_search_vector(sender, instance: PurchaseRequest, update_fields=None, **kwargs) -> None:
+    if _touches(update_fields, PURCHASE_SEARCH_FIELDS):
+        refresh_purchase_search_vectors(PurchaseRequest.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=PurchaseRequest, dispatch_uid='administration_purchase_scope_counts')
+@receiver(post_delete, sender=PurchaseRequest, dispatch_uid='administration_purchase_delete_scope_counts')
+def _invalidate_purchase_scope_counts(sender, instance: PurchaseRequest, update_fields=None, **kwargs) -> None:
+    if _touches(update_fields, ('status', 'delivery_condition')):
+        invalidate_scope_counts()
+
+
+@receiver(post_save, sender=PurchaseItem, dispatch_uid='administration_purchase_item_search_vector')
+@receiver(post_delete, sender=PurchaseItem, dispatch_uid='administration_purchase_item_delete_search_vector')
+def _refresh_purchase_item_search_vector(sender, instance: PurchaseItem, update_fields=None, **kwargs) -> None:
+    if _touches(update_fields, ('scope_farm', 'scope_chicken_house')):
+        refresh_purchase_search_vectors(PurchaseRequest.objects.filter(pk=instance.purchase_id))
+
+
+@receiver(post_save, sender=Supplier, dispatch_uid='administration_supplier_search_vector')
+def _refresh_supplier_search_vector(sender, instance: Supplier, update_fields=None, **kwargs) -> None:
+    if not _touches(update_fields, SUPPLIER_SEARCH_FIELDS):
+        return
+    refresh_supplier_search_vectors([instance.pk])
+    if not kwargs.get('created'):
+        refresh_purchase_search_vectors(PurchaseRequest.objects.filter(supplier_id=instance.pk))
+
+
+@receiver(post_save, sender=PurchasingExpenseType, dispatch_uid='administration_expense_type_search_vector')
+def _refresh_expense_type_search_vector(sender, instance: PurchasingExpenseType, created=False, **kwargs) -> None:
+    if not created:
+        refresh_purchase_search_vectors(PurchaseRequest.objects.filter(expense_type_id=instance.pk))
+
+
+@receiver(post_save, sender=Farm, dispatch_uid='administration_farm_search_vector')
+def _refresh_farm_search_vector(sender, instance: Farm, created=False, **kwargs) -> None:
+    if not created:
+        refresh_purchase_search_vectors(PurchaseRequest.objects.filter(items__scope_farm_id=instance.pk))
+
+
+@receiver(post_save, sender=ChickenHouse, dispatch_uid='administration_chicken_house_search_vector')
+def _refresh_chicken_house_search_vector(sender, instance: ChickenHouse, created=False, **kwargs) -> None:
+    if not created:
+        refresh_purchase_search_vectors(
+            PurchaseRequest.objects.filter(items__scope_chicken_house_id=instance.pk)
+        )
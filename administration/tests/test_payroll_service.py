@@ -5,7 +5,13 @@ from decimal import Decimal
 
 from django.test import TestCase
 
-from administration.services.payroll import build_payroll_summary, resolve_payroll_period, PayrollComputationError
+from administration.services.payroll import (
+    PayrollComputationError,
+    build_payroll_summary,
+    load_payroll_source_versions,
+    refresh_payroll_summary,
+    resolve_payroll_period,
+)
 from personal.models import (
     CalendarStatus,
     OperatorRestPeriod,
@@ -274,6 +280,95 @@ class PayrollServiceTests(TestCase):
         self.assertEqual(len(summary.entries), 1)
         self.assertEqual(summary.entries[0].operator.id, operator.id)
 
+    def test_refresh_reprices_only_the_operator_whose_bonus_changed(self):
+        monthly = self._create_operator(
+            cedula="900",
+            payment_type=OperatorSalary.PaymentType.MONTHLY,
+            amount=Decimal("1500000"),
+        )
+        daily = self._create_operator(
+            cedula="901",
+            payment_type=OperatorSalary.PaymentType.DAILY,
+            amount=Decimal("50000"),
+        )
+        self._assign_days(daily, [date(2025, 4, 1), date(2025, 4, 2)])
+        period = resolve_payroll_period(date(2025, 4, 1), date(2025, 4, 15))
+        summary = build_payroll_summary(period=period)
+        versions = load_payroll_source_versions(period)
+        entries = {entry.operator.pk: entry for entry in summary.entries}
+        idle_token = entries[monthly.pk].non_worked_details[0].token
+
+        refreshed, refreshed_versions = refresh_payroll_summary(
+            summary,
+            source_versions=versions,
+            bonified_idle_tokens={idle_token},
+        )
+
+        refreshed_entries = {entry.operator.pk: entry for entry in refreshed.entries}
+        self.assertIs(entries[daily.pk], refreshed_entries[daily.pk])
+        self.assertEqual(refreshed_entries[monthly.pk].bonified_non_worked_count, 1)
+        self.assertEqual(
+            refreshed_entries[monthly.pk].final_amount - entries[monthly.pk].final_amount,
+            Decimal("50000.00"),
+        )
+        self.assertEqual(refreshed.overall_total, summary.overall_total + Decimal("50000.00"))
+        self.assertEqual(refreshed_versions, versions)
+
+    def test_refresh_rebuilds_operators_whose_assignments_changed(self):
+        monthly = self._create_operator(
+            cedula="910",
+            payment_type=OperatorSalary.PaymentType.MONTHLY,
+            amount=Decimal("1500000"),
+        )
+        daily = self._create_operator(
+            cedula="911",
+            payment_type=OperatorSalary.PaymentType.DAILY,
+            amount=Decimal("50000"),
+        )
+        self._assign_days(daily, [date(2025, 4, 1)])
+        period = resolve_payroll_period(date(2025, 4, 1), date(2025, 4, 15))
+        summary = build_payroll_summary(period=period)
+        versions = load_payroll_source_versions(period)
+        monthly_entry = next(entry for entry in summary.entries if entry.operator.pk == monthly.pk)
+
+        self._assign_days(daily, [date(2025, 4, 2)])
+        refreshed, refreshed_versions = refresh_payroll_summary(summary, source_versions=versions)
+
+        refreshed_entries = {entry.operator.pk: entry for entry in refreshed.entries}
+        self.assertIs(monthly_entry, refreshed_entries[monthly.pk])
+        self.assertEqual(refreshed_entries[daily.pk].worked_days, 2)
+        self.assertEqual(refreshed_entries[daily.pk].final_amount, Decimal("100000.00"))
+        self.assertEqual(refreshed_versions[monthly.pk], versions[monthly.pk])
+        self.assertNotEqual(refreshed_versions[daily.pk], versions[daily.pk])
+
+    def test_refresh_rebuilds_operators_whose_position_or_roles_changed(self):
+        monthly = self._create_operator(
+            cedula="920",
+            payment_type=OperatorSalary.PaymentType.MONTHLY,
+            amount=Decimal("1500000"),
+        )
+        daily = self._create_operator(
+            cedula="921",
+            payment_type=OperatorSalary.PaymentType.DAILY,
+            amount=Decimal("50000"),
+        )
+        self._assign_days(daily, [date(2025, 4, 1)])
+        period = resolve_payroll_period(date(2025, 4, 1), date(2025, 4, 15))
+        summary = build_payroll_summary(period=period)
+        versions = load_payroll_source_versions(period)
+
+        other_farm = Farm.objects.create(name="Altamira")
+        PositionDefinition.objects.filter(pk=self.position.pk).update(farm=other_farm)
+        role, _ = Role.objects.get_or_create(name=Role.RoleName.CLASIFICADOR)
+        monthly.roles.add(role)
+        refreshed, refreshed_versions = refresh_payroll_summary(summary, source_versions=versions)
+
+        refreshed_entries = {entry.operator.pk: entry for entry in refreshed.entries}
+        self.assertEqual(refreshed_entries[daily.pk].farm_label, "Altamira")
+        self.assertNotEqual(refreshed_versions[monthly.pk], versions[monthly.pk])
+        rebuilt = {entry.operator.pk: entry for entry in build_payroll_summary(period=period).entries}
+        self.assertEqual(refreshed_entries[monthly.pk].job_type, rebuilt[monthly.pk].job_type)
+
     def _create_operator(
         self,
         *,
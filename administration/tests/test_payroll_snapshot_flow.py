@@ -2,13 +2,21 @@ from __future__ import annotations
 
 from datetime import date
 from decimal import Decimal
+from io import BytesIO
 
 from django.test import TestCase
 from django.urls import reverse
+from openpyxl import load_workbook
 
 from administration.models import PayrollSnapshot
-from administration.services.payroll import build_payroll_summary, resolve_payroll_period
-from administration.services.payroll_snapshot import deserialize_payroll_summary, serialize_payroll_summary
+from administration.services.payroll import (
+    PayrollOverrideData,
+    build_payroll_summary,
+    load_payroll_source_versions,
+    refresh_payroll_summary,
+    resolve_payroll_period,
+)
+from administration.services.payroll_snapshot import load_payroll_summary, save_payroll_snapshot
 from personal.models import (
     CalendarStatus,
     OperatorSalary,
@@ -74,19 +82,90 @@ class PayrollSnapshotTestDataMixin:
             )
 
 
-class PayrollSnapshotSerializationTests(PayrollSnapshotTestDataMixin, TestCase):
+class PayrollSnapshotStorageTests(PayrollSnapshotTestDataMixin, TestCase):
     def test_roundtrip_preserves_summary(self):
         operator = self._create_operator("800", Decimal("1200000"))
         self._assign_days(operator, [date(2025, 4, day) for day in range(1, 6)])
 
         summary = build_payroll_summary(period=self.period)
-        payload = serialize_payroll_summary(summary)
-        restored = deserialize_payroll_summary(payload)
+        snapshot = save_payroll_snapshot(
+            period=self.period,
+            summary=summary,
+            source_versions=load_payroll_source_versions(self.period),
+            action=PayrollSnapshot.LastAction.GENERATE,
+            computed_by=None,
+        )
+        restored = load_payroll_summary(snapshot)
 
         self.assertEqual(restored.overall_total, summary.overall_total)
         self.assertEqual(len(restored.entries), 1)
         self.assertEqual(restored.entries[0].operator.pk, operator.pk)
         self.assertEqual(restored.entries[0].worked_days, 5)
+        self.assertEqual(restored.entries[0].shift_details, summary.entries[0].shift_details)
+
+    def test_override_rewrites_only_the_affected_row(self):
+        first = self._create_operator("810", Decimal("1200000"))
+        second = self._create_operator("811", Decimal("1200000"))
+        self._assign_days(first, [date(2025, 4, 1)])
+        versions = load_payroll_source_versions(self.period)
+        snapshot = save_payroll_snapshot(
+            period=self.period,
+            summary=build_payroll_summary(period=self.period),
+            source_versions=versions,
+            action=PayrollSnapshot.LastAction.GENERATE,
+            computed_by=None,
+        )
+        untouched_row_id = snapshot.entries.get(operator=second).pk
+
+        stored = load_payroll_summary(snapshot)
+        summary, versions = refresh_payroll_summary(
+            stored,
+            source_versions=versions,
+            overrides={first.pk: PayrollOverrideData(operator_id=first.pk, amount=Decimal("700000"), note="Ajuste")},
+        )
+        save_payroll_snapshot(
+            period=self.period,
+            summary=summary,
+            source_versions=versions,
+            action=PayrollSnapshot.LastAction.APPLY,
+            computed_by=None,
+            instance=snapshot,
+            previous=stored,
+        )
+
+        snapshot.refresh_from_db()
+        self.assertEqual(untouched_row_id, snapshot.entries.get(operator=second).pk)
+        self.assertEqual(Decimal("700000.00"), snapshot.entries.get(operator=first).final_amount)
+        self.assertEqual(summary.overall_total, snapshot.overall_total)
+        only_first = load_payroll_summary(snapshot, operator_ids=[first.pk])
+        self.assertEqual([first.pk], [entry.operator.pk for entry in only_first.entries])
+
+
+    def test_entries_of_deleted_operators_survive_a_partial_save(self):
+        first = self._create_operator("820", Decimal("1200000"))
+        second = self._create_operator("821", Decimal("1300000"))
+        snapshot = save_payroll_snapshot(
+            period=self.period,
+            summary=build_payroll_summary(period=self.period),
+            source_versions=load_payroll_source_versions(self.period),
+            action=PayrollSnapshot.LastAction.GENERATE,
+            computed_by=None,
+        )
+        snapshot.entries.filter(operator__in=[first, second]).update(operator=None)
+
+        stored = load_payroll_summary(snapshot)
+        save_payroll_snapshot(
+            period=self.period,
+            summary=stored,
+            source_versions={},
+            action=PayrollSnapshot.LastAction.APPLY,
+            computed_by=None,
+            instance=snapshot,
+            previous=stored,
+        )
+
+        orphans = snapshot.entries.filter(operator__isnull=True).order_by("position")
+        self.assertEqual(["820", "821"], [row.operator_cedula for row in orphans])
 
 
 class PayrollManagementViewTests(PayrollSnapshotTestDataMixin, TestCase):
@@ -119,7 +198,7 @@ class PayrollManagementViewTests(PayrollSnapshotTestDataMixin, TestCase):
             start_date=self.period.start_date,
             end_date=self.period.end_date,
         )
-        self.assertTrue(snapshot.payload)
+        self.assertEqual(1, snapshot.entries.count())
         self.assertIsNotNone(snapshot.last_computed_at)
 
         response = self.client.get(
@@ -131,3 +210,37 @@ class PayrollManagementViewTests(PayrollSnapshotTestDataMixin, TestCase):
         )
         self.assertContains(response, "Regenerar nómina")
         self.assertContains(response, self.operator.get_full_name())
+
+    def test_farm_export_only_contains_that_farms_entries(self):
+        other_farm = Farm.objects.create(name="Otra granja")
+        other_position = PositionDefinition.objects.create(
+            name="Turno Día Otra",
+            code="POS-2",
+            category=self.category,
+            farm=other_farm,
+            valid_from=date(2024, 1, 1),
+            job_type=PositionJobType.PRODUCTION,
+        )
+        other_operator = self._create_operator("802", Decimal("1000000"))
+        for day in range(1, 6):
+            ShiftAssignment.objects.create(
+                calendar=self.calendar,
+                position=other_position,
+                date=date(2025, 4, day),
+                operator=other_operator,
+            )
+        self.client.force_login(self.staff_user)
+        url = reverse("administration:purchases_payroll")
+        period_data = {
+            "start_date": self.period.start_date.isoformat(),
+            "end_date": self.period.end_date.isoformat(),
+        }
+        self.client.post(url, {**period_data, "form_action": "generate"})
+
+        response = self.client.post(url, {**period_data, "form_action": f"export-farm-{other_farm.pk}"})
+
+        self.assertEqual(response.status_code, 200)
+        sheet = load_workbook(BytesIO(response.content)).active
+        collaborators = {row[0] for row in sheet.iter_rows(min_row=5, values_only=True) if row[0]}
+        self.assertIn(other_operator.get_full_name(), collaborators)
+        self.assertNotIn(self.operator.get_full_name(), collaborators)
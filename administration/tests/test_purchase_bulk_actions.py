@@ -9,6 +9,7 @@ from django.test import TestCase
 from django.utils import timezone
 
 from administration.models import (
+    CodeSequence,
     PurchaseRequest,
     PurchaseSupportAttachment,
     PurchasingExpenseType,
@@ -22,6 +23,7 @@ from administration.services.purchase_bulk_actions import (
     ungroup_support_group,
     update_purchases_requested_date,
 )
+from administration.services.purchases import get_scope_counts
 
 
 class PurchaseBulkActionsTests(TestCase):
@@ -135,6 +137,29 @@ class PurchaseBulkActionsTests(TestCase):
         self.assertEqual(Decimal('45000'), purchase.payment_amount)
         self.assertEqual(PurchaseRequest.Status.PAYMENT, purchase.status)
 
+    def test_scope_counts_are_cached_until_a_status_changes(self) -> None:
+        purchase = self._create_purchase(status=PurchaseRequest.Status.DRAFT)
+        self._create_purchase(status=PurchaseRequest.Status.DRAFT)
+        self.assertEqual(2, get_scope_counts().by_status[PurchaseRequest.Status.DRAFT])
+
+        # Only the shared version is read; the counts themselves come from the cache.
+        with self.assertNumQueries(1):
+            cached = get_scope_counts()
+        self.assertEqual(2, cached.total)
+
+        move_purchases_to_status(purchase_ids=[purchase.pk], target_status=PurchaseRequest.Status.SUBMITTED)
+        counts = get_scope_counts()
+        self.assertEqual(1, counts.by_status[PurchaseRequest.Status.DRAFT])
+        self.assertEqual(1, counts.by_status[PurchaseRequest.Status.SUBMITTED])
+
+        purchase.refresh_from_db()
+        purchase.status = PurchaseRequest.Status.RECEPTION
+        purchase.delivery_condition = PurchaseRequest.DeliveryCondition.SHIPPING
+        purchase.save(update_fields=['status', 'delivery_condition'])
+        counts = get_scope_counts()
+        self.assertEqual(0, counts.by_status[PurchaseRequest.Status.SUBMITTED])
+        self.assertEqual(1, counts.waiting)
+
     def test_move_purchases_to_status_validates_target(self) -> None:
         purchase = self._create_purchase(status=PurchaseRequest.Status.DRAFT)
 
@@ -181,6 +206,17 @@ class PurchaseBulkActionsTests(TestCase):
         self.assertIsNone(first.support_group_leader)
         self.assertEqual(first, second.support_group_leader)
 
+    def test_group_support_codes_follow_the_daily_sequence(self) -> None:
+        purchases = [self._create_purchase(status=PurchaseRequest.Status.INVOICE) for _ in range(4)]
+
+        first_code, *_ = group_purchases_for_support(purchase_ids=[purchases[0].pk, purchases[1].pk])
+        second_code, *_ = group_purchases_for_support(purchase_ids=[purchases[2].pk, purchases[3].pk])
+
+        prefix = timezone.localtime().strftime('SG-%Y%m%d')
+        self.assertEqual(f'{prefix}-01', first_code)
+        self.assertEqual(f'{prefix}-02', second_code)
+        self.assertEqual(2, CodeSequence.objects.get(key=prefix).last_value)
+
     def test_group_support_validates_status(self) -> None:
         draft = self._create_purchase(status=PurchaseRequest.Status.DRAFT)
         invoice = self._create_purchase(status=PurchaseRequest.Status.INVOICE)
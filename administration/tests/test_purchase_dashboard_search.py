@@ -7,8 +7,10 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.utils import timezone
 
-from administration.models import PurchaseRequest, PurchasingExpenseType, Supplier
+from administration.models import PurchaseItem, PurchaseRequest, PurchasingExpenseType, Supplier
+from administration.services.purchase_search import search_suppliers
 from administration.services.purchases import get_dashboard_state
+from production.models import Farm
 
 
 class PurchaseDashboardSearchTests(TestCase):
@@ -77,6 +79,48 @@ class PurchaseDashboardSearchTests(TestCase):
 
         self.assertEqual([draft.pk], [purchase.pk for purchase in state.pagination.records])
 
+    def test_search_matches_word_prefixes_across_related_names(self) -> None:
+        purchase = self._create_purchase(
+            timeline_code='CP-250',
+            name='Compra bebederos',
+            description='Reposición',
+            status=PurchaseRequest.Status.DRAFT,
+        )
+        farm = Farm.objects.create(name='Granja Altamira')
+        PurchaseItem.objects.create(
+            purchase=purchase,
+            description='Bebedero',
+            quantity=Decimal('4'),
+            scope_area=PurchaseRequest.AreaScope.FARM,
+            scope_farm=farm,
+        )
+
+        by_farm = self._dashboard_state(scope=PurchaseRequest.Status.DRAFT, search='altam')
+        by_code = self._dashboard_state(scope=PurchaseRequest.Status.DRAFT, search='cp-25')
+        by_two_words = self._dashboard_state(scope=PurchaseRequest.Status.DRAFT, search='bebe demo')
+
+        self.assertEqual([purchase.pk], [record.pk for record in by_farm.pagination.records])
+        self.assertEqual([purchase.pk], [record.pk for record in by_code.pagination.records])
+        self.assertEqual([purchase.pk], [record.pk for record in by_two_words.pagination.records])
+
+    def test_renaming_supplier_refreshes_purchase_search_document(self) -> None:
+        purchase = self._create_purchase(
+            timeline_code='CP-260',
+            name='Compra insumos',
+            description='Insumos varios',
+            status=PurchaseRequest.Status.DRAFT,
+        )
+        self.supplier.name = 'Agroinsumos del Valle'
+        self.supplier.save()
+
+        state = self._dashboard_state(scope=PurchaseRequest.Status.DRAFT, search='agroinsumos')
+
+        self.assertEqual([purchase.pk], [record.pk for record in state.pagination.records])
+        self.assertEqual(
+            [self.supplier.pk],
+            list(search_suppliers(Supplier.objects.all(), '1234').values_list('pk', flat=True)),
+        )
+
     def test_filters_by_start_date(self) -> None:
         old_purchase = self._create_purchase(
             timeline_code='CP-300',
@@ -164,6 +208,61 @@ class PurchaseDashboardSearchTests(TestCase):
         self.assertFalse(state.pagination.has_next)
         self.assertTrue(state.pagination.has_previous)
 
+    def test_cursor_walks_pages_without_overlap(self) -> None:
+        for idx in range(65):
+            self._create_purchase(
+                timeline_code=f'CP-9{idx:02d}',
+                name=f'Compra #{idx}',
+                description='Cursor',
+                status=PurchaseRequest.Status.DRAFT,
+            )
+
+        first_page = self._dashboard_state(scope=PurchaseRequest.Status.DRAFT)
+        second_page = self._dashboard_state(
+            scope=PurchaseRequest.Status.DRAFT,
+            page=2,
+            cursor=first_page.pagination.next_cursor,
+        )
+        third_page = self._dashboard_state(
+            scope=PurchaseRequest.Status.DRAFT,
+            page=3,
+            cursor=second_page.pagination.next_cursor,
+        )
+        back_page = self._dashboard_state(
+            scope=PurchaseRequest.Status.DRAFT,
+            page=2,
+            cursor=third_page.pagination.previous_cursor,
+        )
+
+        seen = [
+            record.pk
+            for state in (first_page, second_page, third_page)
+            for record in state.pagination.records
+        ]
+        self.assertEqual(65, len(seen))
+        self.assertEqual(65, len(set(seen)))
+        self.assertEqual((61, 65), (third_page.pagination.start_index, third_page.pagination.end_index))
+        self.assertEqual(3, third_page.pagination.page_number)
+        self.assertFalse(third_page.pagination.has_next)
+        self.assertEqual(
+            [record.pk for record in second_page.pagination.records],
+            [record.pk for record in back_page.pagination.records],
+        )
+        self.assertEqual(2, back_page.pagination.page_number)
+
+    def test_malformed_cursor_falls_back_to_first_page(self) -> None:
+        purchase = self._create_purchase(
+            timeline_code='CP-950',
+            name='Compra cursor',
+            description='Cursor inválido',
+            status=PurchaseRequest.Status.DRAFT,
+        )
+
+        state = self._dashboard_state(scope=PurchaseRequest.Status.DRAFT, cursor='no-es-un-cursor')
+
+        self.assertEqual([purchase.pk], [record.pk for record in state.pagination.records])
+        self.assertEqual(1, state.pagination.page_number)
+
     def test_filters_by_category_selection(self) -> None:
         other_category = PurchasingExpenseType.objects.create(name='Bioseguridad')
         match = self._create_purchase(
@@ -316,6 +415,7 @@ class PurchaseDashboardSearchTests(TestCase):
         categories: list[int] | None = None,
         suppliers: list[int] | None = None,
         managers: list[int] | None = None,
+        cursor: str | None = None,
     ):
         return get_dashboard_state(
             scope_code=scope,
@@ -328,4 +428,5 @@ class PurchaseDashboardSearchTests(TestCase):
             category_ids=categories,
             supplier_ids=suppliers,
             manager_ids=managers,
+            cursor=cursor,
         )
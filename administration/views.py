@@ -141,10 +141,14 @@ from .services.payroll import (
     PayrollComputationError,
     PayrollOverrideData,
     build_payroll_summary,
+    load_payroll_source_versions,
+    payroll_source_snapshot,
+    refresh_payroll_summary,
 )
 from .services.payroll_snapshot import (
-    deserialize_payroll_summary,
-    serialize_payroll_summary,
+    load_payroll_summary,
+    load_source_versions,
+    save_payroll_snapshot,
 )
 
 
@@ -1728,6 +1732,7 @@ class AdministrationHomeView(StaffRequiredMixin, generic.TemplateView):
         page_number = _parse_int(page_number_raw) or 1
         if page_number < 1:
             page_number = 1
+        page_cursor = (self.request.GET.get('cursor') or self.request.POST.get('cursor') or '').strip()
         start_date = parse_date(start_date_raw)
         end_date = parse_date(end_date_raw)
         state = get_dashboard_state(
@@ -1741,6 +1746,7 @@ class AdministrationHomeView(StaffRequiredMixin, generic.TemplateView):
             category_ids=category_filters,
             supplier_ids=supplier_filters,
             manager_ids=manager_filters,
+            cursor=page_cursor or None,
         )
         has_active_filters = any(
             [
@@ -1768,6 +1774,7 @@ class AdministrationHomeView(StaffRequiredMixin, generic.TemplateView):
             supplier_ids=supplier_filters,
             manager_ids=manager_filters,
             page_number=state.pagination.page_number if state.pagination else None,
+            cursor=state.pagination.cursor if state.pagination else None,
         )
         context.update(
             purchases_scope=state.scope,
@@ -2022,6 +2029,7 @@ class AdministrationHomeView(StaffRequiredMixin, generic.TemplateView):
         supplier_ids: Iterable[int],
         manager_ids: Iterable[int],
         page_number: int | None = None,
+        cursor: str | None = None,
     ) -> str:
         params: list[tuple[str, str]] = []
         if search_query:
@@ -2038,6 +2046,8 @@ class AdministrationHomeView(StaffRequiredMixin, generic.TemplateView):
             params.append(('manager', str(manager_id)))
         if page_number:
             params.append(('page', str(page_number)))
+        if cursor:
+            params.append(('cursor', cursor))
         if not params:
             return ''
         return mark_safe(f"&{urlencode(params, doseq=True)}")
@@ -3811,6 +3821,9 @@ class AdministrationHomeView(StaffRequiredMixin, generic.TemplateView):
         page_value = (self.request.GET.get('page') or self.request.POST.get('page') or '').strip()
         if page_value and 'page' not in params:
             params['page'] = page_value
+        cursor_value = (self.request.GET.get('cursor') or self.request.POST.get('cursor') or '').strip()
+        if cursor_value and 'cursor' not in params:
+            params['cursor'] = cursor_value
         query = f"?{urlencode(params)}" if params else ""
         return f"{base}{query}"
 
@@ -4235,8 +4248,9 @@ class PayrollManagementView(StaffRequiredMixin, generic.TemplateView):
         export_response: HttpResponse | None = None
         action = action.strip()
         if action == 'generate':
-            summary = self._compute_summary(
+            summary, source_versions, _ = self._compute_summary(
                 period=period,
+                snapshot=None,
                 bonified_tokens=bonified_tokens,
                 bonified_idle_tokens=bonified_idle_tokens,
                 overrides=overrides,
@@ -4244,14 +4258,16 @@ class PayrollManagementView(StaffRequiredMixin, generic.TemplateView):
             snapshot = self._save_snapshot(
                 period=period,
                 summary=summary,
+                source_versions=source_versions,
                 action=PayrollSnapshot.LastAction.GENERATE,
             )
             messages.success(self.request, 'Nómina generada con los datos operativos más recientes.')
             return summary, snapshot, None
 
         if action.startswith('export-'):
-            summary = self._compute_summary(
+            summary, source_versions, previous = self._compute_summary(
                 period=period,
+                snapshot=snapshot,
                 bonified_tokens=bonified_tokens,
                 bonified_idle_tokens=bonified_idle_tokens,
                 overrides=overrides,
@@ -4259,10 +4275,12 @@ class PayrollManagementView(StaffRequiredMixin, generic.TemplateView):
             snapshot = self._save_snapshot(
                 period=period,
                 summary=summary,
+                source_versions=source_versions,
                 action=PayrollSnapshot.LastAction.EXPORT,
                 instance=snapshot,
+                previous=previous,
             )
-            export_response = self._handle_export_action(summary, action)
+            export_response = self._handle_export_action(snapshot, action)
             if not export_response:
                 messages.error(self.request, 'No encontramos datos para generar el archivo solicitado.')
             return summary, snapshot, export_response
@@ -4271,8 +4289,9 @@ class PayrollManagementView(StaffRequiredMixin, generic.TemplateView):
             messages.error(self.request, 'Genera la nómina antes de aplicar ajustes o descargas.')
             return None, None, None
 
-        summary = self._compute_summary(
+        summary, source_versions, previous = self._compute_summary(
             period=period,
+            snapshot=snapshot,
             bonified_tokens=bonified_tokens,
             bonified_idle_tokens=bonified_idle_tokens,
             overrides=overrides,
@@ -4280,8 +4299,10 @@ class PayrollManagementView(StaffRequiredMixin, generic.TemplateView):
         snapshot = self._save_snapshot(
             period=period,
             summary=summary,
+            source_versions=source_versions,
             action=PayrollSnapshot.LastAction.APPLY,
             instance=snapshot,
+            previous=previous,
         )
         messages.success(self.request, 'Montos actualizados y almacenados para este periodo.')
         return summary, snapshot, None
@@ -4290,45 +4311,51 @@ class PayrollManagementView(StaffRequiredMixin, generic.TemplateView):
         self,
         *,
         period: PayrollPeriodInfo,
+        snapshot: PayrollSnapshot | None,
         bonified_tokens: Iterable[str],
         bonified_idle_tokens: Iterable[str],
         overrides: Mapping[int, PayrollOverrideData],
-    ) -> PayrollSummary:
-        return build_payroll_summary(
-            period=period,
-            bonified_rest_tokens=bonified_tokens,
-            bonified_idle_tokens=bonified_idle_tokens,
-            overrides=overrides,
-        )
+    ) -> tuple[PayrollSummary, dict[int, str], PayrollSummary | None]:
+        stored_summary = self._load_snapshot_summary(snapshot)
+        if stored_summary is not None:
+            # Only operators whose shifts, rests or salary changed since the snapshot are rebuilt.
+            summary, source_versions = refresh_payroll_summary(
+                stored_summary,
+                source_versions=load_source_versions(snapshot),
+                bonified_rest_tokens=bonified_tokens,
+                bonified_idle_tokens=bonified_idle_tokens,
+                overrides=overrides,
+            )
+            return summary, source_versions, stored_summary
+        with payroll_source_snapshot():
+            source_versions = load_payroll_source_versions(period)
+            summary = build_payroll_summary(
+                period=period,
+                bonified_rest_tokens=bonified_tokens,
+                bonified_idle_tokens=bonified_idle_tokens,
+                overrides=overrides,
+            )
+        return summary, source_versions, None
 
     def _save_snapshot(
         self,
         *,
         period: PayrollPeriodInfo,
         summary: PayrollSummary,
+        source_versions: Mapping[int, str],
         action: str,
         instance: PayrollSnapshot | None = None,
+        previous: PayrollSummary | None = None,
     ) -> PayrollSnapshot:
-        payload = serialize_payroll_summary(summary)
-        now = timezone.now()
-        user = self.request.user if self.request.user.is_authenticated else None
-        values = {
-            'payload': payload,
-            'last_computed_at': now,
-            'last_computed_by': user,
-            'last_action': action,
-        }
-        if instance:
-            for field, value in values.items():
-                setattr(instance, field, value)
-            instance.save(update_fields=['payload', 'last_computed_at', 'last_computed_by', 'last_action', 'updated_at'])
-            return instance
-        snapshot, _ = PayrollSnapshot.objects.update_or_create(
-            start_date=period.start_date,
-            end_date=period.end_date,
-            defaults=values,
+        return save_payroll_snapshot(
+            period=period,
+            summary=summary,
+            source_versions=source_versions,
+            action=action,
+            computed_by=self.request.user if self.request.user.is_authenticated else None,
+            instance=instance,
+            previous=previous,
         )
-        return snapshot
 
     def _get_snapshot(self, period: PayrollPeriodInfo) -> PayrollSnapshot | None:
         return PayrollSnapshot.objects.filter(
@@ -4337,11 +4364,11 @@ class PayrollManagementView(StaffRequiredMixin, generic.TemplateView):
         ).first()
 
     def _load_snapshot_summary(self, snapshot: PayrollSnapshot | None) -> PayrollSummary | None:
-        if not snapshot or not snapshot.payload:
+        if not snapshot:
             return None
         try:
-            return deserialize_payroll_summary(snapshot.payload)
-        except (ValueError, KeyError):
+            return load_payroll_summary(snapshot)
+        except (PayrollComputationError, ValueError, KeyError):
             return None
 
     def _build_navigation_state(self, period: PayrollPeriodInfo | None) -> dict[str, bool]:
@@ -4351,11 +4378,16 @@ class PayrollManagementView(StaffRequiredMixin, generic.TemplateView):
         next_exists = PayrollSnapshot.objects.filter(start_date__gt=period.end_date).exists()
         return {'has_previous': previous_exists, 'has_next': next_exists}
 
-    def _handle_export_action(self, summary, action: str) -> HttpResponse | None:
+    def _handle_export_action(self, snapshot: PayrollSnapshot, action: str) -> HttpResponse | None:
+        # Each export reads only its own rows from the snapshot that was just saved.
         if action.startswith('export-jobtype-'):
             identifier = action.removeprefix('export-jobtype-')
             job_type_value = None if identifier == 'none' else identifier
-            entries = [entry for entry in summary.entries if (entry.job_type or None) == job_type_value]
+            summary = load_payroll_summary(
+                snapshot,
+                job_types=[None, ''] if job_type_value is None else [job_type_value],
+            )
+            entries = summary.entries
             if not entries:
                 return None
             label = entries[0].job_type_label
@@ -4372,7 +4404,8 @@ class PayrollManagementView(StaffRequiredMixin, generic.TemplateView):
                     farm_id = int(identifier)
                 except ValueError:
                     return None
-            entries = [entry for entry in summary.entries if entry.farm_id == farm_id]
+            summary = load_payroll_summary(snapshot, farm_ids=[farm_id])
+            entries = summary.entries
             if not entries:
                 return None
             label = entries[0].farm_label or 'Otros'
@@ -4390,7 +4423,8 @@ class PayrollManagementView(StaffRequiredMixin, generic.TemplateView):
                 operator_id = int(action.removeprefix('export-operator-'))
             except ValueError:
                 return None
-            entries = [entry for entry in summary.entries if entry.operator.id == operator_id]
+            summary = load_payroll_summary(snapshot, operator_ids=[operator_id])
+            entries = summary.entries
             if not entries:
                 return None
             collaborator = entries[0].operator.get_full_name()
@@ -0,0 +1,294 @@
+"""Keyset (cursor) pagination shared by the long administrative listings.
+
+Offset pagination makes the database walk and discard every preceding row and needs a full
+``COUNT(*)`` to render the page links. A keyset page instead filters on the ordering columns of
+the last row shown, so page 200 costs the same as page 1. Totals are taken from a short-lived
+cache because the listings only show them as a hint; models registered with ``track_counts``
+drop their cached totals whenever a row is saved or deleted.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+
+COUNT_CACHE_PREFIX = "keyset-count"
+COUNT_VERSION_PREFIX = "keyset-count-version"
+COUNT_CACHE_SECONDS = 60
+
+FORWARD = "n"
+BACKWARD = "p"
+
+
+@dataclass(frozen=True, slots=True)
+class Cursor:
+    """Position in an ordered listing.
+
+    ``values`` are the ordering column values of the boundary row. ``offset`` counts the rows
+    that precede the page the cursor opens, when known; cursors created from an arbitrary row
+    (for example a highlighted record) leave it empty.
+    """
+
+    values: tuple[Any, ...]
+    direction: str = FORWARD
+    inclusive: bool = False
+    offset: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class KeysetPage:
+    object_list: list
+    per_page: int
+    has_next: bool
+    has_previous: bool
+    next_cursor: Optional[str]
+    previous_cursor: Optional[str]
+    start_index: Optional[int]
+    end_index: Optional[int]
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    """Keep microseconds: the base encoder trims datetimes to milliseconds, which would skip rows."""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _split_ordering(ordering: Sequence[str]) -> list[tuple[str, bool]]:
+    return [(name.lstrip("-"), name.startswith("-")) for name in ordering]
+
+
+def _resolve_field(model: type[models.Model], name: str) -> models.Field:
+    if name == "pk":
+        return model._meta.pk
+    return model._meta.get_field(name)
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    payload = {"v": list(cursor.values), "d": cursor.direction}
+    if cursor.inclusive:
+        payload["i"] = 1
+    if cursor.offset is not None:
+        payload["o"] = cursor.offset
+    raw = json.dumps(payload, cls=_CursorEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(
+    token: Optional[str],
+    *,
+    model: type[models.Model],
+    ordering: Sequence[str],
+) -> Optional[Cursor]:
+    """Parse a cursor token; malformed or foreign tokens are ignored instead of raising."""
+
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        raw_values = payload["v"]
+        direction = payload.get("d", FORWARD)
+        offset = payload.get("o")
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError):
+        return None
+    columns = _split_ordering(ordering)
+    if (
+        not isinstance(raw_values, list)
+        or len(raw_values) != len(columns)
+        or direction not in {FORWARD, BACKWARD}
+        or (offset is not None and (not isinstance(offset, int) or offset < 0))
+    ):
+        return None
+    try:
+        values = tuple(
+            _resolve_field(model, name).to_python(raw) for (name, _), raw in zip(columns, raw_values)
+        )
+    except (FieldDoesNotExist, ValidationError):
+        return None
+    return Cursor(values=values, direction=direction, inclusive=bool(payload.get("i")), offset=offset)
+
+
+def cursor_for(
+    instance: models.Model,
+    ordering: Sequence[str],
+    *,
+    direction: str = FORWARD,
+    inclusive: bool = False,
+    offset: Optional[int] = None,
+) -> Cursor:
+    values = tuple(
+        instance.pk if name == "pk" else getattr(instance, _resolve_field(type(instance), name).attname)
+        for name, _ in _split_ordering(ordering)
+    )
+    return Cursor(values=values, direction=direction, inclusive=inclusive, offset=offset)
+
+
+def _boundary_filter(ordering: Sequence[str], cursor: Cursor) -> Q:
+    """Row-value comparison ``(a, b, pk) > (x, y, z)`` honouring per-column direction."""
+
+    columns = _split_ordering(ordering)
+    condition = Q()
+    for index, (name, descending) in enumerate(columns):
+        after = descending if cursor.direction == BACKWARD else not descending
+        branch = Q(**{prior: cursor.values[position] for position, (prior, _) in enumerate(columns[:index])})
+        branch &= Q(**{f"{name}__{'gt' if after else 'lt'}": cursor.values[index]})
+        condition |= branch
+    if cursor.inclusive:
+        condition |= Q(**{name: cursor.values[position] for position, (name, _) in enumerate(columns)})
+    return condition
+
+
+def _reverse_ordering(ordering: Sequence[str]) -> list[str]:
+    return [name[1:] if name.startswith("-") else f"-{name}" for name in ordering]
+
+
+def keyset_paginate(
+    queryset: models.QuerySet,
+    *,
+    ordering: Sequence[str],
+    per_page: int,
+    cursor: Optional[Cursor] = None,
+) -> KeysetPage:
+    """Return the page opened by ``cursor`` (the first page when it is empty).
+
+    ``ordering`` must end with ``pk`` (or another unique column) and its columns must not be
+    nullable, otherwise rows could be skipped or repeated between pages.
+    """
+
+    backward = cursor is not None and cursor.direction == BACKWARD
+    page_queryset = queryset
+    if cursor is not None:
+        page_queryset = page_queryset.filter(_boundary_filter(ordering, cursor))
+    page_queryset = page_queryset.order_by(*(_reverse_ordering(ordering) if backward else ordering))
+    rows = list(page_queryset[: per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backward:
+        rows.reverse()
+
+    if cursor is None:
+        start_offset: Optional[int] = 0
+    elif backward:
+        start_offset = None if cursor.offset is None else max(cursor.offset - len(rows), 0)
+    else:
+        start_offset = cursor.offset
+
+    if backward:
+        has_previous, has_next = has_more, True
+    elif cursor is None or cursor.offset == 0:
+        has_previous, has_next = False, has_more
+    elif cursor.offset is None and rows:
+        # Anchored on an arbitrary row: a single indexed probe tells whether anything precedes it.
+        probe = cursor_for(rows[0], ordering, direction=BACKWARD)
+        has_previous, has_next = queryset.filter(_boundary_filter(ordering, probe)).exists(), has_more
+    else:
+        has_previous, has_next = True, has_more
+
+    next_cursor = previous_cursor = None
+    if rows and has_next:
+        next_offset = None if start_offset is None else start_offset + len(rows)
+        next_cursor = encode_cursor(cursor_for(rows[-1], ordering, offset=next_offset))
+    if rows and has_previous:
+        previous_cursor = encode_cursor(
+            cursor_for(rows[0], ordering, direction=BACKWARD, offset=start_offset)
+        )
+
+    start_index = end_index = None
+    if start_offset is not None:
+        start_index = start_offset + 1 if rows else 0
+        end_index = start_offset + len(rows)
+    return KeysetPage(
+        object_list=rows,
+        per_page=per_page,
+        has_next=has_next,
+        has_previous=has_previous,
+        next_cursor=next_cursor,
+        previous_cursor=previous_cursor,
+        start_index=start_index,
+        end_index=end_index,
+    )
+
+
+def page_anchor(
+    queryset: models.QuerySet,
+    *,
+    ordering: Sequence[str],
+    page_number: int,
+    per_page: int,
+) -> Optional[Cursor]:
+    """Cursor opening the numbered page, for links that carry a page number but no cursor.
+
+    Resolving it still skips the preceding rows once, but only reads the ordering columns;
+    navigation from there on follows cursors.
+    """
+
+    offset = max(page_number - 1, 0) * per_page
+    values = (
+        queryset.prefetch_related(None)
+        .order_by(*ordering)
+        .values_list(*(name for name, _ in _split_ordering(ordering)))[offset : offset + 1]
+    )
+    row = next(iter(values), None)
+    if row is None:
+        return None
+    return Cursor(values=tuple(row), inclusive=True, offset=offset)
+
+
+def _count_version_key(model: type[models.Model]) -> str:
+    return f"{COUNT_VERSION_PREFIX}:{model._meta.label_lower}"
+
+
+def invalidate_counts(model: type[models.Model]) -> None:
+    """Retire every cached total of ``model`` by moving to a new version."""
+
+    key = _count_version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def _invalidate_counts_receiver(sender, **kwargs) -> None:
+    invalidate_counts(sender)
+
+
+def track_counts(*tracked_models: type[models.Model]) -> None:
+    for model in tracked_models:
+        for signal in (post_save, post_delete):
+            signal.connect(
+                _invalidate_counts_receiver,
+                sender=model,
+                dispatch_uid=f"keyset_counts_{signal is post_save}_{model._meta.label_lower}",
+            )
+
+
+def approximate_count(queryset: models.QuerySet, *, timeout: int = COUNT_CACHE_SECONDS) -> int:
+    """Row count of ``queryset`` cached for ``timeout`` seconds, keyed by its SQL."""
+
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+    except Exception:  # noqa: BLE001 - EmptyResultSet and friends: count normally
+        return queryset.count()
+    version = cache.get(_count_version_key(queryset.model), 0)
+    digest = hashlib.sha256(f"{sql}|{params!r}".encode("utf-8")).hexdigest()
+    key = f"{COUNT_CACHE_PREFIX}:{queryset.model._meta.label_lower}:{version}:{digest}"
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+    return count
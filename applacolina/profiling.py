@@ -0,0 +1,214 @@
+"""Timing probes for service entry points plus an on-demand sampling profiler.
+
+``profiled("name")`` wraps a function or a block. With ``PROFILING_ENABLED`` off a call only pays
+for one settings lookup. When it is on, each call records wall time, database time, query count
+and row count into a bounded per-probe ring buffer. The buffer is per process, like the LocMem
+cache. ``start_sampling`` starts a daemon thread that snapshots the stacks passing through project
+code and aggregates them as collapsed stacks ready for flamegraph tools.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Iterator
+
+from django.conf import settings
+
+from .query_budget import record_queries
+
+_LOCK = threading.Lock()
+_SAMPLES: dict[str, deque[ProbeSample]] = {}
+_STACKS: Counter[str] = Counter()
+_SAMPLER: _StackSampler | None = None
+
+
+@dataclass(frozen=True)
+class ProbeSample:
+    wall_ms: float
+    db_ms: float
+    queries: int
+    rows: int
+
+
+@dataclass(frozen=True)
+class ProbeStatistics:
+    name: str
+    calls: int
+    wall_p50_ms: float
+    wall_p95_ms: float
+    wall_p99_ms: float
+    wall_max_ms: float
+    db_p50_ms: float
+    db_p95_ms: float
+    avg_queries: float
+    avg_rows: float
+
+
+def profiling_enabled() -> bool:
+    return getattr(settings, "PROFILING_ENABLED", False)
+
+
+class profiled:
+    """Decorator or context manager that records one sample per call under ``name``."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._local = threading.local()
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiling_enabled():
+                return func(*args, **kwargs)
+            with _measure(self.name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def __enter__(self) -> None:
+        stack = self._local.__dict__.setdefault("stack", [])
+        measurement = _measure(self.name) if profiling_enabled() else None
+        if measurement is not None:
+            measurement.__enter__()
+        stack.append(measurement)
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        measurement = self._local.stack.pop()
+        if measurement is not None:
+            measurement.__exit__(exc_type, exc, traceback)
+        return False
+
+
+@contextmanager
+def _measure(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    with record_queries(fingerprint=False) as report:
+        try:
+            yield
+        finally:
+            sample = ProbeSample(
+                wall_ms=(time.perf_counter() - started) * 1000,
+                db_ms=report.duration_ms,
+                queries=report.count,
+                rows=report.rows,
+            )
+            with _LOCK:
+                buffer = _SAMPLES.get(name)
+                if buffer is None:
+                    buffer = _SAMPLES[name] = deque(maxlen=getattr(settings, "PROFILING_BUFFER_SIZE", 500))
+                buffer.append(sample)
+
+
+def probe_statistics() -> list[ProbeStatistics]:
+    with _LOCK:
+        snapshot = {name: list(buffer) for name, buffer in _SAMPLES.items()}
+
+    statistics: list[ProbeStatistics] = []
+    for name, samples in sorted(snapshot.items()):
+        if not samples:
+            continue
+        wall = sorted(sample.wall_ms for sample in samples)
+        db = sorted(sample.db_ms for sample in samples)
+        calls = len(samples)
+        statistics.append(
+            ProbeStatistics(
+                name=name,
+                calls=calls,
+                wall_p50_ms=_percentile(wall, 50),
+                wall_p95_ms=_percentile(wall, 95),
+                wall_p99_ms=_percentile(wall, 99),
+                wall_max_ms=round(wall[-1], 2),
+                db_p50_ms=_percentile(db, 50),
+                db_p95_ms=_percentile(db, 95),
+                avg_queries=round(sum(sample.queries for sample in samples) / calls, 2),
+                avg_rows=round(sum(sample.rows for sample in samples) / calls, 2),
+            )
+        )
+    return statistics
+
+
+def _percentile(ordered: list[float], percent: int) -> float:
+    index = max(0, -(-len(ordered) * percent // 100) - 1)
+    return round(ordered[index], 2)
+
+
+class _StackSampler(threading.Thread):
+    def __init__(self, *, seconds: float, interval: float) -> None:
+        super().__init__(name="applacolina-stack-sampler", daemon=True)
+        self.seconds = seconds
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.project_root = str(Path(settings.BASE_DIR))
+
+    def run(self) -> None:
+        deadline = time.monotonic() + self.seconds
+        while not self.stopped.is_set() and time.monotonic() < deadline:
+            self._sample()
+            self.stopped.wait(self.interval)
+
+    def _sample(self) -> None:
+        own_ident = threading.get_ident()
+        collected: list[str] = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            labels: list[str] = []
+            in_project = False
+            while frame is not None:
+                filename = frame.f_code.co_filename
+                if filename.startswith(self.project_root) and "site-packages" not in filename:
+                    in_project = True
+                    filename = filename[len(self.project_root) + 1 :]
+                else:
+                    filename = filename.rsplit("/", 1)[-1]
+                labels.append(f"{filename}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            if in_project:
+                collected.append(";".join(reversed(labels)))
+        if collected:
+            with _LOCK:
+                _STACKS.update(collected)
+
+
+def start_sampling(*, seconds: float = 30, interval: float = 0.005) -> bool:
+    """Start the stack sampler for ``seconds``; returns False when one is already running."""
+
+    global _SAMPLER
+    with _LOCK:
+        if _SAMPLER is not None and _SAMPLER.is_alive():
+            return False
+        _SAMPLER = _StackSampler(seconds=seconds, interval=interval)
+        _SAMPLER.start()
+    return True
+
+
+def stop_sampling() -> None:
+    sampler = _SAMPLER
+    if sampler is not None:
+        sampler.stopped.set()
+        sampler.join()
+
+
+def sampling_active() -> bool:
+    return _SAMPLER is not None and _SAMPLER.is_alive()
+
+
+def collapsed_stacks() -> str:
+    """Sampled stacks as ``frame;frame;frame count`` lines, the input of flamegraph.pl/speedscope."""
+
+    with _LOCK:
+        stacks = _STACKS.most_common()
+    return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+
+def reset_profiling() -> None:
+    with _LOCK:
+        _SAMPLES.clear()
+        _STACKS.clear()
@@ -0,0 +1,189 @@
+"""Per-request query accounting: counts, database time and repeated statements.
+
+``QueryBudgetMiddleware`` is installed by ``QUERY_BUDGET_ENABLED`` (on by default under tests). It
+reports every request through ``Server-Timing`` headers and the ``applacolina.query_budget``
+logger. Views may declare a budget with ``query_budget`` (class-based views set a ``query_budget``
+attribute); when ``QUERY_BUDGET_ENFORCE`` is on (the default under tests) a request
+that exceeds it raises ``QueryBudgetExceeded`` so the offending test fails. ``assert_query_budget``
+applies the same check to any block of code.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Callable, Iterator
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("applacolina.query_budget")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint_sql(sql: str) -> str:
+    """Collapse literals and IN lists so the same statement with other parameters groups together."""
+    normalized = _STRING_LITERAL.sub("?", sql)
+    normalized = normalized.replace("%s", "?")
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _VALUE_LIST.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request or block issues more queries than it declared."""
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    max_queries: int
+    max_duplicates: int | None = None
+
+    def violations(self, report: QueryReport) -> list[str]:
+        problems: list[str] = []
+        if report.count > self.max_queries:
+            problems.append(f"{report.count} queries exceed the budget of {self.max_queries}")
+        if self.max_duplicates is not None:
+            worst = report.duplicates[0] if report.duplicates else None
+            if worst and worst[1] > self.max_duplicates:
+                problems.append(
+                    f"a statement ran {worst[1]} times (max {self.max_duplicates}): {worst[0][:200]}"
+                )
+        return problems
+
+
+@dataclass
+class QueryReport:
+    count: int = 0
+    duration_ms: float = 0.0
+    rows: int = 0
+    fingerprints: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def duplicates(self) -> list[tuple[str, int]]:
+        """Statements issued more than once, most repeated first; the usual sign of an N+1."""
+        return [(sql, hits) for sql, hits in self.fingerprints.most_common() if hits > 1]
+
+    @property
+    def duplicated_count(self) -> int:
+        return sum(hits - 1 for _, hits in self.duplicates)
+
+    def server_timing(self) -> str:
+        parts = [f'db;dur={self.duration_ms:.1f};desc="{self.count} queries"']
+        if self.duplicated_count:
+            parts.append(f'db-dup;desc="{self.duplicated_count} repeated"')
+        return ", ".join(parts)
+
+    def log_extra(self) -> dict[str, object]:
+        return {
+            "query_count": self.count,
+            "query_duration_ms": round(self.duration_ms, 2),
+            "query_duplicated": self.duplicated_count,
+            "query_top_duplicates": [
+                {"sql": sql[:200], "count": hits} for sql, hits in self.duplicates[:5]
+            ],
+        }
+
+
+class _Recorder:
+    def __init__(self, report: QueryReport, *, fingerprint: bool) -> None:
+        self.report = report
+        self.fingerprint = fingerprint
+
+    def __call__(self, execute: Callable, sql: str, params, many: bool, context) -> object:
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.report.count += 1
+            self.report.duration_ms += (time.perf_counter() - started) * 1000
+            self.report.rows += max(getattr(context.get("cursor"), "rowcount", 0) or 0, 0)
+            if self.fingerprint:
+                self.report.fingerprints[fingerprint_sql(sql)] += 1
+
+
+@contextmanager
+def record_queries(*, fingerprint: bool = True) -> Iterator[QueryReport]:
+    """Record every query issued on any configured database inside the block."""
+    report = QueryReport()
+    recorder = _Recorder(report, fingerprint=fingerprint)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield report
+
+
+@contextmanager
+def assert_query_budget(max_queries: int, *, max_duplicates: int | None = None) -> Iterator[QueryReport]:
+    """Test helper: fail when the block issues more queries, or repeats one more often, than allowed."""
+    budget = QueryBudget(max_queries=max_queries, max_duplicates=max_duplicates)
+    with record_queries() as report:
+        yield report
+    problems = budget.violations(report)
+    if problems:
+        raise QueryBudgetExceeded("; ".join(problems))
+
+
+def query_budget(max_queries: int, *, max_duplicates: int | None = None):
+    """Declare the query budget of a function view; class-based views set a ``query_budget`` attribute."""
+    budget = QueryBudget(max_queries=max_queries, max_duplicates=max_duplicates)
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            return view_func(*args, **kwargs)
+
+        wrapper.query_budget = budget
+        return wrapper
+
+    return decorator
+
+
+def _declared_budget(view_func) -> QueryBudget | None:
+    budget = getattr(view_func, "query_budget", None)
+    if budget is None:
+        budget = getattr(getattr(view_func, "view_class", None), "query_budget", None)
+    return budget
+
+
+class QueryBudgetMiddleware:
+    """Record the queries of each request and report them; see the module docstring."""
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with record_queries() as report:
+            response = self.get_response(request)
+        response["Server-Timing"] = report.server_timing()
+
+        budget: QueryBudget | None = getattr(request, "_query_budget", None)
+        problems = budget.violations(report) if budget else []
+        repeated = report.duplicates[0][1] if report.duplicates else 0
+        threshold = getattr(settings, "QUERY_BUDGET_REPEAT_WARNING", 10)
+        log_level = logging.WARNING if problems or repeated >= threshold else logging.INFO
+        logger.log(
+            log_level,
+            "%s %s issued %s queries in %.1f ms",
+            request.method,
+            request.path,
+            report.count,
+            report.duration_ms,
+            extra={"path": request.path, "status_code": response.status_code, **report.log_extra()},
+        )
+        if problems and getattr(settings, "QUERY_BUDGET_ENFORCE", False):
+            raise QueryBudgetExceeded(f"{request.method} {request.path}: " + "; ".join(problems))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs) -> None:
+        request._query_budget = _declared_budget(view_func)
+        return None
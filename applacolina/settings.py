@@ -1,5 +1,6 @@
 import os
 import sys
+import tempfile
 import time
 from pathlib import Path
 from urllib.parse import urlparse
@@ -87,6 +88,7 @@ DJANGO_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.humanize',
+    'django.contrib.postgres',
 ]
 
 THIRD_PARTY_APPS = [
@@ -248,6 +250,36 @@ MEDIA_ROOT = Path(os.getenv("DJANGO_MEDIA_ROOT", BASE_DIR / "media"))
 if not MEDIA_ROOT.is_absolute():
     MEDIA_ROOT = BASE_DIR / MEDIA_ROOT
 
+# Rendered calendar PDFs and public share pages, evicted oldest-first past the size limit.
+CALENDAR_ARTIFACT_CACHE_DIR = Path(
+    os.getenv("CALENDAR_ARTIFACT_CACHE_DIR", MEDIA_ROOT / "calendar_artifacts")
+)
+CALENDAR_ARTIFACT_CACHE_MAX_BYTES = int(os.getenv("CALENDAR_ARTIFACT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# WeasyPrint process pool for calendar PDFs; 0 renders inline within the request.
+CALENDAR_PDF_RENDER_WORKERS = int(os.getenv("CALENDAR_PDF_RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+if RUNNING_TESTS:
+    CALENDAR_ARTIFACT_CACHE_DIR = Path(tempfile.mkdtemp(prefix="applacolina-calendar-artifacts-"))
+    CALENDAR_PDF_RENDER_WORKERS = 0
+
+# Per-request query accounting (Server-Timing headers and logs); on by default under tests so that
+# views exceeding their declared budget fail, opt-in elsewhere.
+QUERY_BUDGET_ENABLED = _env_bool("QUERY_BUDGET_ENABLED", RUNNING_TESTS)
+QUERY_BUDGET_ENFORCE = _env_bool("QUERY_BUDGET_ENFORCE", RUNNING_TESTS)
+# A single statement repeated this many times in one request is logged as a likely N+1.
+QUERY_BUDGET_REPEAT_WARNING = int(os.getenv("QUERY_BUDGET_REPEAT_WARNING", "10"))
+if QUERY_BUDGET_ENABLED:
+    MIDDLEWARE.insert(0, "applacolina.query_budget.QueryBudgetMiddleware")
+
+# Service timing probes (see applacolina.profiling); samples are kept per process in a ring buffer.
+PROFILING_ENABLED = _env_bool("PROFILING_ENABLED", False)
+PROFILING_BUFFER_SIZE = int(os.getenv("PROFILING_BUFFER_SIZE", "500"))
+
+# Seconds a worker serves its infrastructure catalog before re-reading the shared version row.
+# Tests re-read on every access so rolled back fixtures never leak between test cases.
+INFRASTRUCTURE_CATALOG_RECHECK_SECONDS = 0 if RUNNING_TESTS else int(
+    os.getenv("INFRASTRUCTURE_CATALOG_RECHECK_SECONDS", "10")
+)
+
 WEB_PUSH_PUBLIC_KEY = os.getenv("WEB_PUSH_PUBLIC_KEY", "BPJfP7W8RMefs3I39YB5q9QSQZr6QWY6DBWI24LYVRa-SB81GQMQzv3vxanHMYz02gfPeuItQDIVFgsvbaJGH18")
 WEB_PUSH_PRIVATE_KEY = os.getenv("WEB_PUSH_PRIVATE_KEY", "HzDhcAN2Md16QuLWTG3hp0mgE1xDEIRJOXmfXg7l6t8")
 WEB_PUSH_CONTACT = os.getenv("WEB_PUSH_CONTACT", "mailto:soporte@lacolina.com")
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from applacolina.profiling import (
+    collapsed_stacks,
+    probe_statistics,
+    profiled,
+    reset_profiling,
+    start_sampling,
+    stop_sampling,
+)
+from personal.models import UserProfile
+
+
+@profiled("tests.count_operators")
+def _count_operators() -> int:
+    # Only the test's own staff user: migrations also load fixture users.
+    return len(list(UserProfile.objects.filter(cedula="660001")))
+
+
+class ProfilingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.staff = UserProfile.objects.create_user(
+            cedula="660001",
+            password="test",
+            nombres="Perfil",
+            apellidos="Staff",
+            telefono="3006600001",
+            is_staff=True,
+        )
+
+    def setUp(self) -> None:
+        reset_profiling()
+        self.addCleanup(reset_profiling)
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled_probes_record_nothing(self) -> None:
+        _count_operators()
+
+        self.assertEqual(probe_statistics(), [])
+
+    @override_settings(PROFILING_ENABLED=True)
+    def test_probes_record_wall_time_queries_and_rows(self) -> None:
+        _count_operators()
+        with profiled("tests.block"):
+            _count_operators()
+
+        statistics = {item.name: item for item in probe_statistics()}
+        self.assertEqual(statistics["tests.count_operators"].calls, 2)
+        self.assertEqual(statistics["tests.count_operators"].avg_queries, 1)
+        self.assertEqual(statistics["tests.count_operators"].avg_rows, 1)
+        self.assertEqual(statistics["tests.block"].calls, 1)
+        self.assertGreaterEqual(statistics["tests.block"].wall_p99_ms, statistics["tests.block"].db_p50_ms)
+
+    @override_settings(PROFILING_ENABLED=True, PROFILING_BUFFER_SIZE=3)
+    def test_ring_buffer_keeps_only_recent_samples(self) -> None:
+        for _ in range(5):
+            _count_operators()
+
+        self.assertEqual(probe_statistics()[0].calls, 3)
+
+    def test_sampler_collects_collapsed_stacks_from_project_code(self) -> None:
+        self.assertTrue(start_sampling(seconds=5, interval=0.001))
+        self.assertFalse(start_sampling(seconds=5))
+        for _ in range(200):
+            _count_operators()
+        stop_sampling()
+
+        lines = collapsed_stacks().splitlines()
+        self.assertTrue(lines)
+        self.assertRegex(lines[0], r"^\S.*;.* \d+$")
+
+    @override_settings(PROFILING_ENABLED=True)
+    def test_endpoint_is_staff_only_and_reports_percentiles(self) -> None:
+        _count_operators()
+        url = reverse("profiling")
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+
+        self.client.force_login(self.staff)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        probes = response.json()["probes"]
+        self.assertEqual([probe["name"] for probe in probes], ["tests.count_operators"])
+        self.assertIn("wall_p95_ms", probes[0])
+
+        response = self.client.post(url, {"action": "reset"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(url).json()["probes"], [])
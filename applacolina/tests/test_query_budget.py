@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import resolve, reverse
+
+from applacolina.query_budget import (
+    QueryBudgetExceeded,
+    QueryBudgetMiddleware,
+    _declared_budget,
+    assert_query_budget,
+    fingerprint_sql,
+    query_budget,
+)
+from personal.models import UserProfile
+
+
+def _budget_operators():
+    # Migrations load fixture users, so the views only touch the operators created here.
+    return UserProfile.objects.filter(apellidos="Presupuesto").order_by("pk")
+
+
+def _list_operators(request):
+    names = [operator.nombres for operator in _budget_operators()]
+    return HttpResponse(", ".join(names))
+
+
+def _lookup_each_operator(request):
+    for pk in _budget_operators().values_list("pk", flat=True):
+        UserProfile.objects.get(pk=pk)
+    return HttpResponse("ok")
+
+
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.operators = [
+            UserProfile.objects.create_user(
+                cedula=f"770{index}",
+                password="test",
+                nombres=f"Operario {index}",
+                apellidos="Presupuesto",
+                telefono=f"300770{index}",
+            )
+            for index in range(3)
+        ]
+
+    def _run(self, view, budget=None):
+        if budget:
+            view = query_budget(**budget)(view)
+        request = RequestFactory().get("/presupuesto/")
+        middleware = QueryBudgetMiddleware(lambda req: view(req))
+        middleware.process_view(request, view, (), {})
+        return middleware(request)
+
+    def test_fingerprint_groups_statements_that_only_differ_in_parameters(self) -> None:
+        first = fingerprint_sql("SELECT * FROM t WHERE id = 4 AND name = 'a' AND x IN (%s, %s)")
+        second = fingerprint_sql("SELECT *  FROM t WHERE id = 17 AND name = 'b''c' AND x IN (%s, %s, %s)")
+
+        self.assertEqual(first, second)
+
+    def test_middleware_reports_queries_in_server_timing_header(self) -> None:
+        response = self._run(_list_operators)
+
+        self.assertRegex(response["Server-Timing"], r'^db;dur=[\d.]+;desc="1 queries"$')
+
+    def test_middleware_flags_repeated_statements(self) -> None:
+        with self.assertLogs("applacolina.query_budget", level="INFO") as logs:
+            response = self._run(_lookup_each_operator)
+
+        operator_count = len(self.operators)
+        self.assertIn(f'db-dup;desc="{operator_count - 1} repeated"', response["Server-Timing"])
+        self.assertEqual(logs.records[0].query_count, operator_count + 1)
+        self.assertEqual(logs.records[0].query_top_duplicates[0]["count"], operator_count)
+
+    @override_settings(QUERY_BUDGET_ENFORCE=True)
+    def test_declared_budget_fails_when_exceeded(self) -> None:
+        query_count = len(self.operators) + 1
+        self._run(_lookup_each_operator, budget={"max_queries": query_count})
+
+        with self.assertRaises(QueryBudgetExceeded):
+            self._run(_lookup_each_operator, budget={"max_queries": query_count, "max_duplicates": 1})
+        with self.assertRaises(QueryBudgetExceeded):
+            self._run(_lookup_each_operator, budget={"max_queries": query_count - 1})
+
+    def test_decorator_leaves_the_view_untouched(self) -> None:
+        decorated = query_budget(max_queries=1)(_list_operators)
+
+        self.assertIsNot(decorated, _list_operators)
+        self.assertFalse(hasattr(_list_operators, "query_budget"))
+        self.assertEqual(decorated.query_budget.max_queries, 1)
+        self.assertEqual(decorated.__name__, "_list_operators")
+
+    @override_settings(QUERY_BUDGET_ENFORCE=False)
+    def test_declared_budget_only_logs_when_not_enforced(self) -> None:
+        with self.assertLogs("applacolina.query_budget", level="WARNING"):
+            response = self._run(_lookup_each_operator, budget={"max_queries": 1})
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_assert_query_budget_helper(self) -> None:
+        with assert_query_budget(1) as report:
+            list(UserProfile.objects.all())
+        self.assertEqual(report.count, 1)
+
+        with self.assertRaises(QueryBudgetExceeded):
+            with assert_query_budget(1):
+                list(UserProfile.objects.all())
+                list(UserProfile.objects.all())
+
+    def test_middleware_enforces_declared_view_budgets_under_tests(self) -> None:
+        self.assertIn("applacolina.query_budget.QueryBudgetMiddleware", settings.MIDDLEWARE)
+        self.assertTrue(settings.QUERY_BUDGET_ENFORCE)
+
+        for url in (
+            reverse("task_manager:telegram-mini-app"),
+            reverse("personal:calendar-detail", args=[1]),
+        ):
+            with self.subTest(url=url):
+                self.assertIsNotNone(_declared_budget(resolve(url).func))
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from administration.models import Product, PurchaseRequest, PurchasingExpenseType, Supplier
+from administration.services.purchase_search import search_purchases
+from inventory.models import InventoryScope, ProductInventoryEntry
+from inventory.services import InventoryService
+from personal.models import (
+    CalendarStatus,
+    PositionCategory,
+    PositionCategoryCode,
+    PositionDefinition,
+    ShiftAssignment,
+    ShiftCalendar,
+    ShiftType,
+    UserProfile,
+)
+from production.models import ChickenHouse, EggClassificationSession, EggDispatch, Farm
+from production.services.egg_classification import (
+    build_classification_session_flow_range,
+    build_dispatch_flow_range,
+)
+from task_manager.mini_app.features.production_registry import resolve_assignment_for_date
+from task_manager.models import TaskAssignment, TaskCategory, TaskDefinition, TaskStatus
+from task_manager.services import suppress_task_assignment_sync
+from task_manager.services.task_assignment_sync import TaskAssignmentSynchronizer
+from task_manager.views import _resolve_overdue_task_summary
+
+
+class QueryPlanRegressionTests(TestCase):
+    """The hot service queries must be answered by their composite indexes, never a sequential scan.
+
+    Each test runs the real service and EXPLAINs the statements it issued, so a change to the
+    service filters is caught as well as a dropped index.
+
+    Tables are tiny in tests, so sequential scans are disabled for the transaction: the planner
+    then only falls back to one when no usable index exists.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        farm = Farm.objects.create(name="Colina")
+        category, _ = PositionCategory.objects.get_or_create(
+            code=PositionCategoryCode.GALPONERO_PRODUCCION_DIA,
+            defaults={"shift_type": ShiftType.DAY},
+        )
+        cls.calendar = ShiftCalendar.objects.create(
+            name="Plan de consultas",
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 3, 31),
+            status=CalendarStatus.DRAFT,
+        )
+        positions = [
+            PositionDefinition.objects.create(
+                name=f"Galponero {index}",
+                code=f"QP-{index}",
+                category=category,
+                farm=farm,
+                valid_from=cls.calendar.start_date,
+            )
+            for index in range(4)
+        ]
+        cls.operators = [
+            UserProfile.objects.create_user(
+                cedula=f"880{index}",
+                password="test",  # noqa: S106 - test credential
+                nombres="Operario",
+                apellidos=f"Plan {index}",
+                telefono=f"310880000{index}",
+            )
+            for index in range(4)
+        ]
+        ShiftAssignment.objects.bulk_create(
+            [
+                ShiftAssignment(
+                    calendar=cls.calendar,
+                    position=position,
+                    operator=cls.operators[index],
+                    date=cls.calendar.start_date + timedelta(days=offset),
+                )
+                for offset in range(90)
+                for index, position in enumerate(positions)
+            ]
+        )
+
+        status = TaskStatus.objects.create(name="Activa", is_active=True)
+        task_category = TaskCategory.objects.create(name="Sanidad", is_active=True)
+        with suppress_task_assignment_sync():
+            definitions = [
+                TaskDefinition.objects.create(
+                    name=f"Tarea {index}",
+                    status=status,
+                    category=task_category,
+                    task_type=TaskDefinition.TaskType.ONE_TIME,
+                    scheduled_for=cls.calendar.start_date,
+                    position=positions[index],
+                )
+                for index in range(4)
+            ]
+            TaskAssignment.objects.bulk_create(
+                [
+                    TaskAssignment(
+                        task_definition=definition,
+                        collaborator=operator,
+                        due_date=cls.calendar.start_date + timedelta(days=offset),
+                    )
+                    for offset in range(90)
+                    for definition in definitions
+                    for operator in cls.operators
+                ]
+            )
+
+        supplier = Supplier.objects.create(name="Proveedor Plan", tax_id="900880")
+        expense_type = PurchasingExpenseType.objects.create(name="Mantenimiento")
+        for index in range(40):
+            PurchaseRequest.objects.create(
+                timeline_code=f"SOL-QP-{index:03d}",
+                name=f"Compra {index}",
+                requester=cls.operators[0],
+                supplier=supplier,
+                expense_type=expense_type,
+                estimated_total=Decimal("1000"),
+            )
+
+    def setUp(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE calendario_shiftassignment")
+            cursor.execute("ANALYZE task_manager_taskassignment")
+            cursor.execute(f"ANALYZE {PurchaseRequest._meta.db_table}")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertServiceUsesIndex(self, service: Callable[[], object], model, index_name: str) -> None:
+        """Run ``service`` and EXPLAIN every statement it issued against the model's table."""
+
+        table = connection.ops.quote_name(model._meta.db_table)
+        with CaptureQueriesContext(connection) as captured:
+            service()
+        statements = [query["sql"] for query in captured.captured_queries if f"FROM {table}" in query["sql"]]
+        self.assertTrue(statements, msg=f"The service issued no query against {table}.")
+
+        plans = []
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(f"EXPLAIN {statement}")
+                plans.append("\n".join(row[0] for row in cursor.fetchall()))
+        report = "\n\n".join(plans)
+        self.assertTrue(any(index_name in plan for plan in plans), msg=report)
+        self.assertNotIn(f"Seq Scan on {model._meta.db_table}", report, msg=report)
+
+    def test_operator_assignment_lookup(self) -> None:
+        self.assertServiceUsesIndex(
+            lambda: resolve_assignment_for_date(user=self.operators[0], target_date=date(2025, 2, 3)),
+            ShiftAssignment,
+            "cal_assign_operator_date_idx",
+        )
+
+    def test_task_sync_shift_window(self) -> None:
+        synchronizer = TaskAssignmentSynchronizer(start_date=date(2025, 2, 1), end_date=date(2025, 2, 7))
+        self.assertServiceUsesIndex(
+            synchronizer._load_shift_assignments,
+            ShiftAssignment,
+            "cal_assign_date_calendar_idx",
+        )
+
+    def test_mini_app_overdue_summary(self) -> None:
+        self.assertServiceUsesIndex(
+            lambda: _resolve_overdue_task_summary(user=self.operators[0], reference_date=date(2025, 2, 7)),
+            TaskAssignment,
+            "tm_assign_collab_due_idx",
+        )
+
+    def test_inventory_balance_lookup(self) -> None:
+        service = InventoryService(actor=None)
+        self.assertServiceUsesIndex(
+            lambda: service._balance_as_of(
+                Product(pk=1),
+                InventoryScope.CHICKEN_HOUSE,
+                Farm(pk=1),
+                ChickenHouse(pk=1),
+                date(2025, 2, 1),
+                default_to_current=False,
+            ),
+            ProductInventoryEntry,
+            "inv_entry_ledger_idx",
+        )
+
+    def test_classification_session_flow(self) -> None:
+        self.assertServiceUsesIndex(
+            lambda: build_classification_session_flow_range(start_date=date(2025, 2, 1), end_date=date(2025, 2, 7)),
+            EggClassificationSession,
+            "egg_session_classified_idx",
+        )
+
+    def test_dispatch_flow(self) -> None:
+        self.assertServiceUsesIndex(
+            lambda: build_dispatch_flow_range(start_date=date(2025, 2, 1), end_date=date(2025, 2, 28)),
+            EggDispatch,
+            "egg_dispatch_date_seller_idx",
+        )
+
+    def test_purchase_search_uses_search_document_index(self) -> None:
+        self.assertServiceUsesIndex(
+            lambda: list(search_purchases(PurchaseRequest.objects.all(), "mantenim")),
+            PurchaseRequest,
+            "purchase_search_idx",
+        )
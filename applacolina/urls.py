@@ -20,7 +20,7 @@ from django.contrib import admin
 from django.urls import include, path, re_path
 from django.views.generic import RedirectView, TemplateView
 
-from applacolina.views import digital_asset_links_view
+from applacolina.views import ProfilingView, digital_asset_links_view
 
 admin.site.site_header = "Administracion de La Colina"
 admin.site.site_title = "Administracion de La Colina"
@@ -30,6 +30,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', RedirectView.as_view(pattern_name='task_manager:index', permanent=False)),
     path('.well-known/assetlinks.json', digital_asset_links_view, name='asset-links'),
+    path('perfilado/', ProfilingView.as_view(), name='profiling'),
     path(
         'service-worker.js',
         TemplateView.as_view(
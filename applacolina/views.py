@@ -1,7 +1,21 @@
 from __future__ import annotations
 
+from dataclasses import asdict
+
 from django.conf import settings
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from django.views import View
+
+from applacolina.mixins import StaffRequiredMixin
+from applacolina.profiling import (
+    collapsed_stacks,
+    probe_statistics,
+    profiling_enabled,
+    reset_profiling,
+    sampling_active,
+    start_sampling,
+    stop_sampling,
+)
 
 
 def digital_asset_links_view(request):
@@ -28,3 +42,38 @@ def digital_asset_links_view(request):
         }
     ]
     return JsonResponse(payload, safe=False)
+
+
+class ProfilingView(StaffRequiredMixin, View):
+    """Expose service probe percentiles and drive the on-demand stack sampler."""
+
+    max_sampling_seconds = 120
+
+    def get(self, request, *args, **kwargs):
+        if request.GET.get("format") == "collapsed":
+            return HttpResponse(collapsed_stacks(), content_type="text/plain; charset=utf-8")
+        return JsonResponse(
+            {
+                "enabled": profiling_enabled(),
+                "sampling": sampling_active(),
+                "probes": [asdict(statistics) for statistics in probe_statistics()],
+            }
+        )
+
+    def post(self, request, *args, **kwargs):
+        action = request.POST.get("action")
+        if action == "start":
+            try:
+                seconds = float(request.POST.get("seconds") or 30)
+            except ValueError:
+                return JsonResponse({"error": "Duración inválida."}, status=400)
+            seconds = min(max(seconds, 1), self.max_sampling_seconds)
+            if not start_sampling(seconds=seconds):
+                return JsonResponse({"error": "Ya hay un muestreo en curso."}, status=409)
+        elif action == "stop":
+            stop_sampling()
+        elif action == "reset":
+            reset_profiling()
+        else:
+            return JsonResponse({"error": "Acción no soportada."}, status=400)
+        return JsonResponse({"sampling": sampling_active()})
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_productconsumption_scope'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='productinventoryentry',
+            index=models.Index(fields=['product', 'scope', 'farm', 'chicken_house', 'effective_date', 'created_at'], name='inv_entry_ledger_idx'),
+        ),
+    ]
@@ -151,6 +151,12 @@ class ProductInventoryEntry(TimeStampedModel):
         verbose_name = "Movimiento de inventario"
         verbose_name_plural = "Movimientos de inventario"
         ordering = ("-effective_date", "-created_at")
+        indexes = [
+            models.Index(
+                fields=("product", "scope", "farm", "chicken_house", "effective_date", "created_at"),
+                name="inv_entry_ledger_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.product} · {self.get_entry_type_display()} · {self.scope_label}"
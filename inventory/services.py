@@ -10,7 +10,8 @@ from django.db.models import Q
 from django.utils import timezone
 
 from administration.models import Product
-from production.models import ChickenHouse, Farm, Room
+from applacolina.profiling import profiled
+from production.models import ChickenHouse, Farm, ProductionRoomRecord, Room
 
 from .models import (
     InventoryScope,
@@ -34,6 +35,7 @@ class InventoryService:
     def __init__(self, *, actor) -> None:
         self.actor = actor
 
+    @profiled("inventory.register_receipt")
     def register_receipt(
         self,
         *,
@@ -63,6 +65,7 @@ class InventoryService:
                 metadata=metadata,
             )
 
+    @profiled("inventory.register_manual_consumption")
     def register_manual_consumption(
         self,
         *,
@@ -94,6 +97,7 @@ class InventoryService:
                 executed_by=executed_by,
             )
 
+    @profiled("inventory.reset_scope")
     def reset_scope(
         self,
         *,
@@ -134,6 +138,7 @@ class InventoryService:
             )
             return entry
 
+    @profiled("inventory.consume_for_room_record")
     def consume_for_room_record(
         self,
         *,
@@ -404,3 +409,56 @@ def resolve_product_for_room(room: Room, *, target_date: date) -> Product | None
         if config:
             return config.product
     return None
+
+
+def post_room_record_consumption(
+    deltas: Iterable[tuple[ProductionRoomRecord, Decimal]],
+    *,
+    actor=None,
+) -> int:
+    """
+    Post the feed consumption change of each room record to the inventory ledger.
+
+    The room's product is resolved once per chicken house and date, so a full-farm submission does
+    not repeat the configuration lookups for every room. Returns the number of rooms posted.
+    """
+
+    pending = [(room_record, delta) for room_record, delta in deltas if delta != 0]
+    if not pending:
+        return 0
+    room_field = ProductionRoomRecord._meta.get_field("room")
+    rooms = Room.objects.select_related("chicken_house__farm").in_bulk(
+        {room_record.room_id for room_record, _ in pending if not room_field.is_cached(room_record)}
+    )
+
+    products: dict[tuple[int | None, date], Product | None] = {}
+    posted = 0
+    for room_record, delta in pending:
+        production_record = room_record.production_record
+        room = rooms.get(room_record.room_id) or room_record.room
+        product_key = (room.chicken_house_id, production_record.date)
+        if product_key not in products:
+            products[product_key] = resolve_product_for_room(room, target_date=production_record.date)
+        product = products[product_key]
+        if not product:
+            continue
+        product_category = getattr(product, "category", None)
+        if product_category and product_category != Product.Category.FOOD:
+            continue
+        recorded_by = actor or production_record.updated_by or production_record.created_by
+        InventoryService(actor=recorded_by).consume_for_room_record(
+            room=room,
+            product=product,
+            quantity=delta,
+            effective_date=production_record.date,
+            notes="Consumo registrado automáticamente",
+            reference=InventoryReference.from_instance(room_record),
+            recorded_by=recorded_by,
+            metadata={
+                "production_record_id": production_record.pk,
+                "room_id": room_record.room_id,
+                "bird_batch_id": production_record.bird_batch_id,
+            },
+        )
+        posted += 1
+    return posted
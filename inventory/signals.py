@@ -5,10 +5,9 @@ from decimal import Decimal
 from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from administration.models import Product
 from production.models import ProductionRoomRecord
 
-from .services import InventoryReference, InventoryService, resolve_product_for_room
+from .services import post_room_record_consumption
 
 
 @receiver(pre_save, sender=ProductionRoomRecord)
@@ -40,27 +39,4 @@ def restore_inventory_on_delete(sender, instance: ProductionRoomRecord, **kwargs
 
 
 def _apply_inventory_consumption(instance: ProductionRoomRecord, delta: Decimal) -> None:
-    production_record = instance.production_record
-    product = resolve_product_for_room(instance.room, target_date=production_record.date)
-    if not product:
-        return
-    product_category = getattr(product, "category", None)
-    if product_category and product_category != Product.Category.FOOD:
-        return
-    reference = InventoryReference.from_instance(instance)
-    metadata = {
-        "production_record_id": production_record.pk,
-        "room_id": instance.room_id,
-        "bird_batch_id": production_record.bird_batch_id,
-    }
-    service = InventoryService(actor=production_record.updated_by or production_record.created_by)
-    service.consume_for_room_record(
-        room=instance.room,
-        product=product,
-        quantity=delta,
-        effective_date=production_record.date,
-        notes="Consumo registrado automáticamente",
-        reference=reference,
-        recorded_by=production_record.updated_by or production_record.created_by,
-        metadata=metadata,
-    )
+    post_room_record_consumption([(instance, delta)])
@@ -1,7 +1,23 @@
 from __future__ import annotations
 
+from django.conf import settings
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth.models import Permission
+from django.core.cache import cache
+
+from production.services.cache_versions import bump_cache_versions, read_cache_versions
+
+
+PERMISSIONS_VERSION_KEY = "auth:permissions"
+# A grant or revocation bumps the shared version, so a cached set is never served after it
+# commits; the timeout only evicts sets of versions no longer read.
+PERMISSIONS_CACHE_SECONDS = 60
+
+
+def invalidate_permission_cache() -> None:
+    """Expire every cached permission set on every worker once the surrounding transaction commits."""
+
+    bump_cache_versions(PERMISSIONS_VERSION_KEY)
 
 
 class RoleAwareModelBackend(ModelBackend):
@@ -30,8 +46,28 @@ class RoleAwareModelBackend(ModelBackend):
         return perms
 
     def get_all_permissions(self, user_obj, obj=None):
-        perms = super().get_all_permissions(user_obj, obj=obj)
-        return perms | self.get_role_permissions(user_obj, obj=obj)
+        """
+        Resolve user, group and role permissions once per permission version.
+
+        The per-instance ``_perm_cache`` still serves repeated checks within a request; the shared
+        cache spares later requests the three permission joins for the cost of one version lookup.
+        """
+
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, "_perm_cache"):
+            (version,) = read_cache_versions(PERMISSIONS_VERSION_KEY)
+            cache_key = f"auth:permissions:{version}:{user_obj.pk}:{int(user_obj.is_superuser)}"
+            perms = cache.get(cache_key)
+            if perms is None:
+                perms = super().get_all_permissions(user_obj) | self.get_role_permissions(user_obj)
+                cache.set(
+                    cache_key,
+                    perms,
+                    getattr(settings, "PERMISSIONS_CACHE_SECONDS", PERMISSIONS_CACHE_SECONDS),
+                )
+            user_obj._perm_cache = perms
+        return user_obj._perm_cache
 
     def get_user_permissions(self, user_obj, obj=None):
         perms = super().get_user_permissions(user_obj, obj=obj)
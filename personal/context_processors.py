@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from django.urls import reverse
+from django.urls import reverse_lazy
+from django.utils.functional import SimpleLazyObject
 
 from task_manager.forms import TaskDefinitionQuickCreateForm
 
@@ -12,20 +13,21 @@ def quick_create(request):
     """
     Provide default context required by the global quick-create actions.
 
-    Individual views can override these values by passing their own context
-    when rendering templates.
+    Every value is lazy: forms, queries and URLs are only built when a template actually renders
+    the quick-create modals. Individual views can override these values by passing their own
+    context when rendering templates.
     """
 
     return {
-        "calendar_generation_form": CalendarGenerationForm(),
-        "calendar_generation_recent_calendars": get_recent_calendars_payload(),
-        "task_definition_form": TaskDefinitionQuickCreateForm(),
-        "task_definition_create_url": reverse("task_manager:definition-create"),
-        "task_definition_detail_url_template": reverse(
+        "calendar_generation_form": SimpleLazyObject(CalendarGenerationForm),
+        "calendar_generation_recent_calendars": SimpleLazyObject(get_recent_calendars_payload),
+        "task_definition_form": SimpleLazyObject(TaskDefinitionQuickCreateForm),
+        "task_definition_create_url": reverse_lazy("task_manager:definition-create"),
+        "task_definition_detail_url_template": reverse_lazy(
             "task_manager:definition-detail",
             kwargs={"pk": 0},
         ),
-        "task_definition_update_url_template": reverse(
+        "task_definition_update_url_template": reverse_lazy(
             "task_manager:definition-update",
             kwargs={"pk": 0},
         ),
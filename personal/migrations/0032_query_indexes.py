@@ -0,0 +1,21 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('personal', '0031_calendarrestsuggestion_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='shiftassignment',
+            index=models.Index(fields=['operator', 'date'], name='cal_assign_operator_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shiftassignment',
+            index=models.Index(fields=['date', 'calendar'], name='cal_assign_date_calendar_idx'),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.0.14 on 2026-10-18 23:10
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_schedule_days(apps, schema_editor):
+    """Materialize the upcoming days; past days are never shown by the mini app strip."""
+
+    ShiftAssignment = apps.get_model("personal", "ShiftAssignment")
+    OperatorRestPeriod = apps.get_model("personal", "OperatorRestPeriod")
+    CalendarRestSuggestion = apps.get_model("personal", "CalendarRestSuggestion")
+    OperatorScheduleDay = apps.get_model("personal", "OperatorScheduleDay")
+
+    start_date = timezone.localdate() - timedelta(days=1)
+
+    assignment_by_day = {}
+    for operator_id, day, assignment_id, calendar_id in (
+        ShiftAssignment.objects.filter(date__gte=start_date)
+        .order_by("operator_id", "date", "calendar__start_date", "position__display_order", "position__code")
+        .values_list("operator_id", "date", "pk", "calendar_id")
+    ):
+        assignment_by_day.setdefault((operator_id, day), (assignment_id, calendar_id))
+
+    rest_by_day = {}
+    for operator_id, period_start, period_end, rest_period_id, calendar_id in (
+        OperatorRestPeriod.objects.filter(end_date__gte=start_date)
+        .exclude(status__in=["cancelled", "expired"])
+        .order_by("start_date", "id")
+        .values_list("operator_id", "start_date", "end_date", "pk", "calendar_id")
+    ):
+        current = max(period_start, start_date)
+        while current <= period_end:
+            rest_by_day.setdefault((operator_id, current), (rest_period_id, calendar_id))
+            current += timedelta(days=1)
+
+    suggestion_by_key = {
+        (operator_id, calendar_id, day): suggestion_id
+        for operator_id, calendar_id, day, suggestion_id in CalendarRestSuggestion.objects.filter(
+            scheduled_date__gte=start_date
+        ).values_list("operator_id", "calendar_id", "scheduled_date", "pk")
+    }
+
+    rows = []
+    for key in sorted(assignment_by_day.keys() | rest_by_day.keys()):
+        operator_id, day = key
+        assignment_id, assignment_calendar_id = assignment_by_day.get(key, (None, None))
+        rest_period_id, rest_calendar_id = rest_by_day.get(key, (None, None))
+        calendar_id = assignment_calendar_id or rest_calendar_id
+        rows.append(
+            OperatorScheduleDay(
+                operator_id=operator_id,
+                date=day,
+                assignment_id=assignment_id,
+                rest_period_id=rest_period_id,
+                rest_suggestion_id=suggestion_by_key.get((operator_id, calendar_id, day)),
+            )
+        )
+    OperatorScheduleDay.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('personal', '0032_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OperatorScheduleDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Fecha')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('assignment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='personal.shiftassignment', verbose_name='Turno')),
+                ('operator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_days', to=settings.AUTH_USER_MODEL, verbose_name='Colaborador')),
+                ('rest_period', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='personal.operatorrestperiod', verbose_name='Descanso')),
+                ('rest_suggestion', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='personal.calendarrestsuggestion', verbose_name='Sugerencia de descanso')),
+            ],
+            options={
+                'verbose_name': 'Agenda diaria del colaborador',
+                'verbose_name_plural': 'Agenda diaria de colaboradores',
+                'db_table': 'calendario_operatorscheduleday',
+                'ordering': ('operator', 'date'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='operatorscheduleday',
+            constraint=models.UniqueConstraint(fields=('operator', 'date'), name='unique_operator_schedule_day'),
+        ),
+        migrations.RunPython(backfill_schedule_days, migrations.RunPython.noop),
+    ]
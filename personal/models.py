@@ -810,11 +810,23 @@ class ShiftAssignment(models.Model):
                 name="uniq_calendar_operator_date",
             )
         ]
+        indexes = [
+            models.Index(fields=("operator", "date"), name="cal_assign_operator_date_idx"),
+            models.Index(fields=("date", "calendar"), name="cal_assign_date_calendar_idx"),
+        ]
         db_table = "calendario_shiftassignment"
 
     def __str__(self) -> str:
         return f"{self.date} - {self.position} -> {self.operator}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the persisted operator/date so signal handlers can diff without re-reading the row.
+        if "operator_id" in instance.__dict__ and "date" in instance.__dict__:
+            instance._loaded_state = (instance.operator_id, instance.date)
+        return instance
+
     def clean(self) -> None:
         super().clean()
         if not self.calendar_id:
@@ -1048,6 +1060,62 @@ class CalendarRestSuggestion(models.Model):
                 )
 
 
+class OperatorScheduleDay(models.Model):
+    """Resolved turn, rest and rest suggestion of an operator for one day.
+
+    Read model maintained by ``personal.services.operator_schedule``; only days with a turn or a
+    rest have a row, so the mini app strip is a single range read on ``(operator, date)``.
+    """
+
+    operator = models.ForeignKey(
+        UserProfile,
+        on_delete=models.CASCADE,
+        related_name="schedule_days",
+        verbose_name="Colaborador",
+    )
+    date = models.DateField("Fecha")
+    assignment = models.ForeignKey(
+        ShiftAssignment,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        verbose_name="Turno",
+        null=True,
+        blank=True,
+    )
+    rest_period = models.ForeignKey(
+        OperatorRestPeriod,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        verbose_name="Descanso",
+        null=True,
+        blank=True,
+    )
+    rest_suggestion = models.ForeignKey(
+        CalendarRestSuggestion,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        verbose_name="Sugerencia de descanso",
+        null=True,
+        blank=True,
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Agenda diaria del colaborador"
+        verbose_name_plural = "Agenda diaria de colaboradores"
+        ordering = ("operator", "date")
+        db_table = "calendario_operatorscheduleday"
+        constraints = [
+            models.UniqueConstraint(
+                fields=("operator", "date"),
+                name="unique_operator_schedule_day",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.operator_id} · {self.date}"
+
+
 
 @dataclass
 class AssignmentDecision:
@@ -0,0 +1,57 @@
+"""WeasyPrint helpers that run inside the PDF render pool.
+
+This module must stay importable without configuring Django: worker processes are spawned and
+only receive the rendered HTML and the destination path.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def render_pdf(html: str, base_url: str) -> bytes:
+    """Render HTML into PDF bytes using WeasyPrint if available."""
+
+    try:
+        from weasyprint import HTML  # type: ignore
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError(
+            "WeasyPrint no está disponible en el entorno actual. Sigue la guía de instalación oficial "
+            "para habilitar la exportación a PDF."
+        ) from exc
+    except OSError as exc:  # pragma: no cover - missing system libs during import
+        raise RuntimeError(
+            "WeasyPrint no pudo inicializarse porque faltan bibliotecas del sistema (Cairo/Pango/GObject). "
+            "Instala los paquetes requeridos según la documentación."
+        ) from exc
+
+    try:
+        return HTML(string=html, base_url=base_url).write_pdf()
+    except OSError as exc:  # pragma: no cover - missing system libs
+        raise RuntimeError(
+            "WeasyPrint no pudo cargar las bibliotecas del sistema (Cairo/Pango/GObject). "
+            "Instala los paquetes requeridos según la documentación."
+        ) from exc
+
+
+def _write_atomic(target: Path, data: bytes) -> None:
+    handle, temp_name = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+    with os.fdopen(handle, "wb") as stream:
+        stream.write(data)
+    os.replace(temp_name, target)
+
+
+def render_pdf_to_file(html: str, base_url: str, target: str) -> bool:
+    """Render ``html`` into ``target``; failures are recorded next to it as ``<target>.error``."""
+
+    target_path = Path(target)
+    error_path = target_path.with_name(f"{target_path.name}.error")
+    try:
+        pdf_bytes = render_pdf(html, base_url)
+    except Exception as exc:  # noqa: BLE001 - surfaced to the polling client
+        _write_atomic(error_path, str(exc).encode("utf-8"))
+        return False
+    _write_atomic(target_path, pdf_bytes)
+    return True
@@ -1,19 +1,50 @@
 """Domain services for the personal app."""
 
+from .assignment_changes import batch_assignment_changes
+from .calendar_artifacts import CalendarArtifactCache, calendar_version_stamp
+from .eligibility import (
+    OperatorChoiceTable,
+    OperatorEligibility,
+    eligible_operator_queryset,
+    format_operator_label,
+)
 from .operator_salaries import (
     ParsedSalaryInput,
     apply_salary_entries,
     ensure_active_salary,
     parse_salary_entries,
 )
+from .operator_schedule import (
+    defer_operator_schedule_refresh,
+    refresh_operator_schedule,
+    request_operator_schedule_refresh,
+)
+from .pdf_jobs import CalendarPdfJob, CalendarPdfJobStatus, CalendarPdfRenderQueue
 from .scheduler import CalendarScheduler, SchedulerOptions, sync_calendar_rest_periods
+from .workload import WorkloadScope, WorkloadSnapshotService, refresh_workload_snapshots
 
 __all__ = [
+    "batch_assignment_changes",
+    "CalendarArtifactCache",
+    "calendar_version_stamp",
+    "CalendarPdfJob",
+    "CalendarPdfJobStatus",
+    "CalendarPdfRenderQueue",
     "CalendarScheduler",
     "SchedulerOptions",
+    "OperatorChoiceTable",
+    "OperatorEligibility",
+    "eligible_operator_queryset",
+    "format_operator_label",
     "apply_salary_entries",
     "ensure_active_salary",
     "parse_salary_entries",
     "ParsedSalaryInput",
+    "defer_operator_schedule_refresh",
+    "refresh_operator_schedule",
+    "request_operator_schedule_refresh",
     "sync_calendar_rest_periods",
+    "WorkloadScope",
+    "WorkloadSnapshotService",
+    "refresh_workload_snapshots",
 ]
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set
+
+from ..models import AssignmentChangeLog, ShiftCalendar
+from .operator_schedule import defer_operator_schedule_refresh
+
+
+_BATCH_STATE = threading.local()
+
+
+class AssignmentChangeBatch:
+    """Buffer for the change logs produced by a block of ``ShiftAssignment`` writes."""
+
+    def __init__(self) -> None:
+        self.logs: List[AssignmentChangeLog] = []
+        self.calendar_ids: Set[int] = set()
+        self._logs_by_assignment: Dict[int, List[AssignmentChangeLog]] = {}
+
+    def add(self, log: AssignmentChangeLog, *, calendar_id: Optional[int]) -> None:
+        self.logs.append(log)
+        if log.assignment_id:
+            self._logs_by_assignment.setdefault(log.assignment_id, []).append(log)
+        self.sync_calendar(calendar_id)
+
+    def sync_calendar(self, calendar_id: Optional[int]) -> None:
+        """Sync the calendar's rest periods once on flush, as an unbatched write would right away."""
+
+        if calendar_id:
+            self.calendar_ids.add(calendar_id)
+
+    def detach_assignment(self, assignment_id: Optional[int]) -> None:
+        """Mirror ``on_delete=SET_NULL`` for buffered logs of an assignment deleted inside the batch."""
+
+        for log in self._logs_by_assignment.pop(assignment_id, []) if assignment_id else []:
+            log.assignment = None
+
+    def flush(self) -> int:
+        # Imported lazily: the scheduler module imports this one to batch its own writes.
+        from .scheduler import sync_calendar_rest_periods
+
+        logs, self.logs = self.logs, []
+        calendar_ids, self.calendar_ids = self.calendar_ids, set()
+        self._logs_by_assignment = {}
+        if logs:
+            AssignmentChangeLog.objects.bulk_create(logs)
+        if calendar_ids:
+            for calendar in ShiftCalendar.objects.filter(pk__in=calendar_ids):
+                sync_calendar_rest_periods(calendar)
+        return len(logs)
+
+
+@contextmanager
+def batch_assignment_changes() -> Iterator[AssignmentChangeBatch]:
+    """Collect assignment change logs and write them with a single ``bulk_create`` on exit.
+
+    While active, the ``ShiftAssignment`` signals diff against the state loaded from the database
+    instead of re-reading each row, and operator schedule rows are rebuilt once for the whole block.
+    Nested blocks share the outermost batch.
+    """
+
+    current: Optional[AssignmentChangeBatch] = getattr(_BATCH_STATE, "batch", None)
+    if current is not None:
+        yield current
+        return
+
+    batch = AssignmentChangeBatch()
+    _BATCH_STATE.batch = batch
+    try:
+        with defer_operator_schedule_refresh():
+            yield batch
+    except BaseException:
+        batch.logs.clear()
+        raise
+    else:
+        batch.flush()
+    finally:
+        if hasattr(_BATCH_STATE, "batch"):
+            delattr(_BATCH_STATE, "batch")
+
+
+def get_assignment_change_batch() -> Optional[AssignmentChangeBatch]:
+    """Return the active batch, if any."""
+
+    return getattr(_BATCH_STATE, "batch", None)
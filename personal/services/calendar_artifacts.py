@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+from datetime import date
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from ..models import CalendarRestSuggestion, OperatorRestPeriod, PositionDefinition, ShiftCalendar
+
+logger = logging.getLogger(__name__)
+
+# Bump when the PDF/share templates change so stale renders are not served after a deploy.
+ARTIFACT_FORMAT_VERSION = 2
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def calendar_version_stamp(calendar: ShiftCalendar, start_date: date, end_date: date) -> str:
+    """Fingerprint of everything a rendered calendar depends on.
+
+    Combines the calendar row, its assignments, the rest periods overlapping the window and the
+    calendar rest suggestions; any create, update or delete changes the count or latest timestamp.
+    Positions carry no timestamp, so the names, codes, order and farms of the positions valid in the
+    window are hashed instead; renames and reorders then produce a new stamp.
+    """
+
+    assignments = calendar.assignments.aggregate(total=Count("id"), latest=Max("updated_at"))
+    rest_periods = OperatorRestPeriod.objects.filter(
+        start_date__lte=end_date,
+        end_date__gte=start_date,
+    ).aggregate(total=Count("id"), latest=Max("updated_at"))
+    suggestions = CalendarRestSuggestion.objects.filter(calendar=calendar).aggregate(
+        total=Count("id"),
+        latest=Max("updated_at"),
+    )
+    positions = (
+        PositionDefinition.objects.filter(valid_from__lte=end_date)
+        .exclude(valid_until__lt=start_date)
+        .order_by("pk")
+        .values_list("pk", "name", "code", "display_order", "job_type", "category_id", "farm_id", "chicken_house_id")
+    )
+    position_digest = hashlib.sha1(repr(list(positions)).encode("utf-8")).hexdigest()
+    parts = [
+        calendar.updated_at.isoformat() if calendar.updated_at else "",
+        position_digest,
+        *(
+            f"{values['total']}:{values['latest'].isoformat() if values['latest'] else ''}"
+            for values in (assignments, rest_periods, suggestions)
+        ),
+    ]
+    return "|".join(parts)
+
+
+class CalendarArtifactCache:
+    """Rendered calendar PDFs and share pages stored on disk with size-bounded LRU eviction."""
+
+    def __init__(self, root: Optional[Path] = None, *, max_bytes: Optional[int] = None) -> None:
+        configured_root = getattr(settings, "CALENDAR_ARTIFACT_CACHE_DIR", None)
+        self.root = Path(root or configured_root or Path(settings.MEDIA_ROOT) / "calendar_artifacts")
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else getattr(settings, "CALENDAR_ARTIFACT_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+        )
+
+    @staticmethod
+    def build_key(
+        kind: str,
+        calendar: ShiftCalendar,
+        *,
+        start_date: date,
+        end_date: date,
+        job_types: Iterable[str] = (),
+        version_stamp: str,
+    ) -> str:
+        raw = "|".join(
+            [
+                str(ARTIFACT_FORMAT_VERSION),
+                kind,
+                str(calendar.pk),
+                start_date.isoformat(),
+                end_date.isoformat(),
+                ",".join(sorted(set(job_types))),
+                version_stamp,
+            ]
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def path(self, key: str, suffix: str) -> Path:
+        return self.root / f"{key}{suffix}"
+
+    def get(self, key: str, suffix: str) -> Optional[bytes]:
+        path = self.path(key, suffix)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError:
+            logger.warning("No se pudo leer el artefacto de calendario %s", path, exc_info=True)
+            return None
+        try:
+            os.utime(path)
+        except OSError:  # pragma: no cover - evicted concurrently
+            pass
+        return data
+
+    def put(self, key: str, suffix: str, data: bytes) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            handle, temp_name = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+            with os.fdopen(handle, "wb") as stream:
+                stream.write(data)
+            os.replace(temp_name, self.path(key, suffix))
+        except OSError:
+            logger.warning("No se pudo guardar el artefacto de calendario %s", key, exc_info=True)
+            return
+        self.evict()
+
+    def get_or_render(self, key: str, suffix: str, render: Callable[[], bytes]) -> bytes:
+        cached = self.get(key, suffix)
+        if cached is not None:
+            return cached
+        data = render()
+        self.put(key, suffix, data)
+        return data
+
+    def evict(self) -> int:
+        """Drop the least recently used artifacts until the directory fits ``max_bytes``."""
+
+        try:
+            entries = [
+                (entry.stat().st_mtime, entry.stat().st_size, entry)
+                for entry in self.root.iterdir()
+                if entry.is_file()
+                and not entry.name.startswith(".tmp-")
+                and not entry.name.endswith(".pending")
+            ]
+        except OSError:
+            return 0
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
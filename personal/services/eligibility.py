@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from django.db.models import Q, QuerySet
+
+from ..models import AssignmentAlertLevel, PositionDefinition, UserProfile
+
+
+def format_operator_label(operator: UserProfile) -> str:
+    roles = list(operator.roles.all())
+    role_label = roles[0].get_name_display() if roles else ""
+    label = operator.get_full_name() or operator.nombres
+    if role_label:
+        label = f"{label} · {role_label}"
+    return label
+
+
+def eligible_operator_queryset(range_start: date, range_end: date) -> QuerySet[UserProfile]:
+    """Active operators employed at some point of the window, with the relations used for labels."""
+
+    return (
+        UserProfile.objects.filter(
+            Q(employment_start_date__isnull=True) | Q(employment_start_date__lte=range_end),
+            Q(employment_end_date__isnull=True) | Q(employment_end_date__gte=range_start),
+            is_active=True,
+        )
+        .prefetch_related("roles", "suggested_positions")
+        .order_by("apellidos", "nombres")
+    )
+
+
+class OperatorEligibility:
+    """Operator eligibility for a calendar window, computed once per request.
+
+    Labels, per-day activity and busy bitmaps and the recommended operators of every position are
+    derived in a single pass over the operators and assignments, so building the choices of a
+    ``(position, day)`` cell no longer touches ``roles``/``suggested_positions`` again.
+    """
+
+    def __init__(
+        self,
+        date_columns: Sequence[date],
+        operators: Iterable[UserProfile],
+        assignments: Iterable[Any] = (),
+    ) -> None:
+        self.date_columns: List[date] = list(date_columns)
+        self.day_index: Dict[date, int] = {day: idx for idx, day in enumerate(self.date_columns)}
+        self.operators: Dict[int, UserProfile] = {}
+        self.labels: Dict[int, str] = {}
+        self.active_days: Dict[int, int] = {}
+        self.busy_days: Dict[int, int] = defaultdict(int)
+        self.busy_positions: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        self.recommended: Dict[int, Set[int]] = defaultdict(set)
+
+        for operator in operators:
+            self.add_operator(operator)
+        for assignment in assignments:
+            self.add_assignment(assignment)
+
+    @classmethod
+    def for_window(
+        cls,
+        date_columns: Sequence[date],
+        assignments: Iterable[Any] = (),
+    ) -> "OperatorEligibility":
+        date_columns = list(date_columns)
+        if not date_columns:
+            return cls([], [], [])
+        operators = eligible_operator_queryset(min(date_columns), max(date_columns))
+        return cls(date_columns, operators, assignments)
+
+    def add_operator(self, operator: UserProfile, *, with_suggestions: bool = True) -> None:
+        if operator.id in self.operators:
+            return
+        self.operators[operator.id] = operator
+        self.labels[operator.id] = format_operator_label(operator)
+        mask = 0
+        for idx, day in enumerate(self.date_columns):
+            if operator.is_active_on(day):
+                mask |= 1 << idx
+        self.active_days[operator.id] = mask
+        if with_suggestions:
+            for position in operator.suggested_positions.all():
+                self.recommended[position.id].add(operator.id)
+
+    def add_assignment(self, assignment: Any) -> None:
+        idx = self.day_index.get(assignment.date)
+        if idx is None or not assignment.operator_id:
+            return
+        self.busy_days[assignment.operator_id] |= 1 << idx
+        self.busy_positions[(assignment.operator_id, idx)].add(assignment.position_id)
+
+    def label(self, operator_id: int) -> str:
+        return self.labels.get(operator_id, "")
+
+    def is_active_on(self, operator_id: int, day: date) -> bool:
+        idx = self.day_index.get(day)
+        return idx is not None and bool(self.active_days.get(operator_id, 0) >> idx & 1)
+
+    def is_busy_on(self, operator_id: int, day: date) -> bool:
+        idx = self.day_index.get(day)
+        return idx is not None and bool(self.busy_days.get(operator_id, 0) >> idx & 1)
+
+    def active_operator_ids(self, day: date) -> Set[int]:
+        idx = self.day_index.get(day)
+        if idx is None:
+            return set()
+        bit = 1 << idx
+        return {operator_id for operator_id, mask in self.active_days.items() if mask & bit}
+
+    def is_recommended(self, operator_id: int, position_id: Optional[int]) -> bool:
+        return operator_id in self.recommended.get(position_id, ())
+
+    def choices_for(self, position: PositionDefinition, day: date) -> List[dict[str, Any]]:
+        """Choices of a single cell; operators busy in another position are disabled."""
+
+        idx = self.day_index.get(day)
+        if idx is None or not position.is_active_on(day):
+            return []
+
+        bit = 1 << idx
+        recommended = self.recommended.get(position.id, set())
+        choices: List[dict[str, Any]] = []
+        for operator_id, mask in self.active_days.items():
+            if not mask & bit:
+                continue
+            disabled = False
+            if self.busy_days.get(operator_id, 0) & bit:
+                disabled = any(
+                    position_id != position.id
+                    for position_id in self.busy_positions.get((operator_id, idx), ())
+                )
+            choices.append(
+                {
+                    "id": operator_id,
+                    "label": self.labels[operator_id],
+                    "alert": AssignmentAlertLevel.NONE,
+                    "disabled": disabled,
+                    "recommended": operator_id in recommended,
+                }
+            )
+
+        choices.sort(key=lambda item: (not item["recommended"], item["label"].lower()))
+        return choices
+
+
+class OperatorChoiceTable:
+    """Deduplicated operator options shared by every cell of the calendar grid.
+
+    Cells reference options by index so the page ships one operator table instead of repeating the
+    full option list in every ``<select>``.
+    """
+
+    def __init__(self) -> None:
+        self.entries: List[Tuple[int, str]] = []
+        self._positions: Dict[Tuple[int, str], int] = {}
+
+    def index(self, operator_id: int, label: str) -> int:
+        key = (operator_id, label)
+        position = self._positions.get(key)
+        if position is None:
+            position = len(self.entries)
+            self._positions[key] = position
+            self.entries.append(key)
+        return position
+
+    def as_payload(self) -> List[List[Any]]:
+        return [[operator_id, label] for operator_id, label in self.entries]
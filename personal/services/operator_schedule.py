@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.db import transaction
+
+from ..models import (
+    CalendarRestSuggestion,
+    OperatorRestPeriod,
+    OperatorScheduleDay,
+    RestPeriodStatus,
+    ShiftAssignment,
+)
+
+
+INACTIVE_REST_STATUSES = (RestPeriodStatus.CANCELLED, RestPeriodStatus.EXPIRED)
+
+_DEFER_STATE = threading.local()
+
+
+class OperatorScheduleScope:
+    """Operators and dates whose ``OperatorScheduleDay`` rows must be rebuilt."""
+
+    def __init__(self) -> None:
+        self.operator_ids: Set[int] = set()
+        self.start_date: Optional[date] = None
+        self.end_date: Optional[date] = None
+
+    def add(self, operator_id: Optional[int], start: Optional[date], end: Optional[date] = None) -> None:
+        if not operator_id or start is None:
+            return
+        end = end or start
+        self.operator_ids.add(operator_id)
+        self.start_date = start if self.start_date is None else min(self.start_date, start)
+        self.end_date = end if self.end_date is None else max(self.end_date, end)
+
+    def refresh(self) -> int:
+        operator_ids, self.operator_ids = self.operator_ids, set()
+        start_date, end_date = self.start_date, self.end_date
+        self.start_date = self.end_date = None
+        if not operator_ids or start_date is None or end_date is None:
+            return 0
+        return refresh_operator_schedule(operator_ids, start_date, end_date)
+
+
+def refresh_operator_schedule(operator_ids: Iterable[int], start_date: date, end_date: date) -> int:
+    """
+    Rebuild the schedule rows of ``operator_ids`` between both dates (inclusive).
+
+    A day keeps the first turn in calendar/position order, the earliest active rest covering it and
+    the rest suggestion filed for that turn's (or rest's) calendar, mirroring what the mini app
+    used to resolve on every load.
+    """
+
+    operator_ids = {operator_id for operator_id in operator_ids if operator_id}
+    if not operator_ids or end_date < start_date:
+        return 0
+
+    assignment_by_day: Dict[Tuple[int, date], Tuple[int, Optional[int]]] = {}
+    assignments = (
+        ShiftAssignment.objects.filter(operator_id__in=operator_ids, date__range=(start_date, end_date))
+        .order_by("operator_id", "date", "calendar__start_date", "position__display_order", "position__code")
+        .values_list("operator_id", "date", "pk", "calendar_id")
+    )
+    for operator_id, day, assignment_id, calendar_id in assignments:
+        assignment_by_day.setdefault((operator_id, day), (assignment_id, calendar_id))
+
+    rest_by_day: Dict[Tuple[int, date], Tuple[int, Optional[int]]] = {}
+    rest_periods = (
+        OperatorRestPeriod.objects.filter(
+            operator_id__in=operator_ids,
+            start_date__lte=end_date,
+            end_date__gte=start_date,
+        )
+        .exclude(status__in=INACTIVE_REST_STATUSES)
+        .order_by("start_date", "id")
+        .values_list("operator_id", "start_date", "end_date", "pk", "calendar_id")
+    )
+    for operator_id, period_start, period_end, rest_period_id, calendar_id in rest_periods:
+        current = max(period_start, start_date)
+        limit = min(period_end, end_date)
+        while current <= limit:
+            rest_by_day.setdefault((operator_id, current), (rest_period_id, calendar_id))
+            current += timedelta(days=1)
+
+    scheduled_days = sorted(assignment_by_day.keys() | rest_by_day.keys())
+    suggestion_by_key: Dict[Tuple[int, Optional[int], date], int] = {}
+    if scheduled_days:
+        suggestion_by_key = {
+            (operator_id, calendar_id, day): suggestion_id
+            for operator_id, calendar_id, day, suggestion_id in CalendarRestSuggestion.objects.filter(
+                operator_id__in=operator_ids,
+                scheduled_date__range=(start_date, end_date),
+            ).values_list("operator_id", "calendar_id", "scheduled_date", "pk")
+        }
+
+    rows: List[OperatorScheduleDay] = []
+    for key in scheduled_days:
+        operator_id, day = key
+        assignment_id, assignment_calendar_id = assignment_by_day.get(key, (None, None))
+        rest_period_id, rest_calendar_id = rest_by_day.get(key, (None, None))
+        calendar_id = assignment_calendar_id or rest_calendar_id
+        rows.append(
+            OperatorScheduleDay(
+                operator_id=operator_id,
+                date=day,
+                assignment_id=assignment_id,
+                rest_period_id=rest_period_id,
+                rest_suggestion_id=suggestion_by_key.get((operator_id, calendar_id, day)),
+            )
+        )
+
+    with transaction.atomic():
+        OperatorScheduleDay.objects.filter(
+            operator_id__in=operator_ids,
+            date__range=(start_date, end_date),
+        ).delete()
+        if rows:
+            # Upsert: a concurrent refresh may have inserted the same days after our delete.
+            OperatorScheduleDay.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=("operator", "date"),
+                update_fields=("assignment", "rest_period", "rest_suggestion", "updated_at"),
+            )
+    return len(rows)
+
+
+def request_operator_schedule_refresh(
+    operator_id: Optional[int],
+    start_date: Optional[date],
+    end_date: Optional[date] = None,
+) -> None:
+    """Rebuild the operator's rows now, or at the end of the active deferred block."""
+
+    scope: Optional[OperatorScheduleScope] = getattr(_DEFER_STATE, "scope", None)
+    if scope is not None:
+        scope.add(operator_id, start_date, end_date)
+        return
+    immediate = OperatorScheduleScope()
+    immediate.add(operator_id, start_date, end_date)
+    immediate.refresh()
+
+
+@contextmanager
+def defer_operator_schedule_refresh() -> Iterator[OperatorScheduleScope]:
+    """Collect the schedule refreshes requested inside the block and run them once on exit.
+
+    Nested blocks share the outermost scope; an exception discards the pending refreshes along with
+    the writes that requested them.
+    """
+
+    current: Optional[OperatorScheduleScope] = getattr(_DEFER_STATE, "scope", None)
+    if current is not None:
+        yield current
+        return
+
+    scope = OperatorScheduleScope()
+    _DEFER_STATE.scope = scope
+    try:
+        yield scope
+    finally:
+        if hasattr(_DEFER_STATE, "scope"):
+            delattr(_DEFER_STATE, "scope")
+    scope.refresh()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+
+from ..pdf_rendering import render_pdf_to_file
+from .calendar_artifacts import CalendarArtifactCache
+
+logger = logging.getLogger(__name__)
+
+PDF_SUFFIX = ".pdf"
+PENDING_SUFFIX = ".pdf.pending"
+ERROR_SUFFIX = ".pdf.error"
+# A pending marker older than this belongs to a worker that died; the job may be resubmitted.
+PENDING_TIMEOUT_SECONDS = 300
+
+_EXECUTOR: Optional[Executor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+class CalendarPdfJobStatus:
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+    MISSING = "missing"
+
+
+@dataclass(slots=True)
+class CalendarPdfJob:
+    key: str
+    status: str
+    error: str = ""
+
+
+def _render_workers() -> int:
+    configured = getattr(settings, "CALENDAR_PDF_RENDER_WORKERS", None)
+    if configured is not None:
+        return max(int(configured), 0)
+    return min(4, os.cpu_count() or 1)
+
+
+def _get_executor() -> Optional[Executor]:
+    global _EXECUTOR
+    workers = _render_workers()
+    if workers == 0:
+        return None
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            # Spawned workers never touch Django; they only run WeasyPrint on the rendered HTML.
+            _EXECUTOR = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _EXECUTOR
+
+
+class CalendarPdfRenderQueue:
+    """Render calendar PDFs in a process pool; job state lives next to the cached artifact.
+
+    The job id is the artifact cache key, so any web process can answer a poll and the finished
+    PDF is served by the regular cache. With ``CALENDAR_PDF_RENDER_WORKERS = 0`` jobs render inline.
+    """
+
+    def __init__(self, cache: Optional[CalendarArtifactCache] = None) -> None:
+        self.cache = cache or CalendarArtifactCache()
+
+    def status(self, key: str) -> CalendarPdfJob:
+        if self.cache.path(key, PDF_SUFFIX).exists():
+            return CalendarPdfJob(key=key, status=CalendarPdfJobStatus.READY)
+        error_path = self.cache.path(key, ERROR_SUFFIX)
+        if error_path.exists():
+            try:
+                message = error_path.read_text(encoding="utf-8")
+            except OSError:  # pragma: no cover - removed concurrently
+                message = ""
+            return CalendarPdfJob(key=key, status=CalendarPdfJobStatus.FAILED, error=message)
+        pending_path = self.cache.path(key, PENDING_SUFFIX)
+        try:
+            started_at = pending_path.stat().st_mtime
+        except FileNotFoundError:
+            return CalendarPdfJob(key=key, status=CalendarPdfJobStatus.MISSING)
+        if time.time() - started_at > PENDING_TIMEOUT_SECONDS:
+            return CalendarPdfJob(key=key, status=CalendarPdfJobStatus.MISSING)
+        return CalendarPdfJob(key=key, status=CalendarPdfJobStatus.PENDING)
+
+    def submit(self, key: str, html: str, base_url: str) -> CalendarPdfJob:
+        current = self.status(key)
+        if current.status in {CalendarPdfJobStatus.READY, CalendarPdfJobStatus.PENDING}:
+            return current
+
+        self.cache.root.mkdir(parents=True, exist_ok=True)
+        self.cache.path(key, ERROR_SUFFIX).unlink(missing_ok=True)
+        self.cache.path(key, PENDING_SUFFIX).touch()
+        target = str(self.cache.path(key, PDF_SUFFIX))
+
+        executor = _get_executor()
+        if executor is None:
+            render_pdf_to_file(html, base_url, target)
+            self._finish(key)
+            return self.status(key)
+
+        future = executor.submit(render_pdf_to_file, html, base_url, target)
+        future.add_done_callback(lambda done: self._on_done(key, done))
+        return CalendarPdfJob(key=key, status=CalendarPdfJobStatus.PENDING)
+
+    def _on_done(self, key: str, future: Future) -> None:
+        exception = future.exception()
+        if exception is not None:
+            logger.error("Fallo el proceso de render del PDF %s", key, exc_info=exception)
+            try:
+                self.cache.path(key, ERROR_SUFFIX).write_text(str(exception), encoding="utf-8")
+            except OSError:  # pragma: no cover - cache directory removed
+                pass
+        self._finish(key)
+
+    def _finish(self, key: str) -> None:
+        self.cache.path(key, PENDING_SUFFIX).unlink(missing_ok=True)
+        self.cache.evict()
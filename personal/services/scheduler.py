@@ -8,6 +8,7 @@ from typing import DefaultDict, Dict, Iterable, List, Optional, Sequence, Set, T
 from django.db import transaction
 from django.db.models import Q
 
+from applacolina.profiling import profiled
 from task_manager.services import suppress_task_assignment_sync, sync_task_assignments
 
 from ..models import (
@@ -23,6 +24,9 @@ from ..models import (
     ShiftType,
     UserProfile,
 )
+from .assignment_changes import batch_assignment_changes
+from .operator_schedule import defer_operator_schedule_refresh
+from .workload import WorkloadSnapshotService
 
 
 OperatorId = int
@@ -83,6 +87,7 @@ class CalendarScheduler:
         self._position_history = self._load_position_history()
         self._candidate_priority = self._build_candidate_priority()
 
+    @profiled("personal.calendar_scheduler.generate")
     def generate(self, *, commit: bool = False) -> List[AssignmentDecision]:
         self._validate_calendar_range()
         self._restore_rest_state()
@@ -993,8 +998,8 @@ class CalendarScheduler:
     # ------------------------------------------------------------------ #
 
     def _commit_decisions(self, decisions: Sequence[AssignmentDecision]) -> None:
-        with transaction.atomic():
-            with suppress_task_assignment_sync():
+        with transaction.atomic(), defer_operator_schedule_refresh() as schedule_scope:
+            with suppress_task_assignment_sync(), batch_assignment_changes():
                 self._reset_auto_assignments()
 
                 new_assignments: List[ShiftAssignment] = []
@@ -1023,6 +1028,12 @@ class CalendarScheduler:
             self._persist_calendar_rest_periods()
             self._schedule_task_assignment_sync()
 
+            # Bulk-created turns and rests send no signals; rebuild their operators' schedule rows.
+            for operator_id in {assignment.operator_id for assignment in new_assignments} | set(
+                self._planned_rest_days
+            ):
+                schedule_scope.add(operator_id, self.calendar.start_date, self.calendar.end_date)
+
     def _reset_auto_assignments(self) -> None:
         self.calendar.assignments.all().delete()
 
@@ -1030,7 +1041,7 @@ class CalendarScheduler:
         self.calendar.workload_snapshots.all().delete()
 
     def _rebuild_workload_snapshots(self) -> None:
-        self._clear_workload_snapshots()
+        WorkloadSnapshotService(self.calendar).refresh()
 
     def _clear_calendar_rest_periods(self) -> None:
         self.calendar.rest_periods.filter(source=RestPeriodSource.CALENDAR).delete()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from personal.models import (
+    OperatorRestPeriod,
+    RestPeriodStatus,
+    ShiftAssignment,
+    ShiftCalendar,
+    ShiftType,
+    WorkloadSnapshot,
+)
+
+
+def _month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def _next_month(value: date) -> date:
+    return (value.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _iter_months(start: date, end: date) -> Iterable[date]:
+    current = _month_start(start)
+    while current <= end:
+        yield current
+        current = _next_month(current)
+
+
+@dataclass
+class WorkloadScope:
+    """Operators and months touched by an edit; empty sets mean "every operator/month of the calendar"."""
+
+    operator_ids: Set[int] = field(default_factory=set)
+    months: Set[date] = field(default_factory=set)
+
+    def add(self, operator_id: Optional[int], start: date, end: Optional[date] = None) -> None:
+        if operator_id:
+            self.operator_ids.add(operator_id)
+        self.months.update(_iter_months(start, end or start))
+
+    def add_assignment(self, assignment: Optional[ShiftAssignment]) -> None:
+        if assignment is not None:
+            self.add(assignment.operator_id, assignment.date)
+
+    def add_rest_period(self, rest_period: Optional[OperatorRestPeriod]) -> None:
+        if rest_period is not None:
+            self.add(rest_period.operator_id, rest_period.start_date, rest_period.end_date)
+
+
+class WorkloadSnapshotService:
+    """Recompute ``WorkloadSnapshot`` totals with a couple of aggregate queries.
+
+    Only the operators and months included in the scope are rewritten, so a manual edit does not
+    need the candidate/history loading performed by ``CalendarScheduler``.
+    """
+
+    def __init__(self, calendar: ShiftCalendar) -> None:
+        self.calendar = calendar
+
+    def refresh(self, scope: Optional[WorkloadScope] = None) -> int:
+        calendar = self.calendar
+        scope = scope or WorkloadScope()
+        months = sorted(
+            month
+            for month in (scope.months or set(_iter_months(calendar.start_date, calendar.end_date)))
+            if _month_start(calendar.start_date) <= month <= calendar.end_date
+        )
+        if not months:
+            return 0
+        operator_ids = set(scope.operator_ids)
+
+        window_start = max(calendar.start_date, months[0])
+        window_end = min(calendar.end_date, _next_month(months[-1]) - timedelta(days=1))
+
+        totals: Dict[Tuple[int, date], Dict[str, int]] = defaultdict(
+            lambda: {
+                "total_shifts": 0,
+                "day_shifts": 0,
+                "night_shifts": 0,
+                "rest_days": 0,
+                "overtime_days": 0,
+                "overtime_points_total": 0,
+            }
+        )
+
+        assignment_qs = ShiftAssignment.objects.filter(
+            calendar=calendar,
+            date__gte=window_start,
+            date__lte=window_end,
+        )
+        if operator_ids:
+            assignment_qs = assignment_qs.filter(operator_id__in=operator_ids)
+        assignment_rows = (
+            assignment_qs.annotate(month=TruncMonth("date"))
+            .filter(month__in=months)
+            .values("operator_id", "month")
+            .annotate(
+                total_shifts=Count("id"),
+                night_shifts=Count("id", filter=Q(position__category__shift_type=ShiftType.NIGHT)),
+                overtime_days=Count("id", filter=Q(is_overtime=True)),
+                overtime_points_total=Sum("overtime_points"),
+            )
+        )
+        for row in assignment_rows:
+            entry = totals[(row["operator_id"], row["month"])]
+            entry["total_shifts"] = row["total_shifts"]
+            entry["night_shifts"] = row["night_shifts"]
+            entry["day_shifts"] = row["total_shifts"] - row["night_shifts"]
+            entry["overtime_days"] = row["overtime_days"]
+            entry["overtime_points_total"] = row["overtime_points_total"] or 0
+
+        rest_qs = OperatorRestPeriod.objects.filter(
+            start_date__lte=window_end,
+            end_date__gte=window_start,
+        ).exclude(status=RestPeriodStatus.CANCELLED)
+        if operator_ids:
+            rest_qs = rest_qs.filter(operator_id__in=operator_ids)
+        month_set = set(months)
+        rest_days: Dict[Tuple[int, date], Set[date]] = defaultdict(set)
+        for operator_id, start_date, end_date in rest_qs.values_list("operator_id", "start_date", "end_date"):
+            current = max(start_date, window_start)
+            last = min(end_date, window_end)
+            while current <= last:
+                month = _month_start(current)
+                if month in month_set:
+                    rest_days[(operator_id, month)].add(current)
+                current += timedelta(days=1)
+        for key, days in rest_days.items():
+            totals[key]["rest_days"] = len(days)
+
+        snapshots = [
+            WorkloadSnapshot(
+                calendar=calendar,
+                operator_id=operator_id,
+                month_reference=month,
+                **values,
+            )
+            for (operator_id, month), values in totals.items()
+            if values["total_shifts"] or values["rest_days"]
+        ]
+
+        stale_qs = WorkloadSnapshot.objects.filter(calendar=calendar, month_reference__in=months)
+        if operator_ids:
+            stale_qs = stale_qs.filter(operator_id__in=operator_ids)
+        with transaction.atomic():
+            stale_qs.delete()
+            if snapshots:
+                WorkloadSnapshot.objects.bulk_create(snapshots)
+        return len(snapshots)
+
+
+def refresh_workload_snapshots(calendar: ShiftCalendar, scope: Optional[WorkloadScope] = None) -> int:
+    return WorkloadSnapshotService(calendar).refresh(scope)
@@ -2,24 +2,51 @@ from __future__ import annotations
 
 from typing import Any, Optional
 
-from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 
+from .auth_backends import invalidate_permission_cache
 from .models import (
     AssignmentChangeLog,
+    CalendarRestSuggestion,
     OperatorRestPeriod,
     RestPeriodSource,
     RestPeriodStatus,
+    Role,
+    RolePermission,
     ShiftAssignment,
     ShiftCalendar,
+    UserProfile,
 )
 from .services import sync_calendar_rest_periods
+from .services.assignment_changes import get_assignment_change_batch
+from .services.operator_schedule import request_operator_schedule_refresh
+
+
+def _record_change_log(log: AssignmentChangeLog, instance: ShiftAssignment) -> None:
+    batch = get_assignment_change_batch()
+    if batch is not None:
+        batch.add(log, calendar_id=instance.calendar_id)
+        return
+    log.save()
+    sync_calendar_rest_periods(instance.calendar)
 
 
 @receiver(pre_save, sender=ShiftAssignment)
 def cache_previous_assignment_state(sender: type[ShiftAssignment], instance: ShiftAssignment, **kwargs: Any) -> None:
     if not instance.pk:
         return
+    loaded_state = getattr(instance, "_loaded_state", None)
+    if loaded_state is not None and get_assignment_change_batch() is not None:
+        operator_id, assignment_date = loaded_state
+        instance._previous_assignment = sender(  # type: ignore[attr-defined]
+            pk=instance.pk,
+            calendar_id=instance.calendar_id,
+            operator_id=operator_id,
+            date=assignment_date,
+        )
+        return
     try:
         instance._previous_assignment = sender.objects.get(pk=instance.pk)  # type: ignore[attr-defined]
     except sender.DoesNotExist:
@@ -29,56 +56,111 @@ def cache_previous_assignment_state(sender: type[ShiftAssignment], instance: Shi
 @receiver(post_save, sender=ShiftAssignment)
 def log_assignment_update(sender: type[ShiftAssignment], instance: ShiftAssignment, created: bool, **kwargs: Any) -> None:
     previous: Optional[ShiftAssignment] = getattr(instance, "_previous_assignment", None)
+    instance._loaded_state = (instance.operator_id, instance.date)  # type: ignore[attr-defined]
 
     if created:
-        AssignmentChangeLog.objects.create(
-            assignment=instance,
-            changed_by=None,
-            change_type=AssignmentChangeLog.ChangeType.CREATED,
-            previous_operator=None,
-            new_operator=instance.operator,
-            details={
-                "auto": instance.is_auto_assigned,
-                "alert": instance.alert_level,
-                "calendar_id": instance.calendar_id,
-            },
+        _record_change_log(
+            AssignmentChangeLog(
+                assignment=instance,
+                changed_by=None,
+                change_type=AssignmentChangeLog.ChangeType.CREATED,
+                previous_operator=None,
+                new_operator_id=instance.operator_id,
+                details={
+                    "auto": instance.is_auto_assigned,
+                    "alert": instance.alert_level,
+                    "calendar_id": instance.calendar_id,
+                },
+            ),
+            instance,
         )
-        sync_calendar_rest_periods(instance.calendar)
         return
 
     # Updated assignment
     if previous and previous.operator_id != instance.operator_id:
-        AssignmentChangeLog.objects.create(
-            assignment=instance,
+        _record_change_log(
+            AssignmentChangeLog(
+                assignment=instance,
+                changed_by=None,
+                change_type=AssignmentChangeLog.ChangeType.UPDATED,
+                previous_operator_id=previous.operator_id,
+                new_operator_id=instance.operator_id,
+                details={
+                    "auto": instance.is_auto_assigned,
+                    "alert": instance.alert_level,
+                    "calendar_id": instance.calendar_id,
+                },
+            ),
+            instance,
+        )
+        return
+    batch = get_assignment_change_batch()
+    if batch is not None:
+        batch.sync_calendar(instance.calendar_id)
+        return
+    sync_calendar_rest_periods(instance.calendar)
+
+
+@receiver(post_delete, sender=ShiftAssignment)
+def log_assignment_deletion(sender: type[ShiftAssignment], instance: ShiftAssignment, **kwargs: Any) -> None:
+    batch = get_assignment_change_batch()
+    if batch is not None:
+        batch.detach_assignment(instance.pk)
+    _record_change_log(
+        AssignmentChangeLog(
+            assignment=None,
             changed_by=None,
-            change_type=AssignmentChangeLog.ChangeType.UPDATED,
-            previous_operator=previous.operator,
-            new_operator=instance.operator,
+            change_type=AssignmentChangeLog.ChangeType.DELETED,
+            previous_operator_id=instance.operator_id,
+            new_operator=None,
             details={
                 "auto": instance.is_auto_assigned,
                 "alert": instance.alert_level,
+                "assignment_id": instance.pk,
                 "calendar_id": instance.calendar_id,
             },
-        )
-    sync_calendar_rest_periods(instance.calendar)
+        ),
+        instance,
+    )
 
 
-@receiver(post_delete, sender=ShiftAssignment)
-def log_assignment_deletion(sender: type[ShiftAssignment], instance: ShiftAssignment, **kwargs: Any) -> None:
-    AssignmentChangeLog.objects.create(
-        assignment=None,
-        changed_by=None,
-        change_type=AssignmentChangeLog.ChangeType.DELETED,
-        previous_operator=instance.operator,
-        new_operator=None,
-        details={
-            "auto": instance.is_auto_assigned,
-            "alert": instance.alert_level,
-            "assignment_id": instance.pk,
-            "calendar_id": instance.calendar_id,
-        },
+@receiver(post_save, sender=ShiftAssignment, dispatch_uid="shift_assignment_operator_schedule")
+@receiver(post_delete, sender=ShiftAssignment, dispatch_uid="shift_assignment_delete_operator_schedule")
+def refresh_assignment_schedule_days(sender: type[ShiftAssignment], instance: ShiftAssignment, **kwargs: Any) -> None:
+    previous: Optional[ShiftAssignment] = getattr(instance, "_previous_assignment", None)
+    if previous is not None and kwargs.get("created") is False:
+        request_operator_schedule_refresh(previous.operator_id, previous.date)
+    request_operator_schedule_refresh(instance.operator_id, instance.date)
+
+
+@receiver(pre_save, sender=OperatorRestPeriod, dispatch_uid="rest_period_previous_schedule_range")
+def cache_previous_rest_period_range(
+    sender: type[OperatorRestPeriod], instance: OperatorRestPeriod, **kwargs: Any
+) -> None:
+    instance._previous_schedule_range = (  # type: ignore[attr-defined]
+        sender.objects.filter(pk=instance.pk).values_list("operator_id", "start_date", "end_date").first()
+        if instance.pk
+        else None
     )
-    sync_calendar_rest_periods(instance.calendar)
+
+
+@receiver(post_save, sender=OperatorRestPeriod, dispatch_uid="rest_period_operator_schedule")
+@receiver(post_delete, sender=OperatorRestPeriod, dispatch_uid="rest_period_delete_operator_schedule")
+def refresh_rest_period_schedule_days(
+    sender: type[OperatorRestPeriod], instance: OperatorRestPeriod, **kwargs: Any
+) -> None:
+    previous_range = getattr(instance, "_previous_schedule_range", None)
+    if previous_range is not None and kwargs.get("created") is False:
+        request_operator_schedule_refresh(*previous_range)
+    request_operator_schedule_refresh(instance.operator_id, instance.start_date, instance.end_date)
+
+
+@receiver(post_save, sender=CalendarRestSuggestion, dispatch_uid="rest_suggestion_operator_schedule")
+@receiver(post_delete, sender=CalendarRestSuggestion, dispatch_uid="rest_suggestion_delete_operator_schedule")
+def refresh_rest_suggestion_schedule_days(
+    sender: type[CalendarRestSuggestion], instance: CalendarRestSuggestion, **kwargs: Any
+) -> None:
+    request_operator_schedule_refresh(instance.operator_id, instance.scheduled_date)
 
 
 @receiver(pre_delete, sender=ShiftCalendar)
@@ -91,3 +173,23 @@ def cleanup_rest_periods(sender: type[ShiftCalendar], instance: ShiftCalendar, *
     OperatorRestPeriod.objects.filter(calendar=instance).exclude(
         source=RestPeriodSource.CALENDAR
     ).update(status=RestPeriodStatus.APPROVED, calendar=None)
+
+
+@receiver(post_save, sender=Role, dispatch_uid="role_permission_cache")
+@receiver(post_delete, sender=Role, dispatch_uid="role_delete_permission_cache")
+@receiver(post_save, sender=RolePermission, dispatch_uid="role_permission_row_permission_cache")
+@receiver(post_delete, sender=RolePermission, dispatch_uid="role_permission_row_delete_permission_cache")
+@receiver(m2m_changed, sender=RolePermission, dispatch_uid="role_permissions_m2m_permission_cache")
+@receiver(m2m_changed, sender=UserProfile.roles.through, dispatch_uid="user_roles_permission_cache")
+@receiver(m2m_changed, sender=UserProfile.groups.through, dispatch_uid="user_groups_permission_cache")
+@receiver(
+    m2m_changed,
+    sender=UserProfile.user_permissions.through,
+    dispatch_uid="user_permissions_permission_cache",
+)
+@receiver(m2m_changed, sender=Group.permissions.through, dispatch_uid="group_permissions_permission_cache")
+def expire_permission_cache(sender, **kwargs: Any) -> None:
+    action = kwargs.get("action")
+    if action is not None and not action.startswith("post_"):
+        return
+    invalidate_permission_cache()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from unittest import mock
+
+from django.test import TestCase
+
+from personal.models import (
+    AssignmentChangeLog,
+    CalendarStatus,
+    PositionCategory,
+    PositionCategoryCode,
+    PositionDefinition,
+    ShiftAssignment,
+    ShiftCalendar,
+    ShiftType,
+    UserProfile,
+)
+from personal.services import batch_assignment_changes
+from production.models import Farm
+
+
+class AssignmentChangeLogBatchTests(TestCase):
+    def setUp(self) -> None:
+        farm = Farm.objects.create(name="Colina")
+        category, _ = PositionCategory.objects.get_or_create(
+            code=PositionCategoryCode.GALPONERO_PRODUCCION_DIA,
+            defaults={"shift_type": ShiftType.DAY},
+        )
+        self.calendar = ShiftCalendar.objects.create(
+            name="Semana lote",
+            start_date=date(2025, 7, 7),
+            end_date=date(2025, 7, 13),
+            status=CalendarStatus.DRAFT,
+        )
+        self.position = PositionDefinition.objects.create(
+            name="Galponero día",
+            code="LOG-DAY",
+            category=category,
+            farm=farm,
+            valid_from=self.calendar.start_date,
+        )
+        self.operator = UserProfile.objects.create_user(
+            cedula="6001",
+            password="test",  # noqa: S106 - test credential
+            nombres="Operario",
+            apellidos="Uno",
+            telefono="3106000001",
+        )
+        self.replacement = UserProfile.objects.create_user(
+            cedula="6002",
+            password="test",  # noqa: S106 - test credential
+            nombres="Operario",
+            apellidos="Dos",
+            telefono="3106000002",
+        )
+        ShiftAssignment.objects.bulk_create(
+            [
+                ShiftAssignment(
+                    calendar=self.calendar,
+                    position=self.position,
+                    date=self.calendar.start_date + timedelta(days=offset),
+                    operator=self.operator,
+                )
+                for offset in range(7)
+            ]
+        )
+
+    def test_batched_deletes_write_logs_with_one_insert(self) -> None:
+        # Collector select/updates/delete, one log insert, one calendar lookup and a single schedule
+        # rebuild (two reads, delete inside a savepoint) regardless of row count.
+        with self.assertNumQueries(11):
+            with batch_assignment_changes():
+                self.calendar.assignments.all().delete()
+
+        logs = AssignmentChangeLog.objects.filter(change_type=AssignmentChangeLog.ChangeType.DELETED)
+        self.assertEqual(logs.count(), 7)
+        self.assertTrue(all(log.previous_operator_id == self.operator.pk for log in logs))
+
+    def test_batched_update_diffs_in_memory(self) -> None:
+        assignment = self.calendar.assignments.order_by("date").first()
+
+        with batch_assignment_changes():
+            assignment.operator = self.replacement
+            with self.assertNumQueries(1):
+                assignment.save(update_fields=["operator"])
+
+        log = AssignmentChangeLog.objects.get(change_type=AssignmentChangeLog.ChangeType.UPDATED)
+        self.assertEqual(log.assignment_id, assignment.pk)
+        self.assertEqual(log.previous_operator_id, self.operator.pk)
+        self.assertEqual(log.new_operator_id, self.replacement.pk)
+
+    def test_batched_update_without_operator_change_still_syncs_the_calendar(self) -> None:
+        assignment = self.calendar.assignments.order_by("date").first()
+
+        with mock.patch("personal.services.scheduler.sync_calendar_rest_periods") as sync:
+            with batch_assignment_changes():
+                assignment.is_auto_assigned = False
+                assignment.save(update_fields=["is_auto_assigned"])
+
+        self.assertFalse(AssignmentChangeLog.objects.filter(change_type=AssignmentChangeLog.ChangeType.UPDATED).exists())
+        sync.assert_called_once()
+        self.assertEqual(sync.call_args.args[0].pk, self.calendar.pk)
+
+    def test_assignment_created_and_deleted_inside_batch_keeps_history(self) -> None:
+        self.calendar.assignments.filter(date=self.calendar.end_date).delete()
+        AssignmentChangeLog.objects.all().delete()
+
+        with batch_assignment_changes():
+            assignment = ShiftAssignment.objects.create(
+                calendar=self.calendar,
+                position=self.position,
+                date=self.calendar.end_date,
+                operator=self.replacement,
+            )
+            assignment.delete()
+
+        change_types = set(AssignmentChangeLog.objects.values_list("change_type", "assignment_id"))
+        self.assertEqual(
+            change_types,
+            {
+                (AssignmentChangeLog.ChangeType.CREATED, None),
+                (AssignmentChangeLog.ChangeType.DELETED, None),
+            },
+        )
+
+    def test_logs_are_discarded_when_the_block_fails(self) -> None:
+        with self.assertRaises(RuntimeError):
+            with batch_assignment_changes():
+                self.calendar.assignments.first().delete()
+                raise RuntimeError("abort")
+
+        self.assertFalse(AssignmentChangeLog.objects.exists())
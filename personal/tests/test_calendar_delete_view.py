@@ -3,17 +3,26 @@ from __future__ import annotations
 from datetime import date, timedelta
 
 from django.contrib.messages import get_messages
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from personal.models import (
     CalendarStatus,
     OperatorRestPeriod,
+    OperatorScheduleDay,
+    PositionCategory,
+    PositionCategoryCode,
+    PositionDefinition,
     RestPeriodSource,
     RestPeriodStatus,
+    ShiftAssignment,
     ShiftCalendar,
+    ShiftType,
 )
 from personal.models import UserProfile
+from production.models import Farm
 
 
 class CalendarDeleteViewTests(TestCase):
@@ -117,3 +126,61 @@ class CalendarDeleteViewTests(TestCase):
         period_manual.refresh_from_db()
         self.assertEqual(period_manual.status, RestPeriodStatus.APPROVED)
         self.assertIsNone(period_manual.calendar)
+
+    def _calendar_with_turns(self, *, start: date, days: int, code: str) -> ShiftCalendar:
+        calendar = ShiftCalendar.objects.create(
+            name=f"Semana {code}",
+            start_date=start,
+            end_date=start + timedelta(days=days - 1),
+            status=CalendarStatus.DRAFT,
+            created_by=self.user,
+        )
+        category, _ = PositionCategory.objects.get_or_create(
+            code=PositionCategoryCode.GALPONERO_PRODUCCION_DIA,
+            defaults={"shift_type": ShiftType.DAY},
+        )
+        position = PositionDefinition.objects.create(
+            name=f"Galponero {code}",
+            code=f"POS-{code}",
+            category=category,
+            farm=Farm.objects.create(name=f"Granja {code}"),
+            valid_from=calendar.start_date,
+            valid_until=calendar.end_date,
+        )
+        operator = UserProfile.objects.create_user(
+            cedula=f"93{code}",
+            password="test",  # noqa: S106 - test credential
+            nombres="Operario",
+            apellidos=f"Turnos {code}",
+            telefono=f"30093{code}",
+        )
+        for offset in range(days):
+            ShiftAssignment.objects.create(
+                calendar=calendar,
+                position=position,
+                date=calendar.start_date + timedelta(offset),
+                operator=operator,
+            )
+        return calendar
+
+    def _delete_queries(self, calendar: ShiftCalendar) -> list[str]:
+        next_url = reverse("personal:configurator")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse("personal:calendar-delete", args=[calendar.pk]),
+                data={"next": next_url},
+            )
+        self.assertRedirects(response, next_url)
+        self.assertFalse(ShiftCalendar.objects.filter(pk=calendar.pk).exists())
+        return [query["sql"] for query in queries.captured_queries]
+
+    def test_delete_calendar_cost_does_not_grow_with_its_turns(self) -> None:
+        short = self._calendar_with_turns(start=date(2025, 9, 1), days=2, code="01")
+        long = self._calendar_with_turns(start=date(2025, 10, 1), days=12, code="02")
+
+        short_queries = self._delete_queries(short)
+        long_queries = self._delete_queries(long)
+
+        self.assertEqual(len(short_queries), len(long_queries))
+        schedule_table = OperatorScheduleDay._meta.db_table
+        self.assertEqual(1, sum(sql.startswith(f'DELETE FROM "{schedule_table}"') for sql in long_queries))
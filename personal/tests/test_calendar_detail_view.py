@@ -3,14 +3,18 @@ from __future__ import annotations
 from datetime import date, timedelta
 
 from django.contrib.messages import get_messages
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from personal.models import (
     AssignmentAlertLevel,
+    AssignmentChangeLog,
     CalendarRestSuggestion,
     CalendarStatus,
     OperatorRestPeriod,
+    OperatorScheduleDay,
     PositionCategory,
     PositionCategoryCode,
     PositionDefinition,
@@ -557,6 +561,27 @@ class CalendarDetailViewManualOverrideTests(TestCase):
         )
 
 
+    def test_regenerate_rebuilds_operator_schedules_once(self) -> None:
+        for offset in range(1, 6):
+            ShiftAssignment.objects.create(
+                calendar=self.calendar,
+                position=self.position_primary,
+                date=self.calendar.start_date + timedelta(days=offset),
+                operator=self.operator_initial,
+            )
+        url = reverse("personal:calendar-detail", args=[self.calendar.pk])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, data={"action": "regenerate"})
+
+        self.assertRedirects(response, url)
+        schedule_table = OperatorScheduleDay._meta.db_table
+        change_log_table = AssignmentChangeLog._meta.db_table
+        statements = [query["sql"] for query in queries.captured_queries]
+        self.assertEqual(1, sum(sql.startswith(f'DELETE FROM "{schedule_table}"') for sql in statements))
+        self.assertEqual(1, sum(sql.startswith(f'INSERT INTO "{change_log_table}"') for sql in statements))
+
+
 class CalendarDetailViewModifyCalendarTests(TestCase):
     def setUp(self) -> None:
         self.user = UserProfile.objects.create_user(
@@ -853,6 +878,15 @@ class CalendarActivePositionVisibilityTests(TestCase):
         self.assertFalse(slot_map[calendar.start_date.isoformat()])
         self.assertTrue(slot_map[(calendar.start_date + timedelta(days=1)).isoformat()])
 
+        active_cell = next(cell for cell in row["cells"] if cell["is_position_active"])
+        operator_ids = [operator_id for operator_id, _label in payload["operators"]]
+        self.assertEqual(
+            {choice["id"] for choice in active_cell["choices"]},
+            {operator_ids[index] for index in active_cell["choice_indexes"]},
+        )
+        labels = [choice["label"].lower() for choice in active_cell["choices"]]
+        self.assertEqual(labels, sorted(labels))
+
     def test_administrative_and_sales_positions_grouped_by_category(self) -> None:
         calendar = ShiftCalendar.objects.create(
             name="Semana categorías",
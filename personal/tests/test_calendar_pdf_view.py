@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from datetime import date
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
 from unittest.mock import patch
 
 from django.test import TestCase
 from django.urls import reverse
+from django.utils import timezone
 
 from personal.models import (
     AssignmentAlertLevel,
@@ -17,6 +21,7 @@ from personal.models import (
     ShiftType,
     UserProfile,
 )
+from personal.services import CalendarArtifactCache
 from production.models import Farm
 
 
@@ -123,3 +128,95 @@ class CalendarDetailPDFViewTests(TestCase):
         html = render_pdf_mock.call_args[0][0]
         self.assertIn(self.position_assigned.name, html)
         self.assertNotIn(self.position_empty.name, html)
+
+    @patch("personal.views._render_calendar_pdf", return_value=b"%PDF-TEST%")
+    def test_repeated_downloads_reuse_cached_pdf(self, render_pdf_mock) -> None:
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+
+        self.assertEqual(first.content, second.content)
+        render_pdf_mock.assert_called_once()
+
+        assignment = ShiftAssignment.objects.get(calendar=self.calendar)
+        assignment.alert_level = AssignmentAlertLevel.WARN
+        assignment.save()
+
+        self.client.get(self.url)
+        self.assertEqual(render_pdf_mock.call_count, 2)
+
+    def test_public_share_page_is_served_from_cache(self) -> None:
+        url = reverse("personal:calendar-public-share", args=[self.calendar.pk])
+        first_render = timezone.make_aware(datetime(2025, 1, 3, 8, 15))
+        with patch("django.utils.timezone.now", return_value=first_render):
+            first = self.client.get(url)
+
+        # Calendar lookup, the three version stamp aggregates and the position metadata read.
+        with self.assertNumQueries(5), patch("django.utils.timezone.now", return_value=first_render + timedelta(hours=2)):
+            second = self.client.get(url)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertContains(first, "Generada el 03/01/2025 08:15")
+        self.assertContains(second, "Generada el 03/01/2025 10:15")
+        self.assertEqual(
+            first.content.replace(b"08:15", b"10:15"),
+            second.content,
+        )
+
+    @patch("personal.views._render_calendar_pdf", return_value=b"%PDF-TEST%")
+    def test_position_rename_and_reorder_refresh_the_cached_pdf(self, render_pdf_mock) -> None:
+        self.client.get(self.url)
+
+        self.position_assigned.name = "Operador renombrado"
+        self.position_assigned.save(update_fields=["name"])
+        self.client.get(self.url)
+        self.assertEqual(render_pdf_mock.call_count, 2)
+
+        PositionDefinition.objects.filter(pk=self.position_assigned.pk).update(display_order=99)
+        self.client.get(self.url)
+        self.assertEqual(render_pdf_mock.call_count, 3)
+
+    @patch("personal.pdf_rendering.render_pdf", return_value=b"%PDF-JOB%")
+    def test_pdf_job_renders_and_reports_download_url(self, render_pdf_mock) -> None:
+        jobs_url = reverse("personal:calendar-pdf-jobs", args=[self.calendar.pk])
+
+        response = self.client.post(jobs_url, {"start_date": "2025-01-02", "end_date": "2025-01-05"})
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["status"], "ready")
+        render_pdf_mock.assert_called_once()
+
+        poll = self.client.get(payload["poll_url"])
+        self.assertEqual(poll.json()["status"], "ready")
+
+        download = self.client.get(payload["download_url"])
+        self.assertEqual(download.content, b"%PDF-JOB%")
+        self.assertIn("20250102-20250105", download["Content-Disposition"])
+
+    @patch("personal.pdf_rendering.render_pdf", side_effect=RuntimeError("sin cairo"))
+    def test_pdf_job_failure_is_reported_to_poller(self, render_pdf_mock) -> None:
+        jobs_url = reverse("personal:calendar-pdf-jobs", args=[self.calendar.pk])
+
+        payload = self.client.post(jobs_url).json()
+
+        self.assertEqual(payload["status"], "failed")
+        self.assertIn("error", payload)
+
+    def test_pdf_job_rejects_malformed_ids(self) -> None:
+        response = self.client.get(reverse("personal:calendar-pdf-job", args=[self.calendar.pk, "..evil"]))
+
+        self.assertEqual(response.status_code, 404)
+
+
+class CalendarArtifactCacheTests(TestCase):
+    def test_evicts_least_recently_used_artifacts(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            cache = CalendarArtifactCache(Path(root), max_bytes=10)
+            cache.put("old", ".pdf", b"12345")
+            cache.put("recent", ".pdf", b"12345")
+            os.utime(Path(root) / "old.pdf", (1, 1))
+            cache.put("new", ".pdf", b"12345")
+
+            self.assertIsNone(cache.get("old", ".pdf"))
+            self.assertEqual(cache.get("recent", ".pdf"), b"12345")
+            self.assertEqual(cache.get("new", ".pdf"), b"12345")
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+
+from personal.models import (
+    CalendarStatus,
+    PositionCategory,
+    PositionCategoryCode,
+    PositionDefinition,
+    Role,
+    ShiftAssignment,
+    ShiftCalendar,
+    ShiftType,
+    UserProfile,
+)
+from personal.services import OperatorEligibility
+from production.models import Farm
+
+
+class OperatorEligibilityTests(TestCase):
+    def setUp(self) -> None:
+        self.user = UserProfile.objects.create_user(
+            cedula="7000",
+            password="test",  # noqa: S106 - test credential
+            nombres="Coordinador",
+            apellidos="Elegibles",
+            telefono="3107000000",
+            is_staff=True,
+        )
+        farm = Farm.objects.create(name="Colina")
+        category, _ = PositionCategory.objects.get_or_create(
+            code=PositionCategoryCode.GALPONERO_PRODUCCION_DIA,
+            defaults={"shift_type": ShiftType.DAY},
+        )
+        self.calendar = ShiftCalendar.objects.create(
+            name="Semana elegibles",
+            start_date=date(2025, 7, 7),
+            end_date=date(2025, 7, 13),
+            status=CalendarStatus.DRAFT,
+            created_by=self.user,
+        )
+        self.position = PositionDefinition.objects.create(
+            name="Galponero A",
+            code="ELG-A",
+            category=category,
+            farm=farm,
+            valid_from=self.calendar.start_date,
+        )
+        self.other_position = PositionDefinition.objects.create(
+            name="Galponero B",
+            code="ELG-B",
+            category=category,
+            farm=farm,
+            valid_from=self.calendar.start_date,
+        )
+        role, _ = Role.objects.get_or_create(name=Role.RoleName.GALPONERO)
+        self.operators = []
+        for index in range(4):
+            operator = UserProfile.objects.create_user(
+                cedula=f"700{index + 1}",
+                password="test",  # noqa: S106 - test credential
+                nombres="Operario",
+                apellidos=f"Elegible {index}",
+                telefono=f"310700000{index + 1}",
+            )
+            operator.roles.add(role)
+            self.operators.append(operator)
+        self.operators[3].suggested_positions.add(self.position)
+        self.late_operator = self.operators[2]
+        self.late_operator.employment_start_date = self.calendar.start_date + timedelta(days=3)
+        self.late_operator.save(update_fields=["employment_start_date"])
+
+        ShiftAssignment.objects.create(
+            calendar=self.calendar,
+            position=self.other_position,
+            date=self.calendar.start_date,
+            operator=self.operators[0],
+        )
+
+    def test_choices_use_precomputed_bitmaps_without_extra_queries(self) -> None:
+        date_columns = [self.calendar.start_date + timedelta(days=offset) for offset in range(7)]
+        eligibility = OperatorEligibility.for_window(date_columns, self.calendar.assignments.all())
+
+        with self.assertNumQueries(0):
+            choices = {
+                day: eligibility.choices_for(self.position, day) for day in date_columns
+            }
+
+        first_day = {choice["id"]: choice for choice in choices[self.calendar.start_date]}
+        self.assertTrue(first_day[self.operators[0].pk]["disabled"])
+        self.assertFalse(first_day[self.operators[1].pk]["disabled"])
+        self.assertNotIn(self.late_operator.pk, first_day)
+        self.assertIn("Galponero", first_day[self.operators[1].pk]["label"])
+        self.assertEqual(choices[self.calendar.start_date][0]["id"], self.operators[3].pk)
+        self.assertTrue(choices[self.calendar.start_date][0]["recommended"])
+
+        later_ids = {choice["id"] for choice in choices[self.calendar.start_date + timedelta(days=3)]}
+        self.assertIn(self.late_operator.pk, later_ids)
+
+    def test_detail_cells_reference_shared_operator_table(self) -> None:
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("personal:calendar-detail", args=[self.calendar.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        table = response.context["operator_choice_table"]
+        rows = {row["position"].pk: row for row in response.context["rows"]}
+        first_cells = [rows[position.pk]["cells"][0] for position in (self.position, self.other_position)]
+        self.assertEqual(first_cells[0]["choice_indexes"], first_cells[1]["choice_indexes"])
+        self.assertEqual(
+            [table[index][0] for index in first_cells[0]["choice_indexes"]],
+            [choice["id"] for choice in first_cells[0]["choices"]],
+        )
+        assigned_cell = first_cells[1]
+        self.assertEqual(assigned_cell["selected_choice"]["id"], self.operators[0].pk)
+
+    def test_summary_ships_operator_table_and_indexes(self) -> None:
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("personal-api:calendar-summary", args=[self.calendar.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        operator_ids = {entry[0] for entry in payload["operators"]}
+        self.assertIn(self.operators[1].pk, operator_ids)
+        cell = payload["rows"][0]["cells"][0]
+        self.assertNotIn("choices", cell)
+        self.assertTrue(cell["choice_indexes"])
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from django.test import TestCase
+
+from personal.models import (
+    CalendarRestSuggestion,
+    CalendarStatus,
+    OperatorRestPeriod,
+    OperatorScheduleDay,
+    PositionCategory,
+    PositionCategoryCode,
+    PositionDefinition,
+    RestPeriodStatus,
+    ShiftAssignment,
+    ShiftCalendar,
+    ShiftType,
+    UserProfile,
+)
+from personal.services import batch_assignment_changes
+from production.models import Farm
+from task_manager.views import _resolve_operator_daily_assignments
+
+
+class OperatorScheduleReadModelTests(TestCase):
+    def setUp(self) -> None:
+        farm = Farm.objects.create(name="Colina")
+        category, _ = PositionCategory.objects.get_or_create(
+            code=PositionCategoryCode.GALPONERO_PRODUCCION_DIA,
+            defaults={"shift_type": ShiftType.DAY},
+        )
+        self.calendar = ShiftCalendar.objects.create(
+            name="Semana agenda",
+            start_date=date(2025, 9, 1),
+            end_date=date(2025, 9, 7),
+            status=CalendarStatus.APPROVED,
+        )
+        self.position = PositionDefinition.objects.create(
+            name="Galponero agenda",
+            code="AGD-DAY",
+            category=category,
+            farm=farm,
+            valid_from=self.calendar.start_date,
+        )
+        self.operator = UserProfile.objects.create_user(
+            cedula="650001",
+            password="test",  # noqa: S106 - test credential
+            nombres="Agenda",
+            apellidos="Uno",
+            telefono="3006500001",
+        )
+        self.other_operator = UserProfile.objects.create_user(
+            cedula="650002",
+            password="test",  # noqa: S106 - test credential
+            nombres="Agenda",
+            apellidos="Dos",
+            telefono="3006500002",
+        )
+
+    def _schedule(self, operator: UserProfile) -> dict[date, OperatorScheduleDay]:
+        return {day.date: day for day in OperatorScheduleDay.objects.filter(operator=operator)}
+
+    def test_assignments_rests_and_suggestions_are_materialized(self) -> None:
+        assignment = ShiftAssignment.objects.create(
+            calendar=self.calendar,
+            position=self.position,
+            date=date(2025, 9, 1),
+            operator=self.operator,
+        )
+        rest_period = OperatorRestPeriod.objects.create(
+            operator=self.operator,
+            start_date=date(2025, 9, 2),
+            end_date=date(2025, 9, 3),
+            status=RestPeriodStatus.PLANNED,
+            calendar=self.calendar,
+        )
+        suggestion = CalendarRestSuggestion.objects.create(
+            calendar=self.calendar,
+            operator=self.operator,
+            rest_period=rest_period,
+            scheduled_date=date(2025, 9, 3),
+            suggested_date=date(2025, 9, 5),
+            reason="Cita médica",
+        )
+
+        schedule = self._schedule(self.operator)
+        self.assertEqual(sorted(schedule), [date(2025, 9, 1), date(2025, 9, 2), date(2025, 9, 3)])
+        self.assertEqual(schedule[date(2025, 9, 1)].assignment_id, assignment.pk)
+        self.assertEqual(schedule[date(2025, 9, 2)].rest_period_id, rest_period.pk)
+        self.assertEqual(schedule[date(2025, 9, 3)].rest_suggestion_id, suggestion.pk)
+
+    def test_mini_app_strip_is_a_single_range_read(self) -> None:
+        for offset in range(4):
+            ShiftAssignment.objects.create(
+                calendar=self.calendar,
+                position=self.position,
+                date=self.calendar.start_date + timedelta(days=offset),
+                operator=self.operator,
+            )
+        OperatorRestPeriod.objects.create(
+            operator=self.operator,
+            start_date=date(2025, 9, 5),
+            end_date=date(2025, 9, 7),
+            status=RestPeriodStatus.APPROVED,
+        )
+
+        with self.assertNumQueries(1):
+            payload = _resolve_operator_daily_assignments(
+                user=self.operator,
+                reference_date=self.calendar.start_date,
+                max_days=6,
+            )
+
+        days = payload["days"]
+        self.assertEqual(len(days), 6)
+        self.assertEqual(days[0]["role_label"], "Galponero agenda")
+        self.assertTrue(days[4]["is_rest"])
+
+    def test_changes_rebuild_the_affected_days(self) -> None:
+        assignment = ShiftAssignment.objects.create(
+            calendar=self.calendar,
+            position=self.position,
+            date=date(2025, 9, 1),
+            operator=self.operator,
+        )
+        rest_period = OperatorRestPeriod.objects.create(
+            operator=self.operator,
+            start_date=date(2025, 9, 4),
+            end_date=date(2025, 9, 4),
+            status=RestPeriodStatus.PLANNED,
+        )
+
+        with batch_assignment_changes():
+            assignment.operator = self.other_operator
+            assignment.save(update_fields=["operator"])
+        self.assertEqual(list(self._schedule(self.operator)), [date(2025, 9, 4)])
+        self.assertEqual(self._schedule(self.other_operator)[date(2025, 9, 1)].assignment_id, assignment.pk)
+
+        rest_period.start_date = rest_period.end_date = date(2025, 9, 6)
+        rest_period.save()
+        self.assertEqual(list(self._schedule(self.operator)), [date(2025, 9, 6)])
+
+        rest_period.status = RestPeriodStatus.CANCELLED
+        rest_period.save()
+        self.assertEqual(self._schedule(self.operator), {})
@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 from datetime import date
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from personal.models import (
@@ -13,6 +13,7 @@ from personal.models import (
     ShiftType,
 )
 from production.models import Farm
+from production.services.infrastructure_catalog import get_infrastructure_catalog
 from personal.models import UserProfile
 
 
@@ -104,3 +105,18 @@ class PositionOrderingApiTests(TestCase):
         metadata_positions = metadata_response.json().get("positions", [])
         ordered_ids = [item["id"] for item in metadata_positions[:3]]
         self.assertEqual(ordered_ids, payload["order"])
+
+    @override_settings(INFRASTRUCTURE_CATALOG_RECHECK_SECONDS=60)
+    def test_reorder_refreshes_the_infrastructure_catalog(self) -> None:
+        get_infrastructure_catalog()
+        order = [self.position_b.id, self.position_c.id, self.position_a.id]
+
+        response = self.client.post(
+            self.reorder_url,
+            data=json.dumps({"order": order}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        catalog_ids = [position.id for position in get_infrastructure_catalog().positions]
+        self.assertEqual([position_id for position_id in catalog_ids if position_id in order], order)
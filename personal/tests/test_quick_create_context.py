@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.test import RequestFactory, TestCase
+
+from personal.context_processors import quick_create
+from personal.models import CalendarStatus, ShiftCalendar
+
+
+class QuickCreateContextTests(TestCase):
+    def setUp(self) -> None:
+        self.calendar = ShiftCalendar.objects.create(
+            name="Semana base",
+            start_date=date(2025, 1, 6),
+            end_date=date(2025, 1, 12),
+            status=CalendarStatus.DRAFT,
+        )
+
+    def test_context_costs_no_queries_until_a_template_reads_it(self) -> None:
+        request = RequestFactory().get("/")
+
+        with self.assertNumQueries(0):
+            context = quick_create(request)
+
+        recent = context["calendar_generation_recent_calendars"]
+        self.assertEqual([calendar["id"] for calendar in recent], [self.calendar.pk])
+        self.assertTrue(str(context["task_definition_create_url"]))
+
+    def test_recent_calendars_cost_one_query_when_read(self) -> None:
+        context = quick_create(RequestFactory().get("/"))
+
+        with self.assertNumQueries(1):
+            recent = list(context["calendar_generation_recent_calendars"])
+        self.assertEqual(recent[0]["display_name"], "Semana base")
+
+        self.calendar.name = "Semana renombrada"
+        self.calendar.save(update_fields=["name"])
+
+        renamed = quick_create(RequestFactory().get("/"))["calendar_generation_recent_calendars"]
+        self.assertEqual(renamed[0]["display_name"], "Semana renombrada")
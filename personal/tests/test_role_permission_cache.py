@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.test import TestCase
+
+from personal.models import Role, RolePermission, UserProfile
+
+
+class RolePermissionCacheTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.role, _ = Role.objects.get_or_create(name=Role.RoleName.SUPERVISOR)
+        # Not task_manager.access_mini_app: every new profile is granted that one directly.
+        self.permission = Permission.objects.get(content_type__app_label="personal", codename="view_role")
+        self.user = UserProfile.objects.create_user(
+            cedula="640001",
+            password="test",  # noqa: S106 - test credential
+            nombres="Permisos",
+            apellidos="Cacheados",
+            telefono="3006400001",
+        )
+        self.user.roles.add(self.role)
+
+    def _fresh_user(self) -> UserProfile:
+        return UserProfile.objects.get(pk=self.user.pk)
+
+    def test_permissions_are_resolved_once_across_requests(self) -> None:
+        RolePermission.objects.create(role=self.role, permission=self.permission)
+        self.assertTrue(self._fresh_user().has_perm("personal.view_role"))
+
+        user = self._fresh_user()
+        # Only the shared permission version is read.
+        with self.assertNumQueries(1):
+            self.assertTrue(user.has_perm("personal.view_role"))
+
+    def test_role_permission_changes_expire_cached_sets(self) -> None:
+        self.assertFalse(self._fresh_user().has_perm("personal.view_role"))
+
+        self.role.permissions.add(self.permission)
+        self.assertTrue(self._fresh_user().has_perm("personal.view_role"))
+
+        RolePermission.objects.filter(role=self.role).delete()
+        self.assertFalse(self._fresh_user().has_perm("personal.view_role"))
+
+    def test_role_membership_changes_expire_cached_sets(self) -> None:
+        self.role.permissions.add(self.permission)
+        self.assertTrue(self._fresh_user().has_perm("personal.view_role"))
+
+        self.user.roles.remove(self.role)
+        self.assertFalse(self._fresh_user().has_perm("personal.view_role"))
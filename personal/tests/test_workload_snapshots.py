@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.test import TestCase
+from django.urls import reverse
+
+from personal.models import (
+    CalendarStatus,
+    OperatorRestPeriod,
+    PositionCategory,
+    PositionCategoryCode,
+    PositionDefinition,
+    RestPeriodStatus,
+    ShiftAssignment,
+    ShiftCalendar,
+    ShiftType,
+    UserProfile,
+    WorkloadSnapshot,
+)
+from personal.services import WorkloadScope, WorkloadSnapshotService
+from production.models import Farm
+
+
+class WorkloadSnapshotServiceTests(TestCase):
+    def setUp(self) -> None:
+        self.user = UserProfile.objects.create_user(
+            cedula="5000",
+            password="test",  # noqa: S106 - test credential
+            nombres="Coordinador",
+            apellidos="Cargas",
+            telefono="3105000000",
+            is_staff=True,
+        )
+        farm = Farm.objects.create(name="Colina")
+        day_category, _ = PositionCategory.objects.get_or_create(
+            code=PositionCategoryCode.GALPONERO_PRODUCCION_DIA,
+            defaults={"shift_type": ShiftType.DAY},
+        )
+        night_category, _ = PositionCategory.objects.get_or_create(
+            code=PositionCategoryCode.GALPONERO_PRODUCCION_NOCHE,
+            defaults={"shift_type": ShiftType.NIGHT},
+        )
+        night_category.shift_type = ShiftType.NIGHT
+        night_category.save()
+
+        self.calendar = ShiftCalendar.objects.create(
+            name="Cambio de mes",
+            start_date=date(2025, 7, 28),
+            end_date=date(2025, 8, 3),
+            status=CalendarStatus.DRAFT,
+            created_by=self.user,
+        )
+        self.day_position = PositionDefinition.objects.create(
+            name="Galponero día",
+            code="WL-DAY",
+            category=day_category,
+            farm=farm,
+            valid_from=self.calendar.start_date,
+        )
+        self.night_position = PositionDefinition.objects.create(
+            name="Galponero noche",
+            code="WL-NIGHT",
+            category=night_category,
+            farm=farm,
+            valid_from=self.calendar.start_date,
+        )
+        self.operator = UserProfile.objects.create_user(
+            cedula="5001",
+            password="test",  # noqa: S106 - test credential
+            nombres="Operario",
+            apellidos="Uno",
+            telefono="3105000001",
+        )
+        self.other_operator = UserProfile.objects.create_user(
+            cedula="5002",
+            password="test",  # noqa: S106 - test credential
+            nombres="Operario",
+            apellidos="Dos",
+            telefono="3105000002",
+        )
+
+        ShiftAssignment.objects.create(
+            calendar=self.calendar,
+            position=self.day_position,
+            date=date(2025, 7, 28),
+            operator=self.operator,
+        )
+        ShiftAssignment.objects.create(
+            calendar=self.calendar,
+            position=self.night_position,
+            date=date(2025, 7, 29),
+            operator=self.operator,
+            is_overtime=True,
+            overtime_points=2,
+        )
+        ShiftAssignment.objects.create(
+            calendar=self.calendar,
+            position=self.day_position,
+            date=date(2025, 8, 1),
+            operator=self.operator,
+        )
+        ShiftAssignment.objects.create(
+            calendar=self.calendar,
+            position=self.day_position,
+            date=date(2025, 7, 29),
+            operator=self.other_operator,
+        )
+        OperatorRestPeriod.objects.create(
+            operator=self.operator,
+            start_date=date(2025, 7, 30),
+            end_date=date(2025, 8, 2),
+            status=RestPeriodStatus.PLANNED,
+        )
+        OperatorRestPeriod.objects.create(
+            operator=self.operator,
+            start_date=date(2025, 8, 3),
+            end_date=date(2025, 8, 3),
+            status=RestPeriodStatus.CANCELLED,
+        )
+
+    def test_refresh_computes_totals_per_operator_and_month(self) -> None:
+        # Two aggregate reads plus delete/insert inside a savepoint.
+        with self.assertNumQueries(6):
+            created = WorkloadSnapshotService(self.calendar).refresh()
+
+        self.assertEqual(created, 3)
+        july = WorkloadSnapshot.objects.get(
+            calendar=self.calendar,
+            operator=self.operator,
+            month_reference=date(2025, 7, 1),
+        )
+        self.assertEqual(july.total_shifts, 2)
+        self.assertEqual(july.day_shifts, 1)
+        self.assertEqual(july.night_shifts, 1)
+        self.assertEqual(july.overtime_days, 1)
+        self.assertEqual(july.overtime_points_total, 2)
+        self.assertEqual(july.rest_days, 2)
+
+        august = WorkloadSnapshot.objects.get(
+            calendar=self.calendar,
+            operator=self.operator,
+            month_reference=date(2025, 8, 1),
+        )
+        self.assertEqual(august.total_shifts, 1)
+        self.assertEqual(august.rest_days, 2)
+
+    def test_scoped_refresh_only_rewrites_touched_operator_months(self) -> None:
+        WorkloadSnapshotService(self.calendar).refresh()
+        ShiftAssignment.objects.filter(operator=self.operator, date=date(2025, 8, 1)).delete()
+        ShiftAssignment.objects.filter(operator=self.other_operator).update(overtime_points=5, is_overtime=True)
+
+        scope = WorkloadScope()
+        scope.add(self.operator.pk, date(2025, 8, 1))
+        WorkloadSnapshotService(self.calendar).refresh(scope)
+
+        august = WorkloadSnapshot.objects.get(operator=self.operator, month_reference=date(2025, 8, 1))
+        self.assertEqual(august.total_shifts, 0)
+        self.assertEqual(august.rest_days, 2)
+        untouched = WorkloadSnapshot.objects.get(operator=self.other_operator, month_reference=date(2025, 7, 1))
+        self.assertEqual(untouched.overtime_points_total, 0)
+
+    def test_bulk_update_refreshes_snapshots_for_changed_operators(self) -> None:
+        self.client.force_login(self.user)
+        assignment = ShiftAssignment.objects.get(operator=self.other_operator)
+
+        response = self.client.post(
+            reverse("personal-api:calendar-assignment-bulk", args=[self.calendar.pk]),
+            data={"changes": [{"assignment_id": assignment.pk, "operator_id": None}]},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(WorkloadSnapshot.objects.filter(operator=self.other_operator).exists())
+        self.assertFalse(WorkloadSnapshot.objects.filter(operator=self.operator).exists())
@@ -6,6 +6,7 @@ from .views import (
     CalendarCreateView,
     CalendarDeleteView,
     CalendarDetailPDFView,
+    CalendarPDFJobView,
     CalendarDetailView,
     CalendarPublicShareView,
     CalendarSharePreviewView,
@@ -20,6 +21,8 @@ urlpatterns = [
     path("calendars/create/", CalendarCreateView.as_view(), name="calendar-create"),
     path("calendars/<int:pk>/", CalendarDetailView.as_view(), name="calendar-detail"),
     path("calendars/<int:pk>/pdf/", CalendarDetailPDFView.as_view(), name="calendar-detail-pdf"),
+    path("calendars/<int:pk>/pdf/jobs/", CalendarPDFJobView.as_view(), name="calendar-pdf-jobs"),
+    path("calendars/<int:pk>/pdf/jobs/<str:job_id>/", CalendarPDFJobView.as_view(), name="calendar-pdf-job"),
     path("shared/calendars/<int:pk>/", CalendarPublicShareView.as_view(), name="calendar-public-share"),
     path("calendars/<int:pk>/share-preview/", CalendarSharePreviewView.as_view(), name="calendar-share-preview"),
     path("calendars/<int:pk>/delete/", CalendarDeleteView.as_view(), name="calendar-delete"),
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import re
 from collections import Counter, OrderedDict, defaultdict
 from itertools import cycle
 import logging
@@ -27,34 +28,7 @@ from django.views import View
 from django.views.generic import TemplateView
 
 from applacolina.mixins import StaffRequiredMixin
-
-
-logger = logging.getLogger(__name__)
-
-
-def _render_calendar_pdf(html: str, base_url: str) -> bytes:
-    """Render HTML into PDF bytes using WeasyPrint if available."""
-
-    try:
-        from weasyprint import HTML  # type: ignore
-    except ImportError as exc:  # pragma: no cover - optional dependency
-        raise RuntimeError(
-            "WeasyPrint no está disponible en el entorno actual. Sigue la guía de instalación oficial "
-            "para habilitar la exportación a PDF."
-        ) from exc
-    except OSError as exc:  # pragma: no cover - missing system libs during import
-        raise RuntimeError(
-            "WeasyPrint no pudo inicializarse porque faltan bibliotecas del sistema (Cairo/Pango/GObject). "
-            "Instala los paquetes requeridos según la documentación."
-        ) from exc
-
-    try:
-        return HTML(string=html, base_url=base_url).write_pdf()
-    except OSError as exc:  # pragma: no cover - missing system libs
-        raise RuntimeError(
-            "WeasyPrint no pudo cargar las bibliotecas del sistema (Cairo/Pango/GObject). "
-            "Instala los paquetes requeridos según la documentación."
-        ) from exc
+from applacolina.query_budget import QueryBudget
 
 from .forms import (
     AssignmentCreateForm,
@@ -89,15 +63,38 @@ from .models import (
     resolve_overload_policy,
 )
 from .services import (
+    CalendarArtifactCache,
+    CalendarPdfJob,
+    CalendarPdfJobStatus,
+    CalendarPdfRenderQueue,
     CalendarScheduler,
+    OperatorChoiceTable,
+    OperatorEligibility,
     SchedulerOptions,
     apply_salary_entries,
+    batch_assignment_changes,
+    calendar_version_stamp,
+    eligible_operator_queryset,
     ensure_active_salary,
+    format_operator_label,
     parse_salary_entries,
+    refresh_workload_snapshots,
     sync_calendar_rest_periods,
+    WorkloadScope,
 )
+from .pdf_rendering import render_pdf
 from .selectors import get_recent_calendars_payload
 from production.models import ChickenHouse, Farm, Room
+from production.services.infrastructure_catalog import invalidate_infrastructure_catalog
+
+
+logger = logging.getLogger(__name__)
+
+
+def _render_calendar_pdf(html: str, base_url: str) -> bytes:
+    """Render HTML into PDF bytes using WeasyPrint if available."""
+
+    return render_pdf(html, base_url)
 
 
 class CalendarPortalView(LoginView):
@@ -181,6 +178,13 @@ SHARE_JOB_TYPE_ORDER: tuple[str, ...] = (
     PositionJobType.SALES,
 )
 
+SHARE_PAGE_GENERATED_AT_MARKER = "__calendar_share_generated_at__"
+
+
+def _stamp_share_page(content: bytes) -> bytes:
+    generated_at_label = date_format(timezone.localtime(), "d/m/Y H:i")
+    return content.replace(SHARE_PAGE_GENERATED_AT_MARKER.encode(), generated_at_label.encode())
+
 
 def _operator_display_name(operator: Optional[UserProfile]) -> str:
     if not operator:
@@ -487,6 +491,7 @@ def _build_assignment_matrix(
     List[dict[str, Any]],
     dict[str, dict[str, Any]],
     dict[str, Any],
+    OperatorChoiceTable,
 ]:
     range_start = start_date or calendar.start_date
     range_end = end_date or calendar.end_date
@@ -500,7 +505,7 @@ def _build_assignment_matrix(
     date_columns = _date_range(range_start, range_end)
     if not date_columns:
         empty_rows, empty_rest_rows, position_groups = _build_operational_position_groups([], [])
-        return [], empty_rows, empty_rest_rows, {}, position_groups
+        return [], empty_rows, empty_rest_rows, {}, position_groups, OperatorChoiceTable()
 
     assignments = list(
         calendar.assignments.select_related(
@@ -552,8 +557,6 @@ def _build_assignment_matrix(
         .distinct()
     )
 
-    choices_map = _eligible_operator_map(calendar, positions, date_columns, assignments)
-
     farm_order_index: dict[int, int] = {}
     farm_candidates: list[tuple[str, int]] = []
     for position in positions:
@@ -613,23 +616,16 @@ def _build_assignment_matrix(
             resting_operator_ids_by_day[current_day].add(operator_id)
             current_day += timedelta(days=1)
 
-    available_operator_qs = (
-        UserProfile.objects.filter(
-            Q(employment_start_date__isnull=True) | Q(employment_start_date__lte=range_end),
-            Q(employment_end_date__isnull=True) | Q(employment_end_date__gte=range_start),
-            is_active=True,
-        )
-        .prefetch_related("roles")
-        .order_by("apellidos", "nombres")
+    eligibility = OperatorEligibility(
+        date_columns,
+        eligible_operator_queryset(range_start, range_end),
+        assignments,
     )
-
-    active_candidates_by_day: dict[date, set[int]] = defaultdict(set)
-    for operator in available_operator_qs:
-        if operator.id not in operator_map:
-            operator_map[operator.id] = operator
-        for target_day in date_columns:
-            if operator.is_active_on(target_day):
-                active_candidates_by_day[target_day].add(operator.id)
+    active_candidates_by_day: dict[date, set[int]] = {
+        day: eligibility.active_operator_ids(day) for day in date_columns
+    }
+    for operator_id, operator in eligibility.operators.items():
+        operator_map.setdefault(operator_id, operator)
 
     def _has_suggestion_gap(
         assignment: ShiftAssignment,
@@ -698,43 +694,93 @@ def _build_assignment_matrix(
 
         return "Disponible"
 
+    def _operator_label(operator_id: int) -> str:
+        if operator_id in eligibility.labels:
+            return eligibility.labels[operator_id]
+        return format_operator_label(operator_map[operator_id])
+
+    # The option list of a cell only depends on the day, so it is ordered once per column and
+    # shared by every position instead of being rebuilt for each (position, day) pair.
+    choice_table = OperatorChoiceTable()
+    day_choices: dict[date, List[dict[str, Any]]] = {}
+    day_choice_indexes: dict[date, List[int]] = {}
+    day_choice_lookup: dict[date, dict[int, dict[str, Any]]] = {}
+    for day in date_columns:
+        assigned_today_ids = assigned_operator_ids_by_day.get(day, set())
+        resting_today_ids = resting_operator_ids_by_day.get(day, set())
+        operator_ids = (
+            active_candidates_by_day.get(day, set()) | resting_today_ids | assigned_today_ids
+        )
+
+        sorted_choices: list[tuple[tuple[Any, ...], dict[str, Any]]] = []
+        for operator_id in operator_ids:
+            operator = operator_map.get(operator_id)
+            if not operator:
+                continue
+            if not operator.is_active_on(day) and operator_id not in assigned_today_ids:
+                continue
+
+            suffix = _operator_status_suffix(operator_id, day)
+            base_label = _operator_label(operator_id)
+            choice_data = {
+                "id": operator_id,
+                "label": f"{base_label} - {suffix}" if suffix else base_label,
+                "alert": AssignmentAlertLevel.NONE,
+                "disabled": False,
+            }
+
+            if operator_id in assigned_today_ids:
+                farm_orders: list[int] = []
+                for related_assignment in assignments_by_operator_day.get((operator_id, day), []):
+                    related_position = getattr(related_assignment, "position", None)
+                    if related_position and related_position.farm_id is not None:
+                        farm_orders.append(
+                            farm_order_index.get(related_position.farm_id, default_farm_order)
+                        )
+                primary_farm_order = min(farm_orders) if farm_orders else default_farm_order
+                status_priority = 1
+            elif operator_id in resting_today_ids:
+                primary_farm_order = default_farm_order + 1
+                status_priority = 2
+            else:
+                primary_farm_order = -1
+                status_priority = 0
+
+            sort_key = (status_priority, primary_farm_order, *_operator_sort_key(operator_id))
+            sorted_choices.append((sort_key, choice_data))
+
+        sorted_choices.sort(key=lambda item: item[0])
+        choices = [choice for _, choice in sorted_choices]
+        day_choices[day] = choices
+        day_choice_indexes[day] = [
+            choice_table.index(choice["id"], choice["label"]) for choice in choices
+        ]
+        day_choice_lookup[day] = {choice["id"]: choice for choice in choices}
+
+    placeholder_choice = {
+        "id": "",
+        "label": "Selecciona",
+        "alert": AssignmentAlertLevel.NONE,
+        "disabled": False,
+    }
+
     rows: List[dict[str, Any]] = []
     for position in positions:
-        position_choices = choices_map.get(position.id, {})
         row_cells: List[dict[str, Any]] = []
         for day in date_columns:
             assignment = assignment_map.get((position.id, day))
             is_active = position.is_active_on(day)
 
-            raw_choices = position_choices.get(day, [])
-            choices = [dict(option) for option in raw_choices]
-            choices.sort(key=lambda item: item["label"].lower())
-
-            if assignment and assignment.operator_id:
-                operator = getattr(assignment, "operator", None)
-                if operator and not any(option["id"] == assignment.operator_id for option in choices):
-                    choices.insert(
-                        0,
-                        {
-                            "id": assignment.operator_id,
-                            "label": _format_operator_label(operator),
-                            "alert": AssignmentAlertLevel.NONE,
-                            "disabled": False,
-                        },
-                    )
-                elif operator is None and not any(option["id"] == assignment.operator_id for option in choices):
-                    choices.insert(
-                        0,
-                        {
-                            "id": assignment.operator_id,
-                            "label": str(assignment.operator_id),
-                            "alert": AssignmentAlertLevel.NONE,
-                            "disabled": False,
-                        },
-                    )
-
-            if not is_active:
-                choices = []
+            choices: List[dict[str, Any]] = []
+            choice_indexes: List[int] = []
+            selected_choice: Optional[dict[str, Any]] = None
+            if is_active:
+                choices = day_choices.get(day, [])
+                choice_indexes = day_choice_indexes.get(day, [])
+                if assignment:
+                    choices = [placeholder_choice, *choices]
+                    if assignment.operator_id:
+                        selected_choice = day_choice_lookup[day].get(assignment.operator_id)
 
             has_skill_gap = _has_suggestion_gap(assignment, position) if assignment else False
             skill_gap_message = None
@@ -757,101 +803,6 @@ def _build_assignment_matrix(
                     )
                     alert_level = _escalate_alert(alert_level, desired_alert)
 
-            if is_active:
-                choice_lookup: dict[int, dict[str, Any]] = {
-                    option_id: option
-                    for option in choices
-                    if (option_id := option.get("id")) not in (None, "")
-                }
-                operator_ids: set[int] = set(choice_lookup.keys())
-                operator_ids.update(active_candidates_by_day.get(day, set()))
-                operator_ids.update(resting_operator_ids_by_day.get(day, set()))
-                operator_ids.update(assigned_operator_ids_by_day.get(day, set()))
-                if assignment and assignment.operator_id:
-                    operator_ids.add(assignment.operator_id)
-
-                sorted_choices: list[tuple[tuple[Any, ...], dict[str, Any]]] = []
-                assigned_today_ids = assigned_operator_ids_by_day.get(day, set())
-
-                for operator_id in sorted(operator_ids, key=_operator_sort_key):
-                    if not operator_id:
-                        continue
-
-                    operator = operator_map.get(operator_id)
-                    if not operator and assignment and assignment.operator_id == operator_id:
-                        operator = assignment.operator
-                        if operator:
-                            operator_map[operator_id] = operator
-                    if not operator:
-                        continue
-
-                    is_operator_active = operator.is_active_on(day)
-                    if not is_operator_active:
-                        is_assigned_today = operator_id in assigned_today_ids
-                        if assignment and assignment.operator_id == operator_id:
-                            is_assigned_today = True
-                        if not is_assigned_today:
-                            continue
-
-                    base_choice = choice_lookup.get(operator_id)
-                    choice_data = dict(base_choice) if base_choice else {
-                        "id": operator_id,
-                        "label": "",
-                        "alert": AssignmentAlertLevel.NONE,
-                        "disabled": False,
-                    }
-
-                    is_current_assignment_operator = bool(assignment and assignment.operator_id == operator_id)
-                    base_label = _format_operator_label(operator)
-                    suffix = _operator_status_suffix(operator_id, day)
-                    choice_data["label"] = f"{base_label} - {suffix}" if suffix else base_label
-                    choice_data["disabled"] = False
-
-                    assignments_today = assignments_by_operator_day.get((operator_id, day), [])
-                    is_assigned_today = bool(assignments_today)
-                    is_resting_today = operator_id in resting_operator_ids_by_day.get(day, set())
-
-                    if is_assigned_today:
-                        farm_orders: list[int] = []
-                        for related_assignment in assignments_today:
-                            related_position = getattr(related_assignment, "position", None)
-                            if related_position and related_position.farm_id is not None:
-                                farm_orders.append(
-                                    farm_order_index.get(related_position.farm_id, default_farm_order)
-                                )
-                        primary_farm_order = min(farm_orders) if farm_orders else default_farm_order
-                        status_priority = 1
-                    elif is_resting_today:
-                        primary_farm_order = default_farm_order + 1
-                        status_priority = 2
-                    else:
-                        primary_farm_order = -1
-                        status_priority = 0
-
-                    operator_sort = _operator_sort_key(operator_id)
-                    sort_key = (
-                        status_priority,
-                        primary_farm_order,
-                        operator_sort[0],
-                        operator_sort[1],
-                        operator_sort[2],
-                    )
-                    sorted_choices.append((sort_key, choice_data))
-
-                sorted_choices.sort(key=lambda item: item[0])
-                choices = [choice for _, choice in sorted_choices]
-
-                if assignment:
-                    choices.insert(
-                        0,
-                        {
-                            "id": "",
-                            "label": "Selecciona",
-                            "alert": AssignmentAlertLevel.NONE,
-                            "disabled": False,
-                        },
-                    )
-
             row_cells.append(
                 {
                     "date": day,
@@ -859,6 +810,8 @@ def _build_assignment_matrix(
                     "alert": alert_level.value,
                     "is_position_active": is_active,
                     "choices": choices,
+                    "choice_indexes": choice_indexes,
+                    "selected_choice": selected_choice,
                     "skill_gap_message": skill_gap_message,
                     "is_overtime": is_overtime,
                     "overtime_message": overtime_message,
@@ -949,91 +902,8 @@ def _build_assignment_matrix(
 
     rows, rest_rows, position_groups = _build_operational_position_groups(rows, rest_rows)
 
-    return date_columns, rows, rest_rows, rest_summary, position_groups
-
-
-def _eligible_operator_map(
-    calendar: ShiftCalendar,
-    positions: Iterable[PositionDefinition],
-    date_columns: Iterable[date],
-    assignment_list: Iterable[Any],
-) -> dict[int, dict[date, List[dict[str, Any]]]]:
-    positions = list(positions)
-    date_columns = list(date_columns)
-
-    if not positions or not date_columns:
-        return {}
-
-    position_ids = {position.id for position in positions if position.id}
-    if not position_ids:
-        return {}
-
-    assignment_by_operator_day: dict[tuple[int, date], List[Any]] = defaultdict(list)
-    for assignment in assignment_list:
-        if assignment.operator_id:
-            assignment_by_operator_day[(assignment.operator_id, assignment.date)].append(
-                assignment
-            )
-
-    operator_qs = (
-        UserProfile.objects.prefetch_related("roles", "suggested_positions")
-        .filter(is_active=True)
-        .order_by("apellidos", "nombres")
-    )
-
-    operator_cache: dict[int, UserProfile] = {}
-    suggested_position_map: dict[int, set[int]] = {}
-
-    for operator in operator_qs:
-        operator_cache[operator.id] = operator
-        suggested_ids = {
-            suggested.id
-            for suggested in operator.suggested_positions.all()
-            if suggested.id is not None and suggested.id in position_ids
-        }
-        suggested_position_map[operator.id] = suggested_ids
-
-    result: dict[int, dict[date, List[dict[str, Any]]]] = defaultdict(dict)
-
-    for position in positions:
-        for day in date_columns:
-            if not position.is_active_on(day):
-                result[position.id][day] = []
-                continue
-
-            choices: List[dict[str, Any]] = []
-            for operator_id, operator in operator_cache.items():
-                if not operator:
-                    continue
-
-                if not operator.is_active_on(day):
-                    continue
-
-                busy_assignments = assignment_by_operator_day.get((operator_id, day), [])
-                disabled = any(assign.position_id != position.id for assign in busy_assignments)
-
-                roles = list(operator.roles.all())
-                role_label = roles[0].get_name_display() if roles else ""
-                label = operator.get_full_name() or operator.nombres
-                if role_label:
-                    label = f"{label} · {role_label}"
+    return date_columns, rows, rest_rows, rest_summary, position_groups, choice_table
 
-                is_recommended = position.id in suggested_position_map.get(operator_id, set())
-
-                choices.append(
-                    {
-                        "id": operator_id,
-                        "label": label,
-                        "alert": AssignmentAlertLevel.NONE,
-                        "disabled": disabled,
-                        "recommended": is_recommended,
-                    }
-                )
-
-            choices.sort(key=lambda item: (not item.get("recommended", False), item["label"].lower()))
-            result[position.id][day] = choices
-
-    return result
 
 def _calculate_stats(rows: Iterable[dict[str, Any]]) -> dict[str, int]:
     stats = {
@@ -2061,12 +1931,23 @@ def _build_operational_position_groups(
     return ordered_rows, rest_row_list, position_groups_payload
 
 
-def _refresh_workload_snapshots(calendar: ShiftCalendar) -> None:
-    scheduler = CalendarScheduler(calendar, options=SchedulerOptions())
-    scheduler._rebuild_workload_snapshots()
+def _refresh_workload_snapshots(calendar: ShiftCalendar, scope: WorkloadScope | None = None) -> None:
+    refresh_workload_snapshots(calendar, scope)
     sync_calendar_rest_periods(calendar)
 
 
+def _build_workload_scope(
+    *assignments: ShiftAssignment | None,
+    rest_periods: Iterable[OperatorRestPeriod] = (),
+) -> WorkloadScope:
+    scope = WorkloadScope()
+    for assignment in assignments:
+        scope.add_assignment(assignment)
+    for rest_period in rest_periods:
+        scope.add_rest_period(rest_period)
+    return scope
+
+
 def _release_assignments_for_rest_period(rest_period: OperatorRestPeriod) -> tuple[int, set[int]]:
     if not rest_period.operator_id:
         return 0, set()
@@ -2268,14 +2149,6 @@ def _operator_payload(
     }
 
 
-def _format_operator_label(operator: UserProfile) -> str:
-    roles = list(operator.roles.all())
-    role_label = roles[0].get_name_display() if roles else ""
-    label = operator.get_full_name() or operator.nombres
-    if role_label:
-        label = f"{label} · {role_label}"
-    return label
-
 def _rest_period_payload(period: OperatorRestPeriod) -> dict[str, Any]:
     calendar = period.calendar
     created_by = period.created_by
@@ -2445,7 +2318,14 @@ def _build_calendar_detail_context(
     start_date: date | None = None,
     end_date: date | None = None,
 ) -> dict[str, Any]:
-    date_columns, rows, rest_rows, rest_summary, position_groups = _build_assignment_matrix(
+    (
+        date_columns,
+        rows,
+        rest_rows,
+        rest_summary,
+        position_groups,
+        choice_table,
+    ) = _build_assignment_matrix(
         calendar,
         start_date=start_date,
         end_date=end_date,
@@ -2619,6 +2499,7 @@ def _build_calendar_detail_context(
         "rest_summary": rest_summary,
         "can_override": can_override,
         "has_manual_choices": has_manual_choices,
+        "operator_choice_table": choice_table.as_payload(),
         "calendar_latest_modification": latest_modification,
         "position_groups": position_groups,
         "rest_suggestions": rest_suggestions,
@@ -2634,6 +2515,7 @@ def _build_calendar_detail_context(
 
 class CalendarDetailView(StaffRequiredMixin, View):
     template_name = "calendario/calendar_detail.html"
+    query_budget = QueryBudget(max_queries=80, max_duplicates=25)
 
     def get(self, request: HttpRequest, pk: int, *args: Any, **kwargs: Any) -> Any:
         calendar = get_object_or_404(
@@ -2681,8 +2563,9 @@ class CalendarDetailView(StaffRequiredMixin, View):
                     messages.info(request, "La asignación ya no se encuentra registrada.")
                     return redirect(redirect_url)
 
+                workload_scope = _build_workload_scope(assignment)
                 assignment.delete()
-                _refresh_workload_snapshots(calendar)
+                _refresh_workload_snapshots(calendar, workload_scope)
                 messages.success(request, "Turno liberado. La celda quedó sin colaborador.")
                 return redirect(redirect_url)
 
@@ -2703,6 +2586,12 @@ class CalendarDetailView(StaffRequiredMixin, View):
 
                 removed_assignment_label = ""
                 removed_rest_count = 0
+                workload_scope = _build_workload_scope(
+                    assignment,
+                    conflicting_assignment,
+                    rest_periods=conflicting_rest_periods,
+                )
+                workload_scope.add(operator.pk, assignment.date)
                 with transaction.atomic():
                     removed_assignment_label, removed_rest_count = _apply_assignment_conflict_resets(
                         conflicting_assignment=conflicting_assignment,
@@ -2725,7 +2614,7 @@ class CalendarDetailView(StaffRequiredMixin, View):
                         ]
                     )
 
-                _refresh_workload_snapshots(calendar)
+                _refresh_workload_snapshots(calendar, workload_scope)
                 message_parts = ["Asignación actualizada correctamente."]
                 if removed_assignment_label:
                     message_parts.append(
@@ -2758,6 +2647,11 @@ class CalendarDetailView(StaffRequiredMixin, View):
 
                 removed_assignment_label = ""
                 removed_rest_count = 0
+                workload_scope = _build_workload_scope(
+                    conflicting_assignment,
+                    rest_periods=conflicting_rest_periods,
+                )
+                workload_scope.add(operator.pk, target_date)
 
                 with transaction.atomic():
                     removed_assignment_label, removed_rest_count = _apply_assignment_conflict_resets(
@@ -2776,7 +2670,7 @@ class CalendarDetailView(StaffRequiredMixin, View):
                         is_auto_assigned=False,
                     )
 
-                _refresh_workload_snapshots(calendar)
+                _refresh_workload_snapshots(calendar, workload_scope)
                 message_parts = ["Turno asignado manualmente."]
                 if removed_assignment_label:
                     message_parts.append(
@@ -2794,13 +2688,15 @@ class CalendarDetailView(StaffRequiredMixin, View):
             else:
                 messages.error(request, form.errors.as_text())
         elif action == "regenerate":
-            with transaction.atomic():
+            # One batch for the clear and the rebuild: change logs, rest period syncs and operator
+            # schedule rows are written once for the calendar instead of once per deleted row.
+            with transaction.atomic(), batch_assignment_changes():
                 calendar.assignments.all().delete()
                 calendar.rest_periods.all().delete()
                 calendar.workload_snapshots.all().delete()
 
-            scheduler = CalendarScheduler(calendar, options=SchedulerOptions())
-            decisions = scheduler.generate(commit=True)
+                scheduler = CalendarScheduler(calendar, options=SchedulerOptions())
+                decisions = scheduler.generate(commit=True)
 
             gaps = sum(1 for decision in decisions if decision.operator is None)
             if gaps:
@@ -2823,6 +2719,70 @@ class CalendarDetailView(StaffRequiredMixin, View):
         return redirect(reverse("personal:calendar-detail", args=[calendar.id]))
 
 
+def _resolve_pdf_range(
+    request: HttpRequest,
+    calendar: ShiftCalendar,
+) -> tuple[date, date] | HttpResponse:
+    start_value = (request.GET.get("start_date") or request.POST.get("start_date") or "").strip()
+    end_value = (request.GET.get("end_date") or request.POST.get("end_date") or "").strip()
+    range_start = calendar.start_date
+    range_end = calendar.end_date
+
+    try:
+        if start_value:
+            parsed_start = _parse_date(start_value, _("fecha inicial"))
+            if parsed_start < calendar.start_date or parsed_start > calendar.end_date:
+                return HttpResponseBadRequest("La fecha inicial debe estar dentro del calendario seleccionado.")
+            range_start = parsed_start
+        if end_value:
+            parsed_end = _parse_date(end_value, _("fecha final"))
+            if parsed_end < calendar.start_date or parsed_end > calendar.end_date:
+                return HttpResponseBadRequest("La fecha final debe estar dentro del calendario seleccionado.")
+            range_end = parsed_end
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    if range_start > range_end:
+        return HttpResponseBadRequest("La fecha inicial debe ser anterior o igual a la fecha final.")
+    return range_start, range_end
+
+
+def _calendar_pdf_filename(calendar: ShiftCalendar, range_start: date, range_end: date) -> str:
+    calendar_name = calendar.name or _("Calendario")
+    filename_base = slugify(calendar_name) or f"calendario-{calendar.pk}"
+    return f"{filename_base}-{range_start:%Y%m%d}-{range_end:%Y%m%d}.pdf"
+
+
+def _calendar_pdf_cache_key(
+    artifact_cache: CalendarArtifactCache,
+    calendar: ShiftCalendar,
+    range_start: date,
+    range_end: date,
+) -> str:
+    return artifact_cache.build_key(
+        "pdf",
+        calendar,
+        start_date=range_start,
+        end_date=range_end,
+        version_stamp=calendar_version_stamp(calendar, range_start, range_end),
+    )
+
+
+def _render_calendar_pdf_html(
+    request: HttpRequest,
+    calendar: ShiftCalendar,
+    range_start: date,
+    range_end: date,
+) -> str:
+    context = _build_calendar_detail_context(
+        calendar,
+        start_date=range_start,
+        end_date=range_end,
+    )
+    context.update({"generated_at": timezone.localtime()})
+    return render_to_string(CalendarDetailPDFView.template_name, context, request=request)
+
+
 class CalendarDetailPDFView(StaffRequiredMixin, View):
     template_name = "calendario/calendar_detail_pdf.html"
 
@@ -2832,52 +2792,100 @@ class CalendarDetailPDFView(StaffRequiredMixin, View):
             pk=pk,
         )
 
-        start_value = (request.GET.get("start_date") or "").strip()
-        end_value = (request.GET.get("end_date") or "").strip()
-        range_start = calendar.start_date
-        range_end = calendar.end_date
+        resolved_range = _resolve_pdf_range(request, calendar)
+        if isinstance(resolved_range, HttpResponse):
+            return resolved_range
+        range_start, range_end = resolved_range
 
-        try:
-            if start_value:
-                parsed_start = _parse_date(start_value, _("fecha inicial"))
-                if parsed_start < calendar.start_date or parsed_start > calendar.end_date:
-                    return HttpResponseBadRequest("La fecha inicial debe estar dentro del calendario seleccionado.")
-                range_start = parsed_start
-            if end_value:
-                parsed_end = _parse_date(end_value, _("fecha final"))
-                if parsed_end < calendar.start_date or parsed_end > calendar.end_date:
-                    return HttpResponseBadRequest("La fecha final debe estar dentro del calendario seleccionado.")
-                range_end = parsed_end
-        except ValueError as exc:
-            return HttpResponseBadRequest(str(exc))
+        artifact_cache = CalendarArtifactCache()
+        cache_key = _calendar_pdf_cache_key(artifact_cache, calendar, range_start, range_end)
+        pdf_bytes = artifact_cache.get(cache_key, ".pdf")
+        if pdf_bytes is None:
+            html = _render_calendar_pdf_html(request, calendar, range_start, range_end)
 
-        if range_start > range_end:
-            return HttpResponseBadRequest("La fecha inicial debe ser anterior o igual a la fecha final.")
+            try:
+                pdf_bytes = _render_calendar_pdf(html, request.build_absolute_uri("/"))
+            except RuntimeError as exc:
+                logger.exception("Fallo generando PDF para el calendario %s", calendar.pk)
+                error_message = _(
+                    "No se pudo generar el PDF porque faltan dependencias del sistema para WeasyPrint."
+                )
+                return HttpResponse(error_message, status=503, content_type="text/plain")
+            artifact_cache.put(cache_key, ".pdf", pdf_bytes)
 
-        context = _build_calendar_detail_context(
-            calendar,
-            start_date=range_start,
-            end_date=range_end,
-        )
-        context.update({"generated_at": timezone.localtime()})
-        html = render_to_string(self.template_name, context, request=request)
+        response = HttpResponse(pdf_bytes, content_type="application/pdf")
+        filename = _calendar_pdf_filename(calendar, range_start, range_end)
+        response["Content-Disposition"] = f'inline; filename="{filename}"'
+        return response
 
-        try:
-            pdf_bytes = _render_calendar_pdf(html, request.build_absolute_uri("/"))
-        except RuntimeError as exc:
-            logger.exception("Fallo generando PDF para el calendario %s", calendar.pk)
-            error_message = _(
+
+CALENDAR_PDF_JOB_ID_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+class CalendarPDFJobView(StaffRequiredMixin, View):
+    """Queue a PDF render in the worker pool and report its progress to the polling client."""
+
+    http_method_names = ["get", "post"]
+
+    def _job_payload(
+        self,
+        calendar: ShiftCalendar,
+        job: CalendarPdfJob,
+        range_start: date,
+        range_end: date,
+    ) -> dict[str, Any]:
+        query = f"?start_date={range_start.isoformat()}&end_date={range_end.isoformat()}"
+        payload: dict[str, Any] = {
+            "job": job.key,
+            "status": job.status,
+            "poll_url": reverse("personal:calendar-pdf-job", args=[calendar.pk, job.key]) + query,
+        }
+        if job.status == CalendarPdfJobStatus.READY:
+            payload["download_url"] = reverse("personal:calendar-detail-pdf", args=[calendar.pk]) + query
+        if job.status == CalendarPdfJobStatus.FAILED:
+            payload["error"] = _(
                 "No se pudo generar el PDF porque faltan dependencias del sistema para WeasyPrint."
             )
-            return HttpResponse(error_message, status=503, content_type="text/plain")
+        return payload
 
-        calendar_name = calendar.name or _("Calendario")
-        filename_base = slugify(calendar_name) or f"calendario-{calendar.pk}"
-        filename = f"{filename_base}-{range_start:%Y%m%d}-{range_end:%Y%m%d}.pdf"
+    def post(self, request: HttpRequest, pk: int, *args: Any, **kwargs: Any) -> JsonResponse | HttpResponse:
+        calendar = get_object_or_404(
+            ShiftCalendar.objects.select_related("created_by", "approved_by", "base_calendar"),
+            pk=pk,
+        )
+        resolved_range = _resolve_pdf_range(request, calendar)
+        if isinstance(resolved_range, HttpResponse):
+            return resolved_range
+        range_start, range_end = resolved_range
+
+        render_queue = CalendarPdfRenderQueue()
+        cache_key = _calendar_pdf_cache_key(render_queue.cache, calendar, range_start, range_end)
+        job = render_queue.status(cache_key)
+        if job.status not in {CalendarPdfJobStatus.READY, CalendarPdfJobStatus.PENDING}:
+            html = _render_calendar_pdf_html(request, calendar, range_start, range_end)
+            job = render_queue.submit(cache_key, html, request.build_absolute_uri("/"))
+
+        status_code = 200 if job.status == CalendarPdfJobStatus.READY else 202
+        return JsonResponse(self._job_payload(calendar, job, range_start, range_end), status=status_code)
+
+    def get(
+        self,
+        request: HttpRequest,
+        pk: int,
+        job_id: str,
+        *args: Any,
+        **kwargs: Any,
+    ) -> JsonResponse | HttpResponse:
+        calendar = get_object_or_404(ShiftCalendar, pk=pk)
+        resolved_range = _resolve_pdf_range(request, calendar)
+        if isinstance(resolved_range, HttpResponse):
+            return resolved_range
+        range_start, range_end = resolved_range
 
-        response = HttpResponse(pdf_bytes, content_type="application/pdf")
-        response["Content-Disposition"] = f'inline; filename="{filename}"'
-        return response
+        if not CALENDAR_PDF_JOB_ID_PATTERN.fullmatch(job_id):
+            raise Http404("Trabajo de PDF no encontrado.")
+        job = CalendarPdfRenderQueue().status(job_id)
+        return JsonResponse(self._job_payload(calendar, job, range_start, range_end))
 
 
 class CalendarDeleteView(StaffRequiredMixin, View):
@@ -2891,7 +2899,8 @@ class CalendarDeleteView(StaffRequiredMixin, View):
         calendar_label = calendar.name or f"Calendario {calendar.start_date} -> {calendar.end_date}"
 
         try:
-            calendar.delete()
+            with transaction.atomic(), batch_assignment_changes():
+                calendar.delete()
         except ProtectedError:
             messages.error(
                 request,
@@ -2957,6 +2966,19 @@ class CalendarPublicShareView(View):
         area_label = ", ".join(selected_labels) if selected_labels else _("Todas las áreas")
         range_label = f"{date_format(start_date, 'DATE_FORMAT')} → {date_format(end_date, 'DATE_FORMAT')}"
 
+        artifact_cache = CalendarArtifactCache()
+        cache_key = artifact_cache.build_key(
+            "share",
+            calendar,
+            start_date=start_date,
+            end_date=end_date,
+            job_types=requested_job_types,
+            version_stamp=calendar_version_stamp(calendar, start_date, end_date),
+        )
+        cached_page = artifact_cache.get(cache_key, ".html")
+        if cached_page is not None:
+            return HttpResponse(_stamp_share_page(cached_page), content_type="text/html; charset=utf-8")
+
         date_columns = _date_range(start_date, end_date)
         rows: list[dict[str, Any]] = []
         if date_columns:
@@ -3041,8 +3063,7 @@ class CalendarPublicShareView(View):
                 }
             )
 
-        generated_at = timezone.localtime()
-        return render(
+        response = render(
             request,
             self.template_name,
             {
@@ -3054,9 +3075,13 @@ class CalendarPublicShareView(View):
                 "area_label": area_label,
                 "start_date": start_date,
                 "end_date": end_date,
-                "generated_at": generated_at,
+                # Stamped on every response so cached pages do not show the time of their first render.
+                "generated_at_label": SHARE_PAGE_GENERATED_AT_MARKER,
             },
         )
+        artifact_cache.put(cache_key, ".html", response.content)
+        response.content = _stamp_share_page(response.content)
+        return response
 
 
 class CalendarSharePreviewView(StaffRequiredMixin, View):
@@ -3332,6 +3357,8 @@ class PositionReorderView(StaffRequiredMixin, View):
 
         with transaction.atomic():
             PositionDefinition.objects.bulk_update(ordered_positions, ["display_order"])
+            # bulk_update skips the post_save receivers that keep the catalog order current.
+            invalidate_infrastructure_catalog()
 
         refreshed_positions = [
             _position_payload(position)
@@ -3397,9 +3424,10 @@ class RestPeriodCollectionView(StaffRequiredMixin, View):
         )
 
         if affected_calendar_ids:
+            workload_scope = _build_workload_scope(rest_periods=[rest_period])
             calendars = ShiftCalendar.objects.filter(pk__in=affected_calendar_ids)
             for calendar in calendars:
-                _refresh_workload_snapshots(calendar)
+                _refresh_workload_snapshots(calendar, workload_scope)
 
         requires_refresh = _rest_period_requires_calendar_refresh(
             rest_period.operator_id,
@@ -3439,6 +3467,7 @@ class RestPeriodDetailView(StaffRequiredMixin, View):
         for key, value in payload.items():
             form_data[key] = value
 
+        workload_scope = _build_workload_scope(rest_periods=[rest_period])
         form = OperatorRestPeriodForm(form_data, instance=rest_period)
         if not form.is_valid():
             return _json_error("Datos inválidos para el descanso.", errors=_form_errors(form))
@@ -3454,9 +3483,10 @@ class RestPeriodDetailView(StaffRequiredMixin, View):
             affected_calendar_ids.add(rest_period.calendar_id)
 
         if affected_calendar_ids:
+            workload_scope.add_rest_period(rest_period)
             calendars = ShiftCalendar.objects.filter(pk__in=affected_calendar_ids)
             for calendar in calendars:
-                _refresh_workload_snapshots(calendar)
+                _refresh_workload_snapshots(calendar, workload_scope)
 
         requires_refresh = _rest_period_requires_calendar_refresh(
             rest_period.operator_id,
@@ -3677,6 +3707,13 @@ class CalendarMetadataView(StaffRequiredMixin, View):
         return JsonResponse(response_payload)
 
 
+def _summary_cell_choices(cell: dict[str, Any]) -> List[dict[str, Any]]:
+    """Full option list in the original ``choices`` shape, sorted by label, for existing API consumers."""
+
+    choices = [choice for choice in cell["choices"] if choice["id"] != ""]
+    return sorted(choices, key=lambda choice: choice["label"].lower())
+
+
 class CalendarSummaryView(StaffRequiredMixin, View):
     http_method_names = ["get"]
 
@@ -3686,7 +3723,14 @@ class CalendarSummaryView(StaffRequiredMixin, View):
             pk=calendar_id,
         )
 
-        date_columns, rows, rest_rows, rest_summary, position_groups = _build_assignment_matrix(calendar)
+        (
+            date_columns,
+            rows,
+            rest_rows,
+            rest_summary,
+            position_groups,
+            choice_table,
+        ) = _build_assignment_matrix(calendar)
         stats = _calculate_stats(rows)
         assignment_issues = _identify_calendar_issues(date_columns, rows, rest_rows)
 
@@ -3700,6 +3744,7 @@ class CalendarSummaryView(StaffRequiredMixin, View):
                 "notes": calendar.notes,
             },
             "dates": [column.isoformat() for column in date_columns],
+            "operators": choice_table.as_payload(),
             "rows": [
                 {
                     "position": _position_payload(row["position"]),
@@ -3709,7 +3754,8 @@ class CalendarSummaryView(StaffRequiredMixin, View):
                             "is_position_active": cell["is_position_active"],
                             "assignment": _assignment_payload(cell["assignment"]),
                             "alert": cell["alert"],
-                            "choices": cell["choices"],
+                            "choices": _summary_cell_choices(cell),
+                            "choice_indexes": cell["choice_indexes"],
                             "skill_gap_message": cell["skill_gap_message"],
                             "is_overtime": cell["is_overtime"],
                             "overtime_message": cell["overtime_message"],
@@ -3839,7 +3885,10 @@ class CalendarAssignmentCollectionView(StaffRequiredMixin, View):
             },
         )
 
-        _refresh_workload_snapshots(calendar)
+        # The replaced operator (if any) is unknown here, so refresh every operator of that month.
+        workload_scope = WorkloadScope()
+        workload_scope.add(None, target_date)
+        _refresh_workload_snapshots(calendar, workload_scope)
 
         assignment = (
             ShiftAssignment.objects.select_related("position", "position__farm", "operator")
@@ -3868,9 +3917,10 @@ class CalendarAssignmentBulkUpdateView(StaffRequiredMixin, View):
 
         summary = {"updated": 0, "created": 0, "cleared": 0}
         total_removed_rests = 0
+        self._workload_scope = WorkloadScope()
 
         try:
-            with transaction.atomic():
+            with transaction.atomic(), batch_assignment_changes():
                 for index, change in enumerate(changes, start=1):
                     operation, removed_rests = self._apply_change(
                         calendar=calendar,
@@ -3879,7 +3929,7 @@ class CalendarAssignmentBulkUpdateView(StaffRequiredMixin, View):
                     )
                     summary[operation] += 1
                     total_removed_rests += removed_rests
-                _refresh_workload_snapshots(calendar)
+                _refresh_workload_snapshots(calendar, self._workload_scope)
         except forms.ValidationError as exc:
             return _json_error(str(exc))
         except ValueError as exc:
@@ -3953,6 +4003,7 @@ class CalendarAssignmentBulkUpdateView(StaffRequiredMixin, View):
             raise forms.ValidationError(f"Cambio #{change_index}: la asignación indicada ya no existe.")
 
         if not operator_id:
+            self._workload_scope.add_assignment(assignment)
             assignment.delete()
             return "cleared", 0
 
@@ -3979,6 +4030,12 @@ class CalendarAssignmentBulkUpdateView(StaffRequiredMixin, View):
             form.cleaned_data.get("conflicting_rest_periods", [])
         )
 
+        self._workload_scope.add_assignment(assignment)
+        self._workload_scope.add_assignment(conflicting_assignment)
+        for rest_period in conflicting_rest_periods:
+            self._workload_scope.add_rest_period(rest_period)
+        self._workload_scope.add(operator.pk, assignment.date)
+
         _, removed_rest_count = _apply_assignment_conflict_resets(
             conflicting_assignment=conflicting_assignment,
             conflicting_rest_periods=conflicting_rest_periods,
@@ -4042,6 +4099,11 @@ class CalendarAssignmentBulkUpdateView(StaffRequiredMixin, View):
             form.cleaned_data.get("conflicting_rest_periods", [])
         )
 
+        self._workload_scope.add_assignment(conflicting_assignment)
+        for rest_period in conflicting_rest_periods:
+            self._workload_scope.add_rest_period(rest_period)
+        self._workload_scope.add(operator.pk, target_date_value)
+
         _, removed_rest_count = _apply_assignment_conflict_resets(
             conflicting_assignment=conflicting_assignment,
             conflicting_rest_periods=conflicting_rest_periods,
@@ -4101,8 +4163,9 @@ class CalendarAssignmentDetailView(StaffRequiredMixin, View):
                 "No es posible retirar asignaciones históricas de un calendario aprobado."
             )
 
+        workload_scope = _build_workload_scope(assignment)
         assignment.delete()
-        _refresh_workload_snapshots(calendar)
+        _refresh_workload_snapshots(calendar, workload_scope)
 
         return JsonResponse({"status": "deleted"})
 
@@ -4128,12 +4191,10 @@ class CalendarEligibleOperatorsView(StaffRequiredMixin, View):
         except ValueError as exc:
             return HttpResponseBadRequest(str(exc))
 
-        assignments = list(
-            calendar.assignments.select_related("position", "operator")
-            .prefetch_related("operator__roles", "operator__suggested_positions", "operator__salary_records")
+        eligibility = OperatorEligibility.for_window(
+            [target_date],
+            calendar.assignments.filter(date=target_date).only("operator_id", "position_id", "date"),
         )
-
-        choices_map = _eligible_operator_map(calendar, [position], [target_date], assignments)
-        choices = choices_map.get(position.id, {}).get(target_date, [])
+        choices = eligibility.choices_for(position, target_date)
 
         return JsonResponse({"results": choices})
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0023_eggclassificationbatch_transport_confirmed_at_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eggclassificationsession',
+            index=models.Index(fields=['classified_at'], name='egg_session_classified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eggdispatch',
+            index=models.Index(fields=['date', 'seller'], name='egg_dispatch_date_seller_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0024_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheVersion',
+            fields=[
+                ('key', models.CharField(max_length=120, primary_key=True, serialize=False, verbose_name='Clave')),
+                ('value', models.BigIntegerField(verbose_name='Versión')),
+            ],
+            options={
+                'verbose_name': 'Versión de caché',
+                'verbose_name_plural': 'Versiones de caché',
+            },
+        ),
+        # Sequence values are never handed out twice, even when the bumping transaction rolls back.
+        migrations.RunSQL(
+            "CREATE SEQUENCE production_cacheversion_value_seq",
+            "DROP SEQUENCE production_cacheversion_value_seq",
+        ),
+    ]
@@ -655,6 +655,9 @@ class EggClassificationSession(models.Model):
         verbose_name = "Sesión de clasificación de huevo"
         verbose_name_plural = "Sesiones de clasificación de huevo"
         ordering = ("-classified_at", "-created_at")
+        indexes = [
+            models.Index(fields=("classified_at",), name="egg_session_classified_idx"),
+        ]
 
     def __str__(self) -> str:
         timestamp = timezone.localtime(self.classified_at)
@@ -740,6 +743,9 @@ class EggDispatch(models.Model):
         verbose_name = "Despacho de huevo"
         verbose_name_plural = "Despachos de huevo"
         ordering = ("-date", "-created_at")
+        indexes = [
+            models.Index(fields=("date", "seller"), name="egg_dispatch_date_seller_idx"),
+        ]
 
     def __str__(self) -> str:
         destination = self.get_destination_display()
@@ -944,3 +950,17 @@ class WeightSample(models.Model):
 
     def __str__(self) -> str:
         return f"{self.session} · {self.grams} g"
+
+
+class CacheVersion(models.Model):
+    """Shared version of a cached read model; every bump draws a fresh value from a database sequence."""
+
+    key = models.CharField("Clave", max_length=120, primary_key=True)
+    value = models.BigIntegerField("Versión")
+
+    class Meta:
+        verbose_name = "Versión de caché"
+        verbose_name_plural = "Versiones de caché"
+
+    def __str__(self) -> str:
+        return f"{self.key} · {self.value}"
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from django.db import connection
+
+from production.models import CacheVersion
+
+
+CACHE_VERSION_SEQUENCE = "production_cacheversion_value_seq"
+
+
+def read_cache_versions(*keys: str) -> tuple[int, ...]:
+    """
+    Return the committed version of each key with a single query; keys never bumped read as ``0``.
+
+    Read the versions before loading the data they guard: under read committed the data is then
+    at least as new as the versions it is cached under.
+    """
+
+    versions = dict(CacheVersion.objects.filter(key__in=keys).values_list("key", "value"))
+    return tuple(versions.get(key, 0) for key in keys)
+
+
+def bump_cache_versions(*keys: str) -> None:
+    """
+    Move every key to a fresh sequence value inside the caller's transaction.
+
+    Other workers see the new versions once the writer commits. A rollback restores the previous
+    values, and because the sequence never repeats, an entry cached under a rolled back version
+    can never be mistaken for a later one.
+    """
+
+    # Sorted so concurrent writers lock the rows in the same order.
+    keys = tuple(sorted(set(keys)))
+    if not keys:
+        return
+
+    table = connection.ops.quote_name(CacheVersion._meta.db_table)
+    rows = ", ".join(["(%s, nextval(%s))"] * len(keys))
+    params: list[str] = []
+    for key in keys:
+        params.extend((key, CACHE_VERSION_SEQUENCE))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (key, value) VALUES {rows}
+            ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
+            """,
+            params,
+        )
@@ -799,9 +799,12 @@ def _build_classification_session_flow(
     end_date: date,
     farm_id: Optional[int],
 ) -> list[ClassificationSessionDay]:
+    # Local day bounds instead of ``classified_at__date`` so the classified_at index can serve the range.
+    lower_bound, _ = _local_day_bounds(start_date)
+    _, upper_bound = _local_day_bounds(end_date)
     sessions_qs = EggClassificationSession.objects.filter(
-        classified_at__date__gte=start_date,
-        classified_at__date__lte=end_date,
+        classified_at__gte=lower_bound,
+        classified_at__lt=upper_bound,
     )
     if farm_id:
         sessions_qs = sessions_qs.filter(batch__bird_batch__farm_id=farm_id)
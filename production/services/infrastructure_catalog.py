@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Mapping, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from personal.models import PositionDefinition
+from production.models import ChickenHouse, Farm, Room
+from production.services.cache_versions import bump_cache_versions, read_cache_versions
+
+
+INFRASTRUCTURE_CATALOG_VERSION_KEY = "catalog:infrastructure"
+# How long a worker trusts its catalog before comparing it with the version row again.
+INFRASTRUCTURE_CATALOG_RECHECK_SECONDS = 10
+
+
+@dataclass(frozen=True)
+class FarmEntry:
+    id: int
+    name: str
+
+
+@dataclass(frozen=True)
+class ChickenHouseEntry:
+    id: int
+    name: str
+    farm_id: int
+    farm_name: str
+
+    @property
+    def full_label(self) -> str:
+        return f"{self.farm_name} · {self.name}"
+
+
+@dataclass(frozen=True)
+class RoomEntry:
+    id: int
+    name: str
+    chicken_house_id: int
+    chicken_house_name: str
+    farm_id: int
+    farm_name: str
+
+
+@dataclass(frozen=True)
+class PositionEntry:
+    id: int
+    name: str
+    code: str
+    display_order: int
+    farm_id: Optional[int]
+    farm_name: str
+    chicken_house_id: Optional[int]
+    chicken_house_name: str
+    valid_from: date
+    valid_until: Optional[date]
+
+    def is_active_on(self, target_date: date) -> bool:
+        return self.valid_from <= target_date and (self.valid_until is None or self.valid_until >= target_date)
+
+
+@dataclass(frozen=True)
+class InfrastructureCatalog:
+    """Farms, houses, rooms and positions in display order, plus id lookups."""
+
+    version: int
+    farms: tuple[FarmEntry, ...]
+    chicken_houses: tuple[ChickenHouseEntry, ...]
+    rooms: tuple[RoomEntry, ...]
+    positions: tuple[PositionEntry, ...]
+    farm_by_id: Mapping[int, FarmEntry]
+    chicken_house_by_id: Mapping[int, ChickenHouseEntry]
+    room_by_id: Mapping[int, RoomEntry]
+    position_by_id: Mapping[int, PositionEntry]
+
+    def chicken_houses_for_farm(self, farm_id: int) -> tuple[ChickenHouseEntry, ...]:
+        return tuple(house for house in self.chicken_houses if house.farm_id == farm_id)
+
+    def rooms_for_chicken_house(self, chicken_house_id: int) -> tuple[RoomEntry, ...]:
+        return tuple(room for room in self.rooms if room.chicken_house_id == chicken_house_id)
+
+    def positions_active_on(self, target_date: date) -> tuple[PositionEntry, ...]:
+        return tuple(position for position in self.positions if position.is_active_on(target_date))
+
+
+class _CatalogState:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.catalog: InfrastructureCatalog | None = None
+        self.checked_at = 0.0
+
+
+_STATE = _CatalogState()
+
+
+def get_infrastructure_catalog() -> InfrastructureCatalog:
+    """
+    Return this worker's catalog, rebuilding it when the shared version row moved.
+
+    Within the recheck window the call issues no query at all; afterwards it costs a single
+    primary-key lookup unless another worker changed the infrastructure in the meantime.
+    """
+
+    recheck_seconds = getattr(
+        settings, "INFRASTRUCTURE_CATALOG_RECHECK_SECONDS", INFRASTRUCTURE_CATALOG_RECHECK_SECONDS
+    )
+    now = time.monotonic()
+    catalog = _STATE.catalog
+    if catalog is not None and now - _STATE.checked_at < recheck_seconds:
+        return catalog
+
+    (version,) = read_cache_versions(INFRASTRUCTURE_CATALOG_VERSION_KEY)
+    if catalog is None or catalog.version != version:
+        catalog = _load_catalog(version)
+    with _STATE.lock:
+        _STATE.catalog = catalog
+        _STATE.checked_at = now
+    return catalog
+
+
+def invalidate_infrastructure_catalog() -> None:
+    """
+    Bump the shared version inside the current transaction and drop this worker's copy.
+
+    The copy is dropped again on commit so a catalog rebuilt mid-transaction is not kept. A rolled
+    back change restores the previous version, which differs from the one that catalog was built
+    under, and later bumps draw new sequence values, so that catalog is never served as current.
+    """
+
+    bump_cache_versions(INFRASTRUCTURE_CATALOG_VERSION_KEY)
+    _drop_local_catalog()
+    transaction.on_commit(_drop_local_catalog)
+
+
+def _drop_local_catalog() -> None:
+    with _STATE.lock:
+        _STATE.catalog = None
+
+
+def _load_catalog(version: int) -> InfrastructureCatalog:
+    farms = tuple(
+        FarmEntry(id=pk, name=name)
+        for pk, name in Farm.objects.order_by("name", "pk").values_list("pk", "name")
+    )
+    chicken_houses = tuple(
+        ChickenHouseEntry(id=pk, name=name, farm_id=farm_id, farm_name=farm_name)
+        for pk, name, farm_id, farm_name in ChickenHouse.objects.order_by("farm__name", "name", "pk").values_list(
+            "pk", "name", "farm_id", "farm__name"
+        )
+    )
+    rooms = tuple(
+        RoomEntry(
+            id=pk,
+            name=name,
+            chicken_house_id=house_id,
+            chicken_house_name=house_name,
+            farm_id=farm_id,
+            farm_name=farm_name,
+        )
+        for pk, name, house_id, house_name, farm_id, farm_name in Room.objects.order_by(
+            "chicken_house__farm__name", "chicken_house__name", "name", "pk"
+        ).values_list(
+            "pk",
+            "name",
+            "chicken_house_id",
+            "chicken_house__name",
+            "chicken_house__farm_id",
+            "chicken_house__farm__name",
+        )
+    )
+    positions = tuple(
+        PositionEntry(
+            id=row["pk"],
+            name=row["name"],
+            code=row["code"],
+            display_order=row["display_order"],
+            farm_id=row["farm_id"],
+            farm_name=row["farm__name"] or "",
+            chicken_house_id=row["chicken_house_id"],
+            chicken_house_name=row["chicken_house__name"] or "",
+            valid_from=row["valid_from"],
+            valid_until=row["valid_until"],
+        )
+        for row in PositionDefinition.objects.order_by("display_order", "name", "pk").values(
+            "pk",
+            "name",
+            "code",
+            "display_order",
+            "farm_id",
+            "farm__name",
+            "chicken_house_id",
+            "chicken_house__name",
+            "valid_from",
+            "valid_until",
+        )
+    )
+    return InfrastructureCatalog(
+        version=version,
+        farms=farms,
+        chicken_houses=chicken_houses,
+        rooms=rooms,
+        positions=positions,
+        farm_by_id={farm.id: farm for farm in farms},
+        chicken_house_by_id={house.id: house for house in chicken_houses},
+        room_by_id={room.id: room for room in rooms},
+        position_by_id={position.id: position for position in positions},
+    )
+
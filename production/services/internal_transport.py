@@ -5,15 +5,20 @@ from datetime import date
 from decimal import Decimal
 from typing import Iterable, Sequence
 
+from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.contrib.postgres.fields import ArrayField
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import Prefetch, Sum
-from django.db.models.functions import Coalesce
+from django.db.models import Case, CharField, DecimalField, F, OuterRef, Prefetch, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from personal.models import UserProfile
-from production.models import EggClassificationBatch, Farm, ProductionRoomRecord
+from production.models import EggClassificationBatch, EggClassificationEntry, Farm, ProductionRoomRecord
+from production.services.cache_versions import bump_cache_versions, read_cache_versions
 
 
 @dataclass(frozen=True)
@@ -37,6 +42,20 @@ class TransportBatchSnapshot:
     confirmed_cartons: Decimal | None
 
 
+@dataclass(frozen=True)
+class TransportQueueSnapshot:
+    record_id: int
+    production_date: date
+    farm_names: list[str]
+    destination_name: str
+    chicken_houses: list[str]
+    rooms: list[str]
+    cartons_confirmed: Decimal
+    transport_status: str
+    transporter_id: int | None
+    expected_date: date | None
+
+
 def _room_prefetch() -> Prefetch:
     return Prefetch(
         "production_record__room_records",
@@ -48,37 +67,6 @@ def _room_prefetch() -> Prefetch:
     )
 
 
-def collect_chicken_house_names(room_records: Iterable[ProductionRoomRecord]) -> list[str]:
-    seen: dict[str, None] = {}
-    for record in room_records:
-        name = record.room.chicken_house.name
-        if name not in seen:
-            seen[name] = None
-    return list(seen.keys())
-
-
-def collect_room_names(room_records: Iterable[ProductionRoomRecord]) -> list[str]:
-    seen: dict[str, None] = {}
-    for record in room_records:
-        name = record.room.name
-        if name not in seen:
-            seen[name] = None
-    return list(seen.keys())
-
-
-def _resolve_destination_name(batch: EggClassificationBatch, room_records: Iterable[ProductionRoomRecord]) -> str:
-    if batch.transport_destination_farm:
-        return batch.transport_destination_farm.name
-    destinations: dict[str, None] = {}
-    for record in room_records:
-        destination = record.room.chicken_house.destination_farm
-        if destination:
-            destinations[destination.name] = None
-    if destinations:
-        return ", ".join(destinations.keys())
-    return batch.bird_batch.farm.name
-
-
 def _resolve_destination_farm(batch: EggClassificationBatch) -> Farm | None:
     if batch.transport_destination_farm:
         return batch.transport_destination_farm
@@ -104,7 +92,154 @@ def _format_transporter_label(transporter: UserProfile | None) -> str | None:
     return label.strip() if label else None
 
 
+TRANSPORT_READ_MODEL_CACHE_KEY = "production:transport-read-model"
+TRANSPORT_QUEUE_CACHE_KEY = "production:transport-queue"
+TRANSPORT_VERSION_KEY = "production:transport"
+# Transport steps bump the shared version, so entries never outlive a change; the timeout only
+# evicts snapshots of versions nobody reads anymore.
+TRANSPORT_READ_MODEL_CACHE_SECONDS = 30
+ACTIVE_TRANSPORT_STATUSES = (
+    EggClassificationBatch.TransportStatus.AUTHORIZED,
+    EggClassificationBatch.TransportStatus.IN_TRANSIT,
+    EggClassificationBatch.TransportStatus.VERIFICATION,
+)
+_DECIMAL_FIELD = DecimalField(max_digits=12, decimal_places=2)
+_ROOM_RECORD_ORDERING = ("room__chicken_house__name", "room__name")
+# Rooms whose eggs travel to another farm; only those make a production eligible for transport.
+TRANSFER_ROOM_FILTER = Q(room__chicken_house__egg_destination_farm__isnull=False) & ~Q(
+    room__chicken_house__egg_destination_farm=F("room__chicken_house__farm")
+)
+
+
 def build_transport_snapshot(*, statuses: Iterable[str]) -> list[TransportBatchSnapshot]:
+    wanted = set(statuses)
+    if wanted.issubset(ACTIVE_TRANSPORT_STATUSES):
+        return [snapshot for snapshot in get_transport_read_model() if snapshot.transport_status in wanted]
+    return _query_transport_snapshot(wanted)
+
+
+def get_transport_read_model() -> tuple[TransportBatchSnapshot, ...]:
+    """
+    Snapshot of every batch in an active transport stage, shared by the stage and verification
+    payloads. Cached under the shared transport version that ``invalidate_transport_read_model``
+    bumps after a transport step.
+    """
+    (version,) = read_cache_versions(TRANSPORT_VERSION_KEY)
+    cache_key = f"{TRANSPORT_READ_MODEL_CACHE_KEY}:{version}"
+    snapshot = cache.get(cache_key)
+    if snapshot is not None:
+        return snapshot
+    snapshot = tuple(_query_transport_snapshot(ACTIVE_TRANSPORT_STATUSES))
+    cache.set(
+        cache_key,
+        snapshot,
+        getattr(settings, "TRANSPORT_READ_MODEL_CACHE_SECONDS", TRANSPORT_READ_MODEL_CACHE_SECONDS),
+    )
+    return snapshot
+
+
+def get_transport_queue_snapshot(*, start_date: date) -> tuple[TransportQueueSnapshot, ...]:
+    """
+    Productions since ``start_date`` with transfer rooms and cartons still to move, excluding those
+    already in verification. Cached under the transport read model's version.
+    """
+    (version,) = read_cache_versions(TRANSPORT_VERSION_KEY)
+    cache_key = f"{TRANSPORT_QUEUE_CACHE_KEY}:{version}:{start_date.isoformat()}"
+    snapshot = cache.get(cache_key)
+    if snapshot is not None:
+        return snapshot
+    snapshot = tuple(_query_transport_queue(start_date))
+    cache.set(
+        cache_key,
+        snapshot,
+        getattr(settings, "TRANSPORT_READ_MODEL_CACHE_SECONDS", TRANSPORT_READ_MODEL_CACHE_SECONDS),
+    )
+    return snapshot
+
+
+def invalidate_transport_read_model() -> None:
+    """Retire the cached transport snapshots on every worker once the surrounding transaction commits."""
+    bump_cache_versions(TRANSPORT_VERSION_KEY)
+
+
+def _room_names(expression, *, transfer_only: bool = False) -> Subquery:
+    room_records = ProductionRoomRecord.objects.filter(production_record_id=OuterRef("production_record_id"))
+    if transfer_only:
+        room_records = room_records.filter(TRANSFER_ROOM_FILTER)
+    return Subquery(
+        room_records.order_by()
+        .values("production_record_id")
+        .annotate(names=ArrayAgg(expression, ordering=_ROOM_RECORD_ORDERING))
+        .values("names"),
+        output_field=ArrayField(CharField()),
+    )
+
+
+def _unique(names: Iterable[str] | None) -> list[str]:
+    return list(dict.fromkeys(name for name in names or [] if name))
+
+
+def _classified_cartons() -> Coalesce:
+    classified = (
+        EggClassificationEntry.objects.filter(batch_id=OuterRef("pk"))
+        .order_by()
+        .values("batch_id")
+        .annotate(total=Sum("cartons"))
+        .values("total")
+    )
+    return Coalesce(Subquery(classified, output_field=_DECIMAL_FIELD), Value(Decimal("0")))
+
+
+def _query_transport_queue(start_date: date) -> list[TransportQueueSnapshot]:
+    qs = (
+        EggClassificationBatch.objects.select_related("production_record", "transport_destination_farm")
+        .filter(production_record__date__gte=start_date)
+        .exclude(
+            transport_status__in=[
+                EggClassificationBatch.TransportStatus.VERIFIED,
+                EggClassificationBatch.TransportStatus.VERIFICATION,
+            ]
+        )
+        .annotate(
+            classified_cartons=_classified_cartons(),
+            confirmed_source_cartons=Coalesce("received_cartons", "reported_cartons", output_field=_DECIMAL_FIELD),
+            house_names=_room_names(F("room__chicken_house__name"), transfer_only=True),
+            room_names=_room_names(F("room__name"), transfer_only=True),
+            farm_names=_room_names(F("room__chicken_house__farm__name"), transfer_only=True),
+            destination_names=_room_names(
+                F("room__chicken_house__egg_destination_farm__name"),
+                transfer_only=True,
+            ),
+        )
+        .filter(
+            house_names__isnull=False,
+            confirmed_source_cartons__gt=0,
+            classified_cartons__lt=F("confirmed_source_cartons"),
+        )
+        .order_by("production_record__date", "production_record_id")
+    )
+    return [
+        TransportQueueSnapshot(
+            record_id=batch.production_record_id,
+            production_date=batch.production_record.date,
+            farm_names=_unique(batch.farm_names),
+            destination_name=(
+                batch.transport_destination_farm.name
+                if batch.transport_destination_farm
+                else ", ".join(_unique(batch.destination_names))
+            ),
+            chicken_houses=_unique(batch.house_names),
+            rooms=_unique(batch.room_names),
+            cartons_confirmed=Decimal(batch.confirmed_source_cartons),
+            transport_status=batch.transport_status,
+            transporter_id=batch.transport_transporter_id,
+            expected_date=batch.transport_expected_date,
+        )
+        for batch in qs
+    ]
+
+
+def _query_transport_snapshot(statuses: Iterable[str]) -> list[TransportBatchSnapshot]:
     qs = (
         EggClassificationBatch.objects.select_related(
             "bird_batch__farm",
@@ -112,33 +247,45 @@ def build_transport_snapshot(*, statuses: Iterable[str]) -> list[TransportBatchS
             "transport_transporter",
             "production_record",
         )
-        .prefetch_related(_room_prefetch())
-        .annotate(classified_cartons=Coalesce(Sum("classification_entries__cartons"), Decimal("0")))
+        .annotate(
+            classified_cartons=_classified_cartons(),
+            confirmed_source_cartons=Coalesce("received_cartons", "reported_cartons", output_field=_DECIMAL_FIELD),
+            pending_source_cartons=Greatest(
+                Case(
+                    When(received_cartons__isnull=True, then=F("reported_cartons")),
+                    default=F("received_cartons") - F("classified_cartons"),
+                    output_field=_DECIMAL_FIELD,
+                ),
+                Value(Decimal("0")),
+                output_field=_DECIMAL_FIELD,
+            ),
+            house_names=_room_names(F("room__chicken_house__name")),
+            room_names=_room_names(F("room__name")),
+            destination_names=_room_names(
+                Coalesce("room__chicken_house__egg_destination_farm__name", "room__chicken_house__farm__name")
+            ),
+        )
         .filter(transport_status__in=list(statuses))
         .order_by("production_record__date", "pk")
     )
 
     snapshot: list[TransportBatchSnapshot] = []
     for batch in qs:
-        batch._classified_total_cache = Decimal(batch.classified_cartons)
-        confirmed = Decimal(batch.received_cartons) if batch.received_cartons is not None else Decimal(batch.reported_cartons)
-        pending = batch.pending_cartons
-        if pending < 0:
-            pending = Decimal("0")
-        room_records = getattr(batch.production_record, "transport_room_records", [])
-        chicken_houses = collect_chicken_house_names(room_records)
-        rooms = collect_room_names(room_records)
+        if batch.transport_destination_farm:
+            destination_name = batch.transport_destination_farm.name
+        else:
+            destination_name = ", ".join(_unique(batch.destination_names)) or batch.bird_batch.farm.name
         snapshot.append(
             TransportBatchSnapshot(
                 id=batch.pk,
                 production_date=batch.production_record.date,
                 farm_name=batch.bird_batch.farm.name,
-                destination_name=_resolve_destination_name(batch, room_records),
-                chicken_houses=chicken_houses,
-                rooms=rooms,
-                cartons_confirmed=confirmed,
+                destination_name=destination_name,
+                chicken_houses=_unique(batch.house_names),
+                rooms=_unique(batch.room_names),
+                cartons_confirmed=Decimal(batch.confirmed_source_cartons),
                 classified_cartons=Decimal(batch.classified_cartons),
-                pending_cartons=pending,
+                pending_cartons=Decimal(batch.pending_source_cartons),
                 transport_status=batch.transport_status,
                 transport_status_label=batch.get_transport_status_display(),
                 progress_step=batch.transport_progress_step or None,
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable, Sequence
+
+from django.db import connection
+
+from production.models import BirdBatch, ProductionRecord, ProductionRoomRecord
+from production.services.egg_classification import ensure_batch_for_record
+from production.services.internal_transport import invalidate_transport_read_model
+
+
+ROOM_METRIC_FIELDS = ("production", "consumption", "mortality", "discard")
+
+
+def lock_production_submission(
+    bird_batch_ids: Iterable[int],
+    target_date: date,
+) -> tuple[dict[int, ProductionRecord], dict[tuple[int, int], ProductionRoomRecord]]:
+    """
+    Lock the day's records of the lots and their room records with two queries.
+
+    Returns the records keyed by lot and the room records keyed by ``(bird_batch_id, room_id)``,
+    with ``production_record`` already attached so later writes do not reload it.
+    """
+
+    records = {
+        record.bird_batch_id: record
+        for record in ProductionRecord.objects.select_for_update().filter(
+            bird_batch_id__in=set(bird_batch_ids),
+            date=target_date,
+        )
+    }
+    record_by_id = {record.pk: record for record in records.values()}
+    room_records: dict[tuple[int, int], ProductionRoomRecord] = {}
+    if record_by_id:
+        for room_record in ProductionRoomRecord.objects.select_for_update().filter(
+            production_record_id__in=record_by_id
+        ):
+            record = record_by_id[room_record.production_record_id]
+            room_record.production_record = record
+            room_records[(record.bird_batch_id, room_record.room_id)] = room_record
+    return records, room_records
+
+
+def clean_submission_row(instance: ProductionRecord | ProductionRoomRecord) -> None:
+    """Validate field values without the per-row foreign key and uniqueness lookups."""
+
+    relation_fields = [field.name for field in instance._meta.concrete_fields if field.is_relation]
+    instance.full_clean(exclude=relation_fields, validate_unique=False, validate_constraints=False)
+
+
+def write_production_submission(
+    *,
+    records: Sequence[ProductionRecord],
+    room_records: Sequence[ProductionRoomRecord],
+    record_fields: Sequence[str],
+    room_fields: Sequence[str] = ROOM_METRIC_FIELDS,
+) -> None:
+    """
+    Persist a registry submission with one upsert per table and one totals statement.
+
+    ``records`` and ``room_records`` are validated in memory by the caller; bulk writes skip the
+    model signals, so the egg classification batches and the transport read model are refreshed
+    here once for the whole submission instead of once per row.
+    """
+
+    if not records:
+        return
+
+    ProductionRecord.objects.bulk_create(
+        records,
+        update_conflicts=True,
+        unique_fields=("bird_batch", "date"),
+        update_fields=(*record_fields, "updated_at"),
+    )
+    if room_records:
+        ProductionRoomRecord.objects.bulk_create(
+            room_records,
+            update_conflicts=True,
+            unique_fields=("production_record", "room"),
+            update_fields=(*room_fields, "updated_at"),
+        )
+    recompute_production_totals(records, fields=room_fields)
+
+    bird_batches = BirdBatch.objects.in_bulk({record.bird_batch_id for record in records})
+    for record in records:
+        record.bird_batch = bird_batches[record.bird_batch_id]
+        ensure_batch_for_record(record)
+    invalidate_transport_read_model()
+
+
+def recompute_production_totals(
+    records: Sequence[ProductionRecord],
+    *,
+    fields: Iterable[str] = ROOM_METRIC_FIELDS,
+) -> None:
+    """
+    Set the ``fields`` totals of ``records`` to the sum of their room records in a single statement.
+
+    Only the metrics a submission wrote are recomputed, so a night mortality report leaves the
+    production total as it was.
+    """
+
+    record_by_id = {record.pk: record for record in records if record.pk}
+    wanted = set(fields)
+    metrics = [name for name in ROOM_METRIC_FIELDS if name in wanted]
+    if not record_by_id or not metrics:
+        return
+
+    quote = connection.ops.quote_name
+    record_table = quote(ProductionRecord._meta.db_table)
+    room_table = quote(ProductionRoomRecord._meta.db_table)
+    room_fk = quote(ProductionRoomRecord._meta.get_field("production_record").column)
+    columns = [quote(ProductionRecord._meta.get_field(name).column) for name in metrics]
+    assignments = ", ".join(f"{column} = COALESCE(totals.{column}, 0)" for column in columns)
+    sums = ", ".join(f"SUM(room.{column}) AS {column}" for column in columns)
+    returning = ", ".join(f"record.{column}" for column in columns)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {record_table} AS record
+            SET {assignments}
+            FROM (
+                SELECT parent.id AS record_id, {sums}
+                FROM {record_table} AS parent
+                LEFT JOIN {room_table} AS room ON room.{room_fk} = parent.id
+                WHERE parent.id = ANY(%s)
+                GROUP BY parent.id
+            ) AS totals
+            WHERE record.id = totals.record_id
+            RETURNING record.id, {returning}
+            """,
+            [list(record_by_id)],
+        )
+        for record_id, *totals in cursor.fetchall():
+            record = record_by_id[record_id]
+            for name, value in zip(metrics, totals):
+                field = ProductionRecord._meta.get_field(name)
+                setattr(record, name, field.to_python(value))
@@ -1,10 +1,55 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from production.models import ProductionRecord
+from personal.models import PositionDefinition
+from production.models import (
+    ChickenHouse,
+    EggClassificationBatch,
+    EggClassificationEntry,
+    Farm,
+    ProductionRecord,
+    ProductionRoomRecord,
+    Room,
+)
 from production.services.egg_classification import ensure_batch_for_record
+from production.services.infrastructure_catalog import invalidate_infrastructure_catalog
+from production.services.internal_transport import invalidate_transport_read_model
 
 
 @receiver(post_save, sender=ProductionRecord)
 def ensure_classification_entry(sender, instance: ProductionRecord, **_kwargs) -> None:
     ensure_batch_for_record(instance)
+
+
+@receiver(post_save, sender=ProductionRecord, dispatch_uid="production_record_transport_read_model")
+@receiver(post_delete, sender=ProductionRecord, dispatch_uid="production_record_delete_transport_read_model")
+@receiver(post_save, sender=EggClassificationBatch, dispatch_uid="classification_batch_transport_read_model")
+@receiver(
+    post_delete,
+    sender=EggClassificationBatch,
+    dispatch_uid="classification_batch_delete_transport_read_model",
+)
+@receiver(post_save, sender=EggClassificationEntry, dispatch_uid="classification_entry_transport_read_model")
+@receiver(
+    post_delete,
+    sender=EggClassificationEntry,
+    dispatch_uid="classification_entry_delete_transport_read_model",
+)
+@receiver(post_save, sender=ProductionRoomRecord, dispatch_uid="room_record_transport_read_model")
+@receiver(post_delete, sender=ProductionRoomRecord, dispatch_uid="room_record_delete_transport_read_model")
+@receiver(post_save, sender=ChickenHouse, dispatch_uid="chicken_house_transport_read_model")
+@receiver(post_save, sender=Farm, dispatch_uid="farm_transport_read_model")
+def _invalidate_transport_read_model(sender, **_kwargs) -> None:
+    invalidate_transport_read_model()
+
+
+@receiver(post_save, sender=Farm, dispatch_uid="farm_infrastructure_catalog")
+@receiver(post_delete, sender=Farm, dispatch_uid="farm_delete_infrastructure_catalog")
+@receiver(post_save, sender=ChickenHouse, dispatch_uid="chicken_house_infrastructure_catalog")
+@receiver(post_delete, sender=ChickenHouse, dispatch_uid="chicken_house_delete_infrastructure_catalog")
+@receiver(post_save, sender=Room, dispatch_uid="room_infrastructure_catalog")
+@receiver(post_delete, sender=Room, dispatch_uid="room_delete_infrastructure_catalog")
+@receiver(post_save, sender=PositionDefinition, dispatch_uid="position_infrastructure_catalog")
+@receiver(post_delete, sender=PositionDefinition, dispatch_uid="position_delete_infrastructure_catalog")
+def _invalidate_infrastructure_catalog(sender, **_kwargs) -> None:
+    invalidate_infrastructure_catalog()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from personal.models import PositionCategory, PositionCategoryCode, PositionDefinition, ShiftType
+from production.models import ChickenHouse, Farm, Room
+from production.services.cache_versions import bump_cache_versions
+from production.services.infrastructure_catalog import (
+    INFRASTRUCTURE_CATALOG_VERSION_KEY,
+    get_infrastructure_catalog,
+)
+from task_manager.views import build_scope_filter_groups
+
+
+class InfrastructureCatalogTests(TestCase):
+    def setUp(self) -> None:
+        self.farm = Farm.objects.create(name="Granja Norte")
+        self.house = ChickenHouse.objects.create(farm=self.farm, name="Galpón 1")
+        self.room = Room.objects.create(chicken_house=self.house, name="Sala A", area_m2=100)
+        category, _ = PositionCategory.objects.get_or_create(
+            code=PositionCategoryCode.GALPONERO_PRODUCCION_DIA,
+            defaults={"shift_type": ShiftType.DAY},
+        )
+        self.position = PositionDefinition.objects.create(
+            name="Galponero norte",
+            code="CAT-001",
+            category=category,
+            farm=self.farm,
+            chicken_house=self.house,
+            valid_from=date(2025, 1, 1),
+            valid_until=date(2025, 6, 30),
+        )
+
+    def test_catalog_exposes_hierarchy_and_active_ranges(self) -> None:
+        catalog = get_infrastructure_catalog()
+
+        self.assertEqual(catalog.farm_by_id[self.farm.pk].name, "Granja Norte")
+        self.assertEqual(catalog.chicken_house_by_id[self.house.pk].full_label, "Granja Norte · Galpón 1")
+        self.assertEqual(
+            [room.id for room in catalog.rooms_for_chicken_house(self.house.pk)],
+            [self.room.pk],
+        )
+        self.assertEqual(catalog.room_by_id[self.room.pk].farm_id, self.farm.pk)
+        self.assertIn(self.position.pk, [position.id for position in catalog.positions_active_on(date(2025, 3, 1))])
+        self.assertNotIn(self.position.pk, [position.id for position in catalog.positions_active_on(date(2025, 7, 1))])
+
+    @override_settings(INFRASTRUCTURE_CATALOG_RECHECK_SECONDS=60)
+    def test_filter_pickers_reuse_the_catalog_without_queries(self) -> None:
+        get_infrastructure_catalog()
+
+        with self.assertNumQueries(0):
+            groups = {group.key: group for group in build_scope_filter_groups()}
+
+        room_values = [option.value for option in groups["rooms"].options]
+        self.assertIn(f"room:{self.room.pk}", room_values)
+        self.assertEqual(len(room_values), Room.objects.count())
+
+    @override_settings(INFRASTRUCTURE_CATALOG_RECHECK_SECONDS=60)
+    def test_saving_infrastructure_refreshes_the_catalog(self) -> None:
+        stale = get_infrastructure_catalog()
+
+        self.house.name = "Galpón Renombrado"
+        self.house.save(update_fields=["name"])
+
+        catalog = get_infrastructure_catalog()
+        self.assertGreater(catalog.version, stale.version)
+        self.assertEqual(catalog.chicken_house_by_id[self.house.pk].name, "Galpón Renombrado")
+
+    def test_version_check_detects_changes_from_other_workers(self) -> None:
+        catalog = get_infrastructure_catalog()
+        Farm.objects.filter(pk=self.farm.pk).update(name="Granja Sur")
+
+        with self.assertNumQueries(1):
+            self.assertIs(get_infrastructure_catalog(), catalog)
+
+        bump_cache_versions(INFRASTRUCTURE_CATALOG_VERSION_KEY)
+        self.assertEqual(get_infrastructure_catalog().farm_by_id[self.farm.pk].name, "Granja Sur")
+
+    def test_rolled_back_bump_never_resurfaces_as_a_later_version(self) -> None:
+        class Rollback(Exception):
+            pass
+
+        with self.assertRaises(Rollback), transaction.atomic():
+            self.farm.name = "Granja Fantasma"
+            self.farm.save(update_fields=["name"])
+            uncommitted = get_infrastructure_catalog()
+            raise Rollback
+
+        bump_cache_versions(INFRASTRUCTURE_CATALOG_VERSION_KEY)
+        catalog = get_infrastructure_catalog()
+        self.assertNotEqual(catalog.version, uncommitted.version)
+        self.assertEqual(catalog.farm_by_id[self.farm.pk].name, "Granja Norte")
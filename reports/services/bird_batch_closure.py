@@ -11,6 +11,7 @@ from django.db.models import Avg, ExpressionWrapper, F, Sum
 from django.db.models.functions import Cast, Coalesce
 
 from administration.models import PurchaseRequest, Sale, SaleItem
+from applacolina.profiling import profiled
 from production.models import (
     BirdBatch,
     BirdBatchRoomAllocation,
@@ -89,6 +90,7 @@ class BirdBatchClosureResult:
     inventory_alignment: dict[str, Decimal]
 
 
+@profiled("reports.bird_batch_closure")
 def build_bird_batch_closure_report(*, batch_id: int, start_date: date, end_date: date) -> BirdBatchClosureResult:
     if start_date > end_date:
         raise ValueError("El rango de fechas es inválido.")
@@ -9,6 +9,7 @@ from typing import Any
 from django.db.models import Q, Sum
 
 from administration.models import Sale, SaleItem, SaleProductType
+from applacolina.profiling import profiled
 from production.models import EggClassificationBatch, EggClassificationEntry, EggDispatch, EggDispatchItem, EggType
 from production.services.egg_classification import ORDERED_EGG_TYPES
 
@@ -74,6 +75,7 @@ class InventoryComparisonResult:
     details: dict[str, list["StageDetailRow"]]
 
 
+@profiled("reports.inventory_comparison")
 def build_inventory_comparison(
     *,
     production_start: date,
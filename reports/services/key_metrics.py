@@ -19,6 +19,7 @@ from django.db.models import (
 from django.db.models.functions import Coalesce, Greatest
 
 from administration.models import Sale, SaleItem, SalePayment, SaleProductType
+from applacolina.profiling import profiled
 from production.models import (
     BirdBatch,
     EggClassificationBatch,
@@ -48,6 +49,7 @@ class KeyMetricsResult:
     charts: dict[str, Any]
 
 
+@profiled("reports.key_metrics")
 def build_key_metrics(start_date: date, end_date: date) -> KeyMetricsResult:
     """Compose the aggregated payload for the executive dashboard."""
     if start_date > end_date:
@@ -10,6 +10,7 @@ from django.db.models import DecimalField, Q
 from django.db.models.functions import Coalesce, Cast
 from administration.models import PurchaseRequest
 from administration.services.purchases import ACTION_BY_STATUS, STATUS_BADGES
+from applacolina.profiling import profiled
 
 DECIMAL_FIELD = DecimalField(max_digits=14, decimal_places=2)
 DATE_FIELD = models.DateField()
@@ -73,6 +74,7 @@ class PurchaseInsightsResult:
     chart_payload: dict[str, Any]
 
 
+@profiled("reports.purchase_insights")
 def build_purchase_insights(filters: PurchaseInsightsFilters) -> PurchaseInsightsResult:
     queryset = _base_queryset()
     queryset = _apply_filters(queryset, filters)
@@ -5,6 +5,7 @@ from personal.models import DayOfWeek
 
 from .models import (
     MiniAppPushSubscription,
+    PushNotificationOutbox,
     TaskAssignment,
     TaskAssignmentEvidence,
     TaskCategory,
@@ -202,3 +203,12 @@ class MiniAppPushSubscriptionAdmin(admin.ModelAdmin):
     search_fields = ("user__nombres", "user__apellidos", "user__cedula", "endpoint")
     readonly_fields = ("endpoint", "created_at", "updated_at")
     autocomplete_fields = ("user",)
+
+
+@admin.register(PushNotificationOutbox)
+class PushNotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ("notification_type", "subscription", "status", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("status", "notification_type")
+    search_fields = ("notification_type", "subscription__user__nombres", "subscription__user__apellidos")
+    readonly_fields = ("created_at", "updated_at", "sent_at", "last_error")
+    raw_id_fields = ("subscription",)
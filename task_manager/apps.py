@@ -34,5 +34,9 @@ class TaskManagerConfig(AppConfig):
             dispatch_uid="task_manager_grant_mini_app_permission",
         )
 
+        from applacolina.pagination import track_counts
+
+        track_counts(django_apps.get_model("task_manager", "TaskDefinition"))
+
         # Ensure signal handlers are registered.
         from . import signals  # noqa: F401
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.services.push_notifications import PushOutboxDispatcher
+
+
+class Command(BaseCommand):
+    help = "Envía las notificaciones push pendientes en la cola (outbox) de la mini app."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=100,
+            help="Cantidad máxima de notificaciones reclamadas por iteración (default: 100).",
+        )
+        parser.add_argument(
+            "--workers",
+            dest="workers",
+            type=int,
+            default=8,
+            help="Envíos concurrentes hacia los endpoints push (default: 8).",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            dest="max_attempts",
+            type=int,
+            default=5,
+            help="Intentos antes de marcar una notificación como fallida (default: 5).",
+        )
+        parser.add_argument(
+            "--loop",
+            dest="loop",
+            action="store_true",
+            default=False,
+            help="Mantiene el proceso activo consultando la cola periódicamente.",
+        )
+        parser.add_argument(
+            "--interval",
+            dest="interval",
+            type=float,
+            default=2.0,
+            help="Segundos de espera cuando la cola está vacía en modo --loop (default: 2).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size: int = options["batch_size"]
+        if batch_size <= 0:
+            raise CommandError("El parámetro --batch-size debe ser un entero positivo.")
+
+        dispatcher = PushOutboxDispatcher(
+            max_workers=options["workers"],
+            max_attempts=options["max_attempts"],
+        )
+
+        while True:
+            summary = dispatcher.dispatch_due(batch_size=batch_size)
+            if summary.claimed:
+                self.stdout.write(
+                    self.style.HTTP_INFO(
+                        "  → Procesadas %(claimed)s: enviadas %(sent)s, reintentos %(retried)s, "
+                        "fallidas %(failed)s, descartadas %(discarded)s"
+                        % {
+                            "claimed": summary.claimed,
+                            "sent": summary.sent,
+                            "retried": summary.retried,
+                            "failed": summary.failed,
+                            "discarded": summary.discarded,
+                        }
+                    )
+                )
+            if not options["loop"]:
+                break
+            if summary.claimed < batch_size:
+                time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS("Despacho de notificaciones completado."))
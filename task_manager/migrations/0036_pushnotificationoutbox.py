@@ -0,0 +1,38 @@
+# Generated by Django 5.0.14 on 2026-10-18 21:32
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_manager', '0035_alter_taskdefinition_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PushNotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notification_type', models.CharField(max_length=80, verbose_name='Tipo')),
+                ('payload', models.JSONField(default=dict, verbose_name='Contenido')),
+                ('ttl', models.PositiveIntegerField(default=300, verbose_name='TTL (segundos)')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('sending', 'Enviando'), ('sent', 'Enviada'), ('failed', 'Fallida'), ('discarded', 'Descartada')], default='pending', max_length=16, verbose_name='Estado')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Próximo intento')),
+                ('last_error', models.TextField(blank=True, verbose_name='Último error')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Enviada en')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('subscription', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbox_entries', to='task_manager.miniapppushsubscription', verbose_name='Suscripción')),
+            ],
+            options={
+                'verbose_name': 'Notificación push en cola',
+                'verbose_name_plural': 'Notificaciones push en cola',
+                'ordering': ('next_attempt_at', 'pk'),
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='tm_push_outbox_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0024_query_indexes'),
+        ('task_manager', '0036_pushnotificationoutbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='taskassignment',
+            index=models.Index(fields=['collaborator', 'due_date'], name='tm_assign_collab_due_idx'),
+        ),
+    ]
@@ -1,19 +1,30 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import date
 from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP, ROUND_UP
 from typing import Dict, Iterable, List, Optional, Sequence
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Prefetch, Sum
 from django.utils.formats import date_format
 
 from personal.models import UserProfile
-from production.models import BirdBatch, BirdBatchRoomAllocation, ProductionRoomRecord
+from production.models import BirdBatch, BirdBatchRoomAllocation, ChickenHouse, ProductionRoomRecord
+from production.services.cache_versions import bump_cache_versions, read_cache_versions
+from production.services.infrastructure_catalog import get_infrastructure_catalog
 from production.services.reference_tables import get_reference_targets
 
 from .production_registry import resolve_assignment_for_date
 
+FEED_PLAN_VERSION_CACHE_KEY = "feed-plan:version"
+# Plans are cached under database versions, so a write reaches every worker at once; the timeout
+# only drops plans of dates and versions that are no longer requested.
+FEED_PLAN_CACHE_SECONDS = 900
+
+_MISSING = object()
+
 BAG_WEIGHT_KG = Decimal("40")
 MORNING_RATIO = Decimal("0.65")
 KG_QUANTIZER = Decimal("0.01")
@@ -127,8 +138,77 @@ def build_feed_plan_card(
     if not chicken_house:
         return None
 
-    room_ids = list(position.rooms.values_list("pk", flat=True))
+    room_ids = sorted(position.rooms.values_list("pk", flat=True))
+    plan = get_house_feed_plan(chicken_house=chicken_house, room_ids=room_ids, target_date=target_date)
+    if plan is None:
+        return None
+    return replace(
+        plan,
+        position_label=position.name,
+        farm_name=position.farm.name if position.farm_id else None,
+    )
+
+
+def get_house_feed_plan(
+    *,
+    chicken_house: ChickenHouse,
+    room_ids: Sequence[int],
+    target_date: date,
+) -> Optional[FeedPlan]:
+    """
+    Return the plan for the house rooms on ``target_date``, computed once per house version.
+
+    Every operator assigned to the same rooms shares the cached plan; allocation, room record and
+    lot changes bump the house version so the next render recomputes it.
+    """
 
+    global_version, house_version = read_cache_versions(
+        FEED_PLAN_VERSION_CACHE_KEY, f"{FEED_PLAN_VERSION_CACHE_KEY}:{chicken_house.pk}"
+    )
+    rooms_key = ",".join(str(room_id) for room_id in sorted(room_ids)) or "all"
+    cache_key = (
+        f"feed-plan:{global_version}:{house_version}:{chicken_house.pk}:{target_date.isoformat()}:{rooms_key}"
+    )
+    plan = cache.get(cache_key, _MISSING)
+    if plan is _MISSING:
+        plan = _compute_house_feed_plan(chicken_house=chicken_house, room_ids=room_ids, target_date=target_date)
+        cache.set(cache_key, plan, getattr(settings, "FEED_PLAN_CACHE_SECONDS", FEED_PLAN_CACHE_SECONDS))
+    return plan
+
+
+def invalidate_feed_plans(chicken_house_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Expire the cached plans of the houses (every house when ``None``) once the transaction commits.
+    """
+
+    if chicken_house_ids is None:
+        bump_cache_versions(FEED_PLAN_VERSION_CACHE_KEY)
+        return
+    bump_cache_versions(
+        *(f"{FEED_PLAN_VERSION_CACHE_KEY}:{house_id}" for house_id in sorted(set(chicken_house_ids)) if house_id)
+    )
+
+
+def invalidate_feed_plans_for_rooms(room_ids: Iterable[int]) -> None:
+    """Expire the plans of the houses holding ``room_ids``, resolved through the infrastructure catalog."""
+
+    catalog = get_infrastructure_catalog()
+    house_ids: set[int] = set()
+    for room_id in room_ids:
+        room = catalog.room_by_id.get(room_id)
+        if room is None:
+            invalidate_feed_plans()
+            return
+        house_ids.add(room.chicken_house_id)
+    invalidate_feed_plans(house_ids)
+
+
+def _compute_house_feed_plan(
+    *,
+    chicken_house: ChickenHouse,
+    room_ids: Sequence[int],
+    target_date: date,
+) -> Optional[FeedPlan]:
     allocation_queryset = (
         BirdBatchRoomAllocation.objects.select_related("room", "room__chicken_house", "room__chicken_house__farm")
         .filter(room__chicken_house=chicken_house)
@@ -316,8 +396,8 @@ def build_feed_plan_card(
 
     return FeedPlan(
         date=target_date,
-        position_label=position.name,
-        farm_name=position.farm.name if position.farm_id else None,
+        position_label=None,
+        farm_name=None,
         chicken_house_name=chicken_house.name,
         houses=tuple(house_plans),
         lots=tuple(sorted(lot_summaries, key=lambda lot: lot.label)),
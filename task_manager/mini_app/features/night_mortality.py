@@ -6,15 +6,24 @@ from decimal import Decimal
 from typing import Iterable, Mapping, Optional
 
 from django.core.exceptions import ValidationError
-from django.db import models, transaction
+from django.db import transaction
 from django.utils import timezone
 from django.utils.formats import date_format
 from django.utils.translation import gettext as _
 
+from inventory.services import post_room_record_consumption
 from personal.models import ShiftType, UserProfile
-from production.models import BirdBatch, BirdBatchRoomAllocation, ProductionRecord, ProductionRoomRecord
+from production.models import ProductionRecord, ProductionRoomRecord
+from production.services.production_records import (
+    clean_submission_row,
+    lock_production_submission,
+    write_production_submission,
+)
 
+from .feed_plan import invalidate_feed_plans_for_rooms
 from .production_registry import (
+    get_farm_registry_snapshot,
+    invalidate_registry_snapshots_for_batches,
     resolve_assignment_for_date,
     _coerce_int,
     _coerce_decimal,
@@ -121,83 +130,40 @@ def build_night_mortality_registry(
     if not farm:
         return None
 
-    allocation_queryset = (
-        BirdBatchRoomAllocation.objects.select_related("room", "room__chicken_house")
-        .filter(room__chicken_house__farm=farm)
-        .order_by("room__chicken_house__name", "room__name")
-    )
-    batches_queryset = (
-        BirdBatch.objects.filter(status=BirdBatch.Status.ACTIVE, farm=farm)
-        .select_related("farm")
-        .prefetch_related(
-            models.Prefetch(
-                "allocations",
-                queryset=allocation_queryset,
-                to_attr="farm_allocations",
-            )
-        )
-        .order_by("pk")
-    )
-
-    batches: list[BirdBatch] = list(batches_queryset)
-    if not batches:
-        return None
-
-    room_record_queryset = ProductionRoomRecord.objects.select_related("room", "room__chicken_house")
-    records = {
-        record.bird_batch_id: record
-        for record in ProductionRecord.objects.select_related("created_by", "updated_by")
-        .prefetch_related(models.Prefetch("room_records", queryset=room_record_queryset))
-        .filter(bird_batch__in=batches, date=target_date)
-    }
+    snapshot = get_farm_registry_snapshot(farm.pk, target_date)
 
     lots: list[NightMortalityLotSnapshot] = []
-    for batch in batches:
-        allocations = getattr(batch, "farm_allocations", None) or []
-        if not allocations:
+    for batch in snapshot.batches:
+        allocations = snapshot.allocations.get(batch.batch_id, ())
+        if batch.farm_id != farm.pk or not allocations:
             continue
 
-        allocated_birds = sum(allocation.quantity or 0 for allocation in allocations)
-        record = records.get(batch.pk)
-        room_records_map = {
-            room_record.room_id: room_record
-            for room_record in record.room_records.all()
-        } if record else {}
-
         room_snapshots: list[NightMortalityRoomSnapshot] = []
-        house_labels: list[str] = []
         for allocation in allocations:
-            room = allocation.room
-            chicken_house = room.chicken_house
-            house_name = chicken_house.name if chicken_house else ""
-            if house_name:
-                house_labels.append(house_name)
-
-            room_record = room_records_map.get(allocation.room_id)
+            room_record = snapshot.room_records.get((batch.batch_id, allocation.room_id))
             room_snapshots.append(
                 NightMortalityRoomSnapshot(
                     room_id=allocation.room_id,
-                    label=room.name,
-                    chicken_house=house_name,
-                    allocated_birds=allocation.quantity or 0,
+                    label=allocation.room_name,
+                    chicken_house=allocation.chicken_house_name,
+                    allocated_birds=allocation.quantity,
                     mortality=room_record.mortality if room_record else None,
                     discard=room_record.discard if room_record else None,
                     consumption=_quantize_to_int(room_record.consumption) if room_record else None,
                 )
             )
 
-        if not room_snapshots:
-            continue
-
-        ordered_houses = tuple(dict.fromkeys(house_labels))
+        ordered_houses = tuple(
+            dict.fromkeys(allocation.chicken_house_name for allocation in allocations if allocation.chicken_house_name)
+        )
         lots.append(
             NightMortalityLotSnapshot(
-                batch_id=batch.pk,
-                label=str(batch),
-                farm_name=batch.farm.name if batch.farm_id else "",
+                batch_id=batch.batch_id,
+                label=batch.label,
+                farm_name=batch.farm_name,
                 chicken_house_names=ordered_houses,
                 rooms=tuple(room_snapshots),
-                allocated_birds=allocated_birds,
+                allocated_birds=sum(allocation.quantity for allocation in allocations),
             )
         )
 
@@ -265,146 +231,129 @@ def persist_night_mortality_entries(
     if not lot_by_id:
         raise ValidationError(_("No se encontraron lotes activos en tu granja."))
 
-    saved_records: list[ProductionRecord] = []
-    with transaction.atomic():
-        for entry in entries:
-            if not isinstance(entry, Mapping):
-                raise ValidationError(_("Formato de lote inválido."))
+    room_values_by_batch: dict[int, dict[int, dict[str, object]]] = {}
+    for entry in entries:
+        if not isinstance(entry, Mapping):
+            raise ValidationError(_("Formato de lote inválido."))
+
+        batch_id = entry.get("bird_batch") or entry.get("id")
+        try:
+            batch_id = int(str(batch_id))
+        except (TypeError, ValueError):
+            raise ValidationError(_("El lote enviado es inválido."))
+
+        lot = lot_by_id.get(batch_id)
+        if not lot:
+            raise ValidationError(_("El lote %(batch)s no pertenece a tu granja."), params={"batch": batch_id})
+
+        rooms_payload = entry.get("rooms")
+        if not isinstance(rooms_payload, list) or not rooms_payload:
+            raise ValidationError(
+                _("Debes enviar los salones para el lote %(batch)s."),
+                params={"batch": batch_id},
+            )
+
+        parsed_rooms: dict[int, dict[str, object]] = {}
+        for room_payload in rooms_payload:
+            if not isinstance(room_payload, Mapping):
+                raise ValidationError(_("Formato de salón inválido."))
 
-            batch_id = entry.get("bird_batch") or entry.get("id")
+            raw_room_id = room_payload.get("room_id") or room_payload.get("id")
             try:
-                batch_id = int(str(batch_id))
+                room_id = int(str(raw_room_id))
             except (TypeError, ValueError):
-                raise ValidationError(_("El lote enviado es inválido."))
-
-            lot = lot_by_id.get(batch_id)
-            if not lot:
-                raise ValidationError(_("El lote %(batch)s no pertenece a tu granja."), params={"batch": batch_id})
+                raise ValidationError(_("El identificador del salón es inválido."))
 
-            rooms_payload = entry.get("rooms")
-            if not isinstance(rooms_payload, list) or not rooms_payload:
+            if room_id not in lot.room_ids:
                 raise ValidationError(
-                    _("Debes enviar los salones para el lote %(batch)s."),
-                    params={"batch": batch_id},
+                    _("El salón %(room)s no pertenece al lote %(batch)s."),
+                    params={"room": room_id, "batch": batch_id},
                 )
 
-            parsed_rooms: dict[int, dict[str, object]] = {}
-            for room_payload in rooms_payload:
-                if not isinstance(room_payload, Mapping):
-                    raise ValidationError(_("Formato de salón inválido."))
-
-                raw_room_id = room_payload.get("room_id") or room_payload.get("id")
-                try:
-                    room_id = int(str(raw_room_id))
-                except (TypeError, ValueError):
-                    raise ValidationError(_("El identificador del salón es inválido."))
-
-                if room_id not in lot.room_ids:
-                    raise ValidationError(
-                        _("El salón %(room)s no pertenece al lote %(batch)s."),
-                        params={"room": room_id, "batch": batch_id},
-                    )
-
-                mortality = _coerce_int(room_payload.get("mortality"), field="mortality", allow_empty=True)
-                discard = _coerce_int(room_payload.get("discard"), field="discard", allow_empty=True)
-                consumption = _coerce_decimal(
-                    room_payload.get("consumption"),
-                    field="consumption",
-                    allow_decimals=False,
-                    allow_empty=True,
-                )
-                parsed_rooms[room_id] = {
-                    "mortality": mortality,
-                    "discard": discard,
-                    "consumption": consumption,
-                }
-
-            missing_rooms = lot.room_ids - set(parsed_rooms.keys())
-            if missing_rooms:
-                raise ValidationError(
-                    _("Debes enviar todos los salones asignados para el lote %(batch)s."),
-                    params={"batch": batch_id},
-                )
-
-            total_mortality = sum(values["mortality"] for values in parsed_rooms.values())
-            total_discard = sum(values["discard"] for values in parsed_rooms.values())
-            total_consumption = sum(
-                (values["consumption"] for values in parsed_rooms.values()),
-                Decimal("0"),
+            mortality = _coerce_int(room_payload.get("mortality"), field="mortality", allow_empty=True)
+            discard = _coerce_int(room_payload.get("discard"), field="discard", allow_empty=True)
+            consumption = _coerce_decimal(
+                room_payload.get("consumption"),
+                field="consumption",
+                allow_decimals=False,
+                allow_empty=True,
             )
-            record = _persist_mortality_for_lot(
-                lot=lot,
-                registry=registry,
-                room_values=parsed_rooms,
-                total_mortality=total_mortality,
-                total_discard=total_discard,
-                total_consumption=total_consumption,
-                user=user,
+            parsed_rooms[room_id] = {
+                "mortality": mortality,
+                "discard": discard,
+                "consumption": consumption,
+            }
+
+        missing_rooms = lot.room_ids - set(parsed_rooms.keys())
+        if missing_rooms:
+            raise ValidationError(
+                _("Debes enviar todos los salones asignados para el lote %(batch)s."),
+                params={"batch": batch_id},
             )
-            saved_records.append(record)
-    return saved_records
+        room_values_by_batch[batch_id] = parsed_rooms
+
+    with transaction.atomic():
+        return _persist_mortality_submission(
+            registry=registry,
+            room_values_by_batch=room_values_by_batch,
+            user=user,
+        )
 
 
-def _persist_mortality_for_lot(
+def _persist_mortality_submission(
     *,
-    lot: NightMortalityLotSnapshot,
     registry: NightMortalityRegistry,
-    room_values: Mapping[int, Mapping[str, object]],
-    total_mortality: int,
-    total_discard: int,
-    total_consumption: Decimal,
+    room_values_by_batch: Mapping[int, Mapping[int, Mapping[str, object]]],
     user: UserProfile,
-) -> ProductionRecord:
-    record_defaults = {
-        "production": Decimal("0"),
-        "consumption": total_consumption,
-        "mortality": total_mortality,
-        "discard": total_discard,
-        "created_by": user,
-        "updated_by": user,
-    }
-    record, created = ProductionRecord.objects.select_for_update().get_or_create(
-        bird_batch_id=lot.batch_id,
-        date=registry.date,
-        defaults=record_defaults,
-    )
-
-    if not created:
-        record.mortality = total_mortality
-        record.discard = total_discard
-        record.consumption = total_consumption
-        if record.created_by_id is None:
-            record.created_by = user
-        record.updated_by = user
-    record.full_clean()
-    record.save()
-
-    existing_room_records = {
-        room_record.room_id: room_record
-        for room_record in ProductionRoomRecord.objects.select_for_update()
-        .filter(production_record=record)
-    }
-    for room_id, values in room_values.items():
-        room_record = existing_room_records.get(room_id)
-        if room_record is None:
-            room_record = ProductionRoomRecord(
-                production_record=record,
-                room_id=room_id,
+) -> list[ProductionRecord]:
+    """Upsert every lot and room of the submission in bulk and post inventory once at the end."""
+
+    records_by_batch, existing_room_records = lock_production_submission(room_values_by_batch, registry.date)
+
+    records: list[ProductionRecord] = []
+    room_records: list[ProductionRoomRecord] = []
+    consumption_deltas: list[tuple[ProductionRoomRecord, Decimal]] = []
+    for batch_id, room_values in room_values_by_batch.items():
+        record = records_by_batch.get(batch_id)
+        if record is None:
+            record = ProductionRecord(
+                bird_batch_id=batch_id,
+                date=registry.date,
                 production=Decimal("0"),
-                consumption=Decimal("0"),
-                mortality=0,
-                discard=0,
+                created_by=user,
             )
-        room_record.mortality = values["mortality"]
-        room_record.discard = values["discard"]
-        room_record.consumption = values["consumption"]
-        if room_record.production is None:
-            room_record.production = Decimal("0")
-        if room_record.consumption is None:
-            room_record.consumption = Decimal("0")
-        if room_record.discard is None:
-            room_record.discard = 0
-        room_record.full_clean()
-        room_record.save()
-
-    return record
+        elif record.created_by_id is None:
+            record.created_by = user
+        record.mortality = sum(int(values["mortality"]) for values in room_values.values())
+        record.discard = sum(int(values["discard"]) for values in room_values.values())
+        record.consumption = sum((values["consumption"] for values in room_values.values()), Decimal("0"))
+        record.updated_by = user
+        clean_submission_row(record)
+        records.append(record)
+
+        for room_id, values in room_values.items():
+            room_record = existing_room_records.get((batch_id, room_id))
+            previous_consumption = room_record.consumption if room_record else Decimal("0")
+            if room_record is None:
+                room_record = ProductionRoomRecord(
+                    production_record=record,
+                    room_id=room_id,
+                    production=Decimal("0"),
+                )
+            room_record.mortality = values["mortality"]
+            room_record.discard = values["discard"]
+            room_record.consumption = values["consumption"]
+            clean_submission_row(room_record)
+            room_records.append(room_record)
+            consumption_deltas.append((room_record, room_record.consumption - previous_consumption))
+
+    write_production_submission(
+        records=records,
+        room_records=room_records,
+        record_fields=("created_by", "updated_by"),
+        room_fields=("mortality", "discard", "consumption"),
+    )
+    post_room_record_consumption(consumption_deltas, actor=user)
+    invalidate_feed_plans_for_rooms({room_record.room_id for room_record in room_records})
+    invalidate_registry_snapshots_for_batches(room_values_by_batch)
+    return records
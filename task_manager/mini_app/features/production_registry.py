@@ -5,15 +5,25 @@ from datetime import date, datetime
 from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
 from typing import Iterable, Mapping, Optional
 
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models, transaction
+from django.db import transaction
 from django.db.models import Case, IntegerField, Sum, Value, When
 from django.utils import timezone
 from django.utils.formats import date_format
 from django.utils.translation import gettext as _
 
+from inventory.services import post_room_record_consumption
 from personal.models import CalendarStatus, ShiftAssignment, UserProfile
 from production.models import BirdBatch, BirdBatchRoomAllocation, ProductionRecord, ProductionRoomRecord
+from production.services.cache_versions import bump_cache_versions, read_cache_versions
+from production.services.infrastructure_catalog import get_infrastructure_catalog
+from production.services.production_records import (
+    clean_submission_row,
+    lock_production_submission,
+    write_production_submission,
+)
 
 
 ACTIVE_CALENDAR_STATES = (
@@ -32,6 +42,13 @@ _STATUS_PRIORITY = Case(
 
 PRODUCTION_STEP = Decimal("0.25")
 
+REGISTRY_SNAPSHOT_VERSION_CACHE_KEY = "registry-snapshot:version"
+# Short-lived on purpose: it only has to absorb the burst of operators opening the mini app at shift
+# change, and record, allocation and lot writes bump the farm version anyway.
+REGISTRY_SNAPSHOT_CACHE_SECONDS = 60
+
+_MISSING = object()
+
 
 @dataclass(frozen=True)
 class ProductionRecordSnapshot:
@@ -108,6 +125,192 @@ class ProductionRegistry:
         return date_format(self.date, "l").capitalize()
 
 
+@dataclass(frozen=True)
+class RegistryBatch:
+    batch_id: int
+    label: str
+    farm_id: Optional[int]
+    farm_name: str
+
+
+@dataclass(frozen=True)
+class RegistryAllocation:
+    room_id: int
+    room_name: str
+    chicken_house_id: int
+    chicken_house_name: str
+    quantity: int
+
+
+@dataclass(frozen=True)
+class RegistryRoomValues:
+    production: Optional[Decimal]
+    consumption: Optional[Decimal]
+    mortality: Optional[int]
+    discard: Optional[int]
+
+
+@dataclass(frozen=True)
+class FarmRegistrySnapshot:
+    """Active lots allocated in the farm houses with their records for one date."""
+
+    farm_id: int
+    date: date
+    batches: tuple[RegistryBatch, ...]
+    allocations: Mapping[int, tuple[RegistryAllocation, ...]]
+    records: Mapping[int, ProductionRecordSnapshot]
+    room_records: Mapping[tuple[int, int], RegistryRoomValues]
+    cumulative_mortality: Mapping[tuple[int, int], int]
+
+
+def get_farm_registry_snapshot(farm_id: int, target_date: date) -> FarmRegistrySnapshot:
+    """
+    Return the registry data of ``farm_id`` on ``target_date``, loaded once per farm version.
+
+    The production and night mortality cards of every operator of the farm are cut from this
+    snapshot, so a shift change costs one load per farm instead of one per operator.
+    """
+
+    global_version, farm_version = read_cache_versions(
+        REGISTRY_SNAPSHOT_VERSION_CACHE_KEY, f"{REGISTRY_SNAPSHOT_VERSION_CACHE_KEY}:{farm_id}"
+    )
+    cache_key = f"registry-snapshot:{global_version}:{farm_version}:{farm_id}:{target_date.isoformat()}"
+    snapshot = cache.get(cache_key, _MISSING)
+    if snapshot is _MISSING:
+        snapshot = _load_farm_registry_snapshot(farm_id, target_date)
+        cache.set(
+            cache_key,
+            snapshot,
+            getattr(settings, "REGISTRY_SNAPSHOT_CACHE_SECONDS", REGISTRY_SNAPSHOT_CACHE_SECONDS),
+        )
+    return snapshot
+
+
+def invalidate_registry_snapshots(farm_ids: Optional[Iterable[int]] = None) -> None:
+    """Expire the snapshots of the farms (every farm when ``None``) once the transaction commits."""
+
+    if farm_ids is None:
+        bump_cache_versions(REGISTRY_SNAPSHOT_VERSION_CACHE_KEY)
+        return
+    bump_cache_versions(
+        *(f"{REGISTRY_SNAPSHOT_VERSION_CACHE_KEY}:{farm_id}" for farm_id in sorted(set(farm_ids)) if farm_id)
+    )
+
+
+def invalidate_registry_snapshots_for_rooms(room_ids: Iterable[int]) -> None:
+    """Expire the snapshots of the farms holding ``room_ids``, resolved through the infrastructure catalog."""
+
+    catalog = get_infrastructure_catalog()
+    farm_ids: set[int] = set()
+    for room_id in room_ids:
+        room = catalog.room_by_id.get(room_id)
+        if room is None:
+            invalidate_registry_snapshots()
+            return
+        farm_ids.add(room.farm_id)
+    invalidate_registry_snapshots(farm_ids)
+
+
+def invalidate_registry_snapshots_for_batches(bird_batch_ids: Iterable[int]) -> None:
+    """Expire the snapshots of every farm where the lots hold an allocation."""
+
+    bird_batch_ids = set(bird_batch_ids)
+    if not bird_batch_ids:
+        return
+    invalidate_registry_snapshots_for_rooms(
+        set(
+            BirdBatchRoomAllocation.objects.filter(bird_batch_id__in=bird_batch_ids).values_list(
+                "room_id", flat=True
+            )
+        )
+    )
+
+
+def _load_farm_registry_snapshot(farm_id: int, target_date: date) -> FarmRegistrySnapshot:
+    batches: dict[int, RegistryBatch] = {}
+    allocations: dict[int, list[RegistryAllocation]] = {}
+    allocation_queryset = (
+        BirdBatchRoomAllocation.objects.select_related("bird_batch__farm", "room__chicken_house")
+        .filter(room__chicken_house__farm_id=farm_id, bird_batch__status=BirdBatch.Status.ACTIVE)
+        .order_by("bird_batch_id", "room__chicken_house__name", "room__name")
+    )
+    for allocation in allocation_queryset:
+        batch = allocation.bird_batch
+        if batch.pk not in batches:
+            batches[batch.pk] = RegistryBatch(
+                batch_id=batch.pk,
+                label=str(batch),
+                farm_id=batch.farm_id,
+                farm_name=batch.farm.name if batch.farm_id else "",
+            )
+        chicken_house = allocation.room.chicken_house
+        allocations.setdefault(batch.pk, []).append(
+            RegistryAllocation(
+                room_id=allocation.room_id,
+                room_name=allocation.room.name,
+                chicken_house_id=chicken_house.pk,
+                chicken_house_name=chicken_house.name,
+                quantity=allocation.quantity or 0,
+            )
+        )
+
+    records: dict[int, ProductionRecordSnapshot] = {}
+    room_records: dict[tuple[int, int], RegistryRoomValues] = {}
+    cumulative_mortality: dict[tuple[int, int], int] = {}
+    if batches:
+        for record in ProductionRecord.objects.select_related("created_by", "updated_by").filter(
+            bird_batch_id__in=batches,
+            date=target_date,
+        ):
+            records[record.bird_batch_id] = ProductionRecordSnapshot(
+                production_total=_quantize_production(record.production) or Decimal("0"),
+                consumption_total=_quantize_to_int(record.consumption) or Decimal(0),
+                mortality_total=record.mortality,
+                discard_total=record.discard,
+                average_egg_weight=record.average_egg_weight,
+                recorded_at=record.recorded_at,
+                updated_at=record.updated_at,
+                created_by_display=_display_user(record.created_by),
+                updated_by_display=_display_user(record.updated_by),
+            )
+
+        if records:
+            room_record_rows = ProductionRoomRecord.objects.filter(
+                production_record__bird_batch_id__in=records,
+                production_record__date=target_date,
+            ).values_list("production_record__bird_batch_id", "room_id", "production", "consumption", "mortality", "discard")
+            for batch_id, room_id, production, consumption, mortality, discard in room_record_rows:
+                room_records[(batch_id, room_id)] = RegistryRoomValues(
+                    production=production,
+                    consumption=consumption,
+                    mortality=mortality,
+                    discard=discard,
+                )
+
+        mortality_entries = (
+            ProductionRoomRecord.objects.filter(
+                production_record__bird_batch_id__in=batches,
+                production_record__date__lte=target_date,
+            )
+            .values("production_record__bird_batch_id", "room_id")
+            .annotate(total=Sum("mortality"))
+        )
+        cumulative_mortality = {
+            (entry["production_record__bird_batch_id"], entry["room_id"]): int(entry["total"] or 0)
+            for entry in mortality_entries
+        }
+
+    return FarmRegistrySnapshot(
+        farm_id=farm_id,
+        date=target_date,
+        batches=tuple(batches[batch_id] for batch_id in sorted(batches)),
+        allocations={batch_id: tuple(rows) for batch_id, rows in allocations.items()},
+        records=records,
+        room_records=room_records,
+        cumulative_mortality=cumulative_mortality,
+    )
+
+
 def resolve_assignment_for_date(*, user: UserProfile, target_date: date) -> Optional[ShiftAssignment]:
     if not user.is_active:
         return None
@@ -158,109 +361,42 @@ def build_production_registry(
     if not chicken_house:
         return None
 
-    room_ids = list(position.rooms.values_list("pk", flat=True))
-
-    allocation_queryset = (
-        BirdBatchRoomAllocation.objects.select_related("room", "room__chicken_house")
-        .filter(room__chicken_house=chicken_house)
-        .order_by("room__name")
-    )
-    if room_ids:
-        allocation_queryset = allocation_queryset.filter(room_id__in=room_ids)
-
-    batches_queryset = (
-        BirdBatch.objects.filter(
-            status=BirdBatch.Status.ACTIVE,
-            allocations__room__chicken_house=chicken_house,
-        )
-        .select_related("farm")
-        .prefetch_related(
-            models.Prefetch(
-                "allocations",
-                queryset=allocation_queryset,
-                to_attr="filtered_allocations",
-            )
-        )
-        .order_by("pk")
-        .distinct()
-    )
-    if room_ids:
-        batches_queryset = batches_queryset.filter(allocations__room_id__in=room_ids)
-
-    batches: list[BirdBatch] = list(batches_queryset)
-    if not batches:
+    room_ids = {room.pk for room in position.rooms.all()}
+    snapshot = get_farm_registry_snapshot(chicken_house.farm_id, target_date)
+
+    allocations_by_batch: dict[int, list[RegistryAllocation]] = {}
+    for batch in snapshot.batches:
+        allocations = [
+            allocation
+            for allocation in snapshot.allocations.get(batch.batch_id, ())
+            if allocation.chicken_house_id == chicken_house.pk and (not room_ids or allocation.room_id in room_ids)
+        ]
+        if allocations:
+            allocations_by_batch[batch.batch_id] = allocations
+    if not allocations_by_batch:
         return None
 
-    filtered_room_ids = {
-        allocation.room_id
-        for batch in batches
-        for allocation in getattr(batch, "filtered_allocations", None) or []
-    }
-    batch_ids = [batch.pk for batch in batches]
     cumulative_mortality_by_room: dict[int, int] = {}
-    if filtered_room_ids and batch_ids:
-        mortality_entries = (
-            ProductionRoomRecord.objects.filter(
-                room_id__in=filtered_room_ids,
-                production_record__bird_batch_id__in=batch_ids,
-                production_record__date__lte=target_date,
-            )
-            .values("room_id")
-            .annotate(total=Sum("mortality"))
-        )
-        cumulative_mortality_by_room = {
-            entry["room_id"]: int(entry["total"] or 0) for entry in mortality_entries
-        }
-
-    room_record_queryset = ProductionRoomRecord.objects.select_related("room", "room__chicken_house")
-    records = {
-        record.bird_batch_id: record
-        for record in ProductionRecord.objects.select_related("created_by", "updated_by")
-        .prefetch_related(models.Prefetch("room_records", queryset=room_record_queryset))
-        .filter(bird_batch__in=batches, date=target_date)
-        .all()
-    }
+    for (batch_id, room_id), total in snapshot.cumulative_mortality.items():
+        if batch_id in allocations_by_batch:
+            cumulative_mortality_by_room[room_id] = cumulative_mortality_by_room.get(room_id, 0) + total
 
     lots: list[ProductionLot] = []
-    for batch in batches:
-        allocations = getattr(batch, "filtered_allocations", None) or []
+    for batch in snapshot.batches:
+        allocations = allocations_by_batch.get(batch.batch_id)
         if not allocations:
             continue
 
-        allocated_birds = sum(allocation.quantity or 0 for allocation in allocations)
-
-        record = records.get(batch.pk)
-        record_snapshot: Optional[ProductionRecordSnapshot] = None
-        room_records_map: dict[int, ProductionRoomRecord] = {}
-        if record:
-            created_by_display = _display_user(record.created_by)
-            updated_by_display = _display_user(record.updated_by)
-            record_snapshot = ProductionRecordSnapshot(
-                production_total=_quantize_production(record.production) or Decimal("0"),
-                consumption_total=_quantize_to_int(record.consumption) or Decimal(0),
-                mortality_total=record.mortality,
-                discard_total=record.discard,
-                average_egg_weight=record.average_egg_weight,
-                recorded_at=record.recorded_at,
-                updated_at=record.updated_at,
-                created_by_display=created_by_display,
-                updated_by_display=updated_by_display,
-            )
-            room_records_map = {room_record.room_id: room_record for room_record in record.room_records.all()}
-
         room_snapshots: list[ProductionRoomSnapshot] = []
         for allocation in allocations:
-            room = allocation.room
-            room_record = room_records_map.get(allocation.room_id)
-            allocated_birds = allocation.quantity or 0
+            room_record = snapshot.room_records.get((batch.batch_id, allocation.room_id))
             accumulated_mortality = cumulative_mortality_by_room.get(allocation.room_id, 0)
-            live_birds = max(allocated_birds - accumulated_mortality, 0)
             room_snapshots.append(
                 ProductionRoomSnapshot(
                     room_id=allocation.room_id,
-                    label=room.name,
-                    allocated_birds=allocated_birds,
-                    live_birds=live_birds,
+                    label=allocation.room_name,
+                    allocated_birds=allocation.quantity,
+                    live_birds=max(allocation.quantity - accumulated_mortality, 0),
                     mortality_accumulated=accumulated_mortality,
                     production=_quantize_production(room_record.production) if room_record else None,
                     consumption=_quantize_to_int(room_record.consumption) if room_record else None,
@@ -271,19 +407,16 @@ def build_production_registry(
 
         lots.append(
             ProductionLot(
-                batch_id=batch.pk,
-                label=str(batch),
-                farm_name=batch.farm.name if batch.farm_id else "",
-                chicken_house_name=chicken_house.name if chicken_house else None,
+                batch_id=batch.batch_id,
+                label=batch.label,
+                farm_name=batch.farm_name,
+                chicken_house_name=chicken_house.name,
                 rooms=tuple(room_snapshots),
-                allocated_birds=allocated_birds,
-                record=record_snapshot,
+                allocated_birds=sum(allocation.quantity for allocation in allocations),
+                record=snapshot.records.get(batch.batch_id),
             )
         )
 
-    if not lots:
-        return None
-
     return ProductionRegistry(
         date=target_date,
         assignment_id=assignment.pk,
@@ -365,32 +498,77 @@ def persist_production_records(
     if not lot_by_id:
         raise ValidationError(_("No se encontraron lotes activos para registrar."))
 
-    saved_records: list[ProductionRecord] = []
+    entries = list(entries)
+    for entry in entries:
+        if entry is None:
+            raise ValidationError(_("Formato de lote inválido."))
+        batch_id = entry.get("bird_batch")
+        if batch_id not in lot_by_id:
+            raise ValidationError(_("El lote %(batch)s no es válido para tu posición."), params={"batch": batch_id})
+
     with transaction.atomic():
+        records_by_batch, locked_room_records = lock_production_submission(
+            (entry["bird_batch"] for entry in entries),
+            registry.date,
+        )
+        previous_consumption = {key: room_record.consumption for key, room_record in locked_room_records.items()}
+        room_records_by_batch: dict[int, dict[int, ProductionRoomRecord]] = {}
+        for (batch_id, room_id), room_record in locked_room_records.items():
+            room_records_by_batch.setdefault(batch_id, {})[room_id] = room_record
+
+        # A lot sent twice merges onto the state left by its previous entry, as sequential saves did.
+        saved_records: list[ProductionRecord] = []
+        touched_room_records: dict[tuple[int, int], ProductionRoomRecord] = {}
         for entry in entries:
-            batch_id = entry.get("bird_batch")
-            if batch_id not in lot_by_id:
-                raise ValidationError(_("El lote %(batch)s no es válido para tu posición."), params={"batch": batch_id})
-
-            record = _persist_single_record(
+            batch_id = entry["bird_batch"]
+            batch_rooms = room_records_by_batch.setdefault(batch_id, {})
+            record, room_ids = _merge_single_record(
                 lot=lot_by_id[batch_id],
                 registry=registry,
                 entry=entry,
                 user=user,
+                record=records_by_batch.get(batch_id),
+                room_records=batch_rooms,
             )
-            saved_records.append(record)
+            records_by_batch[batch_id] = record
+            touched_room_records.update(((batch_id, room_id), batch_rooms[room_id]) for room_id in room_ids)
+            if record not in saved_records:
+                saved_records.append(record)
+
+        write_production_submission(
+            records=saved_records,
+            room_records=list(touched_room_records.values()),
+            record_fields=("created_by", "updated_by", "average_egg_weight"),
+        )
+        post_room_record_consumption(
+            [
+                (room_record, room_record.consumption - previous_consumption.get(key, Decimal("0")))
+                for key, room_record in touched_room_records.items()
+            ],
+            actor=user,
+        )
+        # Imported lazily: the feed plan module imports this one to resolve assignments.
+        from .feed_plan import invalidate_feed_plans_for_rooms
+
+        invalidate_feed_plans_for_rooms(room_id for _, room_id in touched_room_records)
+        invalidate_registry_snapshots_for_batches(record.bird_batch_id for record in saved_records)
     return saved_records
 
 
-def _persist_single_record(
+def _merge_single_record(
     *,
     lot: ProductionLot,
     registry: ProductionRegistry,
     entry: dict[str, object],
     user: UserProfile,
-) -> ProductionRecord:
-    if entry is None:
-        raise ValidationError(_("Formato de lote inválido."))
+    record: Optional[ProductionRecord],
+    room_records: dict[int, ProductionRoomRecord],
+) -> tuple[ProductionRecord, tuple[int, ...]]:
+    """
+    Apply an entry onto the lot's locked record and room records, creating them when missing.
+
+    Returns the record and the rooms the entry changed; nothing is written here.
+    """
 
     rooms_payload = entry.get("rooms")
     if not isinstance(rooms_payload, list) or not rooms_payload:
@@ -404,11 +582,6 @@ def _persist_single_record(
     average_weight_defined = raw_average_weight is not _missing
     average_weight = _parse_average_weight(raw_average_weight) if average_weight_defined else None
 
-    record = (
-        ProductionRecord.objects.select_for_update()
-        .filter(bird_batch_id=lot.batch_id, date=registry.date)
-        .first()
-    )
     is_new_record = record is None
     if record is None:
         record = ProductionRecord(
@@ -416,15 +589,8 @@ def _persist_single_record(
             date=registry.date,
         )
 
-    existing_room_records: dict[int, ProductionRoomRecord] = {}
-    if not is_new_record:
-        existing_room_records = {
-            room_record.room_id: room_record
-            for room_record in ProductionRoomRecord.objects.select_for_update().filter(production_record=record)
-        }
-
     existing_room_values: dict[int, dict[str, object]] = {}
-    for room_id, room_record in existing_room_records.items():
+    for room_id, room_record in room_records.items():
         existing_room_values[room_id] = {
             "production": _quantize_production(Decimal(room_record.production)) or Decimal("0"),
             "consumption": _quantize_to_int(Decimal(room_record.consumption)) or Decimal("0"),
@@ -540,24 +706,23 @@ def _persist_single_record(
         record.average_egg_weight = average_weight
     record.updated_by = user
 
-    record.full_clean()
-    record.save()
+    clean_submission_row(record)
 
     for room_id, values in parsed_rooms.items():
-        room_record = existing_room_records.get(room_id)
+        room_record = room_records.get(room_id)
         if room_record is None:
             room_record = ProductionRoomRecord(
                 production_record=record,
                 room_id=room_id,
             )
+            room_records[room_id] = room_record
         room_record.production = values["production"]
         room_record.consumption = values["consumption"]
         room_record.mortality = values["mortality"]
         room_record.discard = values["discard"]
-        room_record.full_clean()
-        room_record.save()
+        clean_submission_row(room_record)
 
-    return record
+    return record, tuple(parsed_rooms)
 
 
 def _parse_average_weight(raw_value: object) -> Optional[Decimal]:
@@ -11,7 +11,7 @@ from django.utils.translation import gettext as _
 
 from administration.models import PurchaseApproval, PurchaseRequest, PurchasingExpenseType, Supplier
 from administration.models import Product as AdministrationProduct, PurchaseItem
-from production.models import ChickenHouse, Farm
+from production.services.infrastructure_catalog import get_infrastructure_catalog
 from personal.models import UserProfile
 
 
@@ -620,24 +620,17 @@ def build_purchase_request_composer(*, user: Optional[UserProfile]) -> Optional[
         return None
 
     manager_options = _build_manager_options()
-    farms = tuple(
-        {
-            "id": farm["id"],
-            "label": farm["name"],
-        }
-        for farm in Farm.objects.order_by("name").values("id", "name")
-    )
+    catalog = get_infrastructure_catalog()
+    farms = tuple({"id": farm.id, "label": farm.name} for farm in catalog.farms)
     chicken_houses = tuple(
         {
-            "id": house["id"],
-            "label": house["name"],
-            "farm_id": house["farm_id"],
-            "full_label": f"{house['farm__name']} · {house['name']}",
-            "farm_name": house["farm__name"],
+            "id": house.id,
+            "label": house.name,
+            "farm_id": house.farm_id,
+            "full_label": house.full_label,
+            "farm_name": house.farm_name,
         }
-        for house in ChickenHouse.objects.select_related("farm")
-        .order_by("farm__name", "name")
-        .values("id", "name", "farm_id", "farm__name")
+        for house in catalog.chicken_houses
     )
     supplier_suggestions = tuple(
         {
@@ -1,27 +1,17 @@
 from __future__ import annotations
 
-from collections import OrderedDict
 from datetime import timedelta
 from decimal import Decimal
-from typing import Iterable
 
-from django.db.models import F, Prefetch, Q, Sum
-from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.formats import date_format
 from django.utils.translation import gettext as _
 
 from personal.models import UserProfile
-from production.models import EggClassificationBatch, ProductionRecord, ProductionRoomRecord
-from production.services.internal_transport import collect_chicken_house_names, collect_room_names
+from production.models import EggClassificationBatch
+from production.services.internal_transport import get_transport_queue_snapshot
 
 TRANSPORT_WINDOW_DAYS = 14
-_ROOM_DESTINATION_FILTER = Q(room__chicken_house__egg_destination_farm__isnull=False) & ~Q(
-    room__chicken_house__egg_destination_farm=F("room__chicken_house__farm")
-)
-_RECORD_DESTINATION_FILTER = Q(
-    room_records__room__chicken_house__egg_destination_farm__isnull=False
-) & ~Q(room_records__room__chicken_house__egg_destination_farm=F("room_records__room__chicken_house__farm"))
 
 
 def _build_transporters() -> list[dict[str, str]]:
@@ -36,142 +26,51 @@ def _build_transporters() -> list[dict[str, str]]:
         contact = (collaborator.telefono or "").strip()
         options.append({"id": str(collaborator.pk), "label": label, "contact": contact})
     return options
-def _load_classification_map(record_ids: list[int]) -> dict[int, dict[str, Decimal]]:
-    queryset = (
-        EggClassificationBatch.objects.filter(production_record_id__in=record_ids)
-        .annotate(classified_cartons=Coalesce(Sum("classification_entries__cartons"), Decimal("0")))
-        .values(
-            "production_record_id",
-            "reported_cartons",
-            "received_cartons",
-            "classified_cartons",
-            "transport_status",
-            "transport_destination_farm__name",
-            "transport_transporter_id",
-            "transport_expected_date",
-        )
-    )
-    data: dict[int, dict[str, Decimal]] = {}
-    for row in queryset:
-        source = Decimal(row["received_cartons"]) if row["received_cartons"] is not None else Decimal(row["reported_cartons"])
-        data[row["production_record_id"]] = {
-            "confirmed_cartons": source,
-            "reported_cartons": Decimal(row["reported_cartons"]),
-            "classified_cartons": Decimal(row["classified_cartons"]),
-            "transport_status": row["transport_status"],
-            "transport_destination": row["transport_destination_farm__name"],
-            "transport_transporter_id": row["transport_transporter_id"],
-            "transport_expected_date": row["transport_expected_date"],
-        }
-    return data
 
 
 def build_transport_queue_payload() -> dict[str, object]:
     today = timezone.localdate()
     start_date = today - timedelta(days=TRANSPORT_WINDOW_DAYS)
-    room_prefetch = Prefetch(
-        "room_records",
-        queryset=ProductionRoomRecord.objects.select_related(
-            "room__chicken_house__farm",
-            "room__chicken_house__egg_destination_farm",
-        )
-        .filter(_ROOM_DESTINATION_FILTER)
-        .order_by("room__chicken_house__name", "room__name"),
-        to_attr="transfer_room_records",
-    )
-    records = list(
-        ProductionRecord.objects.select_related("bird_batch")
-        .prefetch_related(room_prefetch)
-        .filter(date__gte=start_date)
-        .filter(_RECORD_DESTINATION_FILTER)
-        .order_by("date", "pk")
-        .distinct()
-    )
-
-    record_ids = [record.pk for record in records]
-    classification_map = _load_classification_map(record_ids) if record_ids else {}
+    queue_snapshot = get_transport_queue_snapshot(start_date=start_date)
 
     productions: list[dict[str, object]] = []
     total_cartons = Decimal("0")
     transporters = _build_transporters()
-    transporter_lookup: dict[object, str] = {}
-    for transporter in transporters:
-        transporter_lookup[transporter["id"]] = transporter["label"]
-        try:
-            transporter_lookup[int(transporter["id"])] = transporter["label"]
-        except (TypeError, ValueError):
-            continue
-    for record in records:
-        room_records = getattr(record, "transfer_room_records", None) or []
-        if not room_records:
-            continue
-        batch = classification_map.get(record.pk)
-        if not batch:
-            continue
-        transport_status = batch.get("transport_status") if isinstance(batch, dict) else None
-        if transport_status in (
-            EggClassificationBatch.TransportStatus.VERIFIED,
-            EggClassificationBatch.TransportStatus.VERIFICATION,
-        ):
-            continue
-        confirmed_cartons = batch["confirmed_cartons"]
-        classified_cartons = batch["classified_cartons"]
-        if confirmed_cartons <= Decimal("0"):
-            continue
-        if classified_cartons >= confirmed_cartons:
-            continue
-        chicken_houses = collect_chicken_house_names(room_records)
-        if not chicken_houses:
-            continue
-        room_names = collect_room_names(room_records)
-        farm_names = OrderedDict()
-        destination_names = OrderedDict()
-        for entry in room_records:
-            house = entry.room.chicken_house
-            farm_names[house.farm.name] = None
-            destination = house.destination_farm
-            if destination:
-                destination_names[destination.name] = None
-        farms_label = ", ".join(farm_names.keys())
-        destination_label = batch.get("transport_destination") or ", ".join(destination_names.keys())
-        transporter_id = batch.get("transport_transporter_id")
+    transporter_lookup = {transporter["id"]: transporter["label"] for transporter in transporters}
+    for entry in queue_snapshot:
         transporter_label = None
-        if transporter_id is not None:
-            transporter_label = transporter_lookup.get(str(transporter_id))
-            if not transporter_label:
-                transporter_label = str(transporter_id)
-        expected_date = batch.get("transport_expected_date")
-        expected_date_iso = expected_date.isoformat() if expected_date else None
-        expected_date_label = date_format(expected_date, "DATE_FORMAT") if expected_date else None
+        if entry.transporter_id is not None:
+            transporter_label = transporter_lookup.get(str(entry.transporter_id)) or str(entry.transporter_id)
+        expected_date = entry.expected_date
         state = None
         state_label = None
-        if transport_status == EggClassificationBatch.TransportStatus.AUTHORIZED:
+        if entry.transport_status == EggClassificationBatch.TransportStatus.AUTHORIZED:
             state = "authorized"
             state_label = _("Autorizada")
-        elif transport_status == EggClassificationBatch.TransportStatus.IN_TRANSIT:
+        elif entry.transport_status == EggClassificationBatch.TransportStatus.IN_TRANSIT:
             state = "in_transit"
             state_label = _("En tránsito")
         label = _("Lote %(houses)s, día %(date)s") % {
-            "houses": ", ".join(chicken_houses),
-            "date": record.date.strftime("%d/%m"),
+            "houses": ", ".join(entry.chicken_houses),
+            "date": entry.production_date.strftime("%d/%m"),
         }
         production_payload = {
-            "id": record.pk,
+            "id": entry.record_id,
             "label": label,
-            "farm": farms_label,
-            "destination": destination_label,
-            "cartons": confirmed_cartons,
-            "rooms": room_names,
-            "production_date_iso": record.date.isoformat(),
-            "production_date_label": date_format(record.date, "DATE_FORMAT"),
+            "farm": ", ".join(entry.farm_names),
+            "destination": entry.destination_name,
+            "cartons": entry.cartons_confirmed,
+            "rooms": list(entry.rooms),
+            "production_date_iso": entry.production_date.isoformat(),
+            "production_date_label": date_format(entry.production_date, "DATE_FORMAT"),
             "transporter_label": transporter_label,
-            "transporter_id": transporter_id,
-            "expected_date_iso": expected_date_iso,
-            "expected_date_label": expected_date_label,
+            "transporter_id": entry.transporter_id,
+            "expected_date_iso": expected_date.isoformat() if expected_date else None,
+            "expected_date_label": date_format(expected_date, "DATE_FORMAT") if expected_date else None,
             "state": state,
             "state_label": state_label,
         }
-        total_cartons += confirmed_cartons
+        total_cartons += entry.cartons_confirmed
         productions.append(production_payload)
 
     productions.sort(key=lambda item: (item["production_date_iso"], item["id"]))
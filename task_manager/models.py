@@ -507,6 +507,9 @@ class TaskAssignment(models.Model):
                 condition=Q(collaborator__isnull=True),
             ),
         ]
+        indexes = [
+            models.Index(fields=("collaborator", "due_date"), name="tm_assign_collab_due_idx"),
+        ]
 
     def __str__(self) -> str:
         collaborator_name = str(self.collaborator) if self.collaborator_id else _("Sin responsable")
@@ -622,3 +625,45 @@ class MiniAppPushSubscription(models.Model):
     def mark_inactive(self) -> None:
         self.is_active = False
         self.save(update_fields=["is_active", "updated_at"])
+
+
+class PushNotificationOutbox(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pendiente")
+        SENDING = "sending", _("Enviando")
+        SENT = "sent", _("Enviada")
+        FAILED = "failed", _("Fallida")
+        DISCARDED = "discarded", _("Descartada")
+
+    subscription = models.ForeignKey(
+        MiniAppPushSubscription,
+        on_delete=models.CASCADE,
+        related_name="outbox_entries",
+        verbose_name=_("Suscripción"),
+    )
+    notification_type = models.CharField(_("Tipo"), max_length=80)
+    payload = models.JSONField(_("Contenido"), default=dict)
+    ttl = models.PositiveIntegerField(_("TTL (segundos)"), default=300)
+    status = models.CharField(
+        _("Estado"),
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(_("Intentos"), default=0)
+    next_attempt_at = models.DateTimeField(_("Próximo intento"), default=timezone.now)
+    last_error = models.TextField(_("Último error"), blank=True)
+    sent_at = models.DateTimeField(_("Enviada en"), null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Notificación push en cola")
+        verbose_name_plural = _("Notificaciones push en cola")
+        ordering = ("next_attempt_at", "pk")
+        indexes = [
+            models.Index(fields=("status", "next_attempt_at"), name="tm_push_outbox_due_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.notification_type} → {self.subscription_id} ({self.get_status_display()})"
@@ -15,6 +15,7 @@ from task_manager.services.push_notifications import (
     PushNotificationMessage,
     PushNotificationResult,
     PushNotificationService,
+    QueuedPushNotificationService,
 )
 
 _SERVICE_SINGLETON: PushNotificationService | None = None
@@ -25,7 +26,7 @@ def _get_service(service: PushNotificationService | None = None) -> PushNotifica
     if service:
         return service
     if _SERVICE_SINGLETON is None:
-        _SERVICE_SINGLETON = PushNotificationService()
+        _SERVICE_SINGLETON = QueuedPushNotificationService()
     return _SERVICE_SINGLETON
 
 
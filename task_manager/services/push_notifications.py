@@ -2,18 +2,34 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from datetime import timedelta
 from typing import Any, Callable, Iterable
+from urllib.parse import urlparse
 
+import requests
 from django.conf import settings
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from py_vapid import Vapid
+from requests.adapters import HTTPAdapter
 
-from personal.models import UserProfile
+from personal.models import Role, UserProfile
 from pywebpush import WebPushException, webpush
 
-from task_manager.models import MiniAppPushSubscription
+from task_manager.models import MiniAppPushSubscription, PushNotificationOutbox
 
 logger = logging.getLogger(__name__)
 
+# pywebpush signs VAPID JWTs for 12 hours; renew an hour early so in-flight requests never carry an expired token.
+VAPID_HEADER_LIFETIME_SECONDS = 12 * 60 * 60
+VAPID_HEADER_RENEW_MARGIN_SECONDS = 60 * 60
+
 
 @dataclass(slots=True)
 class PushNotificationAction:
@@ -58,14 +74,59 @@ class PushNotificationResult:
     delivered: int
     failures: list[str]
     skipped_reason: str | None = None
+    queued: int = 0
 
     @property
     def success(self) -> bool:
         return self.delivered > 0 and not self.failures
 
 
+RecipientUser = UserProfile | int
+RecipientRole = Role | int | str
+RecipientGroup = Group | int
+
+
+class _VapidHeaderCache:
+    """Signed VAPID headers per push service origin, reused until shortly before they expire."""
+
+    def __init__(
+        self,
+        *,
+        private_key: str,
+        contact: str,
+        lifetime_seconds: int = VAPID_HEADER_LIFETIME_SECONDS,
+        renew_margin_seconds: int = VAPID_HEADER_RENEW_MARGIN_SECONDS,
+    ) -> None:
+        self._private_key = private_key
+        self._contact = contact
+        self._lifetime_seconds = lifetime_seconds
+        self._renew_margin_seconds = renew_margin_seconds
+        self._vapid: Vapid | None = None
+        self._headers: dict[str, tuple[int, dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def headers_for(self, endpoint: str) -> dict[str, str]:
+        parsed = urlparse(endpoint)
+        audience = f"{parsed.scheme}://{parsed.netloc}"
+        now = int(time.time())
+        with self._lock:
+            cached = self._headers.get(audience)
+            if cached and cached[0] - self._renew_margin_seconds > now:
+                return dict(cached[1])
+            if self._vapid is None:
+                self._vapid = Vapid.from_string(private_key=self._private_key)
+            expires_at = now + self._lifetime_seconds
+            headers = self._vapid.sign({"sub": self._contact, "aud": audience, "exp": expires_at})
+            self._headers[audience] = (expires_at, headers)
+            return dict(headers)
+
+
 class PushNotificationService:
-    """Lightweight wrapper around pywebpush for Mini App notifications."""
+    """Lightweight wrapper around pywebpush for Mini App notifications.
+
+    VAPID headers are signed once per push service origin and reused within their validity window,
+    and deliveries share a pooled HTTP session.
+    """
 
     def __init__(
         self,
@@ -74,22 +135,67 @@ class PushNotificationService:
         vapid_contact: str | None = None,
         subscription_queryset: Callable[[], Iterable[MiniAppPushSubscription]] | None = None,
         webpush_client: Callable[..., Any] | None = None,
+        max_workers: int = 8,
+        timeout: float = 10.0,
     ) -> None:
         self._vapid_private_key = vapid_private_key or getattr(settings, "WEB_PUSH_PRIVATE_KEY", "")
         self._vapid_contact = vapid_contact or getattr(settings, "WEB_PUSH_CONTACT", "") or "mailto:soporte@lacolina.com"
         self._webpush_client = webpush_client or webpush
         self._subscription_queryset = subscription_queryset
+        self._max_workers = max(1, max_workers)
+        self._timeout = timeout
+        self._vapid_headers = _VapidHeaderCache(
+            private_key=self._vapid_private_key,
+            contact=self._vapid_contact,
+        )
+        self._http_session: requests.Session | None = None
+        self._http_session_lock = threading.Lock()
 
     def is_enabled(self) -> bool:
         return bool(self._vapid_private_key)
 
-    def _get_subscriptions_for_user(self, user: UserProfile) -> list[MiniAppPushSubscription]:
+    def _get_subscriptions(
+        self,
+        *,
+        users: Iterable[RecipientUser] = (),
+        roles: Iterable[RecipientRole] = (),
+        groups: Iterable[RecipientGroup] = (),
+    ) -> list[MiniAppPushSubscription]:
+        user_ids = {getattr(user, "pk", user) for user in users}
         if self._subscription_queryset:
             candidates = self._subscription_queryset()
-            return [subscription for subscription in candidates if subscription.user_id == user.pk and subscription.is_active]
-        return list(
-            MiniAppPushSubscription.objects.filter(user=user, is_active=True).order_by("-updated_at")
-        )
+            return [
+                subscription
+                for subscription in candidates
+                if subscription.user_id in user_ids and subscription.is_active
+            ]
+
+        role_ids: set[int] = set()
+        role_names: set[str] = set()
+        for role in roles:
+            if isinstance(role, str):
+                role_names.add(role)
+            else:
+                role_ids.add(getattr(role, "pk", role))
+        group_ids = {getattr(group, "pk", group) for group in groups}
+
+        recipients = Q()
+        if user_ids:
+            recipients |= Q(user_id__in=user_ids)
+        if role_ids:
+            recipients |= Q(user__roles__in=role_ids)
+        if role_names:
+            recipients |= Q(user__roles__name__in=role_names)
+        if group_ids:
+            recipients |= Q(user__groups__in=group_ids)
+        if not recipients:
+            return []
+
+        queryset = MiniAppPushSubscription.objects.filter(recipients, is_active=True)
+        if role_ids or role_names or group_ids:
+            # Membership joins can repeat a subscription; broadcasts only target active users.
+            queryset = queryset.filter(user__is_active=True).distinct()
+        return list(queryset.order_by("-updated_at"))
 
     def send_to_user(
         self,
@@ -99,66 +205,200 @@ class PushNotificationService:
         notification_type: str,
         ttl: int = 300,
     ) -> PushNotificationResult:
+        return self.send_to_users(
+            users=[user],
+            message=message,
+            notification_type=notification_type,
+            ttl=ttl,
+        )
+
+    def send_to_users(
+        self,
+        *,
+        message: PushNotificationMessage,
+        notification_type: str,
+        users: Iterable[RecipientUser] = (),
+        roles: Iterable[RecipientRole] = (),
+        groups: Iterable[RecipientGroup] = (),
+        ttl: int = 300,
+    ) -> PushNotificationResult:
+        """Fan a single message out to every active subscription of the given users, roles or groups."""
+
+        subscriptions, skipped = self._resolve_fan_out(
+            users=users,
+            roles=roles,
+            groups=groups,
+            notification_type=notification_type,
+        )
+        if skipped:
+            return skipped
+
+        payload = json.dumps(message.as_payload())
+        outcomes = self.deliver_many(subscriptions=subscriptions, payload=payload, ttl=ttl)
+
+        failures: list[str] = []
+        gone_subscription_ids: list[int] = []
+        for subscription, error in zip(subscriptions, outcomes):
+            if error is None:
+                continue
+            detail = self._format_error(error) if isinstance(error, WebPushException) else str(error)
+            failures.append(detail)
+            logger.warning(
+                "Unable to deliver '%s' to subscription %s: %s",
+                notification_type,
+                subscription.pk,
+                detail,
+                exc_info=error,
+            )
+            if isinstance(error, WebPushException) and self._should_disable_subscription(error):
+                gone_subscription_ids.append(subscription.pk)
+
+        if gone_subscription_ids:
+            MiniAppPushSubscription.objects.filter(pk__in=gone_subscription_ids).update(
+                is_active=False,
+                updated_at=timezone.now(),
+            )
+
+        return PushNotificationResult(
+            attempted=len(subscriptions),
+            delivered=len(subscriptions) - len(failures),
+            failures=failures,
+        )
+
+    def enqueue_to_user(
+        self,
+        *,
+        user: UserProfile,
+        message: PushNotificationMessage,
+        notification_type: str,
+        ttl: int = 300,
+    ) -> PushNotificationResult:
+        return self.enqueue_to_users(
+            users=[user],
+            message=message,
+            notification_type=notification_type,
+            ttl=ttl,
+        )
+
+    def enqueue_to_users(
+        self,
+        *,
+        message: PushNotificationMessage,
+        notification_type: str,
+        users: Iterable[RecipientUser] = (),
+        roles: Iterable[RecipientRole] = (),
+        groups: Iterable[RecipientGroup] = (),
+        ttl: int = 300,
+    ) -> PushNotificationResult:
+        """Persist one outbox entry per active subscription instead of calling the push endpoints."""
+
+        subscriptions, skipped = self._resolve_fan_out(
+            users=users,
+            roles=roles,
+            groups=groups,
+            notification_type=notification_type,
+        )
+        if skipped:
+            return skipped
+
+        payload = message.as_payload()
+        entries = PushNotificationOutbox.objects.bulk_create(
+            [
+                PushNotificationOutbox(
+                    subscription=subscription,
+                    notification_type=notification_type,
+                    payload=payload,
+                    ttl=ttl,
+                )
+                for subscription in subscriptions
+            ]
+        )
+        return PushNotificationResult(
+            attempted=0,
+            delivered=0,
+            failures=[],
+            queued=len(entries),
+        )
+
+    def _resolve_fan_out(
+        self,
+        *,
+        users: Iterable[RecipientUser],
+        roles: Iterable[RecipientRole],
+        groups: Iterable[RecipientGroup],
+        notification_type: str,
+    ) -> tuple[list[MiniAppPushSubscription], PushNotificationResult | None]:
         if not self.is_enabled():
             logger.info(
                 "Skipping push notification '%s' because WEB_PUSH_PRIVATE_KEY is not configured.",
                 notification_type,
             )
-            return PushNotificationResult(attempted=0, delivered=0, failures=[], skipped_reason="disabled")
+            return [], PushNotificationResult(attempted=0, delivered=0, failures=[], skipped_reason="disabled")
 
-        subscriptions = self._get_subscriptions_for_user(user)
+        subscriptions = self._get_subscriptions(users=users, roles=roles, groups=groups)
         if not subscriptions:
-            logger.debug(
-                "No push subscriptions found for user %s when sending '%s'.",
-                user.pk,
-                notification_type,
-            )
-            return PushNotificationResult(
+            logger.debug("No push subscriptions found when sending '%s'.", notification_type)
+            return [], PushNotificationResult(
                 attempted=0,
                 delivered=0,
                 failures=[],
                 skipped_reason="no-subscriptions",
             )
+        return subscriptions, None
 
-        payload = json.dumps(message.as_payload())
-        failures: list[str] = []
-        delivered = 0
-        for subscription in subscriptions:
-            subscription_info = {
-                "endpoint": subscription.endpoint,
-                "keys": {
-                    "p256dh": subscription.p256dh_key,
-                    "auth": subscription.auth_key,
-                },
-            }
-            try:
-                self._webpush_client(
-                    subscription_info=subscription_info,
-                    data=payload,
-                    vapid_private_key=self._vapid_private_key,
-                    vapid_claims={"sub": self._vapid_contact},
-                    ttl=ttl,
-                )
-                delivered += 1
-            except WebPushException as exc:  # pragma: no cover - network errors are environment-specific
-                detail = self._format_error(exc)
-                failures.append(detail)
-                logger.warning(
-                    "Unable to deliver '%s' to subscription %s: %s",
-                    notification_type,
-                    subscription.pk,
-                    detail,
-                    exc_info=exc,
-                )
-                if self._should_disable_subscription(exc):
-                    subscription.mark_inactive()
+    def deliver(self, *, subscription: MiniAppPushSubscription, payload: str, ttl: int) -> None:
+        """Send an already serialized payload to a single subscription; raises ``WebPushException``."""
 
-        return PushNotificationResult(
-            attempted=len(subscriptions),
-            delivered=delivered,
-            failures=failures,
+        self._webpush_client(
+            subscription_info=self._build_subscription_info(subscription),
+            data=payload,
+            headers=self._vapid_headers.headers_for(subscription.endpoint),
+            ttl=ttl,
+            timeout=self._timeout,
+            requests_session=self._get_http_session(),
         )
 
+    def deliver_many(
+        self,
+        *,
+        subscriptions: list[MiniAppPushSubscription],
+        payload: str,
+        ttl: int,
+    ) -> list[Exception | None]:
+        """Deliver one payload to many subscriptions concurrently, returning the error per subscription."""
+
+        def _deliver(subscription: MiniAppPushSubscription) -> Exception | None:
+            try:
+                self.deliver(subscription=subscription, payload=payload, ttl=ttl)
+            except Exception as exc:  # noqa: BLE001 - reported per subscription
+                return exc
+            return None
+
+        if len(subscriptions) <= 1:
+            return [_deliver(subscription) for subscription in subscriptions]
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, len(subscriptions))) as executor:
+            return list(executor.map(_deliver, subscriptions))
+
+    def _get_http_session(self) -> requests.Session:
+        with self._http_session_lock:
+            if self._http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self._max_workers)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._http_session = session
+            return self._http_session
+
+    @staticmethod
+    def _build_subscription_info(subscription: MiniAppPushSubscription) -> dict[str, Any]:
+        return {
+            "endpoint": subscription.endpoint,
+            "keys": {
+                "p256dh": subscription.p256dh_key,
+                "auth": subscription.auth_key,
+            },
+        }
+
     @staticmethod
     def _format_error(exc: WebPushException) -> str:
         response = getattr(exc, "response", None)
@@ -176,3 +416,187 @@ class PushNotificationService:
         response = getattr(exc, "response", None)
         status_code = getattr(response, "status_code", None)
         return status_code in {404, 410}
+
+
+class QueuedPushNotificationService(PushNotificationService):
+    """Drop-in variant whose ``send_to_user(s)`` write to the outbox instead of delivering inline.
+
+    Domain helpers use it so request latency does not depend on the remote push endpoints; the
+    ``dispatch_push_notifications`` command delivers the queued entries.
+    """
+
+    def send_to_users(
+        self,
+        *,
+        message: PushNotificationMessage,
+        notification_type: str,
+        users: Iterable[RecipientUser] = (),
+        roles: Iterable[RecipientRole] = (),
+        groups: Iterable[RecipientGroup] = (),
+        ttl: int = 300,
+    ) -> PushNotificationResult:
+        return self.enqueue_to_users(
+            users=users,
+            roles=roles,
+            groups=groups,
+            message=message,
+            notification_type=notification_type,
+            ttl=ttl,
+        )
+
+
+@dataclass(slots=True)
+class PushOutboxDispatchSummary:
+    claimed: int = 0
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+    discarded: int = 0
+
+
+class PushOutboxDispatcher:
+    """Deliver due ``PushNotificationOutbox`` entries concurrently with retries and backoff."""
+
+    def __init__(
+        self,
+        *,
+        service: PushNotificationService | None = None,
+        max_workers: int = 8,
+        max_attempts: int = 5,
+        backoff_seconds: int = 30,
+        max_backoff_seconds: int = 3600,
+        lease_seconds: int = 600,
+    ) -> None:
+        self._service = service or PushNotificationService(max_workers=max_workers)
+        self._max_workers = max(1, max_workers)
+        self._max_attempts = max(1, max_attempts)
+        self._backoff_seconds = backoff_seconds
+        self._max_backoff_seconds = max_backoff_seconds
+        self._lease_seconds = lease_seconds
+
+    def dispatch_due(self, *, batch_size: int = 100) -> PushOutboxDispatchSummary:
+        summary = PushOutboxDispatchSummary()
+        if not self._service.is_enabled():
+            logger.info("Skipping push outbox dispatch because WEB_PUSH_PRIVATE_KEY is not configured.")
+            return summary
+
+        entries = self._claim_due_entries(batch_size)
+        summary.claimed = len(entries)
+        if not entries:
+            return summary
+
+        deliverable: list[PushNotificationOutbox] = []
+        discarded: list[PushNotificationOutbox] = []
+        for entry in entries:
+            if entry.subscription.is_active:
+                deliverable.append(entry)
+            else:
+                entry.status = PushNotificationOutbox.Status.DISCARDED
+                entry.last_error = "subscription-inactive"
+                discarded.append(entry)
+
+        # Worker threads only talk to the push endpoints; every database write stays in this thread.
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, max(len(deliverable), 1))) as executor:
+            outcomes = list(executor.map(self._deliver_entry, deliverable))
+
+        now = timezone.now()
+        sent: list[PushNotificationOutbox] = []
+        rescheduled: list[PushNotificationOutbox] = []
+        gone_subscription_ids: set[int] = set()
+        for entry, error in zip(deliverable, outcomes):
+            if error is None:
+                entry.status = PushNotificationOutbox.Status.SENT
+                entry.sent_at = now
+                entry.last_error = ""
+                sent.append(entry)
+                continue
+            entry.last_error = PushNotificationService._format_error(error) if isinstance(error, WebPushException) else str(error)
+            logger.warning(
+                "Unable to deliver '%s' to subscription %s (attempt %s): %s",
+                entry.notification_type,
+                entry.subscription_id,
+                entry.attempts,
+                entry.last_error,
+            )
+            if isinstance(error, WebPushException) and PushNotificationService._should_disable_subscription(error):
+                entry.status = PushNotificationOutbox.Status.DISCARDED
+                gone_subscription_ids.add(entry.subscription_id)
+                discarded.append(entry)
+            elif entry.attempts >= self._max_attempts:
+                entry.status = PushNotificationOutbox.Status.FAILED
+                rescheduled.append(entry)
+            else:
+                entry.status = PushNotificationOutbox.Status.PENDING
+                entry.next_attempt_at = now + self._backoff_for(entry.attempts)
+                rescheduled.append(entry)
+
+        with transaction.atomic():
+            for entry in sent + rescheduled + discarded:
+                entry.updated_at = now
+            if sent:
+                PushNotificationOutbox.objects.bulk_update(sent, ["status", "sent_at", "last_error", "updated_at"])
+            if rescheduled:
+                PushNotificationOutbox.objects.bulk_update(
+                    rescheduled,
+                    ["status", "next_attempt_at", "last_error", "updated_at"],
+                )
+            if discarded:
+                PushNotificationOutbox.objects.bulk_update(discarded, ["status", "last_error", "updated_at"])
+            if gone_subscription_ids:
+                MiniAppPushSubscription.objects.filter(pk__in=gone_subscription_ids).update(
+                    is_active=False,
+                    updated_at=now,
+                )
+                PushNotificationOutbox.objects.filter(
+                    subscription_id__in=gone_subscription_ids,
+                    status=PushNotificationOutbox.Status.PENDING,
+                ).update(
+                    status=PushNotificationOutbox.Status.DISCARDED,
+                    last_error="subscription-inactive",
+                    updated_at=now,
+                )
+
+        summary.sent = len(sent)
+        summary.failed = sum(1 for entry in rescheduled if entry.status == PushNotificationOutbox.Status.FAILED)
+        summary.retried = len(rescheduled) - summary.failed
+        summary.discarded = len(discarded)
+        return summary
+
+    def _claim_due_entries(self, batch_size: int) -> list[PushNotificationOutbox]:
+        now = timezone.now()
+        stale_before = now - timedelta(seconds=self._lease_seconds)
+        with transaction.atomic():
+            entries = list(
+                PushNotificationOutbox.objects.select_for_update(skip_locked=True, of=("self",))
+                .select_related("subscription")
+                .filter(
+                    Q(status=PushNotificationOutbox.Status.PENDING, next_attempt_at__lte=now)
+                    | Q(status=PushNotificationOutbox.Status.SENDING, updated_at__lt=stale_before)
+                )
+                .order_by("next_attempt_at", "pk")[:batch_size]
+            )
+            if entries:
+                PushNotificationOutbox.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+                    status=PushNotificationOutbox.Status.SENDING,
+                    attempts=F("attempts") + 1,
+                    updated_at=now,
+                )
+        for entry in entries:
+            entry.status = PushNotificationOutbox.Status.SENDING
+            entry.attempts += 1
+        return entries
+
+    def _deliver_entry(self, entry: PushNotificationOutbox) -> Exception | None:
+        try:
+            self._service.deliver(
+                subscription=entry.subscription,
+                payload=json.dumps(entry.payload),
+                ttl=entry.ttl,
+            )
+        except Exception as exc:  # noqa: BLE001 - connection errors must be retried, not crash the worker
+            return exc
+        return None
+
+    def _backoff_for(self, attempts: int) -> timedelta:
+        seconds = self._backoff_seconds * (2 ** max(attempts - 1, 0))
+        return timedelta(seconds=min(seconds, self._max_backoff_seconds))
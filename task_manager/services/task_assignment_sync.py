@@ -11,6 +11,8 @@ from django.db import transaction
 from django.db.utils import IntegrityError
 from django.db.models import Case, IntegerField, Value, When
 
+from applacolina.profiling import profiled
+
 from personal.models import CalendarStatus, ShiftAssignment, UserProfile
 
 from task_manager.models import TaskAssignment, TaskDefinition
@@ -194,6 +196,7 @@ class TaskAssignmentSynchronizer:
         self.start_date = start_date
         self.end_date = end_date
 
+    @profiled("task_manager.task_assignment_sync")
     def sync(self) -> None:
         """Public entrypoint to synchronize assignments."""
 
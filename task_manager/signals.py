@@ -11,6 +11,23 @@ from django.dispatch import receiver
 from django.utils import timezone
 
 from personal.models import ShiftAssignment
+from production.models import (
+    BirdBatch,
+    BirdBatchRoomAllocation,
+    BreedReference,
+    BreedWeeklyGuide,
+    ChickenHouse,
+    Farm,
+    ProductionRecord,
+    ProductionRoomRecord,
+    Room,
+)
+from task_manager.mini_app.features.feed_plan import invalidate_feed_plans, invalidate_feed_plans_for_rooms
+from task_manager.mini_app.features.production_registry import (
+    invalidate_registry_snapshots,
+    invalidate_registry_snapshots_for_batches,
+    invalidate_registry_snapshots_for_rooms,
+)
 from task_manager.models import TaskDefinition
 from task_manager.services import is_task_assignment_sync_suppressed, sync_task_assignments
 
@@ -115,3 +132,46 @@ def handle_shift_assignment_deletion(sender, instance: ShiftAssignment, **kwargs
         return
     if instance.date:
         _schedule_range_sync(instance.date, instance.date)
+
+
+@receiver(post_save, sender=BirdBatchRoomAllocation, dispatch_uid="allocation_feed_plan")
+@receiver(post_delete, sender=BirdBatchRoomAllocation, dispatch_uid="allocation_delete_feed_plan")
+@receiver(post_save, sender=ProductionRoomRecord, dispatch_uid="room_record_feed_plan")
+@receiver(post_delete, sender=ProductionRoomRecord, dispatch_uid="room_record_delete_feed_plan")
+def expire_room_feed_plans(sender, instance, **kwargs) -> None:
+    invalidate_feed_plans_for_rooms([instance.room_id])
+
+
+@receiver(post_save, sender=BirdBatch, dispatch_uid="bird_batch_feed_plan")
+@receiver(post_delete, sender=BirdBatch, dispatch_uid="bird_batch_delete_feed_plan")
+@receiver(post_save, sender=BreedReference, dispatch_uid="breed_reference_feed_plan")
+@receiver(post_save, sender=BreedWeeklyGuide, dispatch_uid="breed_weekly_guide_feed_plan")
+@receiver(post_delete, sender=BreedWeeklyGuide, dispatch_uid="breed_weekly_guide_delete_feed_plan")
+@receiver(post_save, sender=Farm, dispatch_uid="farm_feed_plan")
+@receiver(post_save, sender=ChickenHouse, dispatch_uid="chicken_house_feed_plan")
+@receiver(post_save, sender=Room, dispatch_uid="room_feed_plan")
+def expire_all_feed_plans(sender, **kwargs) -> None:
+    invalidate_feed_plans()
+
+
+@receiver(post_save, sender=BirdBatchRoomAllocation, dispatch_uid="allocation_registry_snapshot")
+@receiver(post_delete, sender=BirdBatchRoomAllocation, dispatch_uid="allocation_delete_registry_snapshot")
+@receiver(post_save, sender=ProductionRoomRecord, dispatch_uid="room_record_registry_snapshot")
+@receiver(post_delete, sender=ProductionRoomRecord, dispatch_uid="room_record_delete_registry_snapshot")
+def expire_room_registry_snapshots(sender, instance, **kwargs) -> None:
+    invalidate_registry_snapshots_for_rooms([instance.room_id])
+
+
+@receiver(post_save, sender=ProductionRecord, dispatch_uid="production_record_registry_snapshot")
+@receiver(post_delete, sender=ProductionRecord, dispatch_uid="production_record_delete_registry_snapshot")
+@receiver(post_save, sender=BirdBatch, dispatch_uid="bird_batch_registry_snapshot")
+def expire_batch_registry_snapshots(sender, instance, **kwargs) -> None:
+    batch_id = instance.pk if isinstance(instance, BirdBatch) else instance.bird_batch_id
+    invalidate_registry_snapshots_for_batches([batch_id])
+
+
+@receiver(post_save, sender=Farm, dispatch_uid="farm_registry_snapshot")
+@receiver(post_save, sender=ChickenHouse, dispatch_uid="chicken_house_registry_snapshot")
+@receiver(post_save, sender=Room, dispatch_uid="room_registry_snapshot")
+def expire_all_registry_snapshots(sender, **kwargs) -> None:
+    invalidate_registry_snapshots()
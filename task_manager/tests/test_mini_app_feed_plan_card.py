@@ -4,6 +4,7 @@ from datetime import timedelta
 from decimal import Decimal
 
 from django.contrib.auth.models import Permission
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
@@ -29,10 +30,13 @@ from production.models import (
     ProductionRoomRecord,
     Room,
 )
+from task_manager.mini_app.features.feed_plan import build_feed_plan_card, get_house_feed_plan
 
 
 class MiniAppFeedPlanCardTests(TestCase):
     def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
         self._sequence = 0
         self.farm = Farm.objects.create(name="Granja Principal")
         self.breed = BreedReference.objects.create(name="Hy-Line Brown")
@@ -53,6 +57,12 @@ class MiniAppFeedPlanCardTests(TestCase):
             valid_until=today + timedelta(days=30),
         )
         self.position.rooms.add(self.room)
+        self.calendar = ShiftCalendar.objects.create(
+            name="Calendario Producción",
+            start_date=today - timedelta(days=1),
+            end_date=today + timedelta(days=1),
+            status=CalendarStatus.APPROVED,
+        )
 
         self.bird_batch = BirdBatch.objects.create(
             farm=self.farm,
@@ -92,18 +102,16 @@ class MiniAppFeedPlanCardTests(TestCase):
             user.user_permissions.add(feed_perm)
         return user
 
-    def _create_assignment(self, *, operator: UserProfile) -> ShiftAssignment:
-        today = timezone.localdate()
-        calendar = ShiftCalendar.objects.create(
-            name="Calendario Producción",
-            start_date=today - timedelta(days=1),
-            end_date=today + timedelta(days=1),
-            status=CalendarStatus.APPROVED,
-        )
+    def _create_assignment(
+        self,
+        *,
+        operator: UserProfile,
+        position: PositionDefinition | None = None,
+    ) -> ShiftAssignment:
         return ShiftAssignment.objects.create(
-            calendar=calendar,
-            position=self.position,
-            date=today,
+            calendar=self.calendar,
+            position=position or self.position,
+            date=timezone.localdate(),
             operator=operator,
         )
 
@@ -188,3 +196,50 @@ class MiniAppFeedPlanCardTests(TestCase):
         self.assertAlmostEqual(reference["grams_per_bird"], 110.0, places=1)
         self.assertAlmostEqual(reference["rounded_grams_per_bird"], 121.21, places=2)
         self.assertEqual(reference["lots"][0]["age_weeks"], 41)
+
+    def test_operators_on_the_same_rooms_share_one_computation(self):
+        first_user = self._create_user(grant_permission=True)
+        second_user = self._create_user(grant_permission=True)
+        today = timezone.localdate()
+        second_position = PositionDefinition.objects.create(
+            name="Auxiliar Operativo B",
+            code="AUX-OP-02",
+            category=self.category,
+            farm=self.farm,
+            chicken_house=self.chicken_house,
+            valid_from=today - timedelta(days=30),
+            valid_until=today + timedelta(days=30),
+        )
+        second_position.rooms.add(self.room)
+        self._create_assignment(operator=first_user)
+        self._create_assignment(operator=second_user, position=second_position)
+
+        first_plan = build_feed_plan_card(user=first_user, reference_date=today)
+        assert first_plan
+        self.assertEqual(first_plan.position_label, "Auxiliar Operativo")
+        self.assertEqual(first_plan.farm_name, "Granja Principal")
+
+        # Only the shared feed plan versions are read.
+        with self.assertNumQueries(1):
+            cached = get_house_feed_plan(
+                chicken_house=self.chicken_house,
+                room_ids=[self.room.pk],
+                target_date=today,
+            )
+        assert cached
+        self.assertEqual(cached.summary, first_plan.summary)
+        second_plan = build_feed_plan_card(user=second_user, reference_date=today)
+        assert second_plan
+        self.assertEqual(second_plan.houses, first_plan.houses)
+
+    def test_room_record_changes_expire_the_cached_plan(self):
+        today = timezone.localdate()
+        plan = get_house_feed_plan(chicken_house=self.chicken_house, room_ids=[self.room.pk], target_date=today)
+        assert plan
+        self.assertEqual(plan.summary.birds, 1000)
+
+        self._register_room_mortality(quantity=25)
+
+        plan = get_house_feed_plan(chicken_house=self.chicken_house, room_ids=[self.room.pk], target_date=today)
+        assert plan
+        self.assertEqual(plan.summary.birds, 975)
@@ -5,6 +5,7 @@ from datetime import datetime, time, timedelta
 from decimal import Decimal
 
 from django.contrib.auth.models import Permission
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
@@ -24,6 +25,7 @@ from production.models import (
     BirdBatchRoomAllocation,
     BreedReference,
     ChickenHouse,
+    EggClassificationBatch,
     Farm,
     ProductionRecord,
     ProductionRoomRecord,
@@ -31,12 +33,16 @@ from production.models import (
 )
 from task_manager.mini_app.features.night_mortality import (
     build_night_mortality_registry,
+    persist_night_mortality_entries,
     serialize_night_mortality_registry,
 )
+from task_manager.mini_app.features.production_registry import get_farm_registry_snapshot
 
 
 class MiniAppNightMortalityViewTests(TestCase):
     def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
         self.farm = Farm.objects.create(name="Granja Nocturna")
         self.house_a = ChickenHouse.objects.create(farm=self.farm, name="Galpón A")
         self.house_b = ChickenHouse.objects.create(farm=self.farm, name="Galpón B")
@@ -180,6 +186,44 @@ class MiniAppNightMortalityViewTests(TestCase):
         self.assertIn("1", consumptions)
         self.assertIn("2", consumptions)
 
+    def test_farm_snapshot_is_shared_and_refreshed_by_record_writes(self):
+        today = timezone.localdate()
+        snapshot = get_farm_registry_snapshot(self.farm.pk, today)
+        self.assertEqual([batch.batch_id for batch in snapshot.batches], [self.batch.pk])
+        self.assertEqual(snapshot.records, {})
+
+        # A cache hit only reads the shared farm versions.
+        with self.assertNumQueries(1):
+            self.assertEqual(get_farm_registry_snapshot(self.farm.pk, today), snapshot)
+
+        record = ProductionRecord.objects.create(
+            bird_batch=self.batch,
+            date=today,
+            production=Decimal("0"),
+            consumption=Decimal("0"),
+            mortality=4,
+            discard=0,
+        )
+        ProductionRoomRecord.objects.create(
+            production_record=record,
+            room=self.room_b,
+            production=Decimal("0"),
+            consumption=Decimal("0"),
+            mortality=4,
+            discard=0,
+        )
+
+        refreshed = get_farm_registry_snapshot(self.farm.pk, today)
+        self.assertEqual(refreshed.records[self.batch.pk].mortality_total, 4)
+        self.assertEqual(refreshed.room_records[(self.batch.pk, self.room_b.pk)].mortality, 4)
+        self.assertEqual(refreshed.cumulative_mortality, {(self.batch.pk, self.room_b.pk): 4})
+
+        registry = build_night_mortality_registry(user=self.user, registry_date=today)
+        assert registry
+        rooms = {room.room_id: room for room in registry.lots[0].rooms}
+        self.assertEqual(rooms[self.room_b.pk].mortality, 4)
+        self.assertIsNone(rooms[self.room_a.pk].mortality)
+
     def test_registry_date_before_cutoff_uses_today(self):
         today = timezone.localdate()
         tz = timezone.get_current_timezone()
@@ -241,3 +285,56 @@ class MiniAppNightMortalityViewTests(TestCase):
         data = response.json()
         self.assertIn("night_mortality", data)
         self.assertEqual(data["status"], "ok")
+
+    def test_resubmission_upserts_rooms_and_recomputes_totals(self):
+        today = timezone.localdate()
+        registry = build_night_mortality_registry(user=self.user, registry_date=today)
+        assert registry
+
+        def submit(mortality_a: int, consumption_b: int) -> ProductionRecord:
+            entries = [
+                {
+                    "bird_batch": self.batch.pk,
+                    "rooms": [
+                        {"room_id": self.room_a.pk, "mortality": mortality_a, "discard": 0, "consumption": 1},
+                        {"room_id": self.room_b.pk, "mortality": 1, "discard": 1, "consumption": consumption_b},
+                    ],
+                }
+            ]
+            return persist_night_mortality_entries(registry=registry, entries=entries, user=self.user)[0]
+
+        first = submit(2, 2)
+        second = submit(5, 4)
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(ProductionRoomRecord.objects.filter(production_record=second).count(), 2)
+        record = ProductionRecord.objects.get(pk=second.pk)
+        self.assertEqual((record.mortality, record.discard, record.consumption), (6, 1, Decimal("5")))
+        self.assertEqual((second.mortality, second.consumption), (6, Decimal("5")))
+        self.assertEqual(record.created_by, self.user)
+        self.assertTrue(EggClassificationBatch.objects.filter(production_record=record).exists())
+
+    def test_mortality_submission_keeps_the_recorded_production_total(self):
+        today = timezone.localdate()
+        ProductionRecord.objects.create(
+            bird_batch=self.batch,
+            date=today,
+            production=Decimal("150.0"),
+            consumption=Decimal("0"),
+            mortality=0,
+            discard=0,
+        )
+        registry = build_night_mortality_registry(user=self.user, registry_date=today)
+        assert registry
+
+        entries = [
+            {
+                "bird_batch": self.batch.pk,
+                "rooms": [{"room_id": self.room_a.pk, "mortality": 3, "discard": 1, "consumption": 2}],
+            }
+        ]
+        persisted = persist_night_mortality_entries(registry=registry, entries=entries, user=self.user)[0]
+
+        record = ProductionRecord.objects.get(pk=persisted.pk)
+        self.assertEqual(record.production, Decimal("150.0"))
+        self.assertEqual((record.mortality, record.discard, record.consumption), (3, 1, Decimal("2")))
@@ -11,7 +11,11 @@ from personal.models import DayOfWeek, PositionCategory, PositionCategoryCode, P
 from production.models import ChickenHouse, Farm, Room
 from task_manager.models import TaskAssignment, TaskCategory, TaskDefinition, TaskStatus
 from task_manager.services import suppress_task_assignment_sync
-from task_manager.views import _resolve_daily_task_cards
+from task_manager.views import (
+    MINI_APP_OVERDUE_CARD_LIMIT,
+    _resolve_daily_task_cards,
+    _resolve_overdue_task_summary,
+)
 
 
 class MiniAppTaskCardWindowTests(TestCase):
@@ -262,6 +266,42 @@ class MiniAppTaskCardWindowTests(TestCase):
         self.assertEqual(len(cards), 1)
         card = cards[0]
         self.assertEqual(card["status"]["state"], "completed")
+
+    def test_overdue_backlog_is_capped_and_summarized(self):
+        current = self._create_assignment(due_date=self.reference_date, name="Tarea del día")
+        backlog = [
+            self._create_assignment(
+                due_date=self.reference_date - timedelta(days=offset),
+                is_accumulative=True,
+                name=f"Pendiente {offset}",
+            )
+            for offset in range(1, MINI_APP_OVERDUE_CARD_LIMIT + 4)
+        ]
+
+        cards = _resolve_daily_task_cards(
+            user=self.user,
+            reference_date=self.reference_date,
+            current_time=self._aware_datetime(self.reference_date, 9, 0),
+        )
+
+        card_ids = {card["assignment_id"] for card in cards}
+        self.assertIn(current.pk, card_ids)
+        self.assertEqual(len(cards), MINI_APP_OVERDUE_CARD_LIMIT + 1)
+        self.assertTrue({assignment.pk for assignment in backlog[:MINI_APP_OVERDUE_CARD_LIMIT]} <= card_ids)
+
+        summary = _resolve_overdue_task_summary(user=self.user, reference_date=self.reference_date)
+        self.assertEqual(summary["total"], MINI_APP_OVERDUE_CARD_LIMIT + 3)
+        self.assertEqual(summary["hidden_count"], 3)
+        self.assertEqual(summary["oldest_due_date_iso"], backlog[-1].due_date.isoformat())
+
+    def test_overdue_summary_is_empty_when_backlog_fits(self):
+        self._create_assignment(
+            due_date=self.reference_date - timedelta(days=3),
+            is_accumulative=True,
+        )
+
+        self.assertIsNone(_resolve_overdue_task_summary(user=self.user, reference_date=self.reference_date))
+
     def test_task_badges_exclude_recurrence_and_priority(self):
         assignment = self._create_assignment(
             due_date=self.reference_date,
@@ -18,6 +18,7 @@ from production.models import (
     Room,
 )
 from personal.models import UserProfile
+from production.services.internal_transport import authorize_internal_transport, build_transport_snapshot
 from task_manager.mini_app.features.transport_queue import build_transport_queue_payload
 
 
@@ -172,6 +173,35 @@ class MiniAppTransportQueueTests(TestCase):
         self.assertEqual(queue["pending_count"], 1)
         self.assertEqual(queue["productions"][0]["id"], record.pk)
 
+    def test_transport_snapshot_is_cached_until_a_transport_step(self) -> None:
+        record = self._create_production_record(
+            house=self.remote_house,
+            room=self.remote_room,
+            date=timezone.localdate() - timedelta(days=1),
+            reported_cartons=Decimal("35"),
+            received_cartons=Decimal("35"),
+            classified_cartons=Decimal("5"),
+        )
+        statuses = [EggClassificationBatch.TransportStatus.AUTHORIZED]
+        self.assertEqual(build_transport_snapshot(statuses=statuses), [])
+
+        authorize_internal_transport(
+            batch_ids=[record.egg_classification.pk],
+            transporter=self.transporter,
+            expected_date=timezone.localdate(),
+            actor=self.transporter,
+        )
+        snapshot = build_transport_snapshot(statuses=statuses)
+        self.assertEqual(len(snapshot), 1)
+        entry = snapshot[0]
+        self.assertEqual(entry.pending_cartons, Decimal("30"))
+        self.assertEqual(entry.destination_name, self.destination_farm.name)
+        self.assertEqual(entry.chicken_houses, [self.remote_house.name])
+
+        # A cache hit only reads the shared transport version.
+        with self.assertNumQueries(1):
+            self.assertEqual(build_transport_snapshot(statuses=statuses), snapshot)
+
     def test_transporter_options_include_active_users(self) -> None:
         queue = build_transport_queue_payload()
         transporters = queue["transporters"]
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.test import TestCase
+from django.utils import timezone
+from py_vapid import Vapid, b64urlencode
+from pywebpush import WebPushException
+
+from personal.models import Role, UserProfile
+from task_manager.models import MiniAppPushSubscription, PushNotificationOutbox
+from task_manager.services.push_notifications import (
+    PushNotificationMessage,
+    PushNotificationService,
+    PushOutboxDispatcher,
+    QueuedPushNotificationService,
+)
+
+
+def _generate_vapid_key() -> str:
+    vapid = Vapid()
+    vapid.generate_keys()
+    return b64urlencode(vapid.private_key.private_numbers().private_value.to_bytes(32, "big"))
+
+
+_TEST_VAPID_KEY = _generate_vapid_key()
+
+
+class _FakeWebPushClient:
+    def __init__(self, status_by_endpoint: dict[str, int] | None = None):
+        self.status_by_endpoint = status_by_endpoint or {}
+        self.calls: list[dict[str, object]] = []
+
+    def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        endpoint = kwargs["subscription_info"]["endpoint"]
+        status_code = self.status_by_endpoint.get(endpoint)
+        if status_code:
+            raise WebPushException("push failed", response=SimpleNamespace(status_code=status_code, text=""))
+        return SimpleNamespace(status_code=201)
+
+
+class PushNotificationOutboxTests(TestCase):
+    def setUp(self):
+        self.user = UserProfile.objects.create_user(
+            cedula="777",
+            password="pwd",
+            nombres="Laura",
+            apellidos="Gómez",
+            telefono="3001239999",
+        )
+        self.phone = MiniAppPushSubscription.objects.create(
+            user=self.user,
+            endpoint="https://push.example.com/phone",
+            p256dh_key="p256",
+            auth_key="auth",
+        )
+        self.tablet = MiniAppPushSubscription.objects.create(
+            user=self.user,
+            endpoint="https://push.example.com/tablet",
+            p256dh_key="p256",
+            auth_key="auth",
+        )
+        self.message = PushNotificationMessage(title="Hola", body="Mensaje", data={"purchase_id": 1})
+
+    def _build_dispatcher(self, client: _FakeWebPushClient, **kwargs) -> PushOutboxDispatcher:
+        service = PushNotificationService(vapid_private_key=_TEST_VAPID_KEY, webpush_client=client)
+        return PushOutboxDispatcher(service=service, **kwargs)
+
+    def test_queued_service_persists_entries_without_calling_endpoints(self):
+        client = _FakeWebPushClient()
+        service = QueuedPushNotificationService(vapid_private_key=_TEST_VAPID_KEY, webpush_client=client)
+
+        result = service.send_to_user(user=self.user, message=self.message, notification_type="test.queued")
+
+        self.assertEqual(result.queued, 2)
+        self.assertEqual(client.calls, [])
+        entries = PushNotificationOutbox.objects.filter(notification_type="test.queued")
+        self.assertEqual(entries.count(), 2)
+        self.assertTrue(all(entry.status == PushNotificationOutbox.Status.PENDING for entry in entries))
+        self.assertEqual(entries.first().payload["title"], "Hola")
+
+    def test_dispatch_delivers_due_entries(self):
+        QueuedPushNotificationService(vapid_private_key=_TEST_VAPID_KEY).send_to_user(
+            user=self.user,
+            message=self.message,
+            notification_type="test.queued",
+        )
+        client = _FakeWebPushClient()
+
+        summary = self._build_dispatcher(client).dispatch_due()
+
+        self.assertEqual(summary.claimed, 2)
+        self.assertEqual(summary.sent, 2)
+        self.assertEqual(len(client.calls), 2)
+        self.assertFalse(
+            PushNotificationOutbox.objects.exclude(status=PushNotificationOutbox.Status.SENT).exists()
+        )
+
+    def test_gone_subscription_is_deactivated_and_discarded(self):
+        QueuedPushNotificationService(vapid_private_key=_TEST_VAPID_KEY).send_to_user(
+            user=self.user,
+            message=self.message,
+            notification_type="test.queued",
+        )
+        client = _FakeWebPushClient({self.tablet.endpoint: 410})
+
+        summary = self._build_dispatcher(client).dispatch_due()
+
+        self.assertEqual(summary.sent, 1)
+        self.assertEqual(summary.discarded, 1)
+        self.tablet.refresh_from_db()
+        self.assertFalse(self.tablet.is_active)
+        entry = PushNotificationOutbox.objects.get(subscription=self.tablet)
+        self.assertEqual(entry.status, PushNotificationOutbox.Status.DISCARDED)
+
+    def test_transient_errors_are_retried_with_backoff_until_failed(self):
+        entry = PushNotificationOutbox.objects.create(
+            subscription=self.phone,
+            notification_type="test.retry",
+            payload=self.message.as_payload(),
+        )
+        client = _FakeWebPushClient({self.phone.endpoint: 503})
+        dispatcher = self._build_dispatcher(client, max_attempts=2, backoff_seconds=60)
+
+        summary = dispatcher.dispatch_due()
+
+        self.assertEqual(summary.retried, 1)
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, PushNotificationOutbox.Status.PENDING)
+        self.assertEqual(entry.attempts, 1)
+        self.assertGreater(entry.next_attempt_at, timezone.now() + timedelta(seconds=30))
+
+        self.assertEqual(dispatcher.dispatch_due().claimed, 0)
+
+        PushNotificationOutbox.objects.filter(pk=entry.pk).update(next_attempt_at=timezone.now())
+        summary = dispatcher.dispatch_due()
+
+        self.assertEqual(summary.failed, 1)
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, PushNotificationOutbox.Status.FAILED)
+        self.assertEqual(entry.attempts, 2)
+        self.phone.refresh_from_db()
+        self.assertTrue(self.phone.is_active)
+
+
+class PushNotificationFanOutTests(TestCase):
+    def setUp(self):
+        self.role = Role.objects.create(name=Role.RoleName.GALPONERO)
+        self.operators = []
+        for index in range(3):
+            operator = UserProfile.objects.create_user(
+                cedula=f"90{index}",
+                password="pwd",
+                nombres=f"Operario {index}",
+                apellidos="Turno",
+                telefono=f"30012300{index}",
+            )
+            operator.roles.add(self.role)
+            MiniAppPushSubscription.objects.create(
+                user=operator,
+                endpoint=f"https://push.example.com/operator-{index}",
+                p256dh_key="p256",
+                auth_key="auth",
+            )
+            self.operators.append(operator)
+        self.other_user = UserProfile.objects.create_user(
+            cedula="999",
+            password="pwd",
+            nombres="Sin",
+            apellidos="Rol",
+            telefono="3001230999",
+        )
+        MiniAppPushSubscription.objects.create(
+            user=self.other_user,
+            endpoint="https://push.example.com/other",
+            p256dh_key="p256",
+            auth_key="auth",
+        )
+        self.message = PushNotificationMessage(title="Turno", body="Recuerda tu turno de mañana")
+
+    def test_role_broadcast_loads_subscriptions_in_one_query_and_reuses_vapid_headers(self):
+        client = _FakeWebPushClient()
+        service = PushNotificationService(vapid_private_key=_TEST_VAPID_KEY, webpush_client=client)
+
+        with self.assertNumQueries(1):
+            result = service.send_to_users(
+                roles=[Role.RoleName.GALPONERO],
+                message=self.message,
+                notification_type="shift.reminder",
+            )
+
+        self.assertEqual(result.attempted, 3)
+        self.assertEqual(result.delivered, 3)
+        endpoints = {call["subscription_info"]["endpoint"] for call in client.calls}
+        self.assertNotIn("https://push.example.com/other", endpoints)
+        authorizations = {call["headers"]["Authorization"] for call in client.calls}
+        self.assertEqual(len(authorizations), 1)
+        self.assertNotIn("vapid_claims", client.calls[0])
+        self.assertEqual(len({id(call["requests_session"]) for call in client.calls}), 1)
+
+    def test_gone_subscriptions_are_deactivated_with_a_single_update(self):
+        gone_endpoint = "https://push.example.com/operator-1"
+        client = _FakeWebPushClient({gone_endpoint: 404})
+        service = PushNotificationService(vapid_private_key=_TEST_VAPID_KEY, webpush_client=client)
+
+        with self.assertNumQueries(2):
+            result = service.send_to_users(
+                users=self.operators,
+                message=self.message,
+                notification_type="shift.reminder",
+            )
+
+        self.assertEqual(result.delivered, 2)
+        self.assertEqual(len(result.failures), 1)
+        self.assertFalse(MiniAppPushSubscription.objects.get(endpoint=gone_endpoint).is_active)
+
+    def test_queued_broadcast_creates_outbox_entries_in_bulk(self):
+        service = QueuedPushNotificationService(vapid_private_key=_TEST_VAPID_KEY)
+
+        with self.assertNumQueries(2):
+            result = service.send_to_users(
+                roles=[self.role],
+                users=[self.other_user],
+                message=self.message,
+                notification_type="shift.reminder",
+            )
+
+        self.assertEqual(result.queued, 4)
+        self.assertEqual(PushNotificationOutbox.objects.filter(notification_type="shift.reminder").count(), 4)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from datetime import date
+from unittest import mock
 
 from django.contrib.auth import get_user_model
 from django.contrib.messages import get_messages
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from personal.models import (
@@ -241,3 +244,101 @@ class TaskDefinitionDeleteViewTests(TestCase):
         messages = list(get_messages(response.wsgi_request))
         self.assertTrue(messages)
         self.assertNotIn("asignación", str(messages[0]).lower())
+
+
+class TaskDefinitionPaginationTests(TestCase):
+    def setUp(self):
+        self.staff_user = get_user_model().objects.create_user(
+            "902000",
+            password="secret-pass",
+            nombres="Gestor",
+            apellidos="Listado",
+            telefono="3119990001",
+            is_staff=True,
+        )
+        self.client.force_login(self.staff_user)
+        status = TaskStatus.objects.create(name="Activa")
+        category = TaskCategory.objects.create(name="Sanidad")
+        with suppress_task_assignment_sync():
+            self.tasks = [
+                TaskDefinition.objects.create(name=f"Paginada {index:02d}", status=status, category=category)
+                for index in range(7)
+            ]
+        self.tasks.sort(key=lambda task: (task.display_order, task.name, task.pk))
+        self.page_size = mock.patch("task_manager.views.TASK_DEFINITION_PAGE_SIZE", 3)
+        self.page_size.start()
+        self.addCleanup(self.page_size.stop)
+
+    def _fetch_rows(self, cursor: str | None = None) -> dict:
+        params = {"search": "Paginada"}
+        if cursor:
+            params["cursor"] = cursor
+        response = self.client.get(
+            reverse("task_manager:definition-rows"),
+            params,
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_rows_endpoint_follows_cursor_until_exhausted(self):
+        first = self._fetch_rows()
+        second = self._fetch_rows(first["next_cursor"])
+        third = self._fetch_rows(second["next_cursor"])
+
+        self.assertEqual([first["rows_loaded"], second["rows_loaded"], third["rows_loaded"]], [3, 3, 1])
+        self.assertEqual((second["start_index"], second["end_index"], second["page"]), (4, 6, 2))
+        self.assertEqual(third["count"], 7)
+        self.assertFalse(third["has_next"])
+        self.assertIsNone(third["next_cursor"])
+
+    def test_highlighted_task_opens_listing_at_its_row(self):
+        highlighted = self.tasks[5]
+
+        response = self.client.get(
+            reverse("configuration:tasks"),
+            {"search": "Paginada", "tm_task": highlighted.pk},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        page = response.context["task_definition_page_obj"]
+        self.assertEqual([task.pk for task in page.object_list], [task.pk for task in self.tasks[5:]])
+        self.assertTrue(page.has_previous)
+        self.assertIsNone(response.context["task_definition_page_start"])
+        self.assertEqual(response.context["task_definition_highlight_id"], highlighted.pk)
+        self.assertNotIn("tm_task", response.context["task_definition_previous_url"])
+
+    def test_highlight_lookup_never_counts_or_offsets(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(
+                reverse("configuration:tasks"),
+                {"search": "Paginada", "tm_task": self.tasks[5].pk},
+            )
+
+        task_table = TaskDefinition._meta.db_table
+        task_queries = [query["sql"] for query in queries.captured_queries if f'FROM "{task_table}"' in query["sql"]]
+        self.assertFalse([sql for sql in task_queries if " OFFSET " in sql])
+
+    def test_previous_cursor_from_the_highlight_reaches_the_rows_before_it(self):
+        response = self.client.get(
+            reverse("configuration:tasks"),
+            {"search": "Paginada", "tm_task": self.tasks[5].pk},
+        )
+        previous_cursor = response.context["task_definition_page_obj"].previous_cursor
+
+        back = self._fetch_rows(previous_cursor)
+
+        self.assertEqual(back["rows_loaded"], 3)
+        self.assertTrue(back["has_previous"])
+
+    def test_previous_cursor_walks_back_to_the_first_page(self):
+        first = self._fetch_rows()
+        second = self._fetch_rows(first["next_cursor"])
+        self.assertTrue(second["has_previous"])
+
+        back = self._fetch_rows(second["previous_cursor"])
+
+        self.assertEqual((back["start_index"], back["end_index"]), (1, 3))
+        self.assertTrue(back["has_next"])
+        self.assertFalse(back["has_previous"])
+        self.assertIsNone(back["previous_cursor"])
@@ -13,9 +13,8 @@ from django.contrib import messages
 from django.contrib.humanize.templatetags.humanize import intcomma
 from django.contrib.auth import login, logout
 from django.core.exceptions import ValidationError
-from django.core.paginator import Paginator
 from django.db import IntegrityError, transaction
-from django.db.models import Prefetch, Q, QuerySet
+from django.db.models import Count, Min, Prefetch, Q, QuerySet
 from django.http import JsonResponse, QueryDict
 from django.shortcuts import get_object_or_404, redirect
 from django.template.loader import render_to_string
@@ -42,25 +41,34 @@ from administration.services.purchase_requests import (
     PurchaseRequestSubmissionService,
     PurchaseRequestValidationError,
 )
+from administration.services.purchase_search import search_suppliers
 from administration.services.workflows import (
     PurchaseApprovalDecisionError,
     PurchaseApprovalDecisionService,
 )
 from applacolina.mixins import StaffRequiredMixin
+from applacolina.pagination import (
+    KeysetPage,
+    approximate_count,
+    cursor_for,
+    decode_cursor,
+    keyset_paginate,
+    page_anchor,
+)
+from applacolina.query_budget import QueryBudget
 
 from personal.models import (
     CalendarStatus,
     DayOfWeek,
     CalendarRestSuggestion,
     OperatorRestPeriod,
-    PositionDefinition,
+    OperatorScheduleDay,
     RestPeriodStatus,
-    ShiftAssignment,
     ShiftType,
     Role,
     UserProfile,
 )
-from production.models import ChickenHouse, Farm, Room
+from production.services.infrastructure_catalog import get_infrastructure_catalog
 from production.services.internal_transport import (
     authorize_internal_transport,
     record_transporter_confirmation,
@@ -372,72 +380,30 @@ def _resolve_operator_daily_assignments(
 
     search_horizon = reference_date + timedelta(days=45)
 
-    assignments_qs = (
-        ShiftAssignment.objects.select_related(
-            "calendar",
-            "position",
-            "position__category",
-            "position__farm",
-            "position__chicken_house",
+    # One range read on the (operator, date) read model kept up to date by personal.signals.
+    schedule_days = (
+        OperatorScheduleDay.objects.select_related(
+            "assignment__calendar",
+            "assignment__position__category",
+            "assignment__position__farm",
+            "assignment__position__chicken_house",
+            "rest_period__calendar",
+            "rest_suggestion",
         )
         .filter(
+            Q(assignment__isnull=False) | Q(rest_period__isnull=False),
             operator=user,
             date__gte=reference_date,
             date__lte=search_horizon,
         )
-        .order_by("date", "calendar__start_date", "position__display_order", "position__code")
-    )
-
-    assignments_by_day: dict[date, list[ShiftAssignment]] = {}
-    for assignment in assignments_qs:
-        assignments_by_day.setdefault(assignment.date, []).append(assignment)
-
-    # Consider manual and calendar-generated rests except cancelled ones.
-    rest_periods = (
-        OperatorRestPeriod.objects.select_related("calendar")
-        .filter(
-            operator=user,
-            start_date__lte=search_horizon,
-            end_date__gte=reference_date,
-        )
-        .exclude(status__in=[RestPeriodStatus.CANCELLED, RestPeriodStatus.EXPIRED])
-        .order_by("start_date", "id")
+        .order_by("date")[:max_days]
     )
 
-    rest_by_day: dict[date, OperatorRestPeriod] = {}
-    for period in rest_periods:
-        current = max(period.start_date, reference_date)
-        limit = min(period.end_date, search_horizon)
-        while current <= limit:
-            rest_by_day.setdefault(current, period)
-            current += timedelta(days=1)
-
-    rest_suggestion_map: dict[tuple[int, date], CalendarRestSuggestion] = {}
-    rest_suggestions = (
-        CalendarRestSuggestion.objects.filter(
-            operator=user,
-            scheduled_date__gte=reference_date,
-            scheduled_date__lte=search_horizon,
-        )
-        .select_related("calendar")
-        .order_by("-created_at")
-    )
-    for suggestion in rest_suggestions:
-        if suggestion.calendar_id:
-            rest_suggestion_map[(suggestion.calendar_id, suggestion.scheduled_date)] = suggestion
-
     days: list[dict[str, object]] = []
-    cursor = reference_date
-    horizon_limit = search_horizon
-
-    while cursor <= horizon_limit and len(days) < max_days:
-        day_assignments = assignments_by_day.get(cursor, [])
-        rest_period = rest_by_day.get(cursor)
-        if not day_assignments and not rest_period:
-            cursor += timedelta(days=1)
-            continue
-
-        assignment = day_assignments[0] if day_assignments else None
+    for schedule_day in schedule_days:
+        cursor = schedule_day.date
+        assignment = schedule_day.assignment
+        rest_period = schedule_day.rest_period
         alerts: list[str] = []
         calendar = getattr(assignment, "calendar", None)
         calendar_status_key: Optional[str] = getattr(calendar, "status", None)
@@ -505,8 +471,7 @@ def _resolve_operator_daily_assignments(
 
         rest_suggestion_payload: Optional[dict[str, object]] = None
         if calendar_id:
-            suggestion_key = (calendar_id, cursor)
-            suggestion_entry = rest_suggestion_map.get(suggestion_key)
+            suggestion_entry = schedule_day.rest_suggestion
             if suggestion_entry:
                 rest_suggestion_payload = {
                     "id": suggestion_entry.id,
@@ -538,7 +503,6 @@ def _resolve_operator_daily_assignments(
             rest_suggestion=rest_suggestion_payload,
         )
         days.append(day_payload)
-        cursor += timedelta(days=1)
 
     for index, day in enumerate(days):
         day["index"] = index
@@ -768,6 +732,12 @@ def _resolve_task_definition_shift_type(task_definition: TaskDefinition) -> str:
     return ShiftType.DAY
 
 
+def _resolve_night_window_reference_date(*, reference_date: date, current_time: datetime) -> date:
+    if current_time.time() < NIGHT_SHIFT_CUTOFF:
+        return reference_date - timedelta(days=1)
+    return reference_date
+
+
 def _resolve_shift_window_reference_date(
     task_definition: TaskDefinition,
     *,
@@ -778,8 +748,7 @@ def _resolve_shift_window_reference_date(
 
     shift_type = _resolve_task_definition_shift_type(task_definition)
     if shift_type == ShiftType.NIGHT:
-        if current_time.time() < NIGHT_SHIFT_CUTOFF:
-            return reference_date - timedelta(days=1)
+        return _resolve_night_window_reference_date(reference_date=reference_date, current_time=current_time)
     return reference_date
 
 
@@ -801,34 +770,85 @@ def _resolve_assignment_reference_date(
     )
 
 
-def _assignment_matches_active_window(
-    assignment: TaskAssignment,
-    *,
-    reference_date: date,
-    current_time: datetime,
-) -> bool:
-    """Return True when the assignment should show up in the mini app for the current shift."""
+MINI_APP_OVERDUE_CARD_LIMIT = 15
 
-    definition = assignment.task_definition
-    target_date = _resolve_assignment_reference_date(
-        assignment,
+
+def _task_card_target_filter(field: str, *, reference_date: date, current_time: datetime) -> Q:
+    """SQL counterpart of `_resolve_assignment_reference_date`: ``field`` equals the assignment target date."""
+
+    night_reference_date = _resolve_night_window_reference_date(
         reference_date=reference_date,
         current_time=current_time,
     )
+    if night_reference_date == reference_date:
+        return Q(**{field: reference_date})
+    night_window = Q(
+        task_definition__is_accumulative=False,
+        task_definition__position__category__shift_type=ShiftType.NIGHT,
+    )
+    return (night_window & Q(**{field: night_reference_date})) | (~night_window & Q(**{field: reference_date}))
 
-    if assignment.completed_on:
-        if assignment.due_date:
-            return assignment.due_date == target_date
-        return assignment.completed_on == target_date
 
-    if getattr(definition, "is_accumulative", False):
-        return True
+def _overdue_task_backlog_filter(reference_date: date) -> Q:
+    """Accumulative tasks still open after their due date; they stay visible until completed."""
 
-    due_date = assignment.due_date
-    if not due_date:
-        return True
+    return Q(
+        completed_on__isnull=True,
+        task_definition__is_accumulative=True,
+        due_date__lt=reference_date,
+    )
 
-    return due_date == target_date
+
+def _task_card_window_filter(*, reference_date: date, current_time: datetime) -> Q:
+    """Assignments that belong to the active shift window, excluding the overdue backlog."""
+
+    def target(field: str) -> Q:
+        return _task_card_target_filter(field, reference_date=reference_date, current_time=current_time)
+
+    completed = Q(completed_on__gte=reference_date - timedelta(days=1)) & (
+        (Q(due_date__isnull=False) & target("due_date"))
+        | (Q(due_date__isnull=True) & target("completed_on"))
+    )
+    pending = Q(completed_on__isnull=True) & (
+        Q(due_date__isnull=True)
+        | Q(task_definition__is_accumulative=True, due_date__gte=reference_date)
+        | (Q(task_definition__is_accumulative=False) & target("due_date"))
+    )
+    return completed | pending
+
+
+def _resolve_overdue_task_summary(
+    *,
+    user: Optional[UserProfile],
+    reference_date: date,
+) -> Optional[dict[str, object]]:
+    """Summarize the overdue backlog that does not fit in the task feed."""
+
+    if not user or not getattr(user, "is_authenticated", False):
+        return None
+    totals = (
+        TaskAssignment.objects.filter(collaborator=user)
+        .filter(_overdue_task_backlog_filter(reference_date))
+        .aggregate(total=Count("pk"), oldest_due_date=Min("due_date"))
+    )
+    hidden_count = totals["total"] - min(totals["total"], MINI_APP_OVERDUE_CARD_LIMIT)
+    if hidden_count <= 0:
+        return None
+    oldest_due_date = totals["oldest_due_date"]
+    return {
+        "total": totals["total"],
+        "hidden_count": hidden_count,
+        "oldest_due_date_iso": oldest_due_date.isoformat() if oldest_due_date else None,
+        "label": ngettext(
+            "%(count)s tarea vencida más antigua no se muestra",
+            "%(count)s tareas vencidas más antiguas no se muestran",
+            hidden_count,
+        )
+        % {"count": hidden_count},
+        "details": _("Pendiente desde %(date)s") % {"date": date_format(oldest_due_date, "DATE_FORMAT")}
+        if oldest_due_date
+        else "",
+    }
 
 
 def _resolve_daily_task_cards(
@@ -843,11 +863,19 @@ def _resolve_daily_task_cards(
     normalized_now = _normalize_current_time(current_time)
 
     if user and getattr(user, "is_authenticated", False):
+        # The overdue backlog is unbounded, so only its most recent slice joins the feed;
+        # `_resolve_overdue_task_summary` reports the remainder.
+        recent_backlog = (
+            TaskAssignment.objects.filter(collaborator=user)
+            .filter(_overdue_task_backlog_filter(reference_date))
+            .order_by("-due_date", "-pk")
+            .values("pk")[:MINI_APP_OVERDUE_CARD_LIMIT]
+        )
         assignments = (
             TaskAssignment.objects.filter(collaborator=user)
             .filter(
-                Q(completed_on__isnull=True)
-                | Q(completed_on__gte=reference_date - timedelta(days=1))
+                _task_card_window_filter(reference_date=reference_date, current_time=normalized_now)
+                | Q(pk__in=recent_backlog)
             )
             .select_related(
                 "task_definition",
@@ -862,12 +890,6 @@ def _resolve_daily_task_cards(
         )
         serialized_cards: list[tuple[tuple[int, date, int, int], dict[str, object]]] = []
         for assignment in assignments:
-            if not _assignment_matches_active_window(
-                assignment,
-                reference_date=reference_date,
-                current_time=normalized_now,
-            ):
-                continue
             status_reference_date = _resolve_assignment_reference_date(
                 assignment,
                 reference_date=reference_date,
@@ -1157,7 +1179,7 @@ def _build_mini_app_purchase_request_payload(
         farm_id = scope_selection["farm_id"]
         house_id = scope_selection["chicken_house_id"]
         if scope_selection["kind"] == PurchaseRequest.AreaScope.CHICKEN_HOUSE and house_id and not farm_id:
-            house = ChickenHouse.objects.select_related("farm").filter(pk=house_id).first()
+            house = get_infrastructure_catalog().chicken_house_by_id.get(house_id)
             if house and house.farm_id:
                 farm_id = house.farm_id
             else:
@@ -1725,31 +1747,37 @@ class TaskManagerHomeView(StaffRequiredMixin, generic.TemplateView):
                 highlight_id = None
 
         queryset = get_task_definition_queryset(filters)
-        paginator = Paginator(queryset, 400)
-        page_number = self.request.GET.get("page")
-        page_obj = paginator.get_page(page_number)
+        page = paginate_task_definitions(
+            queryset,
+            cursor_token=self.request.GET.get("cursor"),
+            page_number=self.request.GET.get("page"),
+        )
 
-        if highlight_id is not None:
-            if highlight_id not in {task.pk for task in page_obj.object_list}:
-                highlight_page = locate_task_definition_page(queryset, highlight_id, paginator.per_page)
-                if highlight_page is not None and highlight_page != page_obj.number:
-                    page_obj = paginator.get_page(highlight_page)
+        if highlight_id is not None and highlight_id not in {task.pk for task in page.object_list}:
+            highlighted_task = queryset.filter(pk=highlight_id).first()
+            if highlighted_task is not None:
+                # Open the listing at the highlighted row: an inclusive keyset cursor costs the same
+                # as page 1, and the previous cursor leads back to the rows before it.
+                page = keyset_paginate(
+                    queryset,
+                    ordering=TASK_DEFINITION_ORDERING,
+                    per_page=TASK_DEFINITION_PAGE_SIZE,
+                    cursor=cursor_for(highlighted_task, TASK_DEFINITION_ORDERING, inclusive=True),
+                )
 
-        task_rows = build_task_definition_rows(page_obj.object_list)
+        task_rows = build_task_definition_rows(page.object_list)
+        total_count = approximate_count(queryset)
         context["task_definition_rows"] = task_rows
-        context["task_definition_page_obj"] = page_obj
-        context["task_definition_paginator"] = paginator
-        context["task_definition_total_count"] = paginator.count
+        context["task_definition_page_obj"] = page
+        context["task_definition_total_count"] = total_count
 
         if highlight_id is not None:
             context["task_definition_highlight_id"] = highlight_id
 
-        context["task_definition_page_numbers"] = build_compact_page_range(page_obj)
-
         remaining_params = self.request.GET.copy()
         remaining_params._mutable = True
-        if "page" in remaining_params:
-            remaining_params.pop("page")
+        for pagination_param in ("page", "cursor"):
+            remaining_params.pop(pagination_param, None)
         for key in TASK_FILTER_PARAM_NAMES:
             default_value = getattr(defaults, key)
             current_value = getattr(filters, key)
@@ -1765,15 +1793,14 @@ class TaskManagerHomeView(StaffRequiredMixin, generic.TemplateView):
         querystring = remaining_params.urlencode()
         context["task_definition_querystring"] = querystring
         context["task_definition_page_query_prefix"] = f"?{querystring}&" if querystring else "?"
+        if page.previous_cursor:
+            previous_params = remaining_params.copy()
+            previous_params.pop("tm_task", None)
+            previous_params["cursor"] = page.previous_cursor
+            context["task_definition_previous_url"] = f"?{previous_params.urlencode()}"
 
-        if paginator.count:
-            start_index = (page_obj.number - 1) * paginator.per_page + 1
-            end_index = start_index + len(page_obj.object_list) - 1
-        else:
-            start_index = 0
-            end_index = 0
-        context["task_definition_page_start"] = start_index
-        context["task_definition_page_end"] = end_index
+        context["task_definition_page_start"] = page.start_index
+        context["task_definition_page_end"] = page.end_index
 
         group_primary_groups = build_grouping_primary_filter_groups()
         default_group_primary = "status"
@@ -2732,6 +2759,7 @@ def _build_telegram_mini_app_payload(
         }
 
     tasks = _resolve_daily_task_cards(user=user, reference_date=today)
+    tasks_overdue_summary = _resolve_overdue_task_summary(user=user, reference_date=today)
 
     daily_assignment_schedule = _resolve_operator_daily_assignments(
         user=user,
@@ -3345,6 +3373,7 @@ def _build_telegram_mini_app_payload(
         "egg_workflow": egg_workflow,
         "transport_queue": transport_queue,
         "tasks": tasks,
+        "tasks_overdue_summary": tasks_overdue_summary,
         "daily_assignments": daily_assignment_schedule,
         "leader_review": {
             "title": _("Revisión de tareas ejecutadas"),
@@ -3480,6 +3509,7 @@ class TaskManagerMiniAppView(generic.TemplateView):
 
     template_name = "task_manager/telegram_mini_app.html"
     form_class = MiniAppAuthenticationForm
+    query_budget = QueryBudget(max_queries=80, max_duplicates=25)
 
     def dispatch(self, request, *args, **kwargs):
         self.mini_app_client = _resolve_mini_app_client(request)
@@ -4039,9 +4069,7 @@ def mini_app_purchase_supplier_search_view(request):
         return JsonResponse({"error": _("No tienes permisos para consultar terceros.")}, status=403)
 
     query = _normalize_string(request.GET.get("q"))
-    suppliers = Supplier.objects.all()
-    if query:
-        suppliers = suppliers.filter(Q(name__icontains=query) | Q(tax_id__icontains=query))
+    suppliers = search_suppliers(Supplier.objects.all(), query)
     suppliers = suppliers.order_by("name")[:MINI_APP_PURCHASE_SUPPLIER_LIMIT]
 
     results = []
@@ -5012,32 +5040,34 @@ class TaskDefinitionListView(StaffRequiredMixin, View):
 
         filters = build_task_definition_filters(request.GET)
         queryset = get_task_definition_queryset(filters)
-        paginator = Paginator(queryset, 400)
-        page_number = request.GET.get("page")
-        page_obj = paginator.get_page(page_number)
-        rows = build_task_definition_rows(page_obj.object_list)
+        page = paginate_task_definitions(
+            queryset,
+            cursor_token=request.GET.get("cursor"),
+            page_number=request.GET.get("page"),
+        )
+        rows = build_task_definition_rows(page.object_list)
         rows_html = render_to_string(
             "task_manager/includes/task_definition_rows.html",
             {"rows": rows},
             request=request,
         )
 
-        if paginator.count:
-            start_index = page_obj.start_index()
-            end_index = page_obj.end_index()
-        else:
-            start_index = 0
-            end_index = 0
+        page_number = None
+        if page.start_index:
+            page_number = (page.start_index - 1) // TASK_DEFINITION_PAGE_SIZE + 1
 
         payload = {
             "rows_html": rows_html,
-            "page": page_obj.number,
-            "has_next": page_obj.has_next(),
-            "next_page": page_obj.next_page_number() if page_obj.has_next() else None,
-            "count": paginator.count,
-            "page_size": paginator.per_page,
-            "start_index": start_index,
-            "end_index": end_index,
+            "page": page_number,
+            "has_next": page.has_next,
+            "next_page": page_number + 1 if page_number and page.has_next else None,
+            "next_cursor": page.next_cursor,
+            "has_previous": page.has_previous,
+            "previous_cursor": page.previous_cursor,
+            "count": approximate_count(queryset),
+            "page_size": TASK_DEFINITION_PAGE_SIZE,
+            "start_index": page.start_index,
+            "end_index": page.end_index,
             "rows_loaded": len(rows),
         }
         return JsonResponse(payload, status=200)
@@ -5167,6 +5197,9 @@ class TaskDefinitionGroupValue:
     subtitle: Optional[str] = None
 
 
+TASK_DEFINITION_ORDERING: tuple[str, ...] = ("display_order", "name", "pk")
+TASK_DEFINITION_PAGE_SIZE = 400
+
 TASK_FILTER_PARAM_NAMES: tuple[str, ...] = (
     "status",
     "category",
@@ -5217,7 +5250,7 @@ def get_task_definition_queryset(
             "rooms__chicken_house__farm",
             "position__rooms__chicken_house__farm",
         )
-        .order_by("display_order", "name", "pk")
+        .order_by(*TASK_DEFINITION_ORDERING)
     )
 
     if filters is None:
@@ -5671,80 +5704,60 @@ def build_scope_filter_groups() -> Sequence[FilterOptionGroup]:
         )
     )
 
-    farms = Farm.objects.order_by("name").only("id", "name")
-    if farms:
-        farm_options = [
-            FilterOption(
-                value=f"farm:{farm.pk}",
-                label=farm.name,
-            )
-            for farm in farms
-            if farm.name
-        ]
-        if farm_options:
-            groups.append(
-                FilterOptionGroup(
-                    key="farms",
-                    label=_("Granjas específicas"),
-                    options=farm_options,
-                )
+    catalog = get_infrastructure_catalog()
+    farm_options = [
+        FilterOption(
+            value=f"farm:{farm.id}",
+            label=farm.name,
+        )
+        for farm in catalog.farms
+        if farm.name
+    ]
+    if farm_options:
+        groups.append(
+            FilterOptionGroup(
+                key="farms",
+                label=_("Granjas específicas"),
+                options=farm_options,
             )
+        )
 
-    chicken_houses = (
-        ChickenHouse.objects.select_related("farm")
-        .order_by("farm__name", "name")
-        .only("id", "name", "farm__name")
-    )
-    if chicken_houses:
-        house_options = [
-            FilterOption(
-                value=f"house:{house.pk}",
-                label=house.name,
-                description=house.farm.name if house.farm else None,
-            )
-            for house in chicken_houses
-            if house.name
-        ]
-        if house_options:
-            groups.append(
-                FilterOptionGroup(
-                    key="houses",
-                    label=_("Galpones"),
-                    options=house_options,
-                )
+    house_options = [
+        FilterOption(
+            value=f"house:{house.id}",
+            label=house.name,
+            description=house.farm_name or None,
+        )
+        for house in catalog.chicken_houses
+        if house.name
+    ]
+    if house_options:
+        groups.append(
+            FilterOptionGroup(
+                key="houses",
+                label=_("Galpones"),
+                options=house_options,
             )
+        )
 
-    rooms = (
-        Room.objects.select_related("chicken_house__farm")
-        .order_by("chicken_house__farm__name", "chicken_house__name", "name")
-        .only("id", "name", "chicken_house__name", "chicken_house__farm__name")
-    )
-    if rooms:
-        room_options: list[FilterOption] = []
-        for room in rooms:
-            house = room.chicken_house
-            farm = house.farm if house else None
-            description_parts: list[str] = []
-            if farm and getattr(farm, "name", ""):
-                description_parts.append(farm.name)
-            if house and getattr(house, "name", ""):
-                description_parts.append(house.name)
-            description = " · ".join(description_parts) if description_parts else None
-            room_options.append(
-                FilterOption(
-                    value=f"room:{room.pk}",
-                    label=room.name,
-                    description=description,
-                )
+    room_options: list[FilterOption] = []
+    for room in catalog.rooms:
+        description_parts = [name for name in (room.farm_name, room.chicken_house_name) if name]
+        room_options.append(
+            FilterOption(
+                value=f"room:{room.id}",
+                label=room.name,
+                description=" · ".join(description_parts) if description_parts else None,
             )
-        if room_options:
-            groups.append(
-                FilterOptionGroup(
-                    key="rooms",
-                    label=_("Salones"),
-                    options=room_options,
-                )
+        )
+    if room_options:
+        groups.append(
+            FilterOptionGroup(
+                key="rooms",
+                label=_("Salones"),
+                options=room_options,
             )
+        )
 
     return groups
 
@@ -5766,43 +5779,24 @@ def build_responsible_filter_groups() -> Sequence[FilterOptionGroup]:
         )
     )
 
-    positions = (
-        PositionDefinition.objects.select_related("farm", "chicken_house", "handoff_position")
-        .order_by("display_order", "name")
-        .only(
-            "id",
-            "name",
-            "farm__name",
-            "chicken_house__name",
-            "handoff_position__id",
-            "handoff_position__name",
-            "handoff_position__code",
-        )
-    )
-    if positions:
-        position_options: list[FilterOption] = []
-        for position in positions:
-            description_parts: list[str] = []
-            if position.farm and getattr(position.farm, "name", ""):
-                description_parts.append(position.farm.name)
-            if position.chicken_house and getattr(position.chicken_house, "name", ""):
-                description_parts.append(position.chicken_house.name)
-            description = " · ".join(description_parts) if description_parts else None
-            position_options.append(
-                FilterOption(
-                    value=f"position:{position.pk}",
-                    label=position.name,
-                    description=description,
-                )
+    position_options: list[FilterOption] = []
+    for position in get_infrastructure_catalog().positions:
+        description_parts = [name for name in (position.farm_name, position.chicken_house_name) if name]
+        position_options.append(
+            FilterOption(
+                value=f"position:{position.id}",
+                label=position.name,
+                description=" · ".join(description_parts) if description_parts else None,
             )
-        if position_options:
-            groups.append(
-                FilterOptionGroup(
-                    key="positions",
-                    label=_("Posiciones específicas"),
-                    options=position_options,
-                )
+        )
+    if position_options:
+        groups.append(
+            FilterOptionGroup(
+                key="positions",
+                label=_("Posiciones específicas"),
+                options=position_options,
             )
+        )
 
     collaborators = (
         UserProfile.objects.filter(is_active=True)
@@ -5949,12 +5943,12 @@ def build_grouping_secondary_filter_groups() -> Sequence[FilterOptionGroup]:
 
 
 def build_assignment_farm_filter_groups() -> Sequence[FilterOptionGroup]:
-    options = [
-        FilterOption("all", _("Todas las granjas")),
-        FilterOption("farm-el-guadual", "El Guadual"),
-        FilterOption("farm-la-rivera", "La Rivera"),
-        FilterOption("farm-altamira", "Altamira"),
-    ]
+    options = [FilterOption("all", _("Todas las granjas"))]
+    options.extend(
+        FilterOption(f"farm:{farm.id}", farm.name)
+        for farm in get_infrastructure_catalog().farms
+        if farm.name
+    )
     return [
         FilterOptionGroup(
             key="assignment-farms",
@@ -5965,12 +5959,12 @@ def build_assignment_farm_filter_groups() -> Sequence[FilterOptionGroup]:
 
 
 def build_assignment_house_filter_groups() -> Sequence[FilterOptionGroup]:
-    options = [
-        FilterOption("all", _("Todos los galpones")),
-        FilterOption("house-1", _("Galpón 1")),
-        FilterOption("house-2", _("Galpón 2")),
-        FilterOption("house-3", _("Galpón 3")),
-    ]
+    options = [FilterOption("all", _("Todos los galpones"))]
+    options.extend(
+        FilterOption(f"house:{house.id}", house.name, description=house.farm_name or None)
+        for house in get_infrastructure_catalog().chicken_houses
+        if house.name
+    )
     return [
         FilterOptionGroup(
             key="assignment-houses",
@@ -6026,57 +6020,31 @@ def build_today_view_filter_groups() -> Sequence[FilterOptionGroup]:
     ]
 
 
-def locate_task_definition_page(
-    queryset: QuerySet[TaskDefinition], task_id: int, per_page: int
-) -> Optional[int]:
-    if per_page <= 0:
-        return None
-
-    try:
-        task = queryset.get(pk=task_id)
-    except TaskDefinition.DoesNotExist:
-        return None
-
-    preceding = queryset.filter(
-        Q(display_order__lt=task.display_order)
-        | (
-            Q(display_order=task.display_order)
-            & (
-                Q(name__lt=task.name)
-                | (Q(name=task.name) & Q(pk__lt=task.pk))
+def paginate_task_definitions(
+    queryset: QuerySet[TaskDefinition],
+    *,
+    cursor_token: Optional[str],
+    page_number: Optional[str] = None,
+) -> KeysetPage:
+    cursor = decode_cursor(cursor_token, model=TaskDefinition, ordering=TASK_DEFINITION_ORDERING)
+    if cursor is None and page_number:
+        try:
+            requested_page = int(page_number)
+        except (TypeError, ValueError):
+            requested_page = 1
+        if requested_page > 1:
+            cursor = page_anchor(
+                queryset,
+                ordering=TASK_DEFINITION_ORDERING,
+                page_number=requested_page,
+                per_page=TASK_DEFINITION_PAGE_SIZE,
             )
-        )
-    ).count()
-    return preceding // per_page + 1
-
-
-def build_compact_page_range(page_obj, edge_count: int = 1, around_count: int = 1) -> Sequence[Optional[int]]:
-    paginator = page_obj.paginator
-    total_pages = paginator.num_pages
-    if total_pages <= 1:
-        return [page_obj.number]
-
-    current = page_obj.number
-    included: set[int] = set()
-
-    for num in range(1, edge_count + 1):
-        included.add(num)
-        included.add(total_pages - num + 1)
-
-    for num in range(current - around_count, current + around_count + 1):
-        if 1 <= num <= total_pages:
-            included.add(num)
-
-    sorted_pages = []
-    last_page = 0
-    for num in range(1, total_pages + 1):
-        if num in included:
-            if last_page and num - last_page > 1:
-                sorted_pages.append(None)
-            sorted_pages.append(num)
-            last_page = num
-
-    return sorted_pages
+    return keyset_paginate(
+        queryset,
+        ordering=TASK_DEFINITION_ORDERING,
+        per_page=TASK_DEFINITION_PAGE_SIZE,
+        cursor=cursor,
+    )
 
 
 def format_task_schedule(task: TaskDefinition, task_type_label: str | None = None) -> tuple[str, Sequence[str]]: